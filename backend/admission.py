@@ -0,0 +1,252 @@
+"""
+Server-wide admission control for multi-agent diagnosis pipelines.
+
+slowapi limits requests per IP, but nothing bounded how many seven-agent
+pipelines run at once across all clients.  The AdmissionController:
+
+  * Caps in-flight pipelines (MAX_INFLIGHT_PIPELINES)
+  * Queues excess requests fairly — round-robin across tenants (API key or
+    client IP), so one busy caller cannot starve everyone else
+  * Reports queue position / estimated wait to waiting clients
+  * Sheds load with a Retry-After hint when the queue is full or the
+    projected (or actual) wait exceeds the wait SLO (QUEUE_WAIT_SLO_SECONDS)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable
+
+from agents.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_INFLIGHT = 8
+DEFAULT_MAX_QUEUED = 64
+DEFAULT_QUEUE_SLO_SECONDS = 60.0
+
+# Initial guess for one pipeline run before any have completed
+DEFAULT_SERVICE_SECONDS = 45.0
+
+# How often a waiting request re-checks its position
+POSITION_POLL_SECONDS = 1.0
+
+PIPELINES_SHED = Counter(
+    "diagnosis_pipelines_shed_total",
+    "Pipeline requests rejected by admission control, by reason",
+    ("reason",),
+)
+PIPELINES_QUEUED = Counter(
+    "diagnosis_pipelines_queued_total",
+    "Pipeline requests that had to wait for a slot",
+)
+
+PositionCallback = Callable[[int, float], Awaitable[None]]
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed; ``retry_after`` is in whole seconds."""
+
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(f"Server busy ({reason}); retry after {retry_after}s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class _Waiter:
+    __slots__ = ("tenant", "future", "enqueued")
+
+    def __init__(self, tenant: str):
+        self.tenant = tenant
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.enqueued = time.monotonic()
+
+
+class AdmissionController:
+    """Bounded concurrency with a per-tenant fair queue."""
+
+    def __init__(
+        self,
+        max_inflight: int = DEFAULT_MAX_INFLIGHT,
+        max_queued: int = DEFAULT_MAX_QUEUED,
+        queue_slo: float = DEFAULT_QUEUE_SLO_SECONDS,
+    ):
+        self.max_inflight = max(1, max_inflight)
+        self.max_queued = max(0, max_queued)
+        self.queue_slo = queue_slo
+        self.inflight = 0
+        # tenant -> its waiters; iteration order is the round-robin order
+        self._queues: OrderedDict[str, deque[_Waiter]] = OrderedDict()
+        self._service_ewma = DEFAULT_SERVICE_SECONDS
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+        """Build a controller from MAX_INFLIGHT_PIPELINES / MAX_QUEUED_PIPELINES / QUEUE_WAIT_SLO_SECONDS."""
+        try:
+            return cls(
+                max_inflight=int(os.getenv("MAX_INFLIGHT_PIPELINES", DEFAULT_MAX_INFLIGHT)),
+                max_queued=int(os.getenv("MAX_QUEUED_PIPELINES", DEFAULT_MAX_QUEUED)),
+                queue_slo=float(os.getenv("QUEUE_WAIT_SLO_SECONDS", DEFAULT_QUEUE_SLO_SECONDS)),
+            )
+        except ValueError as e:
+            logger.warning("Ignoring invalid admission control settings: %s", e)
+            return cls()
+
+    # ------------------------------------------------------------------
+    # Queue inspection
+    # ------------------------------------------------------------------
+
+    @property
+    def queued(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    def position(self, waiter: _Waiter) -> int:
+        """1-based position of *waiter* in round-robin dispatch order."""
+        own = self._queues.get(waiter.tenant)
+        if not own or waiter not in own:
+            return 0
+        idx = own.index(waiter)
+        ahead = idx
+        before_own = True
+        for tenant, q in self._queues.items():
+            if tenant == waiter.tenant:
+                before_own = False
+                continue
+            # Tenants earlier in the rotation get one extra turn before ours
+            ahead += min(len(q), idx + 1 if before_own else idx)
+        return ahead + 1
+
+    def estimate_wait(self, position: int) -> float:
+        """Projected seconds until the request at *position* gets a slot."""
+        if position <= 0:
+            return 0.0
+        free = self.max_inflight - self.inflight
+        if position <= free:
+            return 0.0
+        return math.ceil((position - max(free, 0)) / self.max_inflight) * self._service_ewma
+
+    def _retry_after(self) -> int:
+        return max(1, int(math.ceil(self.estimate_wait(self.queued + 1))))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "inflight": self.inflight,
+            "max_inflight": self.max_inflight,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "tenants_waiting": len(self._queues),
+            "avg_pipeline_seconds": round(self._service_ewma, 1),
+            "queue_slo_seconds": self.queue_slo,
+        }
+
+    # ------------------------------------------------------------------
+    # Acquire / release
+    # ------------------------------------------------------------------
+
+    def check(self) -> None:
+        """Raise AdmissionRejected now if a new request would be shed."""
+        if self.inflight < self.max_inflight and not self._queues:
+            return
+        if self.queued >= self.max_queued:
+            PIPELINES_SHED.inc(reason="queue_full")
+            raise AdmissionRejected("queue_full", self._retry_after())
+        if self.estimate_wait(self.queued + 1) > self.queue_slo:
+            PIPELINES_SHED.inc(reason="projected_wait")
+            raise AdmissionRejected("projected_wait", self._retry_after())
+
+    def _remove(self, waiter: _Waiter) -> None:
+        q = self._queues.get(waiter.tenant)
+        if q and waiter in q:
+            q.remove(waiter)
+            if not q:
+                del self._queues[waiter.tenant]
+
+    def _dispatch(self) -> None:
+        while self.inflight < self.max_inflight and self._queues:
+            tenant, q = next(iter(self._queues.items()))
+            waiter = q.popleft()
+            if q:
+                self._queues.move_to_end(tenant)
+            else:
+                del self._queues[tenant]
+            if waiter.future.done():
+                continue
+            self.inflight += 1
+            waiter.future.set_result(True)
+
+    async def acquire(
+        self,
+        tenant: str,
+        on_position: PositionCallback | None = None,
+        shed: bool = True,
+    ) -> float:
+        """Wait for a pipeline slot; return the seconds spent queued.
+
+        *on_position(position, eta_seconds)* is awaited whenever the
+        request's queue position changes.  Raises AdmissionRejected if the
+        request is shed up front or its wait exceeds the SLO.  Background
+        work that has already been accepted (jobs, batches) passes
+        ``shed=False`` to wait as long as it takes instead.
+        """
+        if shed:
+            self.check()
+        if self.inflight < self.max_inflight and not self._queues:
+            self.inflight += 1
+            return 0.0
+
+        waiter = _Waiter(tenant)
+        self._queues.setdefault(tenant, deque()).append(waiter)
+        PIPELINES_QUEUED.inc()
+        last_position = None
+        try:
+            while True:
+                position = self.position(waiter)
+                if on_position and position != last_position:
+                    last_position = position
+                    await on_position(position, round(self.estimate_wait(position), 1))
+                try:
+                    await asyncio.wait_for(asyncio.shield(waiter.future), timeout=POSITION_POLL_SECONDS)
+                    return time.monotonic() - waiter.enqueued
+                except asyncio.TimeoutError:
+                    pass
+                if waiter.future.done():
+                    return time.monotonic() - waiter.enqueued
+                if shed and time.monotonic() - waiter.enqueued > self.queue_slo:
+                    self._remove(waiter)
+                    PIPELINES_SHED.inc(reason="wait_exceeded")
+                    raise AdmissionRejected("wait_exceeded", self._retry_after())
+        except BaseException:
+            # Cancelled, shed, or on_position raised: leave no dead waiter behind
+            self._remove(waiter)
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Slot was granted just as we gave up — hand it on
+                self.release()
+            else:
+                waiter.future.cancel()
+            raise
+
+    def release(self, service_seconds: float | None = None) -> None:
+        """Free a slot and admit the next waiter in round-robin order."""
+        if service_seconds is not None:
+            self._service_ewma = 0.8 * self._service_ewma + 0.2 * service_seconds
+        self.inflight = max(0, self.inflight - 1)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, tenant: str, on_position: PositionCallback | None = None, shed: bool = True):
+        """``async with admission.slot(tenant):`` — hold a slot for one pipeline run."""
+        await self.acquire(tenant, on_position, shed)
+        started = time.monotonic()
+        completed = False
+        try:
+            yield
+            completed = True
+        finally:
+            # Only completed runs feed the service-time estimate
+            self.release(time.monotonic() - started if completed else None)
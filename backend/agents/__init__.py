@@ -6,18 +6,36 @@ Architecture:
 
 Each agent is autonomous, uses Claude via tool use, and communicates
 through the shared MessageBus.
+
+Exports are resolved lazily (PEP 562), so importing the package does not
+load every agent module; see ``agents.warmup`` for background preloading.
 """
 
-from .orchestrator import OrchestratorAgent
-from .message_bus import MessageBus
-from .research import ResearchAgent
-from .safety import SafetyAgent
-from .empathy import EmpathyAgent
-
-__all__ = [
-    "OrchestratorAgent",
-    "MessageBus",
-    "ResearchAgent",
-    "SafetyAgent",
-    "EmpathyAgent",
-]
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+_EXPORTS = {
+    "OrchestratorAgent": ".orchestrator",
+    "MessageBus": ".message_bus",
+    "ResearchAgent": ".research",
+    "SafetyAgent": ".safety",
+    "EmpathyAgent": ".empathy",
+    "MedicationSafetyChecker": ".med_safety",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
@@ -10,14 +10,19 @@ Each agent:
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import time
 from typing import Any
 
-from anthropic import AsyncAnthropic
-
 from .message_bus import Message, MessageBus
 from .llm_client import LLMClient
+from .context_packer import pack_context
+from .token_counter import VENDOR_INPUT_CEILING, compact_tool_results
+from .tracing import tracer
+from .timeouts import timeouts
+from .metrics import AGENT_SECONDS, AGENT_TIMEOUTS, LLM_CALLS, LLM_TOKENS, TOOL_CALLS
 
 logger = logging.getLogger(__name__)
 
@@ -30,11 +35,14 @@ class BaseAgent:
     model: str = "claude-sonnet-4-6"
     max_tokens: int = 4096
     temperature: float = 0.3
+    context_token_budget: int = 4000  # max tokens of packed upstream context
+    input_token_budget: int = 24000  # max estimated input tokens per LLM request
 
     def __init__(self, api_key: str, bus: MessageBus, llm_client: LLMClient | None = None):
         # Keep legacy Anthropic client for backward compatibility
         # Skip Anthropic init if using Ollama (key="ollama")
         if api_key and api_key != "ollama":
+            from anthropic import AsyncAnthropic
             self.client = AsyncAnthropic(api_key=api_key)
         else:
             self.client = None
@@ -193,31 +201,49 @@ class BaseAgent:
         """
         import asyncio
         from .llm_client import get_vendor
-        # Local models (Ollama) need more time per agent
+        # Adaptive timeout from observed latency, capped by the pipeline
+        # deadline; local models (Ollama) start from a longer default
         if timeout is None:
-            timeout = 90.0 if get_vendor(self.model) == "ollama" else 45.0
-        try:
-            return await asyncio.wait_for(
-                self._run_loop(user_message, context, images),
-                timeout=timeout
-            )
-        except asyncio.TimeoutError:
-            logger.error("[%s] Agent timed out after %.0fs", self.name, timeout)
-            return {
-                "text": f"Agent {self.name} timed out after {timeout:.0f}s. The analysis may be incomplete.",
-                "tool_calls": [],
-                "timed_out": True,
-            }
+            default = 90.0 if get_vendor(self.model) == "ollama" else 45.0
+            timeout = timeouts.timeout_for(self.name, self.model, default)
+        started = time.perf_counter()
+        with tracer.span(f"agent.{self.name}", agent=self.name, model=self.model, timeout_s=timeout) as span:
+            try:
+                result = await asyncio.wait_for(
+                    self._run_loop(user_message, context, images),
+                    timeout=timeout
+                )
+                span.set(tool_calls=len(result.get("tool_calls", [])))
+                timeouts.observe(self.name, self.model, time.perf_counter() - started)
+                return result
+            except asyncio.CancelledError:
+                # Pipeline cancelled (e.g. client disconnected) — in-flight LLM
+                # requests are aborted by the cancellation itself
+                logger.info("[%s] Agent run cancelled", self.name)
+                raise
+            except asyncio.TimeoutError:
+                logger.error("[%s] Agent timed out after %.0fs", self.name, timeout)
+                span.set(timed_out=True)
+                AGENT_TIMEOUTS.inc(agent=self.name)
+                timeouts.observe_timeout(self.name, self.model, timeout)
+                return {
+                    "text": f"Agent {self.name} timed out after {timeout:.0f}s. The analysis may be incomplete.",
+                    "tool_calls": [],
+                    "timed_out": True,
+                }
+            finally:
+                AGENT_SECONDS.observe(time.perf_counter() - started, agent=self.name)
 
     async def _run_loop(self, user_message: str, context: dict[str, Any] | None = None, images: list[str] | None = None) -> dict[str, Any]:
         """Internal agent loop — called by run() with timeout wrapper."""
         messages: list[dict] = []
 
-        # Inject context from other agents if available
+        # Inject context from other agents if available — projected onto the
+        # fields this agent uses and compacted to its token budget
         if context:
             context_block = (
                 "Here is context from other agents on the team:\n"
-                + json.dumps(context, indent=2)
+                + pack_context(self.name, context, self.context_token_budget, self.model)
             )
             messages.append({"role": "user", "content": context_block})
             messages.append({"role": "assistant", "content": "Thank you. I have reviewed the context from my colleagues. I will now proceed with my analysis."})
@@ -247,69 +273,104 @@ class BaseAgent:
         # Determine whether to use multi-vendor LLMClient or direct Anthropic
         from .llm_client import get_vendor
         use_llm_client = self.llm_client and (get_vendor(self.model) != "anthropic" or self.client is None)
-
-        for _ in range(max_iterations):
-            if use_llm_client:
-                resp = await self.llm_client.create_message(
-                    model=self.model,
-                    system=self._system_prompt,
-                    messages=messages,
-                    tools=tools,
-                    max_tokens=self.max_tokens,
-                    temperature=self.temperature,
-                )
-                assistant_content = resp["content"]
-            else:
-                response = await self.client.messages.create(
-                    model=self.model,
-                    max_tokens=self.max_tokens,
-                    temperature=self.temperature,
-                    system=self._system_prompt,
-                    tools=tools,
-                    messages=messages,
-                )
-                assistant_content = response.content
-
-            # Track token usage
-            if not use_llm_client and hasattr(response, "usage"):
-                u = response.usage
-                total_input_tokens += getattr(u, "input_tokens", 0)
-                total_output_tokens += getattr(u, "output_tokens", 0)
-            elif use_llm_client and isinstance(resp, dict) and "usage" in resp:
-                u = resp["usage"]
-                total_input_tokens += u.get("input_tokens", 0)
-                total_output_tokens += u.get("output_tokens", 0)
-
-            messages.append({"role": "assistant", "content": assistant_content})
-
-            # Check for tool use
-            tool_blocks = [b for b in assistant_content if hasattr(b, "type") and b.type == "tool_use"]
-            if not tool_blocks:
-                # No tool use → final answer
-                text_parts = [b.text for b in assistant_content if hasattr(b, "text") and b.type == "text"]
-                return {
-                    "text": "\n".join(text_parts),
-                    "tool_calls": tool_call_log,
-                    "token_usage": {"input_tokens": total_input_tokens, "output_tokens": total_output_tokens},
-                }
-
-            # Process each tool call
-            tool_results = []
-            for tb in tool_blocks:
-                logger.info("[%s] tool_use: %s", self.name, tb.name)
-                result_str = await self._handle_tool_call(tb.name, tb.input)
-                tool_call_log.append({
-                    "tool": tb.name,
-                    "input": tb.input,
-                    "result": result_str,
-                })
-                tool_results.append({
-                    "type": "tool_result",
-                    "tool_use_id": tb.id,
-                    "content": result_str,
-                })
-
-            messages.append({"role": "user", "content": tool_results})
+        vendor = get_vendor(self.model)
+        input_budget = min(self.input_token_budget, VENDOR_INPUT_CEILING.get(vendor, self.input_token_budget))
+        sized_tools = None if vendor == "ollama" else tools  # Ollama calls are sent without tools
+
+        for iteration in range(max_iterations):
+            with tracer.span("agent.iteration", agent=self.name, iteration=iteration) as iter_span:
+                # Keep the request inside the input budget by compacting tool
+                # results the model has already consumed
+                estimated_input = compact_tool_results(messages, self._system_prompt, sized_tools, self.model, input_budget)
+                iter_span.set(estimated_input_tokens=estimated_input)
+                if estimated_input > input_budget:
+                    logger.warning("[%s] request ~%d tokens exceeds input budget %d after compaction",
+                                   self.name, estimated_input, input_budget)
+                with tracer.span("llm.call", **{"gen_ai.system": vendor, "gen_ai.request.model": self.model}) as llm_span:
+                    t0 = time.perf_counter()
+                    try:
+                        if use_llm_client:
+                            resp = await self.llm_client.create_message(
+                                model=self.model,
+                                system=self._system_prompt,
+                                messages=messages,
+                                tools=tools,
+                                max_tokens=self.max_tokens,
+                                temperature=self.temperature,
+                            )
+                            assistant_content = resp["content"]
+                        else:
+                            response = await self.client.messages.create(
+                                model=self.model,
+                                max_tokens=self.max_tokens,
+                                temperature=self.temperature,
+                                system=self._system_prompt,
+                                tools=tools,
+                                messages=messages,
+                            )
+                            assistant_content = response.content
+                    except asyncio.CancelledError:
+                        LLM_CALLS.inc(vendor=vendor, model=self.model, status="cancelled")
+                        raise
+                    except Exception:
+                        LLM_CALLS.inc(vendor=vendor, model=self.model, status="error")
+                        raise
+                    LLM_CALLS.inc(vendor=vendor, model=self.model, status="ok")
+
+                    # Track token usage
+                    call_in = call_out = 0
+                    if not use_llm_client and hasattr(response, "usage"):
+                        u = response.usage
+                        call_in = getattr(u, "input_tokens", 0)
+                        call_out = getattr(u, "output_tokens", 0)
+                    elif use_llm_client and isinstance(resp, dict) and "usage" in resp:
+                        u = resp["usage"]
+                        call_in = u.get("input_tokens", 0)
+                        call_out = u.get("output_tokens", 0)
+                    total_input_tokens += call_in
+                    total_output_tokens += call_out
+                    LLM_TOKENS.inc(call_in, vendor=vendor, direction="input")
+                    LLM_TOKENS.inc(call_out, vendor=vendor, direction="output")
+                    # Whole-call latency: calls are non-streaming, so there is no separate TTFT
+                    llm_span.set(**{
+                        "gen_ai.usage.input_tokens": call_in,
+                        "gen_ai.usage.output_tokens": call_out,
+                        "llm.latency_ms": round((time.perf_counter() - t0) * 1000, 1),
+                    })
+
+                messages.append({"role": "assistant", "content": assistant_content})
+
+                # Check for tool use
+                tool_blocks = [b for b in assistant_content if hasattr(b, "type") and b.type == "tool_use"]
+                if not tool_blocks:
+                    # No tool use → final answer
+                    text_parts = [b.text for b in assistant_content if hasattr(b, "text") and b.type == "text"]
+                    return {
+                        "text": "\n".join(text_parts),
+                        "tool_calls": tool_call_log,
+                        "token_usage": {"input_tokens": total_input_tokens, "output_tokens": total_output_tokens},
+                    }
+
+                # Process each tool call
+                tool_results = []
+                for tb in tool_blocks:
+                    logger.info("[%s] tool_use: %s", self.name, tb.name)
+                    TOOL_CALLS.inc(agent=self.name, tool=tb.name)
+                    with tracer.span(f"tool.{tb.name}", agent=self.name, tool=tb.name) as tool_span:
+                        result_str = await self._handle_tool_call(tb.name, tb.input)
+                        tool_span.set(result_chars=len(result_str))
+                    tool_call_log.append({
+                        "tool": tb.name,
+                        "input": tb.input,
+                        "result": result_str,
+                    })
+                    tool_results.append({
+                        "type": "tool_result",
+                        "tool_use_id": tb.id,
+                        "content": result_str,
+                    })
+
+                messages.append({"role": "user", "content": tool_results})
 
         # Fallback if max iterations reached
         return {
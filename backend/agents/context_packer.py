@@ -0,0 +1,298 @@
+"""
+Context packer – compact, per-agent projection of upstream agent results.
+
+Downstream agents used to receive every upstream result verbatim as
+pretty-printed JSON, so the Empathy agent's input held five agents' worth of
+output it never reads.  The packer:
+
+  * Projects each upstream result onto the fields the consuming agent uses
+  * Drops repeated content (identical strings / list items across sections)
+  * Serializes compactly (no indentation, minimal separators)
+  * Enforces a per-agent token budget by progressively shortening long
+    strings and lists, then dropping the lowest-priority sections
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from .token_counter import count_tokens
+
+# ---------------------------------------------------------------------------
+# Field projections: consumer agent -> context key -> fields it reads
+# ---------------------------------------------------------------------------
+# A field mapped to ``None`` is kept whole.  A field mapped to a tuple is a
+# list of objects projected onto those sub-keys.  Context keys are listed in
+# priority order — when over budget, the LAST section is dropped first.
+
+_TRIAGE_CORE = {
+    "esi_level": None,
+    "urgency_level": None,
+    "red_flags": None,
+    "triage_summary": None,
+}
+
+_DIFFERENTIAL_BRIEF = ("condition", "confidence", "confidence_pct", "urgency", "recommended_specialty", "specialty")
+
+CONTEXT_PROJECTIONS: dict[str, dict[str, dict[str, tuple | None]]] = {
+    "diagnostician": {
+        "triage_assessment": {
+            **_TRIAGE_CORE,
+            "vital_sign_concerns": None,
+            "review_of_systems": None,
+            "symptom_domains": None,
+            "risk_factors": None,
+        },
+    },
+    "research": {
+        "triage_assessment": {
+            **_TRIAGE_CORE,
+            "symptom_domains": None,
+            "risk_factors": None,
+        },
+    },
+    "specialist": {
+        "triage_assessment": {
+            **_TRIAGE_CORE,
+            "symptom_domains": None,
+            "vital_sign_concerns": None,
+        },
+        "differential_diagnosis": {
+            "problem_representation": None,
+            "differential_diagnosis": (
+                "condition", "confidence", "confidence_pct", "supporting_features",
+                "opposing_features", "must_not_miss", "urgency",
+            ),
+            "must_not_miss": None,
+            "recommended_tests": None,
+            "clinical_reasoning_summary": None,
+        },
+        "research_evidence": {
+            "clinical_guidelines": None,
+            "evidence_summary": None,
+            "prevalence_data": None,
+        },
+    },
+    "treatment": {
+        "triage_assessment": {
+            "urgency_level": None,
+            "red_flags": None,
+            "immediate_actions": None,
+        },
+        "differential_diagnosis": {
+            "differential_diagnosis": _DIFFERENTIAL_BRIEF,
+            "must_not_miss": None,
+        },
+        "specialist_consultation": {
+            "specialty_consulted": None,
+            "specialist_assessment": None,
+            "risk_stratification": None,
+            "referral_recommendation": None,
+            "guideline_concordance": None,
+        },
+        "research_evidence": {
+            "clinical_guidelines": None,
+            "drug_interactions": None,
+            "nnt_nnh_data": None,
+        },
+    },
+    "safety": {
+        "treatment_plan": {
+            "medications": None,
+            "immediate_actions": None,
+            "medication_schedule": None,
+            "safety_warnings": None,
+        },
+        "triage_assessment": {
+            "esi_level": None,
+            "urgency_level": None,
+            "red_flags": None,
+            "risk_factors": None,
+        },
+        "differential_diagnosis": {
+            "differential_diagnosis": _DIFFERENTIAL_BRIEF,
+            "must_not_miss": None,
+        },
+        "research_evidence": {
+            "drug_interactions": None,
+        },
+        "specialist_consultation": {
+            "specialist_red_flags": None,
+            "referral_recommendation": None,
+        },
+    },
+    "empathy": {
+        "safety_review": {
+            "safety_status": None,
+            "critical_issues": None,
+            "high_issues": None,
+            "recommendations": None,
+        },
+        "triage_assessment": {
+            "urgency_level": None,
+            "red_flags": None,
+            "immediate_actions": None,
+        },
+        "treatment_plan": {
+            "medications": ("name", "medication", "dose", "dosage", "frequency", "duration", "warnings"),
+            "immediate_actions": None,
+            "lifestyle_recommendations": None,
+            "warning_signs": None,
+            "follow_up_timeline": None,
+        },
+        "differential_diagnosis": {
+            "differential_diagnosis": ("condition", "confidence", "confidence_pct", "urgency"),
+        },
+        "specialist_consultation": {
+            "referral_recommendation": None,
+        },
+    },
+}
+
+# Fields carried through regardless of projection so failures stay visible
+_ALWAYS_KEEP = ("error", "timed_out")
+
+# Progressive shrink steps applied when a packed context exceeds its budget:
+# (max string chars, max list items)
+_SHRINK_STEPS: tuple[tuple[int, int], ...] = ((600, 8), (300, 5), (160, 3), (80, 2))
+
+# Strings shorter than this are never treated as duplicates
+_DEDUPE_MIN_CHARS = 40
+
+
+# ---------------------------------------------------------------------------
+# Projection
+# ---------------------------------------------------------------------------
+
+def _project_items(items: Any, sub_fields: tuple) -> Any:
+    if not isinstance(items, list):
+        return items
+    projected = []
+    for item in items:
+        if isinstance(item, dict):
+            slim = {k: item[k] for k in sub_fields if k in item and item[k] not in (None, "", [], {})}
+            projected.append(slim or item)
+        else:
+            projected.append(item)
+    return projected
+
+
+def _project_section(data: Any, fields: dict[str, tuple | None]) -> Any:
+    if not isinstance(data, dict):
+        return data
+    out: dict[str, Any] = {}
+    for field, sub_fields in fields.items():
+        value = data.get(field)
+        if value in (None, "", [], {}):
+            continue
+        out[field] = _project_items(value, sub_fields) if sub_fields else value
+    for field in _ALWAYS_KEEP:
+        if field in data:
+            out[field] = data[field]
+    # Unparsed agent output: keep the raw text so the consumer still sees it
+    if not out and data.get("raw_text"):
+        out["raw_text"] = data["raw_text"]
+    return out
+
+
+def project_context(agent_name: str, context: dict[str, Any]) -> dict[str, Any]:
+    """Project *context* onto the fields *agent_name* reads.
+
+    Sections without a projection for this agent (e.g. ``previous_diagnosis``
+    on follow-ups) pass through unchanged.  Section order follows the
+    projection's priority order, with unknown sections appended.
+    """
+    projections = CONTEXT_PROJECTIONS.get(agent_name, {})
+    packed: dict[str, Any] = {}
+    for key in projections:
+        if key in context:
+            section = _project_section(context[key], projections[key])
+            if section not in (None, "", [], {}):
+                packed[key] = section
+    for key, value in context.items():
+        if key not in projections:
+            packed[key] = value
+    return packed
+
+
+# ---------------------------------------------------------------------------
+# Deduplication & shrinking
+# ---------------------------------------------------------------------------
+
+def _dedupe(value: Any, seen: dict[str, str], path: str) -> Any:
+    """Replace long strings already emitted elsewhere with a back-reference."""
+    if isinstance(value, str):
+        if len(value) < _DEDUPE_MIN_CHARS:
+            return value
+        key = value.strip().lower()
+        if key in seen:
+            return f"(same as {seen[key]})"
+        seen[key] = path
+        return value
+    if isinstance(value, dict):
+        return {k: _dedupe(v, seen, f"{path}.{k}" if path else k) for k, v in value.items()}
+    if isinstance(value, list):
+        out = []
+        emitted: set[str] = set()
+        for i, item in enumerate(value):
+            fingerprint = json.dumps(item, sort_keys=True, default=str)
+            if fingerprint in emitted:
+                continue
+            emitted.add(fingerprint)
+            out.append(_dedupe(item, seen, f"{path}[{i}]"))
+        return out
+    return value
+
+
+def _shrink(value: Any, max_chars: int, max_items: int) -> Any:
+    if isinstance(value, str):
+        return value if len(value) <= max_chars else value[:max_chars].rstrip() + "…"
+    if isinstance(value, dict):
+        return {k: _shrink(v, max_chars, max_items) for k, v in value.items()}
+    if isinstance(value, list):
+        shrunk = [_shrink(v, max_chars, max_items) for v in value[:max_items]]
+        if len(value) > max_items:
+            shrunk.append(f"(+{len(value) - max_items} more)")
+        return shrunk
+    return value
+
+
+def _dumps(data: Any) -> str:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+# ---------------------------------------------------------------------------
+# Public entry point
+# ---------------------------------------------------------------------------
+
+def pack_context(
+    agent_name: str,
+    context: dict[str, Any],
+    token_budget: int | None = None,
+    model: str = "claude-sonnet-4-6",
+) -> str:
+    """Return a compact JSON string of *context* tailored to *agent_name*.
+
+    If *token_budget* is given (in *model* tokens), the result is shortened
+    until it fits: long strings and lists are trimmed in steps, then whole
+    sections are dropped from lowest priority upward.  The first (highest-priority) section is
+    never dropped, only shrunk.
+    """
+    packed = _dedupe(project_context(agent_name, context), {}, "")
+    text = _dumps(packed)
+    if token_budget is None or count_tokens(text, model) <= token_budget:
+        return text
+
+    for max_chars, max_items in _SHRINK_STEPS:
+        shrunk = _shrink(packed, max_chars, max_items)
+        text = _dumps(shrunk)
+        if count_tokens(text, model) <= token_budget:
+            return text
+
+    sections = list(shrunk.keys())
+    while len(sections) > 1 and count_tokens(text, model) > token_budget:
+        shrunk.pop(sections.pop())
+        shrunk["_omitted"] = "lower-priority context dropped to fit token budget"
+        text = _dumps(shrunk)
+    return text
@@ -0,0 +1,188 @@
+"""
+Indexed illness scripts for the diagnostician's clinical_pattern_match tool.
+
+The scripts live in the knowledge store (``illness_scripts``: domain ->
+trigger keywords + scripts; "general" is the fallback when nothing
+matches).  On first use they are indexed once per process:
+
+  * all trigger keywords go into one Aho-Corasick automaton, so a symptom
+    text is scanned once regardless of how many domains and keywords exist
+    (same substring semantics as the ``any(w in symptoms ...)`` checks it
+    replaces)
+  * domains are ranked by match strength: each distinct keyword hit adds
+    its word count, divided by how many domains share the keyword, so
+    "shortness of breath" outweighs "pain" and "fever" counts half for
+    respiratory and infectious
+  * script lists are serialized once per (domain, field projection) and
+    spliced into the tool response
+
+``IllnessScriptIndex.match`` returns the top-k domains (with the rest
+listed by name and score only) so the tool output, and the tokens the
+model re-reads on the next turn, stay small.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections import deque
+from typing import Any, Iterable
+
+from .knowledge_store import knowledge
+
+FALLBACK_DOMAIN = "general"
+DEFAULT_TOP_K = 3
+SCRIPT_FIELDS = (
+    "condition",
+    "classic_presentation",
+    "key_discriminating_features",
+    "expected_timeline",
+    "associated_symptoms",
+    "risk_factors",
+    "red_herrings",
+)
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton reporting every keyword occurring in a text."""
+
+    __slots__ = ("_goto", "_fail", "_out")
+
+    def __init__(self, keywords: Iterable[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._out: list[tuple[str, ...]] = [()]
+        for keyword in keywords:
+            state = 0
+            for ch in keyword:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._out.append(())
+                state = nxt
+            if keyword not in self._out[state]:
+                self._out[state] += (keyword,)
+
+        # Breadth-first failure links; outputs inherit their fallback's outputs
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> set[str]:
+        goto, fail, out = self._goto, self._fail, self._out
+        found: set[str] = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+class IllnessScriptIndex:
+    """Keyword index and pre-serialized projections over the illness scripts."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ready = False
+        self._order: list[str] = []
+        self._scripts: dict[str, list[dict]] = {}
+        self._keyword_domains: dict[str, tuple[str, ...]] = {}
+        self._automaton: KeywordAutomaton | None = None
+        self._serialized: dict[tuple[str, tuple[str, ...]], str] = {}
+
+    def _build(self) -> None:
+        with self._lock:
+            if self._ready:
+                return
+            keyword_domains: dict[str, list[str]] = {}
+            for domain, entry in knowledge.table("illness_scripts").items():
+                self._order.append(domain)
+                self._scripts[domain] = entry["illness_scripts"]
+                for keyword in entry.get("triggers", []):
+                    keyword_domains.setdefault(keyword, []).append(domain)
+            self._keyword_domains = {k: tuple(v) for k, v in keyword_domains.items()}
+            self._automaton = KeywordAutomaton(self._keyword_domains)
+            self._ready = True
+
+    def score(self, symptoms: str) -> list[tuple[str, float, list[str]]]:
+        """(domain, score, matched keywords) for every matched domain, strongest first."""
+        if not self._ready:
+            self._build()
+        hits: dict[str, list[str]] = {}
+        for keyword in self._automaton.find(symptoms):
+            for domain in self._keyword_domains[keyword]:
+                hits.setdefault(domain, []).append(keyword)
+        ranked = []
+        for domain, keywords in hits.items():
+            strength = sum(len(k.split()) / len(self._keyword_domains[k]) for k in keywords)
+            ranked.append((domain, round(strength, 3), sorted(keywords)))
+        position = {d: i for i, d in enumerate(self._order)}
+        ranked.sort(key=lambda r: (-r[1], position[r[0]]))
+        return ranked
+
+    def scripts_json(self, domain: str, fields: tuple[str, ...] = SCRIPT_FIELDS) -> str:
+        """Serialized script list for a domain, restricted to ``fields``."""
+        key = (domain, fields)
+        cached = self._serialized.get(key)
+        if cached is None:
+            if not self._ready:
+                self._build()
+            scripts = self._scripts[domain]
+            if fields != SCRIPT_FIELDS:
+                scripts = [{f: s[f] for f in fields if f in s} for s in scripts]
+            cached = json.dumps(scripts)
+            self._serialized[key] = cached
+        return cached
+
+    def match(
+        self, symptoms: str, top_k: int = DEFAULT_TOP_K, fields: Iterable[str] | None = None,
+    ) -> tuple[str, list[dict[str, Any]]]:
+        """JSON array of the top-k matched domains, and a summary of the rest.
+
+        Falls back to the "general" scripts when no keyword matches.
+        """
+        projection = SCRIPT_FIELDS
+        if fields and not isinstance(fields, str):
+            wanted = set(fields) | {"condition"}
+            projection = tuple(f for f in SCRIPT_FIELDS if f in wanted)
+        ranked = self.score(symptoms)
+        if not ranked:
+            ranked = [(FALLBACK_DOMAIN, 0.0, [])]
+        try:
+            top_k = max(1, int(top_k))
+        except (TypeError, ValueError):
+            top_k = DEFAULT_TOP_K
+        parts = [
+            '{"domain": ' + json.dumps(domain)
+            + ', "match_score": ' + json.dumps(strength)
+            + ', "matched_keywords": ' + json.dumps(keywords)
+            + ', "illness_scripts": ' + self.scripts_json(domain, projection) + "}"
+            for domain, strength, keywords in ranked[:top_k]
+        ]
+        others = [
+            {"domain": domain, "match_score": strength, "conditions": [s["condition"] for s in self._scripts[domain]]}
+            for domain, strength, _ in ranked[top_k:]
+        ]
+        return "[" + ", ".join(parts) + "]", others
+
+    @property
+    def domains(self) -> list[str]:
+        if not self._ready:
+            self._build()
+        return list(self._order)
+
+
+illness_scripts = IllnessScriptIndex()
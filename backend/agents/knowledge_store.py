@@ -0,0 +1,301 @@
+"""
+Shared clinical knowledge store.
+
+The agents' knowledge bases (contraindications, dosages, guidelines,
+interactions, prevalence, lay terms, diagnostic criteria, care plans, …)
+live as JSON sources in ``agents/knowledge_data/`` instead of Python
+literals, and are compiled into one read-only SQLite file:
+
+  * Every uvicorn worker maps the same file (``PRAGMA mmap_size``), so the
+    data sits once in the OS page cache instead of once per worker heap
+  * Tables are exposed as read-only ``Mapping``/``Sequence`` views; an
+    entry is decoded from JSON the first time it is looked up and memoized
+    in its view, so a worker only holds the entries it actually uses.
+    Entries are shared between callers, as the old module-level literals
+    were; treat them as read-only
+  * The compiled file is rebuilt automatically when a source file changes
+    (written to a temp file and renamed, so concurrent workers never see a
+    partial store); prebuild it with ``python -m agents.knowledge_store``
+
+KNOWLEDGE_DB_PATH overrides where the compiled file lives (default: next to
+the sources, or the temp directory if that is not writable).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any, Iterator
+
+logger = logging.getLogger(__name__)
+
+SOURCE_DIR = Path(__file__).with_name("knowledge_data")
+DB_FILENAME = "knowledge.sqlite"
+MMAP_SIZE = 64 * 1024 * 1024
+# Zero-padded list positions keep list tables ordered as text keys
+_POS_WIDTH = 6
+
+
+def _fingerprint(source_dir: Path) -> str:
+    """Cheap staleness check: names, sizes and mtimes of the source files."""
+    parts = []
+    for path in sorted(source_dir.glob("*.json")):
+        st = path.stat()
+        parts.append(f"{path.name}:{st.st_size}:{st.st_mtime_ns}")
+    return ";".join(parts)
+
+
+def compile_store(source_dir: Path = SOURCE_DIR, db_path: Path | None = None) -> Path:
+    """Compile every ``<table>.json`` in *source_dir* into a SQLite store at *db_path*."""
+    db_path = Path(db_path or source_dir / DB_FILENAME)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=".knowledge-", suffix=".sqlite", dir=db_path.parent)
+    os.close(fd)
+    try:
+        conn = sqlite3.connect(tmp_name)
+        conn.executescript(
+            """
+            PRAGMA journal_mode = OFF;
+            CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE tables (name TEXT PRIMARY KEY, kind TEXT NOT NULL, size INTEGER NOT NULL);
+            CREATE TABLE entries (
+                tbl TEXT NOT NULL,
+                key TEXT NOT NULL,
+                pos INTEGER NOT NULL,
+                value TEXT NOT NULL,
+                PRIMARY KEY (tbl, key)
+            ) WITHOUT ROWID;
+            """
+        )
+        for path in sorted(source_dir.glob("*.json")):
+            data = json.loads(path.read_text(encoding="utf-8"))
+            name = path.stem
+            if isinstance(data, dict):
+                kind, rows = "mapping", data.items()
+            elif isinstance(data, list):
+                kind, rows = "sequence", ((str(i).zfill(_POS_WIDTH), v) for i, v in enumerate(data))
+            else:
+                raise ValueError(f"{path.name}: top level must be an object or array")
+            conn.execute("INSERT INTO tables VALUES (?, ?, ?)", (name, kind, len(data)))
+            conn.executemany(
+                # pos keeps source order, which first-match lookups in the agents rely on
+                "INSERT INTO entries VALUES (?, ?, ?, ?)",
+                (
+                    (name, key, pos, json.dumps(value, ensure_ascii=False, separators=(",", ":")))
+                    for pos, (key, value) in enumerate(rows)
+                ),
+            )
+        conn.execute("INSERT INTO meta VALUES ('fingerprint', ?)", (_fingerprint(source_dir),))
+        conn.commit()
+        conn.execute("VACUUM")
+        conn.close()
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, db_path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    logger.info("Compiled knowledge store %s", db_path)
+    return db_path
+
+
+# ---------------------------------------------------------------------------
+# Read-only views
+# ---------------------------------------------------------------------------
+
+class KnowledgeTable(Mapping):
+    """Lazy read-only mapping over one table of the store; decoded entries are memoized."""
+
+    def __init__(self, store: "KnowledgeStore", name: str):
+        self._store = store
+        self.name = name
+        self._keys: tuple[str, ...] | None = None
+        self._key_set: frozenset[str] = frozenset()
+        self._decoded: dict[str, Any] = {}
+
+    def _key_tuple(self) -> tuple[str, ...]:
+        if self._keys is None:
+            self._keys = tuple(self._store.keys(self.name))
+            self._key_set = frozenset(self._keys)
+        return self._keys
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._decoded[key]
+        except (KeyError, TypeError):
+            pass
+        # Misses (the common case for .get() probes) are answered from the key set
+        if not isinstance(key, str) or key not in self:
+            raise KeyError(key)
+        value = self._decoded[key] = json.loads(self._store.fetch(self.name, key))
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        self._key_tuple()
+        return key in self._key_set
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._key_tuple())
+
+    def __len__(self) -> int:
+        return len(self._key_tuple())
+
+    def __repr__(self) -> str:
+        return f"<KnowledgeTable {self.name}: {len(self)} entries>"
+
+
+class KnowledgeList(Sequence):
+    """Lazy read-only sequence over a list table of the store; decoded entries are memoized."""
+
+    def __init__(self, store: "KnowledgeStore", name: str):
+        self._store = store
+        self.name = name
+        self._len: int | None = None
+        self._decoded: dict[int, Any] = {}
+        self._complete = False
+
+    def __len__(self) -> int:
+        if self._len is None:
+            self._len = self._store.size(self.name)
+        return self._len
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        try:
+            return self._decoded[index]
+        except KeyError:
+            value = self._decoded[index] = json.loads(self._store.fetch(self.name, str(index).zfill(_POS_WIDTH)))
+            return value
+
+    def __iter__(self) -> Iterator[Any]:
+        if not self._complete:
+            # One scan decodes whatever is not memoized yet
+            for index, raw in enumerate(self._store.values(self.name)):
+                if index not in self._decoded:
+                    self._decoded[index] = json.loads(raw)
+            self._complete = True
+        for index in range(len(self)):
+            yield self._decoded[index]
+
+    def __repr__(self) -> str:
+        return f"<KnowledgeList {self.name}: {len(self)} entries>"
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+class KnowledgeStore:
+    """Connection to the compiled store; opened (and compiled if stale) on first use."""
+
+    def __init__(self, db_path: str | Path | None = None, source_dir: Path = SOURCE_DIR):
+        self.source_dir = source_dir
+        self.db_path = Path(db_path) if db_path else None
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._views: dict[str, KnowledgeTable | KnowledgeList] = {}
+
+    @classmethod
+    def from_env(cls) -> "KnowledgeStore":
+        return cls(os.getenv("KNOWLEDGE_DB_PATH") or None)
+
+    def _candidate_paths(self) -> list[Path]:
+        if self.db_path is not None:
+            return [self.db_path]
+        return [self.source_dir / DB_FILENAME, Path(tempfile.gettempdir()) / f"diagnosis-{DB_FILENAME}"]
+
+    @staticmethod
+    def _is_current(path: Path, fingerprint: str) -> bool:
+        try:
+            conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+            try:
+                row = conn.execute("SELECT value FROM meta WHERE name = 'fingerprint'").fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return False
+        return row is not None and row[0] == fingerprint
+
+    def _open(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._conn is not None:
+                return self._conn
+            fingerprint = _fingerprint(self.source_dir)
+            path = None
+            for candidate in self._candidate_paths():
+                if candidate.exists() and self._is_current(candidate, fingerprint):
+                    path = candidate
+                    break
+                try:
+                    path = compile_store(self.source_dir, candidate)
+                    break
+                except OSError as e:
+                    logger.warning("Cannot write knowledge store at %s: %s", candidate, e)
+            if path is None:
+                raise RuntimeError("No writable location for the knowledge store (set KNOWLEDGE_DB_PATH)")
+            # immutable: the file is only ever replaced by rename, never modified in place
+            conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro&immutable=1", uri=True, check_same_thread=False)
+            conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+            self._conn = conn
+            return conn
+
+    def fetch(self, table: str, key: str) -> str | None:
+        row = self._open().execute("SELECT value FROM entries WHERE tbl = ? AND key = ?", (table, key)).fetchone()
+        return row[0] if row else None
+
+    def keys(self, table: str) -> list[str]:
+        return [r[0] for r in self._open().execute("SELECT key FROM entries WHERE tbl = ? ORDER BY pos", (table,))]
+
+    def values(self, table: str) -> Iterator[str]:
+        for row in self._open().execute("SELECT value FROM entries WHERE tbl = ? ORDER BY pos", (table,)):
+            yield row[0]
+
+    def size(self, table: str) -> int:
+        row = self._open().execute("SELECT size FROM tables WHERE name = ?", (table,)).fetchone()
+        return row[0] if row else 0
+
+    def warm(self) -> int:
+        """Open (compiling if stale) and read the whole store into the page cache; returns its size in bytes."""
+        row = self._open().execute("SELECT COALESCE(SUM(LENGTH(key) + LENGTH(value)), 0) FROM entries").fetchone()
+        return row[0]
+
+    def table(self, name: str) -> KnowledgeTable:
+        view = self._views.get(name)
+        if view is None:
+            view = self._views[name] = KnowledgeTable(self, name)
+        return view
+
+    def list(self, name: str) -> KnowledgeList:
+        view = self._views.get(name)
+        if view is None:
+            view = self._views[name] = KnowledgeList(self, name)
+        return view
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+knowledge = KnowledgeStore.from_env()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile the clinical knowledge store")
+    parser.add_argument("--db", help="output path (default: KNOWLEDGE_DB_PATH or knowledge_data/knowledge.sqlite)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    compile_store(SOURCE_DIR, args.db or os.getenv("KNOWLEDGE_DB_PATH") or SOURCE_DIR / DB_FILENAME)
@@ -120,6 +120,20 @@ class LLMClient:
             )
         return self._clients["ollama"]
 
+    async def aclose(self) -> None:
+        """Close cached vendor clients and their HTTP connection pools."""
+        clients, self._clients = self._clients, {}
+        for vendor, client in clients.items():
+            close = getattr(client, "close", None)
+            if close is None:
+                continue
+            try:
+                result = close()
+                if hasattr(result, "__await__"):
+                    await result
+            except Exception as e:
+                logger.debug("Closing %s client failed: %s", vendor, e)
+
     async def create_message(
         self,
         model: str,
@@ -289,9 +303,12 @@ class LLMClient:
         # Cap max_tokens for local models to prevent very slow generation
         max_tokens = min(max_tokens, 1500)
 
-        # Trim system prompt for Ollama — keep it under 2000 chars for speed
-        if len(system) > 2000:
-            system = system[:1900] + "\n\n[System prompt trimmed for local model. Provide a concise clinical analysis.]"
+        # Trim system prompt for Ollama to a fixed token allowance for speed
+        from .token_counter import OLLAMA_SYSTEM_TOKENS, truncate_to_tokens
+        system = truncate_to_tokens(
+            system, OLLAMA_SYSTEM_TOKENS, model_id,
+            marker="\n\n[System prompt trimmed for local model. Provide a concise clinical analysis.]",
+        )
 
         # Build simple message list — Ollama doesn't support tool use well,
         # so we skip tools and just use text messages
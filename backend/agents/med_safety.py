@@ -0,0 +1,241 @@
+"""
+LLM-free bulk medication safety checks.
+
+Evaluates whole regimens (N medications x M conditions x allergies) against
+the same knowledge-store databases and rules the Treatment and Safety
+agents use through tool calls, without running a pipeline:
+
+  * contraindications and Beers Criteria flags   (SafetyAgent)
+  * allergy cross-reactivity                      (SafetyAgent)
+  * dangerous two/three-drug combinations         (SafetyAgent)
+  * interaction-matrix and profile interactions,
+    age/condition/pregnancy concerns              (TreatmentAgent)
+
+Everything that depends only on a drug name (database matches, trigger
+words it contains, class memberships) is computed once per distinct name
+and cached; everything that depends only on the patient (which
+contraindication triggers their conditions and age hit, their allergy
+classes) is computed once per regimen.  Checking a regimen is then set
+lookups per medication plus one pass over the combination groups.
+
+    from agents.med_safety import med_safety
+    med_safety.check(["ibuprofen", "warfarin"], conditions=["ckd"], allergies=["aspirin"], age=70)
+
+Served by POST /api/medication-safety/check.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Iterable
+
+from .safety import (
+    CONTRAINDICATIONS,
+    DANGEROUS_COMBINATIONS,
+    allergy_classes,
+    beers_flags,
+    combination_memberships,
+    contraindication_findings,
+    contraindication_rules,
+    cross_reactivity,
+    drug_allergy_classes,
+    flag_combinations,
+)
+from .treatment import (
+    OTHER_MEDICATION_CLASS_RULES,
+    class_interaction,
+    find_medication,
+    medication_classes,
+    population_concerns,
+    profile_interactions,
+)
+
+DEFAULT_CACHE_SIZE = 4096
+
+SEVERITY_RANK = {"low": 1, "moderate": 2, "minor": 1, "major": 3, "high": 3, "critical": 4}
+
+
+class DrugFacts:
+    """Everything about one medication name that does not depend on the patient."""
+
+    __slots__ = (
+        "lower", "matched_name", "record", "contra_rules", "beers",
+        "name_triggers", "allergy_classes", "classes", "other_classes", "combos",
+    )
+
+    def __init__(self, lower: str, triggers: frozenset[str], combos: list[dict]):
+        self.lower = lower
+        self.matched_name, self.record = find_medication(self.lower)
+        self.contra_rules = contraindication_rules(self.lower)
+        self.beers = beers_flags(self.lower)
+        # Triggers such as "maoi" or "anticoagulant" fire when this drug is a co-medication
+        self.name_triggers = frozenset(t for t in triggers if t in self.lower)
+        self.allergy_classes = drug_allergy_classes(self.lower)
+        self.classes = medication_classes(self.lower)
+        self.other_classes = medication_classes(self.lower, OTHER_MEDICATION_CLASS_RULES)
+        self.combos = combination_memberships(self.lower, combos)
+
+
+class MedicationSafetyChecker:
+    """Checks regimens against the agent safety databases; thread-safe."""
+
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE):
+        self.cache_size = max(1, cache_size)
+        self._drugs: OrderedDict[str, DrugFacts] = OrderedDict()
+        self._pairs: dict[tuple[str, str], tuple[list[dict], list[dict]]] = {}
+        self._lock = threading.Lock()
+        self._triggers: frozenset[str] | None = None
+        self._combos: list[dict] | None = None
+        self.checks = 0
+
+    # ------------------------------------------------------------------
+    # Per-drug cache
+    # ------------------------------------------------------------------
+
+    def _tables(self) -> tuple[frozenset[str], list[dict]]:
+        if self._triggers is None:
+            self._combos = list(DANGEROUS_COMBINATIONS)
+            self._triggers = frozenset(
+                contra["condition"] for drug_key in CONTRAINDICATIONS for contra in CONTRAINDICATIONS[drug_key]
+            )
+        return self._triggers, self._combos
+
+    def drug(self, name: str) -> DrugFacts:
+        key = name.lower().strip()
+        with self._lock:
+            facts = self._drugs.get(key)
+            if facts is not None:
+                self._drugs.move_to_end(key)
+                return facts
+        facts = DrugFacts(key, *self._tables())
+        with self._lock:
+            self._drugs[key] = facts
+            while len(self._drugs) > self.cache_size:
+                self._drugs.popitem(last=False)
+                self._pairs.clear()
+        return facts
+
+    def _interactions(self, drug: DrugFacts, other: DrugFacts, other_name: str) -> tuple[list[dict], list[dict]]:
+        """(interaction-matrix, profile) alerts of ``drug`` with one co-medication."""
+        key = (drug.lower, other_name)
+        alerts = self._pairs.get(key)
+        if alerts is None:
+            matrix = [
+                {"between": f"{drug.lower} <-> {other_name}", "classes": f"{mc} + {oc}", **interaction}
+                for mc in drug.classes
+                for oc in other.other_classes
+                if (interaction := class_interaction(mc, oc))
+            ]
+            profile = [] if drug.record is None else profile_interactions(drug.matched_name, drug.record, [other_name])
+            alerts = (matrix, profile)
+            if len(self._pairs) >= self.cache_size * 8:
+                self._pairs.clear()
+            self._pairs[key] = alerts
+        return alerts
+
+    # ------------------------------------------------------------------
+    # Regimen checks
+    # ------------------------------------------------------------------
+
+    def check(
+        self,
+        medications: Iterable[str],
+        conditions: Iterable[str] = (),
+        allergies: Iterable[str] = (),
+        age: int = 30,
+        gender: str = "unknown",
+        current_medications: Iterable[str] = (),
+    ) -> dict[str, Any]:
+        """Check every medication in ``medications`` against the patient.
+
+        Each medication is assessed alongside the rest of the regimen and
+        ``current_medications``; dangerous combinations are flagged across
+        both lists.
+        """
+        medications = [m for m in medications if m and m.strip()]
+        current = [m for m in current_medications if m and m.strip()]
+        conditions = [c for c in conditions if c]
+        allergies = [a for a in allergies if a]
+        gender = gender or "unknown"
+
+        names = medications + current
+        drugs = [self.drug(m) for m in names]
+        conditions_lower = [c.lower() for c in conditions]
+        patient_allergies = allergy_classes(allergies)
+
+        # Patient-level trigger hits, evaluated once for every trigger the regimen can raise
+        candidates = {contra["condition"] for d in drugs[:len(medications)] for contra in d.contra_rules}
+        hits = {t for t in candidates if any(t in c or c in t for c in conditions_lower)}
+        if age < 16:
+            hits.add("child")
+        if age >= 65:
+            hits.add("elderly")
+
+        results = []
+        for i, (name, drug) in enumerate(zip(medications, drugs)):
+            others = [(n, d) for j, (n, d) in enumerate(zip(names, drugs)) if j != i]
+            triggered = hits.union(*(d.name_triggers for _, d in others))
+            contraindications = contraindication_findings(drug.contra_rules, drug.beers, age, gender, triggered)
+            allergy_risks = cross_reactivity(drug.allergy_classes, patient_allergies)
+            pairs = [self._interactions(drug, d, n) for n, d in others]
+            interactions = [a for matrix, _ in pairs for a in matrix] + [a for _, profile in pairs for a in profile]
+
+            entry: dict[str, Any] = {
+                "medication": name,
+                "in_database": drug.record is not None,
+                "matched": drug.matched_name,
+                "contraindications": contraindications,
+                "allergy_risks": allergy_risks,
+                "interactions": interactions,
+            }
+            if drug.record is not None:
+                entry["class"] = drug.record.get("class")
+                entry["otc"] = drug.record.get("otc")
+                entry["prescription_required"] = not drug.record.get("otc", False)
+                entry.update(population_concerns(drug.matched_name, drug.record, age, gender, conditions))
+            entry["highest_severity"] = _highest(
+                [c["severity"] for c in contraindications]
+                + [r["risk"] for r in allergy_risks]
+                + [a["severity"] for a in interactions if "severity" in a]
+            )
+            results.append(entry)
+
+        combinations = flag_combinations(
+            [d.lower for d in drugs], [d.combos for d in drugs], self._tables()[1],
+        )
+        self.checks += len(results)
+        return {
+            "medications": results,
+            "dangerous_combinations": combinations,
+            "summary": {
+                "medications_checked": len(results),
+                "absolute_contraindications": sum(
+                    1 for r in results for c in r["contraindications"] if c["type"] == "absolute"
+                ),
+                "flagged_medications": sum(1 for r in results if r["highest_severity"]),
+                "dangerous_combinations": len(combinations),
+                "highest_severity": _highest(
+                    [r["highest_severity"] for r in results if r["highest_severity"]]
+                    + [c["severity"] for c in combinations]
+                ),
+            },
+        }
+
+    def check_many(self, patients: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+        """``check`` for a list of patient dicts (keys as ``check``'s parameters)."""
+        return [self.check(**patient) for patient in patients]
+
+    def stats(self) -> dict[str, Any]:
+        return {"cached_drugs": len(self._drugs), "cached_pairs": len(self._pairs), "checks": self.checks}
+
+
+def _highest(severities: list[str]) -> str | None:
+    best = None
+    for severity in severities:
+        if best is None or SEVERITY_RANK.get(severity.lower(), 0) > SEVERITY_RANK.get(best.lower(), 0):
+            best = severity
+    return best
+
+
+med_safety = MedicationSafetyChecker()
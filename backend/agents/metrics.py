@@ -0,0 +1,277 @@
+"""
+In-process pipeline metrics.
+
+Lightweight, dependency-free counters, histograms and gauges shared by the
+orchestrator, agents and API layer.  Values live in a module-level
+registry so every request in the worker process contributes to the same
+totals; ``render_prometheus()`` serves them in the Prometheus text
+exposition format at GET /metrics.
+
+Updates are a dict lookup and an add under a lock — cheap enough for the
+per-LLM-call and per-tool-call hot paths.
+"""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import threading
+import time
+from typing import Any, Callable
+
+# All agents that make up one full diagnostic pipeline run
+PIPELINE_AGENTS = ("triage", "diagnostician", "research", "specialist", "treatment", "safety", "empathy")
+
+# Latency buckets (seconds): agent runs take 1–90s, whole pipelines up to a few minutes
+LATENCY_BUCKETS = (0.5, 1, 2.5, 5, 10, 20, 30, 45, 60, 90, 120, 180, 300)
+
+
+class _Metric:
+    type_name = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _key(self, labels: dict[str, Any]) -> tuple:
+        return tuple(str(labels.get(l, "")) for l in self.labels)
+
+    def _label_str(self, key: tuple, extra: str = "") -> str:
+        parts = [f'{l}="{_escape(v)}"' for l, v in zip(self.labels, key)]
+        if extra:
+            parts.append(extra)
+        return "{" + ",".join(parts) + "}" if parts else ""
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Counter(_Metric):
+    """Monotonic counter with optional labels."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            return {",".join(k) or "_total": v for k, v in self._values.items()}
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{self._label_str(k)} {v:g}" for k, v in items]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram (Prometheus semantics)."""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...] = (), buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (+Inf last), sum, count]
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][idx] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            return {",".join(k) or "_total": e[2] for k, e in self._values.items()}
+
+    def render(self) -> list[str]:
+        with self._lock:
+            items = [(k, list(e[0]), e[1], e[2]) for k, e in self._values.items()]
+        lines = []
+        for key, counts, total, count in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                le = 'le="%g"' % bound
+                lines.append(f"{self.name}_bucket{self._label_str(key, le)} {cumulative}")
+            inf = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{self._label_str(key, inf)} {count}")
+            lines.append(f"{self.name}_sum{self._label_str(key)} {total:g}")
+            lines.append(f"{self.name}_count{self._label_str(key)} {count}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Point-in-time value read from a callback at scrape time."""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, help_text: str, read: Callable[[], float] | None = None):
+        super().__init__(name, help_text)
+        self._read = read
+        self._value = 0.0
+
+    def set_function(self, read: Callable[[], float]) -> None:
+        self._read = read
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def current(self) -> float:
+        if self._read is None:
+            return self._value
+        try:
+            return float(self._read())
+        except Exception:
+            return float("nan")
+
+    def snapshot(self) -> dict[str, float]:
+        return {"_total": self.current()}
+
+    def render(self) -> list[str]:
+        return [f"{self.name} {self.current():g}"]
+
+
+REGISTRY: list[_Metric] = []
+
+
+# ---------------------------------------------------------------------------
+# Pipeline and agent latency
+# ---------------------------------------------------------------------------
+
+PIPELINE_SECONDS = Histogram(
+    "diagnosis_pipeline_duration_seconds",
+    "End-to-end multi-agent pipeline latency",
+    ("mode",),
+)
+AGENT_SECONDS = Histogram(
+    "diagnosis_agent_duration_seconds",
+    "Per-agent run latency including tool-use rounds",
+    ("agent",),
+)
+PIPELINES_INFLIGHT = Gauge(
+    "diagnosis_pipelines_inflight",
+    "Pipelines currently holding an admission slot",
+)
+QUEUE_DEPTH = Gauge(
+    "diagnosis_admission_queue_depth",
+    "Pipeline requests waiting for an admission slot",
+)
+
+# ---------------------------------------------------------------------------
+# LLM and tool calls
+# ---------------------------------------------------------------------------
+
+LLM_CALLS = Counter(
+    "diagnosis_llm_calls_total",
+    "LLM requests by vendor, model and outcome",
+    ("vendor", "model", "status"),
+)
+LLM_TOKENS = Counter(
+    "diagnosis_llm_tokens_total",
+    "LLM tokens by vendor and direction (input/output)",
+    ("vendor", "direction"),
+)
+TOOL_CALLS = Counter(
+    "diagnosis_tool_calls_total",
+    "Agent tool calls",
+    ("agent", "tool"),
+)
+AGENT_TIMEOUTS = Counter(
+    "diagnosis_agent_timeouts_total",
+    "Agent runs that hit their timeout (timed_out results)",
+    ("agent",),
+)
+PARSE_FAILURES = Counter(
+    "diagnosis_parse_failures_total",
+    "Agent outputs from which no JSON could be extracted",
+)
+FALLBACKS = Counter(
+    "diagnosis_fallbacks_total",
+    "Requests answered by a fallback path instead of the agent pipeline",
+    ("kind",),
+)
+
+
+def timed(histogram: Histogram, **labels: Any) -> Callable:
+    """Decorator: observe an async function's wall-clock duration in *histogram*."""
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            t0 = time.perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - t0, **labels)
+        return wrapper
+    return decorator
+
+
+# ---------------------------------------------------------------------------
+# Abandoned work (client disconnected before the pipeline finished)
+# ---------------------------------------------------------------------------
+
+PIPELINES_CANCELLED = Counter(
+    "diagnosis_pipelines_cancelled_total",
+    "Pipelines cancelled before completion, by reason",
+    ("reason",),
+)
+AGENT_RUNS_ABANDONED = Counter(
+    "diagnosis_agent_runs_abandoned_total",
+    "Agent runs skipped or interrupted because their pipeline was cancelled",
+    ("agent",),
+)
+ABANDONED_PIPELINE_SECONDS = Counter(
+    "diagnosis_abandoned_pipeline_seconds_total",
+    "Wall-clock seconds spent on pipelines that were later cancelled",
+)
+
+
+def record_abandoned_pipeline(completed_agents: set[str] | list[str], elapsed: float, reason: str = "client_disconnect") -> None:
+    """Record a cancelled pipeline and which agents never delivered a result."""
+    PIPELINES_CANCELLED.inc(reason=reason)
+    ABANDONED_PIPELINE_SECONDS.inc(elapsed)
+    for agent in PIPELINE_AGENTS:
+        if agent not in completed_agents:
+            AGENT_RUNS_ABANDONED.inc(agent=agent)
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+def snapshot() -> dict[str, dict[str, float]]:
+    """Return current values of all registered metrics."""
+    return {m.name: m.snapshot() for m in REGISTRY}
+
+
+def render_prometheus() -> str:
+    """All registered metrics in the Prometheus text exposition format (0.0.4)."""
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.type_name}")
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
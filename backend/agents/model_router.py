@@ -0,0 +1,191 @@
+"""
+Complexity-based model routing for the agent pipeline.
+
+Instead of running every agent on the same model, the orchestrator scores
+the case after Triage and assigns each downstream agent a model tier:
+
+  * simple   – e.g. uncomplicated URI: fast tier for Research/Empathy/Specialist
+  * moderate – standard tier for most agents
+  * complex  – deep tier for the Diagnostician, standard for everything else
+
+Scoring uses the triage output (ESI level, red flags, ROS systems involved)
+and summary features (medication count, history, age extremes, images).
+
+Defaults can be overridden per agent with the MODEL_ROUTING_CONFIG env var,
+a JSON object such as:
+    {"tiers": {"fast": "gpt-4o-mini"},
+     "agents": {"treatment": {"simple": "standard"}}}
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Tier name -> model name (any name accepted by llm_client.get_vendor)
+DEFAULT_TIERS: dict[str, str] = {
+    "fast": "claude-haiku-4-5",
+    "standard": "claude-sonnet-4-6",
+    "deep": "claude-opus-4-6",
+}
+
+# Agent -> complexity level -> tier.  Safety always stays on the standard tier.
+DEFAULT_ROUTING: dict[str, dict[str, str]] = {
+    "diagnostician": {"simple": "standard", "moderate": "standard", "complex": "deep"},
+    "research": {"simple": "fast", "moderate": "fast", "complex": "standard"},
+    "specialist": {"simple": "fast", "moderate": "standard", "complex": "standard"},
+    "treatment": {"simple": "fast", "moderate": "standard", "complex": "standard"},
+    "safety": {"simple": "standard", "moderate": "standard", "complex": "standard"},
+    "empathy": {"simple": "fast", "moderate": "fast", "complex": "standard"},
+}
+
+# Score thresholds: score < MODERATE -> simple, score >= COMPLEX -> complex
+MODERATE_THRESHOLD = 3
+COMPLEX_THRESHOLD = 7
+
+
+def _count_items(value: Any) -> int:
+    """Count entries in a list, dict of truthy values, or delimited string."""
+    if isinstance(value, list):
+        return len(value)
+    if isinstance(value, dict):
+        involved = value.get("systems_involved")
+        if isinstance(involved, list):
+            return len(involved)
+        return sum(1 for v in value.values() if v)
+    if isinstance(value, str) and value.strip():
+        return len([p for p in re.split(r"[,;\n]", value) if p.strip()])
+    return 0
+
+
+# urgency_level labels the Triage agent maps from ESI-1/ESI-2
+_URGENCY_ESI = {"emergency": 1, "resuscitation": 1, "emergent": 2}
+
+
+def parse_esi_level(triage: dict) -> int | None:
+    """Read the ESI level from triage output (int, "2", "ESI-2" or urgency label)."""
+    esi = triage.get("esi_level")
+    if isinstance(esi, (int, float)):
+        return int(esi)
+    if isinstance(esi, str):
+        digits = "".join(ch for ch in esi if ch.isdigit())
+        if digits:
+            return int(digits[0])
+    return _URGENCY_ESI.get(str(triage.get("urgency_level", "")).lower())
+
+
+def score_case_complexity(
+    triage: dict,
+    age: int = 30,
+    symptoms: str = "",
+    medical_history: str | None = None,
+    current_medications: str | None = None,
+    has_image: bool = False,
+) -> dict[str, Any]:
+    """Score case complexity from triage output and summary features.
+
+    Returns ``{"score", "level", "features"}`` where level is one of
+    simple / moderate / complex.
+    """
+    triage = triage if isinstance(triage, dict) else {}
+    red_flags = triage.get("red_flags") or []
+    red_flag_count = len(red_flags) if isinstance(red_flags, list) else 0
+    critical_flags = sum(
+        1 for f in red_flags
+        if (isinstance(f, dict) and f.get("severity") == "critical") or "critical" in str(f).lower()
+    ) if isinstance(red_flags, list) else 0
+    ros_systems = _count_items(triage.get("review_of_systems")) or _count_items(triage.get("symptom_domains"))
+    med_text = current_medications or ""
+    if not med_text:
+        match = re.search(r"Current Medications:\s*(.+)", symptoms or "")
+        med_text = match.group(1) if match else ""
+    if med_text.strip().lower() in ("", "none", "n/a", "no"):
+        med_count = 0
+    else:
+        med_count = _count_items(med_text)
+    history_count = 0 if (medical_history or "").strip().lower() in ("", "none", "n/a") else _count_items(medical_history)
+    esi = parse_esi_level(triage)
+
+    score = 0
+    score += min(red_flag_count, 4)
+    score += 2 * min(critical_flags, 2)
+    score += max(ros_systems - 1, 0) if ros_systems <= 4 else 3
+    score += 0 if med_count < 3 else (1 if med_count < 5 else 2)
+    score += 1 if history_count >= 2 else 0
+    score += 1 if age < 2 or age >= 75 else 0
+    score += 1 if has_image else 0
+    if esi is not None:
+        score += {1: 6, 2: 4, 3: 1}.get(esi, 0)
+    if triage.get("error"):
+        # Triage failed — we know nothing, so don't route down
+        score = max(score, MODERATE_THRESHOLD)
+
+    if score >= COMPLEX_THRESHOLD:
+        level = "complex"
+    elif score >= MODERATE_THRESHOLD:
+        level = "moderate"
+    else:
+        level = "simple"
+
+    return {
+        "score": score,
+        "level": level,
+        "features": {
+            "esi_level": esi,
+            "red_flag_count": red_flag_count,
+            "critical_flag_count": critical_flags,
+            "ros_systems": ros_systems,
+            "medication_count": med_count,
+            "history_count": history_count,
+            "has_image": has_image,
+        },
+    }
+
+
+class ModelRouter:
+    """Maps (agent, case complexity) to a concrete model name."""
+
+    def __init__(
+        self,
+        tiers: dict[str, str] | None = None,
+        routing: dict[str, dict[str, str]] | None = None,
+    ):
+        self.tiers = {**DEFAULT_TIERS, **(tiers or {})}
+        self.routing = {agent: dict(levels) for agent, levels in DEFAULT_ROUTING.items()}
+        for agent, levels in (routing or {}).items():
+            self.routing.setdefault(agent, {}).update(levels)
+
+    @classmethod
+    def from_env(cls) -> "ModelRouter":
+        """Build a router with overrides from MODEL_ROUTING_CONFIG (JSON), if set."""
+        raw = os.getenv("MODEL_ROUTING_CONFIG", "").strip()
+        if not raw:
+            return cls()
+        try:
+            cfg = json.loads(raw)
+            return cls(tiers=cfg.get("tiers"), routing=cfg.get("agents"))
+        except (ValueError, TypeError, AttributeError) as e:
+            # Bad JSON (JSONDecodeError is a ValueError) or the wrong shape
+            logger.warning("Ignoring invalid MODEL_ROUTING_CONFIG: %s", e)
+            return cls()
+
+    def model_for(self, agent_name: str, level: str, default: str) -> str:
+        """Model for *agent_name* at complexity *level*; *default* if unrouted."""
+        tier = self.routing.get(agent_name, {}).get(level)
+        if not tier:
+            return default
+        # A routing entry may name a model directly instead of a tier
+        return self.tiers.get(tier, tier)
+
+    def assign(self, agents: list, level: str) -> dict[str, str]:
+        """Set ``agent.model`` for each agent and return the name -> model map."""
+        assignments = {}
+        for agent in agents:
+            agent.model = self.model_for(agent.name, level, agent.model)
+            assignments[agent.name] = agent.model
+        return assignments
@@ -11,6 +11,11 @@ Flow:
   7. Run Empathy Agent (produces final patient-friendly summary)
   8. Synthesize all agent outputs into a unified response
 
+Emergency fast path: when Triage returns ESI-1/ESI-2 with red flags, an
+emergency result (triage red flags + templated patient message) is produced
+immediately after step 2 — a single LLM call — and the remaining agents either
+refine it in the background (streaming) or are skipped.
+
 Agents run in a pipeline but can also communicate laterally via the MessageBus.
 """
 
@@ -23,17 +28,31 @@ import time
 from typing import Any
 
 from .message_bus import MessageBus
-from .triage import TriageAgent
-from .diagnostician import DiagnosticianAgent
-from .specialist import SpecialistAgent
-from .treatment import TreatmentAgent
-from .research import ResearchAgent
-from .safety import SafetyAgent
-from .empathy import EmpathyAgent
 from .llm_client import LLMClient
+from .model_router import ModelRouter, parse_esi_level, score_case_complexity
+from .tracing import current_trace_id, traced, tracer
+from .metrics import PARSE_FAILURES, PIPELINE_SECONDS, timed
+from .timeouts import within_slo
 
 logger = logging.getLogger(__name__)
 
+# Patient-facing message used by the emergency fast path in place of the
+# Empathy agent (which has not run yet when the fast path fires)
+EMERGENCY_PATIENT_MESSAGE = (
+    "Based on what you've described, your symptoms may need emergency care right now. "
+    "Please call 911 (or your local emergency number) or go to the nearest emergency "
+    "department immediately. Do not drive yourself if you feel faint, confused, or "
+    "short of breath. A more detailed analysis may follow, but getting help should "
+    "not wait for it."
+)
+
+EMERGENCY_ACTION_CHECKLIST = [
+    "Call 911 or your local emergency number now, or have someone take you to the nearest emergency department.",
+    "Do not eat or drink anything until you have been seen, unless told otherwise.",
+    "If you are alone, unlock your door and stay where you can be found.",
+    "Bring a list of your medications and allergies if you can do so quickly.",
+]
+
 
 class OrchestratorAgent:
     """
@@ -58,6 +77,15 @@ class OrchestratorAgent:
             google_key=google_key,
         )
 
+        # Agent modules load on first use, not when the orchestrator is imported
+        from .triage import TriageAgent
+        from .diagnostician import DiagnosticianAgent
+        from .specialist import SpecialistAgent
+        from .treatment import TreatmentAgent
+        from .research import ResearchAgent
+        from .safety import SafetyAgent
+        from .empathy import EmpathyAgent
+
         # Instantiate all agents with shared bus and LLM client
         self.triage = TriageAgent(api_key, self.bus, llm_client=self.llm_client)
         self.diagnostician = DiagnosticianAgent(api_key, self.bus, llm_client=self.llm_client)
@@ -67,6 +95,28 @@ class OrchestratorAgent:
         self.safety = SafetyAgent(api_key, self.bus, llm_client=self.llm_client)
         self.empathy = EmpathyAgent(api_key, self.bus, llm_client=self.llm_client)
 
+        # Per-agent model tiers by case complexity (used when model_preference="auto")
+        self.model_router = ModelRouter.from_env()
+
+    async def aclose(self) -> None:
+        """Release vendor HTTP clients held by the shared LLM client."""
+        await self.llm_client.aclose()
+
+    def reset(self) -> None:
+        """Clear per-run state so a pooled orchestrator can take the next case.
+
+        Model preference and complexity routing overwrite ``agent.model`` on
+        each run; restore the class defaults and drop the bus history.
+        """
+        self.bus.clear()
+        for agent in (self.triage, self.diagnostician, self.research,
+                      self.specialist, self.treatment, self.safety, self.empathy):
+            agent.model = type(agent).model
+            self.bus.register(agent.name)
+
+    @traced("diagnosis.pipeline")
+    @timed(PIPELINE_SECONDS, mode="blocking")
+    @within_slo
     async def run_diagnosis(
         self,
         symptoms: str,
@@ -81,11 +131,14 @@ class OrchestratorAgent:
         family_history: str | None = None,
         social_history: str | None = None,
         model_preference: str = "auto",
+        emergency_fast_path: bool = False,
     ) -> dict[str, Any]:
         """
         Execute the full multi-agent diagnostic pipeline.
 
-        Returns a unified response combining all agent outputs.
+        Returns a unified response combining all agent outputs.  With
+        *emergency_fast_path*, a critical triage result short-circuits the
+        pipeline and an emergency result is returned after the Triage agent.
         """
         start = time.time()
         agent_results: dict[str, Any] = {}
@@ -162,6 +215,21 @@ class OrchestratorAgent:
             agent_results["triage"] = {"urgency_level": "routine", "red_flags": [], "error": str(e)}
         agent_timings["triage"] = round(time.time() - t0, 2)
 
+        if emergency_fast_path and self._is_critical_triage(agent_results["triage"]):
+            logger.warning("Critical triage — returning emergency fast-path result")
+            result = self._build_emergency_result(
+                agent_results["triage"], agent_timings, round(time.time() - start, 2), symptoms, age, gender,
+            )
+            token_usage = self._collect_token_usage(agent_results)
+            result["token_usage"] = token_usage
+            result["estimated_cost"] = self._calculate_cost(token_usage)
+            return result
+
+        model_routing = self._route_models(
+            model_preference, agent_results["triage"], age, symptoms,
+            medical_history, current_medications, image_base64 is not None,
+        )
+
         # ── Steps 2+3: Diagnostician + Research IN PARALLEL ─────────
         logger.info("Steps 2+3/7: Running Diagnostician + Research Agents in parallel")
         t0 = time.time()
@@ -327,12 +395,15 @@ class OrchestratorAgent:
         total_time = round(time.time() - start, 2)
 
         # ── Synthesize final response ───────────────────────────────
-        result = self._synthesize(agent_results, agent_timings, total_time, symptoms, age, gender)
+        with tracer.span("diagnosis.synthesize"):
+            result = self._synthesize(agent_results, agent_timings, total_time, symptoms, age, gender)
 
         # ── Collect token usage from all raw results ──────────────
         token_usage = self._collect_token_usage(agent_results)
         result["token_usage"] = token_usage
         result["estimated_cost"] = self._calculate_cost(token_usage)
+        if model_routing:
+            result["model_routing"] = model_routing
 
         return result
 
@@ -505,6 +576,9 @@ class OrchestratorAgent:
         except Exception:
             return "Complete"
 
+    @traced("diagnosis.pipeline_streaming")
+    @timed(PIPELINE_SECONDS, mode="streaming")
+    @within_slo
     async def run_diagnosis_streaming(
         self,
         event_queue: "asyncio.Queue",
@@ -520,12 +594,20 @@ class OrchestratorAgent:
         family_history: str | None = None,
         social_history: str | None = None,
         model_preference: str = "auto",
+        emergency_fast_path: bool = False,
+        continue_after_emergency: bool = True,
     ) -> None:
         """
         Execute the full multi-agent diagnostic pipeline with SSE streaming.
 
-        After each agent completes, puts an event dict onto event_queue.
+        After each agent completes, puts an event dict onto event_queue (a
+        RunEventLog in production; anything with an async ``put`` works).
         At the end, puts a 'complete' event with the full synthesized result.
+
+        With *emergency_fast_path*, a critical triage result immediately emits
+        an 'emergency' event.  The remaining agents then keep streaming as
+        refinements, or — if *continue_after_emergency* is False — the
+        emergency result is sent as the 'complete' event and the run stops.
         """
         start = time.time()
         agent_results: dict[str, Any] = {}
@@ -604,6 +686,31 @@ class OrchestratorAgent:
             "data": agent_results["triage"],
         })
 
+        emergency_result = None
+        if emergency_fast_path and self._is_critical_triage(agent_results["triage"]):
+            logger.warning("[stream] Critical triage — emitting emergency fast-path result")
+            emergency_result = self._build_emergency_result(
+                agent_results["triage"], agent_timings, round(time.time() - start, 2), symptoms, age, gender,
+            )
+            token_usage = self._collect_token_usage(agent_results)
+            emergency_result["token_usage"] = token_usage
+            emergency_result["estimated_cost"] = self._calculate_cost(token_usage)
+            await event_queue.put({
+                "event": "emergency",
+                "agent": "triage",
+                "elapsed": elapsed_triage,
+                "continuing": continue_after_emergency,
+                "result": emergency_result,
+            })
+            if not continue_after_emergency:
+                await event_queue.put({"event": "complete", "result": emergency_result})
+                return
+
+        model_routing = self._route_models(
+            model_preference, agent_results["triage"], age, symptoms,
+            medical_history, current_medications, image_base64 is not None,
+        )
+
         # ── Steps 2+3: Diagnostician + Research IN PARALLEL ─────────
         logger.info("[stream] Steps 2+3/7: Running Diagnostician + Research in parallel")
         t0 = time.time()
@@ -823,10 +930,19 @@ class OrchestratorAgent:
 
         # ── Synthesize final response ───────────────────────────────
         try:
-            final_result = self._synthesize(agent_results, agent_timings, total_time, symptoms, age, gender)
+            with tracer.span("diagnosis.synthesize"):
+                final_result = self._synthesize(agent_results, agent_timings, total_time, symptoms, age, gender)
             token_usage = self._collect_token_usage(agent_results)
             final_result["token_usage"] = token_usage
             final_result["estimated_cost"] = self._calculate_cost(token_usage)
+            if current_trace_id():
+                final_result["trace_id"] = current_trace_id()
+            if model_routing:
+                final_result["model_routing"] = model_routing
+            if emergency_result is not None:
+                # Keep the emergency alert on the refined result so the UI never downgrades it
+                final_result["emergency"] = True
+                final_result["emergency_alert"] = emergency_result["emergency_alert"]
         except Exception as e:
             logger.error("[stream] Synthesis failed: %s", e, exc_info=True)
             final_result = {
@@ -846,6 +962,131 @@ class OrchestratorAgent:
             "result": final_result,
         })
 
+    # ------------------------------------------------------------------
+    # Model routing
+    # ------------------------------------------------------------------
+
+    def _route_models(
+        self,
+        model_preference: str,
+        triage: dict,
+        age: int,
+        symptoms: str,
+        medical_history: str | None,
+        current_medications: str | None,
+        has_image: bool,
+    ) -> dict[str, Any] | None:
+        """Assign per-agent models from case complexity when no model was forced."""
+        if model_preference and model_preference != "auto":
+            return None
+        complexity = score_case_complexity(
+            triage, age=age, symptoms=symptoms, medical_history=medical_history,
+            current_medications=current_medications, has_image=has_image,
+        )
+        models = self.model_router.assign(
+            [self.diagnostician, self.research, self.specialist,
+             self.treatment, self.safety, self.empathy],
+            complexity["level"],
+        )
+        logger.info("Case complexity %s (score %d) — models: %s",
+                    complexity["level"], complexity["score"], models)
+        return {"complexity": complexity, "models": {"triage": self.triage.model, **models}}
+
+    # ------------------------------------------------------------------
+    # Emergency fast path
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _is_critical_triage(triage: dict) -> bool:
+        """ESI-1 always qualifies; ESI-2 qualifies when red flags were found."""
+        if not isinstance(triage, dict) or triage.get("error"):
+            return False
+        esi = parse_esi_level(triage)
+        if esi == 1:
+            return True
+        red_flags = triage.get("red_flags") or []
+        return esi == 2 and isinstance(red_flags, list) and len(red_flags) > 0
+
+    def _build_emergency_result(
+        self,
+        triage: dict,
+        timings: dict[str, float],
+        total_time: float,
+        symptoms: str,
+        age: int,
+        gender: str,
+    ) -> dict[str, Any]:
+        """Build an actionable result from triage alone, shaped like _synthesize output."""
+        # Critical-severity flags first, then the rest
+        raw_flags = triage.get("red_flags", []) or []
+        ordered = sorted(
+            raw_flags,
+            key=lambda f: 0 if (isinstance(f, dict) and f.get("severity") == "critical") or "critical" in str(f).lower() else 1,
+        )
+        red_flags = []
+        for f in ordered:
+            if isinstance(f, dict):
+                red_flags.append(f.get("finding", f.get("description", str(f))))
+            elif isinstance(f, str):
+                red_flags.append(f)
+
+        esi = parse_esi_level(triage)
+        urgency = triage.get("urgency_level", "emergency" if esi == 1 else "emergent")
+        immediate = triage.get("immediate_actions") or []
+        if isinstance(immediate, str):
+            immediate = [immediate]
+        action_checklist = list(dict.fromkeys(EMERGENCY_ACTION_CHECKLIST[:1] + immediate + EMERGENCY_ACTION_CHECKLIST[1:]))
+
+        lines = [
+            "EMERGENCY — SEEK IMMEDIATE CARE",
+            "=" * 46,
+            f"Age: {age} years | Gender: {gender}",
+            f"Triage: ESI-{esi} ({str(urgency).upper()})" if esi else f"Triage: {str(urgency).upper()}",
+            "",
+            EMERGENCY_PATIENT_MESSAGE,
+        ]
+        if triage.get("triage_summary"):
+            lines += ["", f"Summary: {triage['triage_summary']}"]
+        if red_flags:
+            lines += ["", "WARNING SIGNS DETECTED:"] + [f"  - {flag}" for flag in red_flags]
+        lines += ["", "WHAT TO DO NOW:"] + [f"  {i}. {a}" for i, a in enumerate(action_checklist, 1)]
+        lines += [
+            "",
+            "---",
+            "DISCLAIMER: This AI assessment is for informational purposes only.",
+            "In emergencies, call local emergency services immediately.",
+        ]
+
+        return {
+            "answer": "\n".join(lines),
+            "confidence_scores": {"high": 0.6, "medium": 0.3, "low": 0.1},
+            "causes": [],
+            "red_flags": red_flags,
+            "additional_questions": [],
+            "recommended_tests": [],
+            "patient_summary": EMERGENCY_PATIENT_MESSAGE,
+            "action_checklist": action_checklist,
+            "safety_status": "EMERGENCY",
+            "safety_warnings": red_flags[:5],
+            "medications": [],
+            "lifestyle_recommendations": [],
+            "warning_signs": red_flags,
+            "follow_up_timeline": "Immediately — emergency evaluation",
+            "emergency": True,
+            "emergency_alert": {
+                "esi_level": esi,
+                "urgency_level": urgency,
+                "red_flags": red_flags,
+                "message": EMERGENCY_PATIENT_MESSAGE,
+            },
+            "agent_details": {"triage": triage},
+            "agent_timings": dict(timings),
+            "total_time": total_time,
+            "agent_communication_log": self.bus.get_full_log()[:20],
+            "multi_agent": True,
+            "agents_used": ["triage"],
+        }
+
     # ------------------------------------------------------------------
     # Follow-up question handler
     # ------------------------------------------------------------------
@@ -1003,6 +1244,7 @@ class OrchestratorAgent:
                     continue
 
         logger.warning("_safe_parse failed to extract JSON from %d chars of text", len(text))
+        PARSE_FAILURES.inc()
         return {"raw_text": text}
 
     def _synthesize(
@@ -0,0 +1,335 @@
+"""
+Sampling profiler and event-loop lag monitor for the agent pipeline.
+
+Answers "where did the time go?" for slow cases — LLM waits vs. CPU work
+on the event loop (context packing, json.dumps, _safe_parse, _synthesize,
+keyword scans).
+
+  * SamplingProfiler – opt-in per case (X-Profile request header or
+    PROFILE_SAMPLE_RATE).  A background thread samples the event-loop
+    thread's stack every PROFILE_INTERVAL_MS and folds the samples into
+    collapsed stacks ("frame;frame;frame count"), the input format of
+    flamegraph.pl, speedscope and inferno.  Samples whose leaf is the
+    selector wait (stdlib loop) or the frame that entered the loop
+    (uvloop, whose wait and dispatch run in C) are the loop idling on I/O
+    (LLM and HTTP calls); every other sample is the loop busy on this
+    process's own Python code.
+  * LoopLagMonitor – always-on heartbeat on the event loop.  Time the
+    heartbeat wakes up late is counted as loop-blocked time, and a stall
+    longer than LOOP_LAG_THRESHOLD_MS is logged with the stack of the code
+    holding the loop.
+
+One sampler thread serves all profiled cases; cases that overlap on the
+same worker share loop samples, so profile under low concurrency when
+attributing CPU time precisely.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_MS = 5
+DEFAULT_BUFFER_SIZE = 20
+DEFAULT_LAG_THRESHOLD_MS = 250
+MAX_STACK_DEPTH = 64
+
+# Leaf frames that mean the stdlib loop thread is parked waiting for I/O
+_IDLE_LEAVES = {("selectors.py", "select"), ("selectors.py", "_select")}
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def loop_entry_code(frame):
+    """Code of the frame that drives the event loop running *frame*'s task, or None.
+
+    That is the caller of the outermost coroutine on the stack.  Under
+    uvloop the loop runs in C, so a sample whose leaf is this frame means
+    no Python code is running on the loop: it is waiting (or in uvloop's
+    own C callbacks), not busy.
+    """
+    entry = None
+    while frame is not None:
+        if frame.f_code.co_flags & inspect.CO_COROUTINE:
+            entry = frame.f_back
+        frame = frame.f_back
+    return entry.f_code if entry is not None else None
+
+
+def collapse_stack(frame, loop_entry=None) -> tuple[str, bool]:
+    """Fold *frame* and its callers into one collapsed-stack line (root first).
+
+    Returns ``(stack, idle)`` where *idle* means the thread is in the
+    selector wait, or parked in the loop entered from *loop_entry* (a
+    code object from ``loop_entry_code``).
+    """
+    code = frame.f_code
+    idle = code is loop_entry or (os.path.basename(code.co_filename), code.co_name) in _IDLE_LEAVES
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return ";".join(labels), idle
+
+
+# ---------------------------------------------------------------------------
+# Event-loop lag
+# ---------------------------------------------------------------------------
+
+class LoopLagMonitor:
+    """Measures and reports time the event loop is blocked."""
+
+    def __init__(self, threshold: float = DEFAULT_LAG_THRESHOLD_MS / 1000, interval: float = 0.05):
+        self.threshold = threshold
+        self.interval = interval
+        self.blocked_seconds = 0.0
+        self.max_lag = 0.0
+        self.stalls = 0
+        self._beat = time.monotonic()
+        self._loop_thread: int | None = None
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold > 0
+
+    def start(self) -> None:
+        """Start monitoring the running loop (call from the loop thread)."""
+        if not self.enabled or self._task is not None:
+            return
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = now - expected
+            if lag > 0.001:
+                self.blocked_seconds += lag
+                self.max_lag = max(self.max_lag, lag)
+            self._beat = now
+
+    def _watch(self) -> None:
+        reported_beat = None
+        while not self._stop.wait(self.threshold / 2):
+            beat = self._beat
+            stalled = time.monotonic() - beat
+            if stalled < self.threshold or beat == reported_beat:
+                continue
+            # Report each stall once, with the stack that is holding the loop
+            reported_beat = beat
+            self.stalls += 1
+            frame = sys._current_frames().get(self._loop_thread)
+            stack = "".join(traceback.format_stack(frame, limit=25)) if frame is not None else "<unavailable>\n"
+            logger.warning("Event loop blocked for %.0fms (threshold %.0fms) in:\n%s",
+                           stalled * 1000, self.threshold * 1000, stack)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "threshold_ms": round(self.threshold * 1000),
+            "blocked_ms_total": round(self.blocked_seconds * 1000, 1),
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+            "stalls": self.stalls,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Sampling profiler
+# ---------------------------------------------------------------------------
+
+class ProfileSession:
+    """Samples collected for one case."""
+
+    __slots__ = (
+        "profile_id", "thread_id", "loop_entry", "started", "stacks", "samples", "idle_samples",
+        "_blocked_at_start", "summary",
+    )
+
+    def __init__(self, profile_id: str, thread_id: int, blocked_at_start: float, loop_entry=None):
+        self.profile_id = profile_id
+        self.thread_id = thread_id
+        self.loop_entry = loop_entry
+        self.started = time.perf_counter()
+        self.stacks: dict[str, int] = {}
+        self.samples = 0
+        self.idle_samples = 0
+        self._blocked_at_start = blocked_at_start
+        self.summary: dict[str, Any] = {}
+
+    def add(self, stack: str, idle: bool) -> None:
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+        self.samples += 1
+        if idle:
+            self.idle_samples += 1
+
+    def collapsed(self) -> str:
+        """Flamegraph input: one ``stack count`` line per distinct stack."""
+        return "".join(f"{stack} {n}\n" for stack, n in sorted(self.stacks.items(), key=lambda kv: -kv[1]))
+
+
+class SamplingProfiler:
+    """Opt-in, per-case stack sampling of the event-loop thread."""
+
+    def __init__(
+        self,
+        rate: float = 0.0,
+        interval: float = DEFAULT_INTERVAL_MS / 1000,
+        directory: str | None = None,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        lag_monitor: LoopLagMonitor | None = None,
+    ):
+        self.rate = min(max(rate, 0.0), 1.0)
+        self.interval = max(interval, 0.001)
+        self.directory = Path(directory) if directory else None
+        self.lag_monitor = lag_monitor or LoopLagMonitor(threshold=0)
+        self._profiles: deque[ProfileSession] = deque(maxlen=max(1, buffer_size))
+        self._active: list[ProfileSession] = []
+        self._lock = threading.Lock()
+        self._sampler: threading.Thread | None = None
+
+    @classmethod
+    def from_env(cls) -> "SamplingProfiler":
+        """Build from PROFILE_SAMPLE_RATE / PROFILE_INTERVAL_MS / PROFILE_DIR / PROFILE_BUFFER / LOOP_LAG_THRESHOLD_MS."""
+        try:
+            return cls(
+                rate=float(os.getenv("PROFILE_SAMPLE_RATE", "0")),
+                interval=float(os.getenv("PROFILE_INTERVAL_MS", DEFAULT_INTERVAL_MS)) / 1000,
+                directory=os.getenv("PROFILE_DIR") or None,
+                buffer_size=int(os.getenv("PROFILE_BUFFER", DEFAULT_BUFFER_SIZE)),
+                lag_monitor=LoopLagMonitor(float(os.getenv("LOOP_LAG_THRESHOLD_MS", DEFAULT_LAG_THRESHOLD_MS)) / 1000),
+            )
+        except ValueError as e:
+            logger.warning("Ignoring invalid profiling settings: %s", e)
+            return cls(lag_monitor=LoopLagMonitor())
+
+    def wanted(self, requested: bool = False) -> bool:
+        """Profile this case? Explicitly requested, or picked by the sampling rate."""
+        return requested or (self.rate > 0 and random.random() < self.rate)
+
+    @contextmanager
+    def session(self, profile_id: str, enabled: bool = True):
+        """``with profiler.session(case_id, enabled) as session:`` — *session* is None when not profiling.
+
+        Must be entered on the event-loop thread.
+        """
+        if not enabled:
+            yield None
+            return
+        session = ProfileSession(
+            profile_id, threading.get_ident(), self.lag_monitor.blocked_seconds, loop_entry_code(sys._getframe()),
+        )
+        with self._lock:
+            self._active.append(session)
+            if self._sampler is None or not self._sampler.is_alive():
+                self._sampler = threading.Thread(target=self._sample_loop, name="pipeline-profiler", daemon=True)
+                self._sampler.start()
+        try:
+            yield session
+        finally:
+            with self._lock:
+                self._active.remove(session)
+            self._finish(session)
+
+    def _sample_loop(self) -> None:
+        while True:
+            with self._lock:
+                if not self._active:
+                    self._sampler = None
+                    return
+                active = list(self._active)
+            frames = sys._current_frames()
+            loop_entries = {s.thread_id: s.loop_entry for s in active}
+            for thread_id, loop_entry in loop_entries.items():
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                stack, idle = collapse_stack(frame, loop_entry)
+                for s in active:
+                    if s.thread_id == thread_id:
+                        s.add(stack, idle)
+            del frames
+            time.sleep(self.interval)
+
+    def _finish(self, session: ProfileSession) -> None:
+        wall = time.perf_counter() - session.started
+        busy = session.samples - session.idle_samples
+        session.summary = {
+            "profile_id": session.profile_id,
+            "wall_ms": round(wall * 1000, 1),
+            "samples": session.samples,
+            "interval_ms": round(self.interval * 1000, 2),
+            # Share of samples where the loop was running Python rather than waiting on I/O
+            "loop_busy_pct": round(100 * busy / session.samples, 1) if session.samples else 0.0,
+            "loop_blocked_ms": round((self.lag_monitor.blocked_seconds - session._blocked_at_start) * 1000, 1)
+            if self.lag_monitor.enabled else None,
+        }
+        self._profiles.append(session)
+        logger.info("Profile %s: %s", session.profile_id, session.summary)
+        if self.directory is not None:
+            try:
+                asyncio.get_running_loop().run_in_executor(None, self._write_file, session)
+            except RuntimeError:
+                self._write_file(session)
+
+    def _write_file(self, session: ProfileSession) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            (self.directory / f"{session.profile_id}.collapsed").write_text(session.collapsed(), encoding="utf-8")
+        except OSError as e:
+            logger.warning("Could not write profile %s: %s", session.profile_id, e)
+
+    # ------------------------------------------------------------------
+    # Buffered profiles
+    # ------------------------------------------------------------------
+
+    def recent(self) -> list[dict[str, Any]]:
+        return [s.summary for s in reversed(self._profiles)]
+
+    def get(self, profile_id: str) -> ProfileSession | None:
+        for session in self._profiles:
+            if session.profile_id == profile_id:
+                return session
+        return None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "rate": self.rate,
+            "interval_ms": round(self.interval * 1000, 2),
+            "active": len(self._active),
+            "buffered": len(self._profiles),
+            "directory": str(self.directory) if self.directory else None,
+            "loop_lag": self.lag_monitor.stats(),
+        }
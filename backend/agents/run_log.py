@@ -0,0 +1,472 @@
+"""
+Resumable event logs for streaming diagnosis runs.
+
+Each streaming pipeline run gets a run ID and a short-lived, append-only log
+of the events it emits:
+
+  * SSE event ids are ``<run_id>:<seq>``; a client that reconnects with
+    ``Last-Event-ID`` is replayed every later event and then follows the
+    still-running pipeline — no second pipeline, no extra LLM spend
+  * The pipeline is not tied to one connection: when its last subscriber
+    leaves, it keeps running for a grace period so a reconnect can
+    re-attach, and is cancelled only if nobody comes back.  A cancelled
+    run logs a final ``cancelled`` event, so late followers stop too
+  * Logs live in-process for ``RUN_LOG_TTL_SECONDS`` after the run ends.
+    With ``REDIS_URL`` set (and ``redis`` installed) they are mirrored to
+    Redis so a reconnect routed to another worker can still replay them
+  * Each log is bounded by event count and payload bytes
+    (``RUN_LOG_MAX_BYTES``); the oldest events are evicted first.  A client
+    resuming from an evicted event — or a follower that falls behind the
+    buffer — gets :class:`ReplayTruncated` instead of a silent gap
+
+Superseded events are coalesced as they are logged: a newer
+``queue_position`` / ``progress`` replaces the older one, and ``complete``
+drops an ``emergency`` preview from the replay.  Coalescing is not
+truncation; only evicted events make a replay incomplete.
+
+The log is also what bounds a stream's memory.  Events are serialised once
+when logged, and every subscriber (and replay) sends those bytes as-is.
+Subscribers read the shared log at their own pace rather than draining a
+queue, so a slow client costs a cursor, not a backlog.  Per run, memory
+tops out at ``RUN_LOG_MAX_BYTES``.  There is deliberately no backpressure on
+the pipeline: it must outlive its connections, so a client too slow to keep
+up is told it missed events (:class:`ReplayTruncated`) instead of stalling
+the run.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable
+
+from .metrics import record_abandoned_pipeline
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 600
+DEFAULT_GRACE_SECONDS = 30
+DEFAULT_MAX_RUNS = 500
+
+# Per-run caps; a full pipeline emits well under these
+MAX_EVENTS_PER_RUN = 128
+DEFAULT_MAX_BYTES_PER_RUN = 2 * 1024 * 1024
+
+# Events after which a run has nothing more to send
+TERMINAL_EVENTS = ("complete", "overloaded", "cancelled")
+
+# Poll interval when following a run that lives in another worker
+REMOTE_POLL_SECONDS = 1.0
+
+
+# Event types where only the latest instance matters
+_COALESCED_EVENTS = {"queue_position", "progress"}
+
+# Event type -> earlier event types it makes obsolete
+_SUPERSEDES: dict[str, tuple[str, ...]] = {
+    "complete": ("emergency", "progress"),
+}
+
+
+def is_superseded(earlier: Any, new: Any) -> bool:
+    """True if *earlier* is made obsolete by *new* (both need ``event`` and ``agent``)."""
+    if earlier.event in _SUPERSEDES.get(new.event, ()):
+        return True
+    return new.event in _COALESCED_EVENTS and earlier.event == new.event and earlier.agent == new.agent
+
+
+class ReplayTruncated(Exception):
+    """Events after ``after`` were evicted from the run log before they were read."""
+
+    def __init__(self, run_id: str, after: int, evicted_through: int):
+        super().__init__(f"Run {run_id}: events {after + 1}-{evicted_through} are no longer buffered")
+        self.run_id = run_id
+        self.after = after
+        self.evicted_through = evicted_through
+
+    def to_event(self) -> dict[str, Any]:
+        """Final SSE payload telling the client its replay has a gap."""
+        return {
+            "event": "replay_truncated",
+            "run_id": self.run_id,
+            "after": self.after,
+            "first_available": self.evicted_through + 1,
+        }
+
+
+def parse_event_id(value: str | None) -> tuple[str, int] | None:
+    """Split a ``<run_id>:<seq>`` event id; ``None`` if malformed."""
+    if not value or ":" not in value:
+        return None
+    run_id, _, seq = value.strip().rpartition(":")
+    if not run_id or not seq.isdigit():
+        return None
+    return run_id, int(seq)
+
+
+class LoggedEvent:
+    """A serialized event with its position in a run log."""
+
+    __slots__ = ("run_id", "seq", "event", "agent", "data")
+
+    def __init__(self, run_id: str, seq: int, event: str, agent: str | None, data: str):
+        self.run_id = run_id
+        self.seq = seq
+        self.event = event
+        self.agent = agent
+        self.data = data
+
+    @property
+    def size(self) -> int:
+        # Payloads are ASCII JSON (ensure_ascii), so len() is the byte size
+        return len(self.data)
+
+    @property
+    def id(self) -> str:
+        return f"{self.run_id}:{self.seq}"
+
+    def to_record(self) -> str:
+        return json.dumps({"seq": self.seq, "event": self.event, "agent": self.agent, "data": self.data})
+
+    @classmethod
+    def from_record(cls, run_id: str, record: str | bytes) -> "LoggedEvent":
+        r = json.loads(record)
+        return cls(run_id, r["seq"], r["event"], r.get("agent"), r["data"])
+
+
+# ---------------------------------------------------------------------------
+# Optional Redis mirror
+# ---------------------------------------------------------------------------
+
+class RedisRunStore:
+    """Mirror of run logs in Redis lists (``diag:run:<id>``), best effort.
+
+    The owning worker's evictions are mirrored as a ``diag:run:<id>:evicted``
+    marker, and the list itself is capped at the per-run event count.
+    """
+
+    def __init__(self, client: Any, ttl: int, max_events: int = MAX_EVENTS_PER_RUN):
+        self._redis = client
+        self.ttl = ttl
+        self.max_events = max_events
+
+    @classmethod
+    def from_url(cls, url: str, ttl: int) -> "RedisRunStore | None":
+        try:
+            import redis.asyncio as aioredis
+        except ImportError:
+            logger.warning("REDIS_URL is set but the redis package is not installed — run logs stay in-process")
+            return None
+        return cls(aioredis.from_url(url), ttl)
+
+    @staticmethod
+    def _key(run_id: str) -> str:
+        return f"diag:run:{run_id}"
+
+    async def append(self, item: LoggedEvent, evicted_through: int = 0) -> None:
+        try:
+            key = self._key(item.run_id)
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.rpush(key, item.to_record())
+                pipe.ltrim(key, -self.max_events, -1)
+                pipe.expire(key, self.ttl)
+                if evicted_through:
+                    pipe.set(f"{key}:evicted", evicted_through, ex=self.ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning("Run log mirror write failed for %s: %s", item.run_id, e)
+
+    async def exists(self, run_id: str) -> bool:
+        try:
+            return bool(await self._redis.exists(self._key(run_id)))
+        except Exception as e:
+            logger.warning("Run log mirror read failed for %s: %s", run_id, e)
+            return False
+
+    async def read(self, run_id: str, after: int = 0) -> list[LoggedEvent] | None:
+        """Events with seq > *after*, or ``None`` if the run is unknown.
+
+        Raises :class:`ReplayTruncated` if some of those events were evicted.
+        """
+        key = self._key(run_id)
+        try:
+            records, marker = await asyncio.gather(self._redis.lrange(key, 0, -1), self._redis.get(f"{key}:evicted"))
+        except Exception as e:
+            logger.warning("Run log mirror read failed for %s: %s", run_id, e)
+            return None
+        if not records:
+            return None
+        events = [LoggedEvent.from_record(run_id, r) for r in records]
+        # Events trimmed off the front of the list count as evicted too
+        evicted_through = max(int(marker or 0), events[0].seq - 1)
+        if after < evicted_through:
+            raise ReplayTruncated(run_id, after, evicted_through)
+        # Coalescing only happens in the owning worker; apply it here too
+        kept: list[LoggedEvent] = []
+        for item in events:
+            kept = [p for p in kept if not is_superseded(p, item)]
+            kept.append(item)
+        return [e for e in kept if e.seq > after]
+
+    async def aclose(self) -> None:
+        await self._redis.aclose()
+
+
+# ---------------------------------------------------------------------------
+# Per-run log
+# ---------------------------------------------------------------------------
+
+class RunEventLog:
+    """Append-only event log for one pipeline run, with live followers.
+
+    The pipeline writes with :meth:`put` (same interface as an event queue);
+    each SSE connection reads with :meth:`follow`.
+    """
+
+    def __init__(
+        self,
+        run_id: str,
+        store: RedisRunStore | None = None,
+        max_events: int = MAX_EVENTS_PER_RUN,
+        max_bytes: int = DEFAULT_MAX_BYTES_PER_RUN,
+    ):
+        self.run_id = run_id
+        self.max_events = max(1, max_events)
+        self.max_bytes = max_bytes
+        self.started = time.time()
+        self.finished_at: float | None = None
+        self.subscribers = 0
+        self.completed_agents: set[str] = set()
+        self.task: asyncio.Task | None = None
+        self._events: list[LoggedEvent] = []
+        self._bytes = 0
+        self._seq = 0
+        # Highest seq evicted for space (coalesced events are not counted)
+        self.evicted_through = 0
+        self._cond = asyncio.Condition()
+        self._store = store
+
+    @property
+    def finished(self) -> bool:
+        return self.finished_at is not None
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    async def put(self, event: dict[str, Any]) -> None:
+        """Serialize *event* once and append it to the log, evicting the oldest events over budget."""
+        async with self._cond:
+            self._seq += 1
+            item = LoggedEvent(self.run_id, self._seq, event.get("event", ""), event.get("agent"), json.dumps(event, default=str))
+            kept = []
+            for pending in self._events:
+                if is_superseded(pending, item):
+                    self._bytes -= pending.size
+                else:
+                    kept.append(pending)
+            self._events = kept
+            self._events.append(item)
+            self._bytes += item.size
+            # The newest event is always kept, however large
+            while len(self._events) > 1 and (len(self._events) > self.max_events or self._bytes > self.max_bytes):
+                evicted = self._events.pop(0)
+                self._bytes -= evicted.size
+                self.evicted_through = evicted.seq
+            if item.event == "agent_complete" and item.agent:
+                self.completed_agents.add(item.agent)
+            if item.event in TERMINAL_EVENTS:
+                self.finished_at = time.time()
+            self._cond.notify_all()
+        if self._store is not None:
+            await self._store.append(item, self.evicted_through)
+
+    def events_after(self, seq: int) -> list[LoggedEvent]:
+        """Logged events with seq > *seq*; raises :class:`ReplayTruncated` if some were evicted."""
+        if seq < self.evicted_through:
+            raise ReplayTruncated(self.run_id, seq, self.evicted_through)
+        return [e for e in self._events if e.seq > seq]
+
+    async def follow(self, after: int = 0, keepalive: float = 10.0) -> AsyncIterator[LoggedEvent | None]:
+        """Yield events with seq > *after*, then live ones, until a terminal event.
+
+        Yields ``None`` every *keepalive* seconds without new events.  Raises
+        :class:`ReplayTruncated` if events the follower has not read yet were
+        evicted (a resume from too far back, or a follower that fell behind).  Use
+        with ``contextlib.aclosing`` so the subscriber count drops promptly
+        when the consumer stops early.
+        """
+        self.subscribers += 1
+        try:
+            cursor = after
+            while True:
+                async with self._cond:
+                    pending = self.events_after(cursor)
+                    if not pending and not self.finished:
+                        try:
+                            await asyncio.wait_for(
+                                self._cond.wait_for(lambda: bool(self.events_after(cursor)) or self.finished),
+                                timeout=keepalive,
+                            )
+                        except asyncio.TimeoutError:
+                            pass
+                        pending = self.events_after(cursor)
+                if not pending:
+                    if self.finished:
+                        return
+                    yield None
+                    continue
+                for item in pending:
+                    cursor = item.seq
+                    yield item
+                    if item.event in TERMINAL_EVENTS:
+                        return
+        finally:
+            self.subscribers -= 1
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+class RunRegistry:
+    """Tracks run logs for this worker and cancels runs nobody follows."""
+
+    def __init__(
+        self,
+        ttl: int = DEFAULT_TTL_SECONDS,
+        grace: float = DEFAULT_GRACE_SECONDS,
+        max_runs: int = DEFAULT_MAX_RUNS,
+        store: RedisRunStore | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES_PER_RUN,
+    ):
+        self.ttl = ttl
+        self.grace = grace
+        self.max_runs = max_runs
+        self.max_bytes = max_bytes
+        self.store = store
+        self._runs: OrderedDict[str, RunEventLog] = OrderedDict()
+        # Grace-period watchers; held here so they are not garbage-collected mid-sleep
+        self._watchers: set[asyncio.Task] = set()
+
+    @classmethod
+    def from_env(cls) -> "RunRegistry":
+        """Build from RUN_LOG_TTL_SECONDS / STREAM_RESUME_GRACE_SECONDS / RUN_LOG_MAX_BYTES / REDIS_URL."""
+        try:
+            ttl = int(os.getenv("RUN_LOG_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+            grace = float(os.getenv("STREAM_RESUME_GRACE_SECONDS", DEFAULT_GRACE_SECONDS))
+            max_bytes = int(os.getenv("RUN_LOG_MAX_BYTES", DEFAULT_MAX_BYTES_PER_RUN))
+        except ValueError as e:
+            logger.warning("Ignoring invalid run log settings: %s", e)
+            ttl, grace, max_bytes = DEFAULT_TTL_SECONDS, DEFAULT_GRACE_SECONDS, DEFAULT_MAX_BYTES_PER_RUN
+        url = os.getenv("REDIS_URL", "").strip()
+        store = RedisRunStore.from_url(url, ttl) if url else None
+        return cls(ttl=ttl, grace=grace, store=store, max_bytes=max_bytes)
+
+    @staticmethod
+    def _dead(run: RunEventLog) -> bool:
+        """Finished, or its pipeline task ended (or never started) without a terminal event."""
+        return run.finished or run.task is None or run.task.done()
+
+    def _prune(self) -> None:
+        now = time.time()
+        for run_id in list(self._runs):
+            run = self._runs[run_id]
+            ended = run.finished_at if run.finished else run.started
+            if self._dead(run) and now - ended > self.ttl:
+                del self._runs[run_id]
+        # Over capacity: evict the oldest finished or dead runs first
+        if len(self._runs) > self.max_runs:
+            for run_id in [r for r, run in self._runs.items() if self._dead(run)]:
+                if len(self._runs) <= self.max_runs:
+                    break
+                del self._runs[run_id]
+
+    def create(self) -> RunEventLog:
+        self._prune()
+        run = RunEventLog(uuid.uuid4().hex, store=self.store, max_bytes=self.max_bytes)
+        self._runs[run.run_id] = run
+        return run
+
+    def start(self, run: RunEventLog, pipeline: Awaitable[Any]) -> asyncio.Task:
+        """Run *pipeline* as *run*'s task; a cancelled run logs a final ``cancelled`` event."""
+        async def _guarded():
+            try:
+                await pipeline
+            except asyncio.CancelledError:
+                if not run.finished:
+                    await run.put({"event": "cancelled", "run_id": run.run_id, "message": "Pipeline cancelled"})
+                raise
+
+        run.task = asyncio.create_task(_guarded())
+        return run.task
+
+    def get(self, run_id: str) -> RunEventLog | None:
+        self._prune()
+        return self._runs.get(run_id)
+
+    async def exists(self, run_id: str) -> bool:
+        if self.get(run_id) is not None:
+            return True
+        return self.store is not None and await self.store.exists(run_id)
+
+    async def check_replay(self, run_id: str, after: int) -> None:
+        """Raise :class:`ReplayTruncated` if events after *after* are no longer buffered."""
+        run = self.get(run_id)
+        if run is not None:
+            run.events_after(after)
+        elif self.store is not None:
+            await self.store.read(run_id, after)
+
+    async def follow_remote(self, run_id: str, after: int = 0, keepalive: float = 10.0) -> AsyncIterator[LoggedEvent | None]:
+        """Follow a run owned by another worker by polling the Redis mirror."""
+        cursor = after
+        idle = 0.0
+        deadline = time.monotonic() + self.ttl
+        while self.store is not None and time.monotonic() < deadline:
+            events = await self.store.read(run_id, cursor) or []
+            for item in events:
+                cursor = item.seq
+                yield item
+                if item.event in TERMINAL_EVENTS:
+                    return
+            if events:
+                idle = 0.0
+                continue
+            await asyncio.sleep(REMOTE_POLL_SECONDS)
+            idle += REMOTE_POLL_SECONDS
+            if idle >= keepalive:
+                idle = 0.0
+                yield None
+
+    def release(self, run: RunEventLog) -> None:
+        """A subscriber left before the run finished; cancel it after the grace period if nobody re-attaches."""
+        if run.finished or run.task is None or run.task.done():
+            return
+        task = asyncio.create_task(self._cancel_if_abandoned(run))
+        self._watchers.add(task)
+        task.add_done_callback(self._watchers.discard)
+
+    async def _cancel_if_abandoned(self, run: RunEventLog) -> None:
+        await asyncio.sleep(self.grace)
+        # A run that logged its terminal event only has cleanup left; not abandoned
+        if run.subscribers or run.finished or run.task is None or run.task.done():
+            return
+        run.task.cancel()
+        elapsed = round(time.time() - run.started, 2)
+        record_abandoned_pipeline(run.completed_agents, elapsed)
+        logger.warning(
+            "Abandoned streaming run %s after %.1fs (%d/7 agents delivered)",
+            run.run_id, elapsed, len(run.completed_agents),
+        )
+
+    async def aclose(self) -> None:
+        for task in list(self._watchers):
+            task.cancel()
+        if self.store is not None:
+            await self.store.aclose()
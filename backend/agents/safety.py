@@ -18,686 +18,228 @@ from typing import Any
 
 from .base import BaseAgent
 from .message_bus import MessageBus
+from .knowledge_store import knowledge
 
 
 # ---------------------------------------------------------------------------
 # Contraindication database
 # ---------------------------------------------------------------------------
 
-CONTRAINDICATIONS: dict[str, list[dict]] = {
-    # NSAIDs
-    "ibuprofen": [
-        {"condition": "gi bleed", "type": "absolute", "severity": "critical", "detail": "Active GI bleeding or history of NSAID-induced GI bleed", "alternative": "Acetaminophen, topical NSAIDs, or COX-2 selective inhibitor with PPI"},
-        {"condition": "peptic ulcer", "type": "absolute", "severity": "critical", "detail": "Active peptic ulcer disease", "alternative": "Acetaminophen; if NSAID essential, use celecoxib + PPI"},
-        {"condition": "ckd", "type": "relative", "severity": "high", "detail": "NSAIDs reduce renal blood flow via prostaglandin inhibition; may worsen CKD (avoid if eGFR < 30)", "alternative": "Acetaminophen, topical agents, non-pharmacologic pain management"},
-        {"condition": "kidney", "type": "relative", "severity": "high", "detail": "NSAIDs may worsen renal function; avoid in advanced kidney disease", "alternative": "Acetaminophen, topical NSAIDs"},
-        {"condition": "heart failure", "type": "relative", "severity": "high", "detail": "NSAIDs cause sodium and water retention, worsening heart failure; increase CV events", "alternative": "Acetaminophen; short-course topical NSAID if essential"},
-        {"condition": "pregnancy", "type": "absolute", "severity": "critical", "detail": "Contraindicated in third trimester (premature ductus arteriosus closure). Avoid throughout pregnancy if possible.", "alternative": "Acetaminophen"},
-        {"condition": "asthma", "type": "relative", "severity": "high", "detail": "NSAID-exacerbated respiratory disease (Samter's triad) in ~10% of asthmatics", "alternative": "Acetaminophen (generally safe), COX-2 inhibitor with caution, desensitization if needed"},
-        {"condition": "anticoagulant", "type": "relative", "severity": "high", "detail": "Additive bleeding risk with anticoagulants", "alternative": "Acetaminophen; if needed, use lowest dose shortest duration with PPI"},
-    ],
-    "naproxen": [
-        {"condition": "gi bleed", "type": "absolute", "severity": "critical", "detail": "Active GI bleeding", "alternative": "Acetaminophen"},
-        {"condition": "peptic ulcer", "type": "absolute", "severity": "critical", "detail": "Active peptic ulcer disease", "alternative": "Acetaminophen + PPI if needed"},
-        {"condition": "ckd", "type": "relative", "severity": "high", "detail": "Nephrotoxic; avoid if eGFR < 30", "alternative": "Acetaminophen"},
-        {"condition": "heart failure", "type": "relative", "severity": "high", "detail": "Fluid retention and CV risk", "alternative": "Acetaminophen"},
-        {"condition": "pregnancy", "type": "absolute", "severity": "critical", "detail": "Avoid especially in third trimester", "alternative": "Acetaminophen"},
-    ],
-    "diclofenac": [
-        {"condition": "gi bleed", "type": "absolute", "severity": "critical", "detail": "Active GI bleeding", "alternative": "Acetaminophen, topical diclofenac (lower systemic absorption)"},
-        {"condition": "cardiovascular", "type": "relative", "severity": "high", "detail": "Higher CV risk than other NSAIDs (similar to COX-2 inhibitors). Avoid in established CVD.", "alternative": "Naproxen (lowest CV risk among NSAIDs), acetaminophen"},
-        {"condition": "ckd", "type": "relative", "severity": "high", "detail": "Nephrotoxic", "alternative": "Acetaminophen"},
-        {"condition": "liver disease", "type": "relative", "severity": "high", "detail": "Hepatotoxicity risk; monitor LFTs", "alternative": "Acetaminophen (with dose adjustment), topical agents"},
-    ],
-    "aspirin": [
-        {"condition": "child", "type": "absolute", "severity": "critical", "detail": "Contraindicated in children < 16 years — Reye syndrome risk (acute hepatic encephalopathy)", "alternative": "Acetaminophen or ibuprofen for pediatric pain/fever"},
-        {"condition": "gi bleed", "type": "absolute", "severity": "critical", "detail": "Active GI bleeding", "alternative": "Acetaminophen"},
-        {"condition": "bleeding disorder", "type": "absolute", "severity": "critical", "detail": "Hemophilia or severe thrombocytopenia", "alternative": "Acetaminophen"},
-        {"condition": "gout", "type": "relative", "severity": "moderate", "detail": "Low-dose aspirin raises uric acid levels and may trigger gout flares", "alternative": "Acetaminophen for pain; if antiplatelet needed, monitor uric acid"},
-    ],
-    # ACE inhibitors
-    "lisinopril": [
-        {"condition": "pregnancy", "type": "absolute", "severity": "critical", "detail": "Teratogenic — causes fetal renal dysgenesis, oligohydramnios, skull defects (2nd/3rd trimester)", "alternative": "Labetalol, nifedipine, or methyldopa for hypertension in pregnancy"},
-        {"condition": "angioedema", "type": "absolute", "severity": "critical", "detail": "History of ACE inhibitor-induced angioedema", "alternative": "ARB (with caution, ~2% cross-reactivity) or CCB"},
-        {"condition": "bilateral renal artery stenosis", "type": "absolute", "severity": "critical", "detail": "May precipitate acute renal failure", "alternative": "CCB (amlodipine)"},
-        {"condition": "hyperkalemia", "type": "relative", "severity": "high", "detail": "K > 5.5 mEq/L — ACEi reduces potassium excretion", "alternative": "CCB, thiazide diuretic"},
-        {"condition": "ckd", "type": "relative", "severity": "moderate", "detail": "Beneficial in CKD with proteinuria but requires monitoring; contraindicated if eGFR < 20 without specialist guidance", "alternative": "ARB if ACEi not tolerated; CCB for BP control alone"},
-    ],
-    "enalapril": [
-        {"condition": "pregnancy", "type": "absolute", "severity": "critical", "detail": "Teratogenic in all trimesters", "alternative": "Labetalol, nifedipine, methyldopa"},
-        {"condition": "angioedema", "type": "absolute", "severity": "critical", "detail": "History of ACEi-induced angioedema", "alternative": "ARB or CCB"},
-        {"condition": "hyperkalemia", "type": "relative", "severity": "high", "detail": "Risk of hyperkalemia", "alternative": "CCB"},
-    ],
-    "ramipril": [
-        {"condition": "pregnancy", "type": "absolute", "severity": "critical", "detail": "Teratogenic", "alternative": "Labetalol, nifedipine, methyldopa"},
-        {"condition": "angioedema", "type": "absolute", "severity": "critical", "detail": "ACEi angioedema history", "alternative": "ARB or CCB"},
-    ],
-    # Beta-blockers
-    "propranolol": [
-        {"condition": "asthma", "type": "absolute", "severity": "critical", "detail": "Non-selective beta-blocker causes bronchospasm in asthma", "alternative": "Cardioselective beta-blocker (metoprolol, bisoprolol) with caution, or CCB"},
-        {"condition": "copd", "type": "relative", "severity": "high", "detail": "Non-selective BB may worsen bronchospasm in severe COPD", "alternative": "Cardioselective BB (bisoprolol) generally safe in mild-moderate COPD"},
-        {"condition": "bradycardia", "type": "absolute", "severity": "critical", "detail": "Heart rate < 50 bpm or sick sinus syndrome without pacemaker", "alternative": "CCB (if needed for rate control, use verapamil/diltiazem with caution)"},
-        {"condition": "diabetes", "type": "relative", "severity": "moderate", "detail": "Masks hypoglycemia symptoms (tachycardia, tremor) and may prolong hypoglycemic episodes", "alternative": "Cardioselective BB (less masking effect) or alternative antihypertensive"},
-        {"condition": "raynaud", "type": "relative", "severity": "moderate", "detail": "Worsens peripheral vasoconstriction", "alternative": "CCB (nifedipine, amlodipine)"},
-    ],
-    "metoprolol": [
-        {"condition": "severe bradycardia", "type": "absolute", "severity": "critical", "detail": "Heart rate < 45 bpm or heart block > 1st degree without pacemaker", "alternative": "CCB, hydralazine"},
-        {"condition": "cardiogenic shock", "type": "absolute", "severity": "critical", "detail": "Negative inotropic effect worsens cardiogenic shock", "alternative": "Hemodynamic support first, then consider BB when stable"},
-        {"condition": "asthma", "type": "relative", "severity": "moderate", "detail": "Cardioselective but may still worsen severe asthma at higher doses", "alternative": "CCB for rate control or hypertension"},
-    ],
-    "atenolol": [
-        {"condition": "asthma", "type": "relative", "severity": "moderate", "detail": "Cardioselective; generally safer but caution in severe asthma", "alternative": "CCB"},
-        {"condition": "pregnancy", "type": "relative", "severity": "high", "detail": "Associated with IUGR; avoid in pregnancy", "alternative": "Labetalol"},
-    ],
-    # Statins
-    "atorvastatin": [
-        {"condition": "pregnancy", "type": "absolute", "severity": "critical", "detail": "All statins are Category X — teratogenic (cholesterol essential for fetal development)", "alternative": "Discontinue during pregnancy; bile acid sequestrants if LDL treatment essential"},
-        {"condition": "liver disease", "type": "absolute", "severity": "critical", "detail": "Active liver disease or unexplained persistent transaminase elevation > 3x ULN", "alternative": "Ezetimibe, bile acid sequestrants, PCSK9 inhibitors"},
-        {"condition": "rhabdomyolysis", "type": "absolute", "severity": "critical", "detail": "History of statin-induced rhabdomyolysis", "alternative": "Ezetimibe, PCSK9 inhibitor, bempedoic acid"},
-        {"condition": "myopathy", "type": "relative", "severity": "moderate", "detail": "Muscle symptoms on prior statin — try dose reduction, alternate-day dosing, or different statin", "alternative": "Rosuvastatin (lower myopathy risk), pravastatin, or non-statin therapy"},
-    ],
-    "simvastatin": [
-        {"condition": "pregnancy", "type": "absolute", "severity": "critical", "detail": "Teratogenic (Category X)", "alternative": "Discontinue in pregnancy"},
-        {"condition": "liver disease", "type": "absolute", "severity": "critical", "detail": "Active liver disease", "alternative": "Ezetimibe"},
-        {"condition": "cyp3a4 inhibitor", "type": "absolute", "severity": "critical", "detail": "Contraindicated with strong CYP3A4 inhibitors (ketoconazole, itraconazole, HIV protease inhibitors) — rhabdomyolysis risk", "alternative": "Rosuvastatin or pravastatin (not CYP3A4 substrates)"},
-    ],
-    # Anticoagulants
-    "warfarin": [
-        {"condition": "pregnancy", "type": "absolute", "severity": "critical", "detail": "Teratogenic (warfarin embryopathy — nasal hypoplasia, stippled epiphyses, CNS abnormalities). Especially weeks 6-12.", "alternative": "LMWH (enoxaparin) throughout pregnancy"},
-        {"condition": "active bleeding", "type": "absolute", "severity": "critical", "detail": "Active hemorrhage or recent hemorrhagic stroke", "alternative": "Assess need for anticoagulation; mechanical valve may require heparin bridge"},
-        {"condition": "severe liver disease", "type": "relative", "severity": "high", "detail": "Impaired clotting factor synthesis increases bleeding risk", "alternative": "Dose reduction with careful INR monitoring; DOAC may be preferred in mild-moderate liver disease"},
-        {"condition": "falls risk", "type": "relative", "severity": "moderate", "detail": "Increased intracranial hemorrhage risk in elderly with frequent falls", "alternative": "DOAC (lower ICH risk than warfarin), assess fall prevention"},
-    ],
-    "rivaroxaban": [
-        {"condition": "severe ckd", "type": "relative", "severity": "high", "detail": "Avoid if CrCl < 15 mL/min (no dialysis data). Dose adjust at CrCl 15-50.", "alternative": "Warfarin with INR monitoring, or apixaban (better renal safety data)"},
-        {"condition": "active bleeding", "type": "absolute", "severity": "critical", "detail": "Active pathological bleeding", "alternative": "Assess anticoagulation need"},
-        {"condition": "liver disease", "type": "absolute", "severity": "critical", "detail": "Avoid in Child-Pugh B/C with coagulopathy", "alternative": "Warfarin with careful monitoring"},
-    ],
-    "apixaban": [
-        {"condition": "severe liver disease", "type": "absolute", "severity": "critical", "detail": "Avoid in Child-Pugh C", "alternative": "Warfarin with careful monitoring"},
-        {"condition": "active bleeding", "type": "absolute", "severity": "critical", "detail": "Active pathological bleeding", "alternative": "Assess anticoagulation need"},
-        {"condition": "mechanical valve", "type": "absolute", "severity": "critical", "detail": "DOACs contraindicated with mechanical heart valves (RE-ALIGN trial showed harm)", "alternative": "Warfarin is the only approved anticoagulant for mechanical valves"},
-    ],
-    # Opioids
-    "morphine": [
-        {"condition": "respiratory depression", "type": "absolute", "severity": "critical", "detail": "Severe respiratory depression or acute/severe asthma in unmonitored setting", "alternative": "Non-opioid analgesia; if opioid essential, use with monitoring and naloxone available"},
-        {"condition": "paralytic ileus", "type": "absolute", "severity": "critical", "detail": "Known or suspected GI obstruction", "alternative": "Non-opioid analgesia"},
-        {"condition": "head injury", "type": "relative", "severity": "high", "detail": "May mask neurological signs, raise ICP", "alternative": "Acetaminophen; if opioid needed, use with close neuro monitoring"},
-        {"condition": "severe ckd", "type": "relative", "severity": "high", "detail": "Active metabolite (M6G) accumulates in renal failure, causing prolonged sedation", "alternative": "Fentanyl or hydromorphone (no active renal metabolites)"},
-    ],
-    "codeine": [
-        {"condition": "child", "type": "absolute", "severity": "critical", "detail": "Contraindicated in children < 12 years and post-tonsillectomy in < 18 years (FDA black box). CYP2D6 ultra-rapid metabolizers at risk for fatal respiratory depression.", "alternative": "Acetaminophen, ibuprofen"},
-        {"condition": "respiratory depression", "type": "absolute", "severity": "critical", "detail": "Severe respiratory insufficiency", "alternative": "Non-opioid analgesia"},
-        {"condition": "breastfeeding", "type": "absolute", "severity": "critical", "detail": "Active metabolite (morphine) excreted in breast milk; fatal infant cases reported in ultra-rapid metabolizers", "alternative": "Acetaminophen, ibuprofen"},
-    ],
-    # Benzodiazepines
-    "diazepam": [
-        {"condition": "myasthenia gravis", "type": "absolute", "severity": "critical", "detail": "Worsens muscle weakness; may precipitate respiratory failure", "alternative": "Buspirone for anxiety; gabapentin for muscle spasm"},
-        {"condition": "severe respiratory disease", "type": "relative", "severity": "high", "detail": "Risk of respiratory depression, especially with concurrent opioids", "alternative": "Buspirone, SSRI for anxiety; non-benzo muscle relaxant"},
-        {"condition": "sleep apnea", "type": "relative", "severity": "high", "detail": "Worsens upper airway obstruction", "alternative": "Trazodone, melatonin for insomnia"},
-        {"condition": "elderly", "type": "relative", "severity": "high", "detail": "Beers Criteria: avoid in elderly (falls, cognitive impairment, delirium, fractures). Long half-life especially problematic.", "alternative": "Buspirone, SSRI/SNRI, non-pharmacologic therapies"},
-        {"condition": "liver disease", "type": "relative", "severity": "high", "detail": "Extensively hepatically metabolized; accumulation in cirrhosis", "alternative": "Lorazepam or oxazepam (conjugation only, safer in liver disease)"},
-    ],
-    "alprazolam": [
-        {"condition": "elderly", "type": "relative", "severity": "high", "detail": "Beers Criteria: avoid in elderly; high fall and fracture risk", "alternative": "Buspirone, SSRI"},
-        {"condition": "liver disease", "type": "relative", "severity": "high", "detail": "CYP3A4 metabolized; accumulation in hepatic impairment", "alternative": "Lorazepam, oxazepam"},
-    ],
-    # SSRIs
-    "sertraline": [
-        {"condition": "maoi", "type": "absolute", "severity": "critical", "detail": "Serotonin syndrome risk with MAOIs — potentially fatal. Requires 14-day washout.", "alternative": "Wait 14 days after MAOI discontinuation; or use non-serotonergic antidepressant (bupropion)"},
-        {"condition": "qt prolongation", "type": "relative", "severity": "moderate", "detail": "Dose-dependent QTc prolongation, especially at higher doses", "alternative": "Escitalopram at low dose, or mirtazapine"},
-        {"condition": "bleeding risk", "type": "relative", "severity": "moderate", "detail": "SSRIs impair platelet aggregation; increased bleeding with anticoagulants", "alternative": "Mirtazapine, bupropion (no significant serotonin reuptake inhibition)"},
-    ],
-    "fluoxetine": [
-        {"condition": "maoi", "type": "absolute", "severity": "critical", "detail": "Serotonin syndrome. Fluoxetine requires 5-week washout due to long half-life of norfluoxetine.", "alternative": "5-week washout before MAOI"},
-        {"condition": "tamoxifen", "type": "relative", "severity": "high", "detail": "Strong CYP2D6 inhibitor reduces tamoxifen activation (endoxifen)", "alternative": "Sertraline, citalopram, venlafaxine (weak CYP2D6 inhibitors)"},
-    ],
-    # Metformin
-    "metformin": [
-        {"condition": "severe ckd", "type": "absolute", "severity": "critical", "detail": "Contraindicated if eGFR < 30 mL/min (lactic acidosis risk). Dose reduction at eGFR 30-45.", "alternative": "SGLT2 inhibitor, DPP-4 inhibitor, insulin, GLP-1 RA"},
-        {"condition": "liver failure", "type": "absolute", "severity": "critical", "detail": "Impaired lactate clearance increases lactic acidosis risk", "alternative": "Insulin, DPP-4 inhibitor"},
-        {"condition": "alcoholism", "type": "relative", "severity": "high", "detail": "Chronic heavy alcohol use increases lactic acidosis risk", "alternative": "DPP-4 inhibitor, GLP-1 RA"},
-        {"condition": "contrast", "type": "relative", "severity": "high", "detail": "Hold for 48h after iodinated contrast; restart after confirming stable renal function", "alternative": "Temporary insulin coverage if needed"},
-    ],
-    # Insulin
-    "insulin": [
-        {"condition": "hypoglycemia unawareness", "type": "relative", "severity": "high", "detail": "Loss of hypoglycemia warning symptoms increases risk of severe hypoglycemia", "alternative": "Relax glycemic targets (HbA1c < 8%), CGM, hypoglycemia awareness training"},
-        {"condition": "insulinoma", "type": "absolute", "severity": "critical", "detail": "Exogenous insulin in insulinoma causes refractory hypoglycemia", "alternative": "Surgical resection of insulinoma"},
-    ],
-    # Corticosteroids
-    "prednisone": [
-        {"condition": "systemic fungal infection", "type": "absolute", "severity": "critical", "detail": "Immunosuppression worsens systemic fungal infections", "alternative": "Treat infection first; if steroid essential, ensure concurrent antifungal therapy"},
-        {"condition": "diabetes", "type": "relative", "severity": "high", "detail": "Corticosteroids cause dose-dependent hyperglycemia; may require insulin initiation", "alternative": "Steroid-sparing agents; if steroid needed, monitor glucose and adjust diabetes medications"},
-        {"condition": "osteoporosis", "type": "relative", "severity": "moderate", "detail": "Accelerates bone loss; fracture risk increases within 3 months of starting", "alternative": "Lowest effective dose, shortest duration. Start bisphosphonate + calcium + vitamin D if > 3 months predicted."},
-        {"condition": "peptic ulcer", "type": "relative", "severity": "moderate", "detail": "Increased GI bleeding risk, especially with concurrent NSAIDs", "alternative": "PPI co-prescription if steroid essential"},
-        {"condition": "psychosis", "type": "relative", "severity": "moderate", "detail": "Steroid-induced psychosis in 5-18% of patients at doses >= 40mg/day", "alternative": "Lowest effective dose; monitor mental status"},
-    ],
-    # Fluoroquinolones
-    "ciprofloxacin": [
-        {"condition": "myasthenia gravis", "type": "absolute", "severity": "critical", "detail": "Fluoroquinolones may exacerbate muscle weakness and cause respiratory failure in MG", "alternative": "Amoxicillin-clavulanate, TMP-SMX, or consult infectious disease"},
-        {"condition": "tendon disorder", "type": "relative", "severity": "high", "detail": "FDA black box: tendinitis and tendon rupture risk, especially in elderly, corticosteroid users, and transplant recipients", "alternative": "Other antibiotic classes based on susceptibility"},
-        {"condition": "qt prolongation", "type": "relative", "severity": "moderate", "detail": "QTc prolongation risk, especially with other QT-prolonging drugs", "alternative": "Amoxicillin-clavulanate, TMP-SMX, cephalosporins"},
-        {"condition": "child", "type": "relative", "severity": "moderate", "detail": "FDA: use only when no alternative; concern for musculoskeletal toxicity in children", "alternative": "Amoxicillin-clavulanate, cephalosporins, azithromycin"},
-    ],
-    # Tetracyclines
-    "doxycycline": [
-        {"condition": "pregnancy", "type": "absolute", "severity": "critical", "detail": "Tetracyclines cause permanent teeth discoloration and bone growth inhibition in fetus", "alternative": "Amoxicillin, azithromycin, cephalosporins depending on indication"},
-        {"condition": "child", "type": "absolute", "severity": "critical", "detail": "Avoid in children < 8 years (permanent teeth staining)", "alternative": "Amoxicillin, azithromycin"},
-        {"condition": "esophagitis", "type": "relative", "severity": "moderate", "detail": "Pill esophagitis risk — take with full glass of water, remain upright 30 min", "alternative": "Minocycline (less esophageal risk), or alternative antibiotic class"},
-    ],
-    # Methotrexate
-    "methotrexate": [
-        {"condition": "pregnancy", "type": "absolute", "severity": "critical", "detail": "Potent teratogen and abortifacient. Contraception required during and 3 months after treatment.", "alternative": "Azathioprine, sulfasalazine for rheumatologic conditions; certolizumab in pregnancy"},
-        {"condition": "severe ckd", "type": "absolute", "severity": "critical", "detail": "Renal clearance; accumulation causes fatal pancytopenia and mucositis", "alternative": "Leflunomide, biologics"},
-        {"condition": "liver disease", "type": "relative", "severity": "high", "detail": "Hepatotoxic; avoid in significant hepatic impairment or heavy alcohol use", "alternative": "Biologics, sulfasalazine"},
-        {"condition": "immunodeficiency", "type": "relative", "severity": "high", "detail": "Severe immunosuppression risk; monitor CBC regularly", "alternative": "Biologics with different mechanism"},
-    ],
-    # Isotretinoin
-    "isotretinoin": [
-        {"condition": "pregnancy", "type": "absolute", "severity": "critical", "detail": "iPLEDGE program mandatory. Category X: causes craniofacial, cardiac, CNS birth defects. Two forms of contraception required.", "alternative": "Topical retinoids (less teratogenic but still avoid in pregnancy), antibiotics for acne"},
-        {"condition": "liver disease", "type": "relative", "severity": "high", "detail": "Hepatotoxic; monitor LFTs monthly", "alternative": "Topical retinoids, oral antibiotics"},
-        {"condition": "depression", "type": "relative", "severity": "moderate", "detail": "Controversial association with depression and suicidality; monitor mental health", "alternative": "Topical retinoids, hormonal therapy, antibiotics"},
-    ],
-}
+CONTRAINDICATIONS = knowledge.table("contraindications")
 
 # ---------------------------------------------------------------------------
 # Dosage database
 # ---------------------------------------------------------------------------
 
-DOSAGE_DATABASE: dict[str, dict] = {
-    "ibuprofen": {
-        "standard_adult_dose": "200-400mg every 4-6 hours",
-        "max_daily_dose": "1200mg OTC; 3200mg prescription",
-        "pediatric_dose": "5-10 mg/kg every 6-8 hours (max 40 mg/kg/day)",
-        "geriatric_adjustment": "Start at lowest effective dose; avoid if possible (Beers Criteria: increased GI bleed, AKI risk). Max 1200mg/day if used.",
-        "renal_adjustment": {
-            "eGFR_30_60": "Use with caution; lowest dose, shortest duration. Monitor creatinine.",
-            "eGFR_15_30": "Generally avoid; use only if no alternative with close monitoring",
-            "eGFR_below_15": "Contraindicated",
-        },
-        "hepatic_adjustment": {
-            "child_pugh_A": "Standard dose with monitoring",
-            "child_pugh_B": "Reduce dose by 50%; monitor LFTs",
-            "child_pugh_C": "Avoid",
-        },
-    },
-    "acetaminophen": {
-        "standard_adult_dose": "500-1000mg every 4-6 hours",
-        "max_daily_dose": "3000mg (conservative) to 4000mg/day. Limit to 2000mg/day with liver disease or heavy alcohol use.",
-        "pediatric_dose": "10-15 mg/kg every 4-6 hours (max 75 mg/kg/day, not to exceed 4000mg)",
-        "geriatric_adjustment": "Max 2000-3000mg/day; hepatic metabolism declines with age",
-        "renal_adjustment": {
-            "eGFR_30_60": "No adjustment needed",
-            "eGFR_15_30": "Extend interval to every 6-8 hours",
-            "eGFR_below_15": "Extend interval to every 8 hours; max 2000mg/day",
-        },
-        "hepatic_adjustment": {
-            "child_pugh_A": "Max 2000mg/day",
-            "child_pugh_B": "Max 2000mg/day with close monitoring",
-            "child_pugh_C": "Avoid or max 1000mg/day with specialist guidance",
-        },
-    },
-    "amoxicillin": {
-        "standard_adult_dose": "250-500mg every 8 hours, or 500-875mg every 12 hours",
-        "max_daily_dose": "3000mg/day (higher in some infections: 4000mg/day)",
-        "pediatric_dose": "25-50 mg/kg/day divided every 8-12 hours. High-dose AOM: 80-90 mg/kg/day divided BID.",
-        "geriatric_adjustment": "Adjust for renal function; otherwise standard dose",
-        "renal_adjustment": {
-            "eGFR_30_60": "No dose adjustment, consider extended interval",
-            "eGFR_15_30": "250-500mg every 12 hours",
-            "eGFR_below_15": "250-500mg every 24 hours",
-        },
-        "hepatic_adjustment": {
-            "child_pugh_A": "No adjustment",
-            "child_pugh_B": "No adjustment",
-            "child_pugh_C": "No adjustment (renally cleared)",
-        },
-    },
-    "metformin": {
-        "standard_adult_dose": "500mg BID with meals, titrate to 1000mg BID",
-        "max_daily_dose": "2550mg/day (2000mg/day in many guidelines)",
-        "pediatric_dose": "500mg daily, titrate to max 2000mg/day (age >= 10 years)",
-        "geriatric_adjustment": "Conservative titration; use lowest effective dose; avoid if eGFR < 30",
-        "renal_adjustment": {
-            "eGFR_30_60": "eGFR 30-45: max 1000mg/day, do not initiate. eGFR 45-60: max 2000mg/day, may initiate with caution.",
-            "eGFR_15_30": "Contraindicated",
-            "eGFR_below_15": "Contraindicated",
-        },
-        "hepatic_adjustment": {
-            "child_pugh_A": "Use with caution",
-            "child_pugh_B": "Avoid (impaired lactate clearance)",
-            "child_pugh_C": "Contraindicated",
-        },
-    },
-    "lisinopril": {
-        "standard_adult_dose": "5-10mg daily initially; titrate to 20-40mg daily",
-        "max_daily_dose": "80mg/day (heart failure target: 20-40mg/day)",
-        "pediatric_dose": "0.07 mg/kg once daily (max 5mg); titrate to 0.6 mg/kg/day (max 40mg)",
-        "geriatric_adjustment": "Start at 2.5-5mg daily; titrate slowly monitoring renal function and potassium",
-        "renal_adjustment": {
-            "eGFR_30_60": "Start 5mg daily; titrate with monitoring",
-            "eGFR_15_30": "Start 2.5mg daily; max 40mg",
-            "eGFR_below_15": "Start 2.5mg daily; use with specialist guidance",
-        },
-        "hepatic_adjustment": {
-            "child_pugh_A": "No adjustment (renally cleared)",
-            "child_pugh_B": "No adjustment",
-            "child_pugh_C": "No adjustment",
-        },
-    },
-    "amlodipine": {
-        "standard_adult_dose": "5mg once daily; may increase to 10mg",
-        "max_daily_dose": "10mg/day",
-        "pediatric_dose": "2.5mg once daily (ages 6-17); max 5mg/day",
-        "geriatric_adjustment": "Start 2.5mg daily (reduced clearance)",
-        "renal_adjustment": {
-            "eGFR_30_60": "No adjustment",
-            "eGFR_15_30": "No adjustment",
-            "eGFR_below_15": "No adjustment (hepatically metabolized)",
-        },
-        "hepatic_adjustment": {
-            "child_pugh_A": "No adjustment",
-            "child_pugh_B": "Start 2.5mg daily",
-            "child_pugh_C": "Start 2.5mg daily; titrate cautiously",
-        },
-    },
-    "atorvastatin": {
-        "standard_adult_dose": "10-20mg once daily; high-intensity: 40-80mg daily",
-        "max_daily_dose": "80mg/day",
-        "pediatric_dose": "10-20mg daily (ages 10-17); max 20mg/day",
-        "geriatric_adjustment": "No specific dose adjustment; monitor for myopathy",
-        "renal_adjustment": {
-            "eGFR_30_60": "No adjustment",
-            "eGFR_15_30": "No adjustment (hepatically metabolized)",
-            "eGFR_below_15": "No adjustment; but use cautiously",
-        },
-        "hepatic_adjustment": {
-            "child_pugh_A": "Use with caution",
-            "child_pugh_B": "Contraindicated if ALT/AST > 3x ULN",
-            "child_pugh_C": "Contraindicated",
-        },
-    },
-    "metoprolol": {
-        "standard_adult_dose": "Tartrate: 25-100mg BID. Succinate ER: 25-200mg daily.",
-        "max_daily_dose": "Tartrate: 450mg/day. Succinate: 400mg/day. HF: start 12.5-25mg, target 200mg.",
-        "pediatric_dose": "1-2 mg/kg/day divided BID (max 6 mg/kg/day, up to 200mg)",
-        "geriatric_adjustment": "Start low (12.5-25mg); titrate slowly; monitor heart rate and BP",
-        "renal_adjustment": {
-            "eGFR_30_60": "No adjustment",
-            "eGFR_15_30": "No adjustment",
-            "eGFR_below_15": "No adjustment (hepatically metabolized)",
-        },
-        "hepatic_adjustment": {
-            "child_pugh_A": "No adjustment",
-            "child_pugh_B": "Reduce dose; monitor closely",
-            "child_pugh_C": "Reduce dose significantly; monitor for excessive bradycardia",
-        },
-    },
-    "sertraline": {
-        "standard_adult_dose": "50mg daily; titrate by 50mg at >= 1 week intervals",
-        "max_daily_dose": "200mg/day",
-        "pediatric_dose": "OCD ages 6-12: start 25mg daily. Ages 13-17: start 50mg daily. Max 200mg/day.",
-        "geriatric_adjustment": "Start 25mg daily; slower titration. Monitor for hyponatremia (SIADH).",
-        "renal_adjustment": {
-            "eGFR_30_60": "No adjustment",
-            "eGFR_15_30": "No adjustment per manufacturer, but start conservatively",
-            "eGFR_below_15": "Use with caution; limited data",
-        },
-        "hepatic_adjustment": {
-            "child_pugh_A": "No adjustment",
-            "child_pugh_B": "Reduce dose by 50%",
-            "child_pugh_C": "Avoid or use minimal dose",
-        },
-    },
-    "omeprazole": {
-        "standard_adult_dose": "20mg daily (GERD); 40mg daily (erosive esophagitis, ZES)",
-        "max_daily_dose": "40mg daily (up to 120mg TID for ZES)",
-        "pediatric_dose": "1 mg/kg/day (max 20mg) for ages 1-16. Weight-based: 5-<10kg: 5mg; 10-<20kg: 10mg; >=20kg: 20mg.",
-        "geriatric_adjustment": "No specific dose adjustment. Consider deprescribing if no ongoing indication. Monitor B12, Mg, Ca.",
-        "renal_adjustment": {
-            "eGFR_30_60": "No adjustment",
-            "eGFR_15_30": "No adjustment",
-            "eGFR_below_15": "No adjustment",
-        },
-        "hepatic_adjustment": {
-            "child_pugh_A": "No adjustment",
-            "child_pugh_B": "Max 20mg daily",
-            "child_pugh_C": "Max 10mg daily",
-        },
-    },
-    "warfarin": {
-        "standard_adult_dose": "2-5mg daily initially; adjust based on INR (target 2.0-3.0 for most indications; 2.5-3.5 for mechanical valves)",
-        "max_daily_dose": "Highly individualized (usual maintenance 2-10mg/day). Pharmacogenomics (CYP2C9, VKORC1) may guide dosing.",
-        "pediatric_dose": "0.1-0.2 mg/kg/day initially; adjust to INR",
-        "geriatric_adjustment": "Lower starting doses (1-2mg/day); elderly more sensitive. Increased bleeding risk. Consider DOAC if appropriate.",
-        "renal_adjustment": {
-            "eGFR_30_60": "No dose adjustment; may need lower doses due to altered protein binding",
-            "eGFR_15_30": "Use with caution; increase INR monitoring frequency",
-            "eGFR_below_15": "Use with caution; may be only option for mechanical valves. Increased bleeding risk.",
-        },
-        "hepatic_adjustment": {
-            "child_pugh_A": "Increased sensitivity; start lower, monitor closely",
-            "child_pugh_B": "Very sensitive; start 1mg; frequent INR monitoring",
-            "child_pugh_C": "Extreme caution; very high bleeding risk; specialist management required",
-        },
-    },
-    "apixaban": {
-        "standard_adult_dose": "5mg BID (AF); 10mg BID x7d then 5mg BID (VTE treatment); 2.5mg BID (VTE prevention)",
-        "max_daily_dose": "10mg/day for AF; 20mg/day for acute VTE treatment phase",
-        "pediatric_dose": "Not approved for most pediatric indications; weight-based dosing in clinical trials",
-        "geriatric_adjustment": "Reduce to 2.5mg BID if >= 2 of: age >= 80, weight <= 60kg, Cr >= 1.5 mg/dL",
-        "renal_adjustment": {
-            "eGFR_30_60": "No adjustment; dose reduction criteria may apply",
-            "eGFR_15_30": "5mg BID (some guidelines); 2.5mg BID if other dose-reduction criteria met",
-            "eGFR_below_15": "Limited data; 5mg BID studied in ESKD on dialysis (may be used per 2019 AHA guidance)",
-        },
-        "hepatic_adjustment": {
-            "child_pugh_A": "No adjustment",
-            "child_pugh_B": "Use with caution; limited data",
-            "child_pugh_C": "Not recommended",
-        },
-    },
-    "prednisone": {
-        "standard_adult_dose": "Varies by indication: 5-60mg/day. Anti-inflammatory: 5-20mg. Immunosuppression: 20-60mg.",
-        "max_daily_dose": "No absolute max; pulse doses up to 1mg/kg (60-80mg) or higher for acute conditions",
-        "pediatric_dose": "0.5-2 mg/kg/day depending on indication. Asthma burst: 1-2 mg/kg/day (max 60mg) x 3-5 days.",
-        "geriatric_adjustment": "Use lowest effective dose for shortest duration. High osteoporosis and infection risk. Start bone protection if > 3 months.",
-        "renal_adjustment": {
-            "eGFR_30_60": "No adjustment",
-            "eGFR_15_30": "No adjustment",
-            "eGFR_below_15": "No adjustment (but fluid retention may worsen)",
-        },
-        "hepatic_adjustment": {
-            "child_pugh_A": "No adjustment (prednisone is prodrug converted to prednisolone in liver)",
-            "child_pugh_B": "Consider using prednisolone directly (bypasses hepatic conversion)",
-            "child_pugh_C": "Use prednisolone directly; monitor closely",
-        },
-    },
-    "gabapentin": {
-        "standard_adult_dose": "300mg day 1, 300mg BID day 2, 300mg TID day 3; titrate to 900-3600mg/day divided TID",
-        "max_daily_dose": "3600mg/day",
-        "pediatric_dose": "10-15 mg/kg/day divided TID (ages 3-12); titrate over 3 days. Max ~50 mg/kg/day.",
-        "geriatric_adjustment": "Start 100mg at bedtime; titrate slowly. Increased sedation and fall risk.",
-        "renal_adjustment": {
-            "eGFR_30_60": "200-700mg BID",
-            "eGFR_15_30": "100-300mg daily",
-            "eGFR_below_15": "100-300mg daily. Supplemental dose after hemodialysis.",
-        },
-        "hepatic_adjustment": {
-            "child_pugh_A": "No adjustment (renally cleared)",
-            "child_pugh_B": "No adjustment",
-            "child_pugh_C": "No adjustment",
-        },
-    },
-    "ciprofloxacin": {
-        "standard_adult_dose": "250-750mg BID depending on infection type and severity",
-        "max_daily_dose": "1500mg/day",
-        "pediatric_dose": "10-20 mg/kg/dose BID (max 750mg/dose). Reserve for infections without safer alternatives.",
-        "geriatric_adjustment": "Adjust for renal function. Increased tendon rupture risk, especially with corticosteroids. Avoid if possible.",
-        "renal_adjustment": {
-            "eGFR_30_60": "250-500mg every 12 hours",
-            "eGFR_15_30": "250-500mg every 18 hours",
-            "eGFR_below_15": "250-500mg every 24 hours",
-        },
-        "hepatic_adjustment": {
-            "child_pugh_A": "No adjustment",
-            "child_pugh_B": "No adjustment",
-            "child_pugh_C": "Use with caution; monitor for toxicity",
-        },
-    },
-    "levothyroxine": {
-        "standard_adult_dose": "1.6 mcg/kg/day (full replacement). Start 25-50 mcg/day and titrate.",
-        "max_daily_dose": "200-300 mcg/day (rarely needed)",
-        "pediatric_dose": "Neonates: 10-15 mcg/kg/day. Children 1-5: 5-6 mcg/kg/day. Children 6-12: 4-5 mcg/kg/day. Adolescents: 2-3 mcg/kg/day.",
-        "geriatric_adjustment": "Start 12.5-25 mcg/day, increase by 12.5-25 mcg every 6-8 weeks. Cardiac patients: very slow titration.",
-        "renal_adjustment": {
-            "eGFR_30_60": "No adjustment",
-            "eGFR_15_30": "No adjustment",
-            "eGFR_below_15": "No adjustment",
-        },
-        "hepatic_adjustment": {
-            "child_pugh_A": "No adjustment",
-            "child_pugh_B": "No adjustment",
-            "child_pugh_C": "No adjustment",
-        },
-    },
-    "furosemide": {
-        "standard_adult_dose": "20-80mg once or twice daily. IV: 20-40mg bolus.",
-        "max_daily_dose": "600mg/day oral; higher IV doses in refractory edema",
-        "pediatric_dose": "1-2 mg/kg/dose every 6-12 hours. Max 6 mg/kg/dose.",
-        "geriatric_adjustment": "Start low (20mg); monitor electrolytes, BP, and volume status closely. Risk of dehydration and falls.",
-        "renal_adjustment": {
-            "eGFR_30_60": "Higher doses often needed (80-160mg BID) due to reduced secretion into tubule",
-            "eGFR_15_30": "May need 160-200mg BID; monitor response",
-            "eGFR_below_15": "IV dosing often required; high doses (up to 400mg) may be needed",
-        },
-        "hepatic_adjustment": {
-            "child_pugh_A": "No adjustment",
-            "child_pugh_B": "Use with potassium-sparing diuretic to prevent hepatic encephalopathy",
-            "child_pugh_C": "Cautious dosing; avoid hypokalemia (hepatic encephalopathy risk)",
-        },
-    },
-    "allopurinol": {
-        "standard_adult_dose": "100mg daily initially; titrate by 100mg every 2-4 weeks to target uric acid < 6 mg/dL",
-        "max_daily_dose": "800mg/day (most patients reach target at 300-600mg/day)",
-        "pediatric_dose": "< 6 years: 150mg/day; 6-10 years: 300mg/day",
-        "geriatric_adjustment": "Start 50-100mg daily; titrate slowly. Adjust for renal function.",
-        "renal_adjustment": {
-            "eGFR_30_60": "Start 50mg daily; titrate cautiously to target uric acid (max ~200mg/day historically, but treat-to-target now preferred)",
-            "eGFR_15_30": "Start 50mg daily; max 100-200mg/day",
-            "eGFR_below_15": "Start 50mg every other day; max 100mg/day",
-        },
-        "hepatic_adjustment": {
-            "child_pugh_A": "No adjustment",
-            "child_pugh_B": "Use with caution; monitor LFTs",
-            "child_pugh_C": "Use with caution; monitor LFTs",
-        },
-    },
-    "clopidogrel": {
-        "standard_adult_dose": "75mg daily. Loading dose: 300-600mg for ACS/PCI.",
-        "max_daily_dose": "75mg/day maintenance",
-        "pediatric_dose": "0.2 mg/kg/day (limited data; off-label)",
-        "geriatric_adjustment": "No specific adjustment; balance bleeding risk vs thrombotic benefit",
-        "renal_adjustment": {
-            "eGFR_30_60": "No adjustment",
-            "eGFR_15_30": "Limited data; use with caution",
-            "eGFR_below_15": "Limited data; use with caution",
-        },
-        "hepatic_adjustment": {
-            "child_pugh_A": "No adjustment",
-            "child_pugh_B": "Use with caution (prodrug requires hepatic activation via CYP2C19)",
-            "child_pugh_C": "Avoid (impaired activation and increased bleeding risk)",
-        },
-    },
-}
+DOSAGE_DATABASE = knowledge.table("dosage_database")
 
 # ---------------------------------------------------------------------------
 # Dangerous combination database
 # ---------------------------------------------------------------------------
 
-DANGEROUS_COMBINATIONS: list[dict] = [
-    {
-        "category": "Serotonin Syndrome",
-        "drugs": [
-            ["fluoxetine", "sertraline", "paroxetine", "citalopram", "escitalopram", "fluvoxamine"],
-            ["phenelzine", "tranylcypromine", "selegiline", "isocarboxazid", "linezolid", "methylene blue"],
-        ],
-        "severity": "critical",
-        "mechanism": "Combined serotonin reuptake inhibition and MAO inhibition causes dangerous serotonin excess",
-        "onset": "Hours to days",
-        "symptoms": "Hyperthermia (> 41C), muscle rigidity, clonus, myoclonus, altered mental status, autonomic instability, seizures",
-        "management": "Discontinue serotonergic agents immediately. Cyproheptadine 12mg then 4mg q2h. Benzodiazepines for agitation. Active cooling. ICU if severe.",
-    },
-    {
-        "category": "Serotonin Syndrome",
-        "drugs": [
-            ["tramadol", "meperidine", "fentanyl", "methadone"],
-            ["fluoxetine", "sertraline", "paroxetine", "venlafaxine", "duloxetine"],
-        ],
-        "severity": "high",
-        "mechanism": "Opioids with serotonergic properties combined with SSRIs/SNRIs increase serotonin syndrome risk",
-        "onset": "Hours to days",
-        "symptoms": "Clonus, agitation, diaphoresis, tachycardia, hyperthermia",
-        "management": "Use alternative opioid without serotonergic activity (morphine, oxycodone). Monitor for SS symptoms.",
-    },
-    {
-        "category": "QT Prolongation",
-        "drugs": [
-            ["amiodarone", "sotalol", "dofetilide", "dronedarone"],
-            ["azithromycin", "levofloxacin", "moxifloxacin", "haloperidol", "ondansetron", "methadone", "citalopram", "escitalopram"],
-        ],
-        "severity": "high",
-        "mechanism": "Additive blockade of cardiac hERG potassium channels prolongs ventricular repolarization",
-        "onset": "Hours to days (especially with loading doses or renal impairment)",
-        "symptoms": "Palpitations, syncope, torsades de pointes (polymorphic VT), sudden cardiac death",
-        "management": "ECG before and after starting combination. Maintain K > 4.0, Mg > 2.0. Avoid if baseline QTc > 470ms (women) or > 450ms (men). Use alternatives.",
-    },
-    {
-        "category": "QT Prolongation",
-        "drugs": [
-            ["domperidone"],
-            ["ketoconazole", "fluconazole", "erythromycin", "clarithromycin"],
-        ],
-        "severity": "high",
-        "mechanism": "CYP3A4 inhibitors increase domperidone levels + additive QT prolongation",
-        "onset": "Days",
-        "symptoms": "QTc prolongation, torsades de pointes",
-        "management": "Avoid combination. Use metoclopramide (lower QT risk) or alternative antiemetic.",
-    },
-    {
-        "category": "Bleeding Risk",
-        "drugs": [
-            ["warfarin", "rivaroxaban", "apixaban", "dabigatran", "edoxaban", "enoxaparin"],
-            ["aspirin", "clopidogrel", "prasugrel", "ticagrelor"],
-        ],
-        "severity": "high",
-        "mechanism": "Anticoagulant + antiplatelet: additive inhibition of hemostasis through different mechanisms",
-        "onset": "Immediate to days",
-        "symptoms": "GI bleeding, intracranial hemorrhage, hematuria, bleeding from minor injuries, anemia",
-        "management": "Triple therapy (OAC + dual antiplatelet) only when absolutely indicated (e.g., AF + recent PCI). Shorten duration. Add PPI. Use DOAC over warfarin. Monitor Hb.",
-    },
-    {
-        "category": "Bleeding Risk",
-        "drugs": [
-            ["warfarin", "rivaroxaban", "apixaban"],
-            ["ibuprofen", "naproxen", "diclofenac", "ketorolac", "meloxicam", "celecoxib"],
-        ],
-        "severity": "high",
-        "mechanism": "NSAIDs inhibit platelet function and cause GI mucosal damage, adding to anticoagulant bleeding risk",
-        "onset": "Days",
-        "symptoms": "GI bleeding (melena, hematemesis), easy bruising, prolonged bleeding from wounds",
-        "management": "Avoid combination. Use acetaminophen for pain. If NSAID essential, use lowest dose + PPI + shortest duration.",
-    },
-    {
-        "category": "Nephrotoxic Combination",
-        "drugs": [
-            ["lisinopril", "enalapril", "ramipril", "losartan", "valsartan"],
-            ["ibuprofen", "naproxen", "diclofenac", "ketorolac"],
-            ["furosemide", "hydrochlorothiazide", "chlorthalidone"],
-        ],
-        "severity": "high",
-        "mechanism": "'Triple whammy': ACEi/ARB + NSAID + diuretic synergistically reduce renal perfusion. ACEi/ARB reduce efferent tone, NSAID reduces afferent dilation, diuretic reduces volume.",
-        "onset": "Days to weeks",
-        "symptoms": "Rising creatinine, decreased urine output, hyperkalemia, AKI (especially if volume depleted or elderly)",
-        "management": "Avoid 'triple whammy'. If combination unavoidable, monitor creatinine and potassium within 1 week. Ensure adequate hydration. Educate patient to hold NSAID and diuretic during illness.",
-    },
-    {
-        "category": "Hepatotoxic Combination",
-        "drugs": [
-            ["methotrexate"],
-            ["leflunomide", "azathioprine", "isoniazid", "rifampin"],
-        ],
-        "severity": "high",
-        "mechanism": "Additive hepatotoxicity from multiple hepatotoxic agents",
-        "onset": "Weeks to months",
-        "symptoms": "Elevated transaminases, jaundice, hepatic fibrosis/cirrhosis, fatigue, RUQ pain",
-        "management": "Monitor LFTs monthly when combining hepatotoxic agents. Baseline LFTs before starting. Hold if ALT > 3x ULN with symptoms or > 5x ULN without symptoms.",
-    },
-    {
-        "category": "CNS Depression",
-        "drugs": [
-            ["oxycodone", "morphine", "hydrocodone", "fentanyl", "codeine", "tramadol"],
-            ["diazepam", "lorazepam", "alprazolam", "clonazepam", "temazepam", "zolpidem"],
-        ],
-        "severity": "critical",
-        "mechanism": "Synergistic CNS and respiratory depression through opioid receptor and GABA-A receptor agonism",
-        "onset": "Minutes to hours",
-        "symptoms": "Excessive sedation, respiratory depression (RR < 12), hypoxia, unresponsiveness, death",
-        "management": "FDA black box warning on combination. Avoid if possible. If essential, use lowest doses of both. Naloxone rescue available. Monitor respiratory rate and SpO2.",
-    },
-    {
-        "category": "CNS Depression",
-        "drugs": [
-            ["oxycodone", "morphine", "hydrocodone", "fentanyl"],
-            ["gabapentin", "pregabalin"],
-        ],
-        "severity": "high",
-        "mechanism": "Gabapentinoids potentiate opioid-induced respiratory depression",
-        "onset": "Hours",
-        "symptoms": "Excessive sedation, respiratory depression, especially in elderly or with renal impairment",
-        "management": "FDA warning (2019). Use lowest effective doses. Avoid in opioid-naive patients. Monitor for sedation. Naloxone available.",
-    },
-    {
-        "category": "Hypoglycemia Risk",
-        "drugs": [
-            ["glipizide", "glyburide", "glimepiride"],
-            ["fluconazole", "miconazole", "trimethoprim-sulfamethoxazole", "ciprofloxacin"],
-        ],
-        "severity": "high",
-        "mechanism": "CYP2C9 inhibition (fluconazole, TMP-SMX) increases sulfonylurea levels. Fluoroquinolones directly stimulate insulin release.",
-        "onset": "Hours to days",
-        "symptoms": "Hypoglycemia: tremor, diaphoresis, confusion, tachycardia, seizures, loss of consciousness",
-        "management": "Reduce sulfonylurea dose by 50% when adding interacting drug. Increase SMBG frequency. Educate patient on hypoglycemia recognition and treatment (15g glucose rule).",
-    },
-    {
-        "category": "Hypoglycemia Risk",
-        "drugs": [
-            ["insulin"],
-            ["fluoxetine", "aspirin", "trimethoprim-sulfamethoxazole"],
-        ],
-        "severity": "moderate",
-        "mechanism": "These drugs may lower blood glucose through various mechanisms, potentiating insulin effect",
-        "onset": "Days",
-        "symptoms": "Hypoglycemia",
-        "management": "Increase glucose monitoring frequency. Educate patient. May need insulin dose reduction.",
-    },
-    {
-        "category": "Hyperkalemia Risk",
-        "drugs": [
-            ["lisinopril", "enalapril", "ramipril", "losartan", "valsartan"],
-            ["spironolactone", "eplerenone", "amiloride", "triamterene"],
-        ],
-        "severity": "high",
-        "mechanism": "ACEi/ARB reduce aldosterone-mediated K excretion; K-sparing diuretics directly reduce K excretion. Additive K retention.",
-        "onset": "Days to weeks",
-        "symptoms": "Peaked T waves, widened QRS, sine wave pattern on ECG; muscle weakness, paresthesias, cardiac arrest at K > 6.5",
-        "management": "Monitor K within 1 week of starting combination, then regularly. Low-K diet. Avoid in eGFR < 30. Hold both if K > 5.5. Avoid potassium supplements.",
-    },
-    {
-        "category": "Hyperkalemia Risk",
-        "drugs": [
-            ["lisinopril", "enalapril", "ramipril", "losartan", "valsartan"],
-            ["potassium chloride", "potassium supplements"],
-        ],
-        "severity": "high",
-        "mechanism": "Exogenous potassium combined with reduced renal K excretion from RAASi",
-        "onset": "Days",
-        "symptoms": "Cardiac conduction abnormalities, muscle weakness, cardiac arrest",
-        "management": "Avoid routine K supplementation with ACEi/ARB. Only supplement if documented hypokalemia. Monitor K level.",
-    },
-    {
-        "category": "Rhabdomyolysis Risk",
-        "drugs": [
-            ["simvastatin", "lovastatin"],
-            ["clarithromycin", "erythromycin", "itraconazole", "ketoconazole", "ritonavir", "cyclosporine", "gemfibrozil"],
-        ],
-        "severity": "critical",
-        "mechanism": "CYP3A4 inhibition (or gemfibrozil OATP1B1 inhibition) causes massive statin accumulation",
-        "onset": "Days to weeks",
-        "symptoms": "Muscle pain/weakness, dark urine (myoglobinuria), markedly elevated CK (> 10x ULN), AKI, DIC, death",
-        "management": "Contraindicated combinations. Switch to rosuvastatin or pravastatin (not CYP3A4 substrates). If gemfibrozil needed, use fenofibrate instead.",
-    },
-]
+DANGEROUS_COMBINATIONS = knowledge.list("dangerous_combinations")
+
+# ---------------------------------------------------------------------------
+# Rule helpers
+#
+# Shared by the agent tools below and the LLM-free bulk checker
+# (agents.med_safety), which caches the per-drug parts across a regimen.
+# ---------------------------------------------------------------------------
+
+NSAIDS = ("ibuprofen", "naproxen", "diclofenac", "ketorolac", "indomethacin")
+PENICILLINS = ("amoxicillin", "ampicillin", "penicillin", "piperacillin", "nafcillin", "oxacillin", "dicloxacillin")
+CEPHALOSPORINS = ("cephalexin", "cefazolin", "ceftriaxone", "cefuroxime", "cefdinir", "cefepime", "cefpodoxime")
+CARBAPENEMS = ("meropenem", "imipenem", "ertapenem", "doripenem")
+SULFA_ANTIBIOTICS = ("sulfamethoxazole", "sulfasalazine", "trimethoprim-sulfamethoxazole", "sulfadiazine")
+SULFA_NON_ANTIBIOTICS = ("furosemide", "hydrochlorothiazide", "celecoxib", "sumatriptan", "sulfonylurea")
+
+# (drug names, Beers Criteria flag) checked for patients >= 65
+BEERS_RULES = (
+    (("diazepam", "alprazolam", "lorazepam", "clonazepam", "temazepam"),
+     "Benzodiazepine in elderly: Beers Criteria — increased fall risk, cognitive impairment, delirium"),
+    (("diphenhydramine", "chlorpheniramine", "hydroxyzine"),
+     "First-generation antihistamine in elderly: Beers Criteria — anticholinergic effects, cognitive impairment"),
+    (NSAIDS,
+     "NSAID in elderly: Beers Criteria — GI bleeding, AKI, cardiovascular risk. Avoid chronic use."),
+    (("meperidine",),
+     "Meperidine in elderly: Beers Criteria — neurotoxic metabolite (normeperidine) causes seizures"),
+)
+
+# (drug class, allergy class, finding) in report order
+CROSS_REACTIVITY_RULES = (
+    ("penicillin", "cephalosporin", {
+        "risk": "moderate",
+        "probability": "1-2%",
+        "issue": "Penicillin-cephalosporin cross-reactivity. Higher risk with 1st generation cephalosporins sharing R1 side chain.",
+        "recommendation": "Skin testing if available. Graded challenge if low-risk reaction history. Avoid if prior anaphylaxis.",
+    }),
+    ("penicillin", "penicillin_class", {
+        "risk": "high",
+        "probability": "Direct allergy",
+        "issue": "Patient has documented penicillin-class allergy. True IgE-mediated allergy present in ~5% of labeled patients.",
+        "recommendation": "Consider penicillin allergy testing (90% of labeled patients can tolerate). Alternatives: azithromycin, fluoroquinolone, doxycycline depending on indication.",
+    }),
+    ("cephalosporin", "penicillin_class", {
+        "risk": "moderate",
+        "probability": "1-2%",
+        "issue": "Cephalosporin-penicillin cross-reactivity. Risk primarily with similar R1 side chains.",
+        "recommendation": "1st gen cephalosporins: higher risk. 3rd/4th gen: lower risk. Consider skin testing or graded challenge. Avoid if prior anaphylaxis to penicillin.",
+    }),
+    ("carbapenem", "penicillin", {
+        "risk": "low",
+        "probability": "< 1%",
+        "issue": "Carbapenem-penicillin cross-reactivity is rare (~0.5-1%) despite historical concern. Meropenem has lowest risk.",
+        "recommendation": "Generally safe in penicillin allergy unless prior carbapenem reaction. Consider graded challenge if prior severe reaction.",
+    }),
+    ("sulfa_antibiotic", "sulfa", {
+        "risk": "high",
+        "probability": "Direct class allergy",
+        "issue": "Patient has documented sulfa allergy. Sulfonamide antibiotics share arylamine structure.",
+        "recommendation": "Avoid sulfonamide antibiotics. Non-antibiotic sulfonamides (furosemide, thiazides, celecoxib) have different structure and very low cross-reactivity (< 2%).",
+    }),
+    ("sulfa_non_antibiotic", "sulfa", {
+        "risk": "low",
+        "probability": "< 2%",
+        "issue": "Non-antibiotic sulfonamide in patient with sulfa allergy. Cross-reactivity with sulfonamide antibiotics is very low.",
+        "recommendation": "Generally safe to use. True cross-reactivity between antibiotic and non-antibiotic sulfonamides is minimal.",
+    }),
+    ("nsaid", "aspirin_nsaid", {
+        "risk": "high",
+        "probability": "Cross-intolerance in ~50% of aspirin-intolerant patients",
+        "issue": "NSAIDs share COX-1 inhibition mechanism with aspirin. High cross-reactivity in aspirin-exacerbated respiratory disease.",
+        "recommendation": "Avoid NSAIDs in aspirin allergy. Consider acetaminophen (safe in most) or COX-2 selective inhibitor (celecoxib) with supervised challenge.",
+    }),
+)
+
+
+def contraindication_rules(treatment_lower: str) -> list[dict]:
+    """Database entries for every contraindication drug the name matches."""
+    rules = []
+    for drug_key in CONTRAINDICATIONS:
+        if drug_key in treatment_lower or treatment_lower in drug_key:
+            rules.extend(CONTRAINDICATIONS[drug_key])
+    return rules
+
+
+def beers_flags(treatment_lower: str) -> list[str]:
+    return [flag for names, flag in BEERS_RULES if any(n in treatment_lower for n in names)]
+
+
+def trigger_matched(trigger: str, age: int, conditions_lower: list[str], meds_lower: list[str]) -> bool:
+    """Whether a contraindication trigger applies (condition, age group or co-medication)."""
+    if any(trigger in cond or cond in trigger for cond in conditions_lower):
+        return True
+    if (trigger == "child" and age < 16) or (trigger == "elderly" and age >= 65):
+        return True
+    return any(trigger in med for med in meds_lower)
+
+
+def contraindication_findings(
+    rules: list[dict], beers: list[str], age: int, gender: str, triggered: set[str] | frozenset[str],
+) -> list[dict]:
+    """Findings for one treatment given the set of triggers that apply to the patient."""
+    found = []
+    for contra in rules:
+        trigger = contra["condition"]
+        if trigger == "pregnancy" and gender.lower() == "female" and 12 <= age <= 50:
+            # Flag as warning for women of childbearing age
+            found.append({
+                "type": "relative",
+                "severity": "high",
+                "issue": f"Patient is female of childbearing age: {contra['detail']}",
+                "alternative": contra["alternative"],
+                "note": "Verify pregnancy status before prescribing.",
+            })
+        if trigger in triggered:
+            found.append({
+                "type": contra["type"],
+                "severity": contra["severity"],
+                "issue": contra["detail"],
+                "alternative": contra["alternative"],
+            })
+    if age >= 65:
+        for flag in beers:
+            found.append({
+                "type": "relative",
+                "severity": "high",
+                "issue": flag,
+                "alternative": "See Beers Criteria alternatives",
+            })
+    return found
+
+
+def drug_allergy_classes(med_lower: str) -> frozenset[str]:
+    """Cross-reactivity classes a medication belongs to."""
+    classes = set()
+    for cls, names in (
+        ("penicillin", PENICILLINS),
+        ("cephalosporin", CEPHALOSPORINS),
+        ("carbapenem", CARBAPENEMS),
+        ("sulfa_antibiotic", SULFA_ANTIBIOTICS),
+        ("sulfa_non_antibiotic", SULFA_NON_ANTIBIOTICS),
+        ("nsaid", NSAIDS),
+    ):
+        if any(n in med_lower for n in names):
+            classes.add(cls)
+    return frozenset(classes)
+
+
+def allergy_classes(allergies: list[str]) -> frozenset[str]:
+    """Allergy classes documented in a patient's allergy list."""
+    lowered = [a.lower() for a in allergies]
+    classes = set()
+    if any("cephalosporin" in a or any(c in a for c in CEPHALOSPORINS) for a in lowered):
+        classes.add("cephalosporin")
+    if any("penicillin" in a or any(p in a for p in PENICILLINS) for a in lowered):
+        classes.add("penicillin_class")
+    if any("penicillin" in a for a in lowered):
+        classes.add("penicillin")
+    if any("sulfa" in a for a in lowered):
+        classes.add("sulfa")
+    if any("aspirin" in a or "nsaid" in a for a in lowered):
+        classes.add("aspirin_nsaid")
+    return frozenset(classes)
+
+
+def cross_reactivity(drug_classes: frozenset[str], patient_allergies: frozenset[str]) -> list[dict]:
+    return [
+        dict(finding) for drug_cls, allergy_cls, finding in CROSS_REACTIVITY_RULES
+        if drug_cls in drug_classes and allergy_cls in patient_allergies
+    ]
+
+
+def combination_memberships(med_lower: str, combos=DANGEROUS_COMBINATIONS) -> tuple[frozenset[int], ...]:
+    """For each dangerous combination, the indexes of its drug groups the medication falls in."""
+    return tuple(
+        frozenset(i for i, group in enumerate(combo["drugs"]) if any(d in med_lower or med_lower in d for d in group))
+        for combo in combos
+    )
+
+
+def flag_combinations(
+    meds_lower: list[str], memberships: list[tuple[frozenset[int], ...]], combos=DANGEROUS_COMBINATIONS,
+) -> list[dict]:
+    """Dangerous two- and three-drug combinations present in a medication list."""
+    flagged = []
+    for index, combo in enumerate(combos):
+        n_groups = len(combo["drugs"])
+        if n_groups not in (2, 3):
+            continue
+        matched_groups = [
+            [m for m, member in zip(meds_lower, memberships) if group in member[index]]
+            for group in range(n_groups)
+        ]
+        if all(matched_groups):
+            flagged.append({
+                "category": combo["category"],
+                "severity": combo["severity"],
+                "drugs_involved": list(set(m for matches in matched_groups for m in matches)),
+                "mechanism": combo["mechanism"],
+                "onset": combo["onset"],
+                "symptoms_to_watch": combo["symptoms"],
+                "management": combo["management"],
+            })
+    return flagged
 
 
 class SafetyAgent(BaseAgent):
@@ -935,73 +477,18 @@ Always respond with structured JSON in your final answer:
 
         treatment_lower = treatment.lower().strip()
         conditions_lower = [c.lower() for c in conditions]
-
-        found_contraindications = []
+        meds_lower = [m.lower() for m in current_meds]
 
         # Look up in contraindication database
-        for drug_key, contra_list in CONTRAINDICATIONS.items():
-            if drug_key in treatment_lower or treatment_lower in drug_key:
-                for contra in contra_list:
-                    # Check if patient has the contraindicated condition
-                    trigger = contra["condition"]
-
-                    matched = False
-
-                    # Check conditions
-                    for cond in conditions_lower:
-                        if trigger in cond or cond in trigger:
-                            matched = True
-                            break
-
-                    # Check age-based triggers
-                    if trigger == "child" and age < 16:
-                        matched = True
-                    if trigger == "elderly" and age >= 65:
-                        matched = True
-
-                    # Check pregnancy context
-                    if trigger == "pregnancy" and gender.lower() == "female" and 12 <= age <= 50:
-                        # Flag as warning for women of childbearing age
-                        found_contraindications.append({
-                            "type": "relative",
-                            "severity": "high",
-                            "issue": f"Patient is female of childbearing age: {contra['detail']}",
-                            "alternative": contra["alternative"],
-                            "note": "Verify pregnancy status before prescribing.",
-                        })
-
-                    # Check medication-based triggers (e.g., MAOI, anticoagulant)
-                    for med in current_meds:
-                        if trigger in med.lower():
-                            matched = True
-                            break
-
-                    if matched:
-                        found_contraindications.append({
-                            "type": contra["type"],
-                            "severity": contra["severity"],
-                            "issue": contra["detail"],
-                            "alternative": contra["alternative"],
-                        })
-
-        # Additional age-based checks
-        if age >= 65:
-            beers_flags = []
-            if any(benzo in treatment_lower for benzo in ["diazepam", "alprazolam", "lorazepam", "clonazepam", "temazepam"]):
-                beers_flags.append("Benzodiazepine in elderly: Beers Criteria — increased fall risk, cognitive impairment, delirium")
-            if any(ah in treatment_lower for ah in ["diphenhydramine", "chlorpheniramine", "hydroxyzine"]):
-                beers_flags.append("First-generation antihistamine in elderly: Beers Criteria — anticholinergic effects, cognitive impairment")
-            if any(nsaid in treatment_lower for nsaid in ["ibuprofen", "naproxen", "diclofenac", "ketorolac", "indomethacin"]):
-                beers_flags.append("NSAID in elderly: Beers Criteria — GI bleeding, AKI, cardiovascular risk. Avoid chronic use.")
-            if "meperidine" in treatment_lower:
-                beers_flags.append("Meperidine in elderly: Beers Criteria — neurotoxic metabolite (normeperidine) causes seizures")
-            for flag in beers_flags:
-                found_contraindications.append({
-                    "type": "relative",
-                    "severity": "high",
-                    "issue": flag,
-                    "alternative": "See Beers Criteria alternatives",
-                })
+        rules = contraindication_rules(treatment_lower)
+        triggered = {
+            contra["condition"] for contra in rules
+            if trigger_matched(contra["condition"], age, conditions_lower, meds_lower)
+        }
+        # Additional age-based checks (Beers Criteria) apply from 65
+        found_contraindications = contraindication_findings(
+            rules, beers_flags(treatment_lower), age, gender, triggered,
+        )
 
         return json.dumps({
             "treatment": treatment,
@@ -1031,9 +518,9 @@ Always respond with structured JSON in your final answer:
         # Look up in dosage database
         dosage_info = None
         matched_key = None
-        for key, info in DOSAGE_DATABASE.items():
+        for key in DOSAGE_DATABASE:
             if key in med_lower or med_lower in key:
-                dosage_info = info
+                dosage_info = DOSAGE_DATABASE[key]
                 matched_key = key
                 break
 
@@ -1146,84 +633,15 @@ Always respond with structured JSON in your final answer:
         allergies = tool_input.get("known_allergies", [])
         reaction_history = tool_input.get("reaction_history", "")
 
-        cross_reactivity = []
-        med_lower = medication.lower()
-
-        # Penicillin cross-reactivity
-        penicillins = ["amoxicillin", "ampicillin", "penicillin", "piperacillin", "nafcillin", "oxacillin", "dicloxacillin"]
-        cephalosporins = ["cephalexin", "cefazolin", "ceftriaxone", "cefuroxime", "cefdinir", "cefepime", "cefpodoxime"]
-        carbapenems = ["meropenem", "imipenem", "ertapenem", "doripenem"]
-
-        if any(p in med_lower for p in penicillins):
-            if any("cephalosporin" in a.lower() or any(c in a.lower() for c in cephalosporins) for a in allergies):
-                cross_reactivity.append({
-                    "risk": "moderate",
-                    "probability": "1-2%",
-                    "issue": "Penicillin-cephalosporin cross-reactivity. Higher risk with 1st generation cephalosporins sharing R1 side chain.",
-                    "recommendation": "Skin testing if available. Graded challenge if low-risk reaction history. Avoid if prior anaphylaxis.",
-                })
-            if any("penicillin" in a.lower() or any(p2 in a.lower() for p2 in penicillins) for a in allergies):
-                cross_reactivity.append({
-                    "risk": "high",
-                    "probability": "Direct allergy",
-                    "issue": "Patient has documented penicillin-class allergy. True IgE-mediated allergy present in ~5% of labeled patients.",
-                    "recommendation": "Consider penicillin allergy testing (90% of labeled patients can tolerate). Alternatives: azithromycin, fluoroquinolone, doxycycline depending on indication.",
-                })
-
-        if any(c in med_lower for c in cephalosporins):
-            if any("penicillin" in a.lower() or any(p in a.lower() for p in penicillins) for a in allergies):
-                cross_reactivity.append({
-                    "risk": "moderate",
-                    "probability": "1-2%",
-                    "issue": "Cephalosporin-penicillin cross-reactivity. Risk primarily with similar R1 side chains.",
-                    "recommendation": "1st gen cephalosporins: higher risk. 3rd/4th gen: lower risk. Consider skin testing or graded challenge. Avoid if prior anaphylaxis to penicillin.",
-                })
-
-        if any(c in med_lower for c in carbapenems):
-            if any("penicillin" in a.lower() for a in allergies):
-                cross_reactivity.append({
-                    "risk": "low",
-                    "probability": "< 1%",
-                    "issue": "Carbapenem-penicillin cross-reactivity is rare (~0.5-1%) despite historical concern. Meropenem has lowest risk.",
-                    "recommendation": "Generally safe in penicillin allergy unless prior carbapenem reaction. Consider graded challenge if prior severe reaction.",
-                })
-
-        # Sulfa cross-reactivity
-        sulfa_abx = ["sulfamethoxazole", "sulfasalazine", "trimethoprim-sulfamethoxazole", "sulfadiazine"]
-        sulfa_non_abx = ["furosemide", "hydrochlorothiazide", "celecoxib", "sumatriptan", "sulfonylurea"]
-        if any(s in med_lower for s in sulfa_abx):
-            if any("sulfa" in a.lower() for a in allergies):
-                cross_reactivity.append({
-                    "risk": "high",
-                    "probability": "Direct class allergy",
-                    "issue": "Patient has documented sulfa allergy. Sulfonamide antibiotics share arylamine structure.",
-                    "recommendation": "Avoid sulfonamide antibiotics. Non-antibiotic sulfonamides (furosemide, thiazides, celecoxib) have different structure and very low cross-reactivity (< 2%).",
-                })
-        if any(s in med_lower for s in sulfa_non_abx):
-            if any("sulfa" in a.lower() for a in allergies):
-                cross_reactivity.append({
-                    "risk": "low",
-                    "probability": "< 2%",
-                    "issue": "Non-antibiotic sulfonamide in patient with sulfa allergy. Cross-reactivity with sulfonamide antibiotics is very low.",
-                    "recommendation": "Generally safe to use. True cross-reactivity between antibiotic and non-antibiotic sulfonamides is minimal.",
-                })
-
-        # NSAID cross-reactivity
-        if any(nsaid in med_lower for nsaid in ["ibuprofen", "naproxen", "diclofenac", "ketorolac", "indomethacin"]):
-            if any("aspirin" in a.lower() or "nsaid" in a.lower() for a in allergies):
-                cross_reactivity.append({
-                    "risk": "high",
-                    "probability": "Cross-intolerance in ~50% of aspirin-intolerant patients",
-                    "issue": "NSAIDs share COX-1 inhibition mechanism with aspirin. High cross-reactivity in aspirin-exacerbated respiratory disease.",
-                    "recommendation": "Avoid NSAIDs in aspirin allergy. Consider acetaminophen (safe in most) or COX-2 selective inhibitor (celecoxib) with supervised challenge.",
-                })
+        # Penicillin/cephalosporin/carbapenem, sulfonamide and NSAID cross-reactivity
+        risks = cross_reactivity(drug_allergy_classes(medication.lower()), allergy_classes(allergies))
 
         return json.dumps({
             "medication": medication,
             "known_allergies": allergies,
             "reaction_history": reaction_history,
-            "cross_reactivity_risks": cross_reactivity,
-            "count": len(cross_reactivity),
+            "cross_reactivity_risks": risks,
+            "count": len(risks),
             "note": (
                 "Use clinical knowledge to identify any additional allergy or "
                 "cross-reactivity risks. Consider the severity of prior reactions "
@@ -1237,46 +655,7 @@ Always respond with structured JSON in your final answer:
         conditions = tool_input.get("conditions", [])
 
         med_lower = [m.lower().strip() for m in medications]
-        flagged = []
-
-        for combo in DANGEROUS_COMBINATIONS:
-            drug_groups = combo["drugs"]
-
-            if len(drug_groups) == 2:
-                group_a, group_b = drug_groups
-                matched_a = [m for m in med_lower if any(d in m or m in d for d in group_a)]
-                matched_b = [m for m in med_lower if any(d in m or m in d for d in group_b)]
-
-                if matched_a and matched_b:
-                    flagged.append({
-                        "category": combo["category"],
-                        "severity": combo["severity"],
-                        "drugs_involved": list(set(matched_a + matched_b)),
-                        "mechanism": combo["mechanism"],
-                        "onset": combo["onset"],
-                        "symptoms_to_watch": combo["symptoms"],
-                        "management": combo["management"],
-                    })
-            elif len(drug_groups) == 3:
-                # Triple combination (e.g., triple whammy)
-                matched_groups = []
-                for group in drug_groups:
-                    matches = [m for m in med_lower if any(d in m or m in d for d in group)]
-                    matched_groups.append(matches)
-
-                if all(matched_groups):
-                    all_matched = []
-                    for mg in matched_groups:
-                        all_matched.extend(mg)
-                    flagged.append({
-                        "category": combo["category"],
-                        "severity": combo["severity"],
-                        "drugs_involved": list(set(all_matched)),
-                        "mechanism": combo["mechanism"],
-                        "onset": combo["onset"],
-                        "symptoms_to_watch": combo["symptoms"],
-                        "management": combo["management"],
-                    })
+        flagged = flag_combinations(med_lower, [combination_memberships(m) for m in med_lower])
 
         return json.dumps({
             "medications_reviewed": medications,
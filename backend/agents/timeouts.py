@@ -0,0 +1,222 @@
+"""
+Adaptive agent timeouts and the end-to-end pipeline deadline.
+
+Replaces the fixed 45s (90s for Ollama) timeout on every agent run:
+
+  * Latency of every agent run is recorded per (agent, model); once a
+    window has enough samples, the timeout becomes a high quantile of it
+    times a headroom factor (clamped to AGENT_TIMEOUT_MIN/MAX_SECONDS).
+    Until then the fixed default applies.
+  * Each pipeline run sets a deadline of PIPELINE_SLO_SECONDS.  It flows to
+    agents through a context variable (so the parallel Diagnostician and
+    Research tasks see it too), and each agent's timeout is capped at the
+    time left minus what the remaining stages are expected to need — when
+    early agents overrun, later ones get shorter timeouts instead of the
+    whole request blowing through the SLO.
+
+Timed-out runs are recorded at (at least) their timeout value, so a model
+that keeps hitting its limit pushes its own quantile (and timeout) up.
+"""
+
+from __future__ import annotations
+
+import functools
+import logging
+import math
+import os
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SLO_SECONDS = 180.0
+DEFAULT_QUANTILE = 0.95
+DEFAULT_HEADROOM = 1.5
+DEFAULT_MIN_TIMEOUT = 10.0
+DEFAULT_MAX_TIMEOUT = 180.0
+MIN_SAMPLES = 20
+WINDOW_SIZE = 200
+
+# Pipeline stages in execution order; agents within a stage run in parallel
+PIPELINE_STAGES = (
+    ("triage",),
+    ("diagnostician", "research"),
+    ("specialist",),
+    ("treatment",),
+    ("safety",),
+    ("empathy",),
+)
+_STAGE_INDEX = {agent: i for i, stage in enumerate(PIPELINE_STAGES) for agent in stage}
+
+# Absolute time.monotonic() deadline of the current pipeline run
+_deadline: ContextVar[float | None] = ContextVar("pipeline_deadline", default=None)
+
+
+class LatencyWindow:
+    """Sliding window of recent latencies with quantile lookup."""
+
+    __slots__ = ("samples",)
+
+    def __init__(self, size: int = WINDOW_SIZE):
+        self.samples: deque[float] = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def quantile(self, q: float) -> float:
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+class TimeoutManager:
+    """Derives agent timeouts from observed latency and the pipeline deadline."""
+
+    def __init__(
+        self,
+        slo: float = DEFAULT_SLO_SECONDS,
+        quantile: float = DEFAULT_QUANTILE,
+        headroom: float = DEFAULT_HEADROOM,
+        min_timeout: float = DEFAULT_MIN_TIMEOUT,
+        max_timeout: float = DEFAULT_MAX_TIMEOUT,
+        min_samples: int = MIN_SAMPLES,
+    ):
+        self.slo = slo
+        self.quantile = min(max(quantile, 0.5), 1.0)
+        self.headroom = max(headroom, 1.0)
+        self.min_timeout = min_timeout
+        self.max_timeout = max(max_timeout, min_timeout)
+        self.min_samples = max(1, min_samples)
+        self._by_model: dict[tuple[str, str], LatencyWindow] = {}
+        self._by_agent: dict[str, LatencyWindow] = {}
+
+    @classmethod
+    def from_env(cls) -> "TimeoutManager":
+        """Build from PIPELINE_SLO_SECONDS / AGENT_TIMEOUT_QUANTILE / AGENT_TIMEOUT_HEADROOM / AGENT_TIMEOUT_MIN_SECONDS / AGENT_TIMEOUT_MAX_SECONDS."""
+        try:
+            return cls(
+                slo=float(os.getenv("PIPELINE_SLO_SECONDS", DEFAULT_SLO_SECONDS)),
+                quantile=float(os.getenv("AGENT_TIMEOUT_QUANTILE", DEFAULT_QUANTILE)),
+                headroom=float(os.getenv("AGENT_TIMEOUT_HEADROOM", DEFAULT_HEADROOM)),
+                min_timeout=float(os.getenv("AGENT_TIMEOUT_MIN_SECONDS", DEFAULT_MIN_TIMEOUT)),
+                max_timeout=float(os.getenv("AGENT_TIMEOUT_MAX_SECONDS", DEFAULT_MAX_TIMEOUT)),
+            )
+        except ValueError as e:
+            logger.warning("Ignoring invalid timeout settings: %s", e)
+            return cls()
+
+    # ------------------------------------------------------------------
+    # Latency observations
+    # ------------------------------------------------------------------
+
+    def observe(self, agent: str, model: str, seconds: float) -> None:
+        window = self._by_model.get((agent, model))
+        if window is None:
+            window = self._by_model[(agent, model)] = LatencyWindow()
+        window.add(seconds)
+        agent_window = self._by_agent.get(agent)
+        if agent_window is None:
+            agent_window = self._by_agent[agent] = LatencyWindow()
+        agent_window.add(seconds)
+
+    def observe_timeout(self, agent: str, model: str, timeout: float) -> None:
+        """Record a run that hit *timeout* (its true latency is at least that)."""
+        window = self._by_model.get((agent, model))
+        if window is not None and len(window):
+            # Deadline-capped timeouts are short; don't let them drag the quantile down
+            timeout = max(timeout, window.quantile(self.quantile))
+        self.observe(agent, model, timeout)
+
+    def _expected(self, agent: str) -> float:
+        """Typical (median) run time of *agent* on any model."""
+        window = self._by_agent.get(agent)
+        if window is None or len(window) < self.min_samples:
+            return self.min_timeout
+        return window.quantile(0.5)
+
+    def _downstream(self, agent: str) -> float:
+        """Expected time still needed by the stages after *agent*'s."""
+        stage = _STAGE_INDEX.get(agent)
+        if stage is None:
+            return 0.0
+        return sum(max(self._expected(a) for a in later) for later in PIPELINE_STAGES[stage + 1:])
+
+    # ------------------------------------------------------------------
+    # Timeouts
+    # ------------------------------------------------------------------
+
+    def _adaptive(self, window: LatencyWindow) -> float:
+        return min(max(window.quantile(self.quantile) * self.headroom, self.min_timeout), self.max_timeout)
+
+    def timeout_for(self, agent: str, model: str, default: float) -> float:
+        """Timeout for one run of *agent* on *model* (falls back to *default* until warmed up)."""
+        window = self._by_model.get((agent, model))
+        if window is not None and len(window) >= self.min_samples:
+            timeout = self._adaptive(window)
+        else:
+            timeout = default
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        budget = remaining - self._downstream(agent)
+        if budget < self.min_timeout:
+            # Behind schedule: give the agent a minimal slot rather than none,
+            # but never past the deadline itself
+            budget = max(min(self.min_timeout, remaining), 1.0)
+        if budget < timeout:
+            logger.info("[%s] timeout %.0fs capped to %.0fs by pipeline deadline (%.0fs left)",
+                        agent, timeout, budget, remaining)
+        return min(timeout, budget)
+
+    # ------------------------------------------------------------------
+    # Pipeline deadline
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def remaining() -> float | None:
+        deadline = _deadline.get()
+        return None if deadline is None else deadline - time.monotonic()
+
+    @contextmanager
+    def deadline(self, seconds: float | None = None):
+        """Run the enclosed pipeline against an SLO deadline (the tighter one wins when nested)."""
+        seconds = self.slo if seconds is None else seconds
+        if seconds <= 0:
+            yield
+            return
+        expires = time.monotonic() + seconds
+        outer = _deadline.get()
+        token = _deadline.set(expires if outer is None else min(outer, expires))
+        try:
+            yield
+        finally:
+            _deadline.reset(token)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "slo_seconds": self.slo,
+            "quantile": self.quantile,
+            "headroom": self.headroom,
+            "timeouts": {
+                f"{agent}/{model}": round(self._adaptive(w), 1)
+                for (agent, model), w in self._by_model.items()
+                if len(w) >= self.min_samples
+            },
+        }
+
+
+timeouts = TimeoutManager.from_env()
+
+
+def within_slo(fn: Callable) -> Callable:
+    """Decorator: run an async pipeline method under the pipeline deadline."""
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with timeouts.deadline():
+            return await fn(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,215 @@
+"""
+Local token counting and context-budget helpers for the agent loop.
+
+No vendor round-trip is needed to size a prompt:
+  * OpenAI models are counted exactly with ``tiktoken`` when it is installed
+  * Other vendors reuse the tiktoken count scaled by a per-vendor calibration
+    factor, or fall back to a characters-per-token heuristic
+  * Images are charged a flat per-image cost
+
+BaseAgent uses these to keep each LLM request under the agent's input budget
+by compacting older ``tool_result`` messages before sending.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from functools import lru_cache
+from typing import Any
+
+from .llm_client import get_vendor
+
+logger = logging.getLogger(__name__)
+
+# Characters per token when no tokenizer is available (English + JSON mix)
+CHARS_PER_TOKEN: dict[str, float] = {
+    "anthropic": 3.5,
+    "openai": 4.0,
+    "google": 4.0,
+    "ollama": 3.7,
+}
+
+# Scale applied to an o200k tiktoken count to approximate other vendors' tokenizers
+TIKTOKEN_SCALE: dict[str, float] = {
+    "anthropic": 1.15,
+    "openai": 1.0,
+    "google": 1.0,
+    "ollama": 1.1,
+}
+
+# Approximate input cost of one attached image (Claude: ~1.6k tokens at 1092px)
+IMAGE_TOKENS = 1600
+
+# Fixed overhead per message for role/formatting tokens
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Hard ceiling on per-request input regardless of agent budget (local models
+# run with a small context window and slow prefill)
+VENDOR_INPUT_CEILING: dict[str, int] = {
+    "ollama": 6000,
+}
+
+# System prompt allowance for local models (the rest of the window is messages)
+OLLAMA_SYSTEM_TOKENS = 500
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the tiktoken encoding once; ``None`` if tiktoken is not installed."""
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:  # encoding download can fail in air-gapped setups
+        logger.debug("tiktoken encoding unavailable: %s", e)
+        return None
+
+
+def count_tokens(text: str, model: str = "claude-sonnet-4-6") -> int:
+    """Estimate the number of tokens *text* costs for *model*."""
+    if not text:
+        return 0
+    vendor = get_vendor(model)
+    enc = _get_encoding()
+    if enc is not None:
+        return int(len(enc.encode(text, disallowed_special=())) * TIKTOKEN_SCALE.get(vendor, 1.0)) + 1
+    return int(len(text) / CHARS_PER_TOKEN.get(vendor, 4.0)) + 1
+
+
+def _block_text(block: Any) -> tuple[str, int]:
+    """Return (text, image_count) for a single content block (dict or SDK object)."""
+    if isinstance(block, dict):
+        btype = block.get("type")
+        if btype == "text":
+            return block.get("text", ""), 0
+        if btype == "image":
+            return "", 1
+        if btype == "tool_result":
+            content = block.get("content", "")
+            return content if isinstance(content, str) else json.dumps(content, default=str), 0
+        if btype == "tool_use":
+            return json.dumps(block.get("input", {}), default=str) + block.get("name", ""), 0
+        return json.dumps(block, default=str), 0
+    btype = getattr(block, "type", None)
+    if btype == "text":
+        return getattr(block, "text", ""), 0
+    if btype == "tool_use":
+        return json.dumps(getattr(block, "input", {}), default=str) + getattr(block, "name", ""), 0
+    return str(block), 0
+
+
+def count_message_tokens(messages: list[dict], model: str) -> int:
+    """Estimate tokens for an Anthropic-style message list."""
+    total = 0
+    for msg in messages:
+        total += MESSAGE_OVERHEAD_TOKENS
+        content = msg.get("content", "")
+        if isinstance(content, str):
+            total += count_tokens(content, model)
+            continue
+        texts = []
+        for block in content:
+            text, images = _block_text(block)
+            texts.append(text)
+            total += images * IMAGE_TOKENS
+        total += count_tokens("\n".join(texts), model)
+    return total
+
+
+def count_request_tokens(
+    system: str,
+    messages: list[dict],
+    tools: list[dict] | None,
+    model: str,
+) -> int:
+    """Estimate total input tokens for one LLM request (system + tools + messages)."""
+    total = count_tokens(system, model)
+    if tools:
+        total += count_tokens(json.dumps(tools, separators=(",", ":")), model)
+    return total + count_message_tokens(messages, model)
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str, marker: str = "") -> str:
+    """Cut *text* so it fits in roughly *max_tokens*, appending *marker* if cut."""
+    if count_tokens(text, model) <= max_tokens:
+        return text
+    ratio = max_tokens / max(count_tokens(text, model), 1)
+    return text[: max(int(len(text) * ratio) - len(marker), 0)] + marker
+
+
+# ---------------------------------------------------------------------------
+# Tool-result compaction
+# ---------------------------------------------------------------------------
+
+def summarize_tool_result(content: str, max_chars: int = 400) -> str:
+    """Compact a tool result that the model has already read.
+
+    JSON objects keep their scalar fields (shortened) and report the size of
+    list/dict fields; anything else is truncated to *max_chars*.
+    """
+    try:
+        data = json.loads(content)
+    except (json.JSONDecodeError, TypeError):
+        data = None
+    if isinstance(data, dict):
+        summary: dict[str, Any] = {}
+        for key, value in data.items():
+            if isinstance(value, str):
+                summary[key] = value if len(value) <= 80 else value[:80] + "…"
+            elif isinstance(value, (int, float, bool)) or value is None:
+                summary[key] = value
+            elif isinstance(value, list):
+                summary[key] = f"[{len(value)} items]"
+            elif isinstance(value, dict):
+                summary[key] = f"{{{len(value)} fields}}"
+        text = json.dumps({"_summarized": True, **summary}, separators=(",", ":"))
+        if len(text) <= max_chars:
+            return text
+        content = text
+    if len(content) <= max_chars:
+        return content
+    return content[:max_chars] + f"… [trimmed {len(content) - max_chars} chars]"
+
+
+def compact_tool_results(
+    messages: list[dict],
+    system: str,
+    tools: list[dict] | None,
+    model: str,
+    budget: int,
+) -> int:
+    """Shrink older tool_result blocks in-place until the request fits *budget*.
+
+    The most recent tool_result message is left intact — the model still needs
+    to act on it.  Older results are first summarized, then replaced with a
+    stub if that is still not enough.  Returns the final token estimate.
+    """
+    estimate = count_request_tokens(system, messages, tools, model)
+    if estimate <= budget:
+        return estimate
+
+    result_msgs = [
+        m for m in messages
+        if isinstance(m.get("content"), list)
+        and any(isinstance(b, dict) and b.get("type") == "tool_result" for b in m["content"])
+    ][:-1]
+
+    for max_chars, stub in ((400, False), (0, True)):
+        for msg in result_msgs:
+            for block in msg["content"]:
+                if not (isinstance(block, dict) and block.get("type") == "tool_result"):
+                    continue
+                content = block.get("content", "")
+                if not isinstance(content, str):
+                    content = json.dumps(content, default=str)
+                block["content"] = (
+                    '{"_omitted":"earlier tool result removed to fit context budget"}'
+                    if stub else summarize_tool_result(content, max_chars)
+                )
+            estimate = count_request_tokens(system, messages, tools, model)
+            if estimate <= budget:
+                return estimate
+    return estimate
@@ -0,0 +1,308 @@
+"""
+Lightweight tracing with OpenTelemetry-compatible spans.
+
+Spans cover each pipeline run, agent run, agent loop iteration, LLM call
+and tool call.  All spans of one case share a trace ID — the case
+correlation ID (run ID for streams, job ID for jobs), returned as
+``trace_id`` in results — and parent/child links follow the asyncio task
+context, so the parallel Diagnostician and Research runs get separate
+spans instead of one shared timing.
+
+Exporters are chosen with TRACE_EXPORTERS (comma-separated):
+
+  * console – one log line per span
+  * jsonl   – one JSON object per span, appended to TRACE_FILE
+  * otlp    – OTLP/HTTP JSON to OTEL_EXPORTER_OTLP_ENDPOINT (…/v1/traces)
+
+With no exporter configured, ``span()`` hands out a shared no-op span, so
+tracing costs nothing in production unless switched on.  Spans are
+buffered per trace and exported together when the root span ends.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import secrets
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "ai-medical-diagnosis"
+
+
+def new_trace_id() -> str:
+    return secrets.token_hex(16)
+
+
+class Span:
+    """One timed operation; attribute names follow OTel conventions where they exist."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "_t0", "attributes", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: str | None, attributes: dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self._t0 = time.perf_counter_ns()
+        self.end_ns: int | None = None
+        self.attributes = {k: v for k, v in attributes.items() if v is not None}
+        self.error: str | None = None
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update({k: v for k, v in attributes.items() if v is not None})
+
+    def record_error(self, exc: BaseException) -> None:
+        self.error = f"{type(exc).__name__}: {exc}"
+
+    def end(self) -> None:
+        self.end_ns = self.start_ns + (time.perf_counter_ns() - self._t0)
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else self.start_ns + (time.perf_counter_ns() - self._t0)
+        return (end - self.start_ns) / 1e6
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    __slots__ = ()
+    trace_id = None
+    span_id = None
+
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def record_error(self, exc: BaseException) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def current_trace_id() -> str | None:
+    span = _current_span.get()
+    return span.trace_id if span else None
+
+
+# ---------------------------------------------------------------------------
+# Exporters
+# ---------------------------------------------------------------------------
+
+def _run_in_background(coro_fn: Callable, *args: Any) -> None:
+    """Run blocking/async export work without holding up the caller."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        result = coro_fn(*args)
+        if asyncio.iscoroutine(result):
+            asyncio.run(result)
+        return
+    if asyncio.iscoroutinefunction(coro_fn):
+        task = loop.create_task(coro_fn(*args))
+    else:
+        task = loop.create_task(asyncio.to_thread(coro_fn, *args))
+    _BACKGROUND.add(task)
+    task.add_done_callback(_BACKGROUND.discard)
+
+
+_BACKGROUND: set[asyncio.Task] = set()
+
+
+class ConsoleExporter:
+    def export(self, spans: list[Span]) -> None:
+        for s in spans:
+            logger.info(
+                "span %s trace=%s %.1fms %s%s",
+                s.name, s.trace_id[:12], s.duration_ms,
+                json.dumps(s.attributes, default=str),
+                f" error={s.error}" if s.error else "",
+            )
+
+
+class JsonlFileExporter:
+    def __init__(self, path: str):
+        self.path = path
+
+    def _write(self, lines: str) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+    def export(self, spans: list[Span]) -> None:
+        lines = "".join(json.dumps(s.to_dict(), default=str) + "\n" for s in spans)
+        _run_in_background(self._write, lines)
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OtlpHttpExporter:
+    """OTLP/HTTP with the JSON encoding — accepted by the OTel Collector, Jaeger, Tempo."""
+
+    def __init__(self, endpoint: str, headers: dict[str, str] | None = None):
+        self.url = endpoint.rstrip("/")
+        if not self.url.endswith("/v1/traces"):
+            self.url += "/v1/traces"
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+
+    def payload(self, spans: list[Span]) -> dict[str, Any]:
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+                "scopeSpans": [{
+                    "scope": {"name": "agents.tracing"},
+                    "spans": [
+                        {
+                            "traceId": s.trace_id,
+                            "spanId": s.span_id,
+                            **({"parentSpanId": s.parent_id} if s.parent_id else {}),
+                            "name": s.name,
+                            "kind": 1,  # SPAN_KIND_INTERNAL
+                            "startTimeUnixNano": str(s.start_ns),
+                            "endTimeUnixNano": str(s.end_ns),
+                            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()],
+                            "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+                        }
+                        for s in spans
+                    ],
+                }],
+            }],
+        }
+
+    async def _post(self, body: dict[str, Any]) -> None:
+        import httpx
+        try:
+            async with httpx.AsyncClient(timeout=5.0) as client:
+                resp = await client.post(self.url, json=body, headers=self.headers)
+                if resp.status_code >= 400:
+                    logger.warning("OTLP export rejected (%d): %s", resp.status_code, resp.text[:200])
+        except Exception as e:
+            logger.warning("OTLP export failed: %s", e)
+
+    def export(self, spans: list[Span]) -> None:
+        _run_in_background(self._post, self.payload(spans))
+
+
+def _parse_headers(raw: str) -> dict[str, str]:
+    headers = {}
+    for pair in raw.split(","):
+        if "=" in pair:
+            key, value = pair.split("=", 1)
+            headers[key.strip()] = value.strip()
+    return headers
+
+
+def exporters_from_env() -> list:
+    exporters = []
+    for name in filter(None, (n.strip().lower() for n in os.getenv("TRACE_EXPORTERS", "").split(","))):
+        if name == "console":
+            exporters.append(ConsoleExporter())
+        elif name == "jsonl":
+            exporters.append(JsonlFileExporter(os.getenv("TRACE_FILE", "traces.jsonl")))
+        elif name == "otlp":
+            exporters.append(OtlpHttpExporter(
+                os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4318"),
+                _parse_headers(os.getenv("OTEL_EXPORTER_OTLP_HEADERS", "")),
+            ))
+        else:
+            logger.warning("Unknown trace exporter %r ignored", name)
+    return exporters
+
+
+# ---------------------------------------------------------------------------
+# Tracer
+# ---------------------------------------------------------------------------
+
+class Tracer:
+    """Creates spans and hands finished traces to the exporters."""
+
+    def __init__(self, exporters: list | None = None):
+        self.exporters = exporters or []
+        self._pending: dict[str, list[Span]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters)
+
+    @contextmanager
+    def span(self, name: str, trace_id: str | None = None, **attributes: Any):
+        """``with tracer.span("llm.call", **attrs) as span:`` — child of the current span.
+
+        *trace_id* starts a new root span for that trace (e.g. a run ID).
+        """
+        if not self.exporters:
+            yield _NOOP_SPAN
+            return
+        parent = _current_span.get()
+        if trace_id is None and parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        else:
+            trace_id = trace_id or new_trace_id()
+            parent_id = parent.span_id if parent is not None and parent.trace_id == trace_id else None
+        span = Span(name, trace_id, parent_id, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            span.end()
+            _current_span.reset(token)
+            self._finish(span)
+
+    def _finish(self, span: Span) -> None:
+        self._pending.setdefault(span.trace_id, []).append(span)
+        if span.parent_id is not None:
+            return
+        spans = self._pending.pop(span.trace_id)
+        for exporter in self.exporters:
+            try:
+                exporter.export(spans)
+            except Exception as e:
+                logger.warning("Trace exporter %s failed: %s", type(exporter).__name__, e)
+
+
+tracer = Tracer(exporters_from_env())
+
+
+def traced(name: str) -> Callable:
+    """Decorator: run an async method inside a span and stamp ``trace_id`` on a dict result."""
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with tracer.span(name) as span:
+                result = await fn(*args, **kwargs)
+                if span.trace_id and isinstance(result, dict):
+                    result.setdefault("trace_id", span.trace_id)
+                return result
+        return wrapper
+    return decorator
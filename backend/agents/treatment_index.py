@@ -0,0 +1,173 @@
+"""
+In-memory indexes over the TreatmentAgent's knowledge tables.
+
+The medication profiles, care plans and medication timing rules are read
+from the knowledge store once per process and indexed so the treatment
+tools resolve names with hash lookups instead of scanning every entry:
+
+  * ``normalize_drug_name`` is the one normalizer for regimen entries:
+    lower-case, doses ("500 mg", "0.5%") and dosage-form words dropped
+  * medications are keyed by generic name and every brand alias, and
+    grouped by drug class
+  * care plans by condition, timing rules by drug
+
+A name is resolved by exact key, then by any of its words or word pairs,
+and only then by the original first-match substring scan, so unusual
+inputs resolve exactly as before.  Every resolution — hit or miss — is
+memoized, so a repeated name (the common case across a regimen or a
+batch) costs one dict lookup.
+
+Entries are shared between callers; treat them as read-only.
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from typing import Any, Callable
+
+from .knowledge_store import knowledge
+
+_MEMO_LIMIT = 4096
+
+_DOSE = re.compile(r"\b\d+(?:\.\d+)?\s*(?:mg|mcg|g|ml|units?|iu|%)?(?=\s|$|/)")
+_PUNCT = re.compile(r"[^a-z0-9_\-' ]+")
+_FORM_WORDS = frozenset({
+    "tablet", "tablets", "tab", "tabs", "capsule", "capsules", "cap", "caps", "oral", "po",
+    "er", "xr", "sr", "dr", "ec", "extended", "delayed", "release", "suspension", "solution",
+    "liquid", "chewable", "otc",
+})
+
+
+def normalize_drug_name(name: str) -> str:
+    """"Omeprazole 20 mg DR capsule" -> "omeprazole".
+
+    A name with nothing left after stripping is only lower-cased and trimmed.
+    """
+    lower = name.lower()
+    text = _PUNCT.sub(" ", _DOSE.sub(" ", lower))
+    return " ".join(t for t in text.split() if t not in _FORM_WORDS) or lower.strip()
+
+
+def _candidates(normalized: str) -> list[str]:
+    """The whole name, then word pairs, then single words."""
+    words = normalized.split()
+    pairs = [" ".join(words[i:i + 2]) for i in range(len(words) - 1)]
+    return [normalized, *pairs, *words]
+
+
+class _KeyedTable:
+    """A knowledge table decoded once, resolved by key with a memoized fallback scan."""
+
+    def __init__(self, entries: dict[str, Any], keys: dict[str, str], scan: Callable[[str], str | None]):
+        self.entries = entries
+        self._keys = keys  # lookup key (name or alias) -> entry name
+        self._scan = scan  # original first-match rule, for names no key covers
+        self._memo: dict[str, str | None] = {}
+
+    def resolve(self, normalized: str) -> str | None:
+        try:
+            return self._memo[normalized]
+        except KeyError:
+            pass
+        found = next((self._keys[c] for c in _candidates(normalized) if c in self._keys), None)
+        if found is None:
+            found = self._scan(normalized)
+        if len(self._memo) >= _MEMO_LIMIT:
+            self._memo.clear()
+        self._memo[normalized] = found
+        return found
+
+
+class TreatmentIndex:
+    """Medication, care-plan and timing-rule indexes for the treatment tools."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._medications: _KeyedTable | None = None
+        self._care_plans: _KeyedTable | None = None
+        self._timing: _KeyedTable | None = None
+        self._by_class: dict[str, tuple[str, ...]] = {}
+        self._medication_names: list[str] = []
+        self._care_plan_conditions: list[str] = []
+
+    def _build(self) -> None:
+        with self._lock:
+            if self._medications is not None:
+                return
+            meds = dict(knowledge.table("medications").items())
+            med_keys: dict[str, str] = {}
+            by_class: dict[str, list[str]] = {}
+            for name, info in meds.items():
+                for key in (name, *(info.get("aliases") or ())):
+                    med_keys.setdefault(key, name)
+                # "NSAID/Antiplatelet" files the drug under both classes
+                for cls in filter(None, (info.get("class") or "").lower().split("/")):
+                    by_class.setdefault(cls.strip(), []).append(name)
+
+            def scan_meds(med: str) -> str | None:
+                for name, info in meds.items():
+                    aliases = info.get("aliases", [])
+                    if med in name or name in med or any(a in med or med in a for a in aliases):
+                        return name
+                return None
+
+            plans = dict(knowledge.table("care_plans").items())
+
+            def scan_plans(condition: str) -> str | None:
+                return next((key for key in plans if condition in key or key in condition), None)
+
+            timing = dict(knowledge.table("medication_timing").items())
+
+            def scan_timing(med: str) -> str | None:
+                return next((key for key in timing if key in med), None)
+
+            self._by_class = {cls: tuple(names) for cls, names in by_class.items()}
+            self._medication_names = sorted(meds)
+            self._care_plan_conditions = sorted(plans)
+            self._care_plans = _KeyedTable(plans, {k: k for k in plans}, scan_plans)
+            self._timing = _KeyedTable(timing, {k: k for k in timing}, scan_timing)
+            # Exact keys must resolve as the first-match scan would (an alias may
+            # also be a substring of an earlier entry); keep only those that agree
+            self._medications = _KeyedTable(
+                meds, {k: v for k, v in med_keys.items() if scan_meds(k) == v}, scan_meds,
+            )
+
+    def _table(self, attr: str) -> _KeyedTable:
+        if self._medications is None:
+            self._build()
+        return getattr(self, attr)
+
+    def medication(self, name: str) -> tuple[str | None, dict | None]:
+        """(generic name, profile) for a medication name, generic or brand."""
+        table = self._table("_medications")
+        found = table.resolve(normalize_drug_name(name))
+        return (found, table.entries[found]) if found is not None else (None, None)
+
+    def care_plan(self, condition: str) -> tuple[str | None, dict | None]:
+        table = self._table("_care_plans")
+        found = table.resolve(condition.lower())
+        return (found, table.entries[found]) if found is not None else (None, None)
+
+    def timing_rule(self, name: str) -> dict | None:
+        table = self._table("_timing")
+        found = table.resolve(normalize_drug_name(name))
+        return table.entries[found] if found is not None else None
+
+    def medications_in_class(self, drug_class: str) -> tuple[str, ...]:
+        """Generic names of the database medications in a drug class."""
+        self._table("_medications")
+        return self._by_class.get(drug_class.lower().strip(), ())
+
+    @property
+    def medication_names(self) -> list[str]:
+        self._table("_medications")
+        return self._medication_names
+
+    @property
+    def care_plan_conditions(self) -> list[str]:
+        self._table("_care_plans")
+        return self._care_plan_conditions
+
+
+treatment_index = TreatmentIndex()
@@ -0,0 +1,153 @@
+"""
+Precomputed VINDICATE tables for the diagnostician's apply_vindicate_framework tool.
+
+The category definitions and per-system condition lists live in the
+knowledge store (``vindicate_categories`` / ``vindicate_systems``).  They
+are materialized once per process:
+
+  * systems are keyed by canonical name; a free-text ``affected_system`` is
+    resolved by its aliases (first system whose alias it contains, else
+    "general") and the resolution is memoized
+  * each condition carries a demographic bitmask over (age band x gender)
+    cells, built from optional ``min_age`` / ``max_age`` / ``genders``
+    fields in the source (absent = applies to everyone)
+  * for every system and cell, the JSON of the framework section is
+    serialized once, shared between cells that include the same conditions
+
+A tool call is then an alias lookup, a cell index and a string join.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any
+
+from .knowledge_store import knowledge
+
+# Inclusive lower bounds of the age bands (infant, child, adolescent, young adult, adult, older adult)
+AGE_BANDS = (0, 2, 12, 18, 40, 65)
+GENDERS = ("female", "male", "unknown")
+CELLS = len(AGE_BANDS) * len(GENDERS)
+ALL_CELLS = (1 << CELLS) - 1
+
+DEFAULT_SYSTEM = "general"
+_MAX_ALIAS_CACHE = 1024
+
+
+def age_band(age: Any) -> int:
+    try:
+        age = int(age)
+    except (TypeError, ValueError):
+        age = 30
+    band = 0
+    for i, lower in enumerate(AGE_BANDS):
+        if age >= lower:
+            band = i
+    return band
+
+
+def gender_index(gender: str) -> int:
+    gender = gender.lower()
+    return GENDERS.index(gender) if gender in GENDERS[:2] else GENDERS.index("unknown")
+
+
+def cell_index(age: Any, gender: str) -> int:
+    return age_band(age) * len(GENDERS) + gender_index(gender)
+
+
+def demographic_mask(entry: dict) -> int:
+    """Bitmask of the (age band, gender) cells a condition applies to."""
+    min_age = entry.get("min_age")
+    max_age = entry.get("max_age")
+    genders = entry.get("genders")
+    if min_age is None and max_age is None and not genders:
+        return ALL_CELLS
+    mask = 0
+    for band, lower in enumerate(AGE_BANDS):
+        upper = AGE_BANDS[band + 1] - 1 if band + 1 < len(AGE_BANDS) else 200
+        # A band is in range if it overlaps [min_age, max_age]
+        if min_age is not None and upper < min_age:
+            continue
+        if max_age is not None and lower > max_age:
+            continue
+        for g, gender in enumerate(GENDERS):
+            if genders and gender != "unknown" and gender not in genders:
+                continue
+            mask |= 1 << (band * len(GENDERS) + g)
+    return mask
+
+
+class VindicateTables:
+    """Per-system VINDICATE sections, pre-serialized per demographic cell."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fragments: dict[str, tuple[str, ...]] | None = None
+        self._aliases: list[tuple[str, tuple[str, ...]]] = []
+        self._resolved: dict[str, str] = {}
+
+    def _build(self) -> dict[str, tuple[str, ...]]:
+        categories = dict(knowledge.table("vindicate_categories").items())
+        fragments: dict[str, tuple[str, ...]] = {}
+        aliases = []
+        for system, spec in knowledge.table("vindicate_systems").items():
+            aliases.append((system, tuple(spec.get("aliases", []))))
+            # Flatten (category, condition, mask) so a cell's content is a bitmask over conditions
+            entries = [
+                (category, {"condition": c["condition"], "brief": c["brief"]}, demographic_mask(c))
+                for category in categories
+                for c in spec["conditions"].get(category, [])
+            ]
+            by_content: dict[int, str] = {}
+            per_cell = []
+            for cell in range(CELLS):
+                included = sum(1 << i for i, (_, _, mask) in enumerate(entries) if mask >> cell & 1)
+                if included not in by_content:
+                    section = {
+                        category: {
+                            "category_full_name": data["full_name"],
+                            "plausible_conditions": [
+                                cond for i, (cat, cond, _) in enumerate(entries)
+                                if cat == category and included >> i & 1
+                            ],
+                            "reasoning_prompt": data["reasoning"],
+                        }
+                        for category, data in categories.items()
+                    }
+                    by_content[included] = json.dumps(section)
+                per_cell.append(by_content[included])
+            fragments[system] = tuple(per_cell)
+        self._aliases = aliases
+        return fragments
+
+    def _tables(self) -> dict[str, tuple[str, ...]]:
+        if self._fragments is None:
+            with self._lock:
+                if self._fragments is None:
+                    self._fragments = self._build()
+        return self._fragments
+
+    def resolve(self, system: str) -> str:
+        """Canonical system for a free-text body system (e.g. "chest pain" -> "cardiovascular")."""
+        resolved = self._resolved.get(system)
+        if resolved is None:
+            tables = self._tables()
+            resolved = next(
+                (name for name, aliases in self._aliases if any(a in system for a in aliases)),
+                DEFAULT_SYSTEM if DEFAULT_SYSTEM in tables else self._aliases[-1][0],
+            )
+            if len(self._resolved) >= _MAX_ALIAS_CACHE:
+                self._resolved.clear()
+            self._resolved[system] = resolved
+        return resolved
+
+    def framework_json(self, system: str, age: Any, gender: str) -> str:
+        """Serialized ``vindicate_framework`` section for a patient."""
+        return self._tables()[self.resolve(system)][cell_index(age, gender)]
+
+    def framework(self, system: str, age: Any, gender: str) -> dict[str, Any]:
+        return json.loads(self.framework_json(system, age, gender))
+
+
+vindicate_tables = VindicateTables()
@@ -0,0 +1,94 @@
+"""
+Background warm-up of the agent pipeline.
+
+Agent modules, vendor SDKs and the knowledge store load lazily on first
+use, which keeps worker start-up short but would put that cost on the
+first diagnosis.  ``WarmUp`` pays it in the background instead, right
+after the server starts accepting connections:
+
+  * imports every agent module (and the anthropic SDK) in a worker thread
+  * opens the knowledge store — compiling it if stale — and reads it once
+    so its pages are in the shared OS page cache
+  * materializes the precomputed illness-script and VINDICATE indexes
+
+Progress is reported through ``stats()`` (GET /health) so orchestration can
+treat a worker as fully warm, not just alive.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import logging
+import time
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+AGENT_MODULES = ("triage", "diagnostician", "research", "specialist", "treatment", "safety", "empathy")
+VENDOR_SDKS = ("anthropic",)
+
+
+def preload() -> dict[str, Any]:
+    """Import the agent modules and warm the knowledge store (blocking)."""
+    t0 = time.perf_counter()
+    for name in AGENT_MODULES:
+        importlib.import_module(f"{__package__}.{name}")
+    for sdk in VENDOR_SDKS:
+        try:
+            importlib.import_module(sdk)
+        except ImportError:
+            pass
+    imported = time.perf_counter()
+
+    from .knowledge_store import knowledge
+    from .illness_scripts import illness_scripts
+    from .treatment_index import treatment_index
+    from .vindicate import vindicate_tables
+    knowledge_bytes = knowledge.warm()
+    # Materialize the diagnostician's and treatment agent's precomputed indexes
+    illness_scripts.domains
+    vindicate_tables.resolve("general")
+    treatment_index.medication_names
+    return {
+        "import_ms": round((imported - t0) * 1000, 1),
+        "knowledge_ms": round((time.perf_counter() - imported) * 1000, 1),
+        "knowledge_bytes": knowledge_bytes,
+    }
+
+
+class WarmUp:
+    """Runs ``preload`` once in the background and records the outcome."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.state = "pending" if enabled else "disabled"
+        self.details: dict[str, Any] = {}
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Schedule the warm-up on the running loop (returns immediately)."""
+        if not self.enabled or self._task is not None:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        self.state = "running"
+        t0 = time.perf_counter()
+        try:
+            # Module imports and SQLite I/O stay off the event loop
+            self.details = await asyncio.to_thread(preload)
+            self.state = "done"
+        except Exception as e:
+            logger.warning("Warm-up failed (components will load on first use): %s", e)
+            self.details = {"error": str(e)}
+            self.state = "failed"
+        self.details["total_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        logger.info("Warm-up %s: %s", self.state, self.details)
+
+    @property
+    def ready(self) -> bool:
+        return self.state in ("done", "disabled")
+
+    def stats(self) -> dict[str, Any]:
+        return {"state": self.state, **self.details}
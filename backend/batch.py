@@ -0,0 +1,374 @@
+"""
+Bulk batch diagnosis for offline case sets.
+
+Takes a JSONL file of DiagnosisRequests (one per line, optionally with an
+``id`` field), runs the unique cases with bounded global concurrency, and
+yields one JSONL result line per input line as cases finish:
+
+  * Identical cases (same request fields) run once; duplicates reuse the
+    result and point at the line that produced it
+  * "pipeline" backend – the full multi-agent pipeline on a shared pool of
+    OrchestratorAgents (no per-case client/agent construction)
+  * "anthropic-batch" backend – a single-call differential per case via
+    the Anthropic Message Batches API (about half the price, results within
+    24h, no agent pipeline); meant for large re-evaluation sweeps
+
+Used by POST /api/batch/diagnose and from the command line:
+
+    python -m batch cases.jsonl -o results.jsonl --concurrency 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Iterable
+
+from pydantic import ValidationError
+
+from agents import OrchestratorAgent
+from models import DiagnosisRequest
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 4
+MAX_BATCH_CASES = int(os.getenv("BATCH_MAX_CASES", "5000"))
+
+BATCH_BACKENDS = ("pipeline", "anthropic-batch")
+
+# Optional caller labels on a line; not part of the case content
+_CASE_ID_FIELDS = ("id", "case_id")
+
+
+def case_fingerprint(request: DiagnosisRequest) -> str:
+    """Stable hash of a request's content, for deduplication."""
+    canonical = json.dumps(request.model_dump(), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def parse_cases(lines: Iterable[str]) -> list[dict[str, Any]]:
+    """Parse JSONL lines into case entries.
+
+    Each entry is ``{"line", "case_id", "request"}`` or, for an invalid line,
+    ``{"line", "case_id", "error"}``.  Blank lines are skipped.
+    """
+    cases = []
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        case_id = None
+        try:
+            raw = json.loads(line)
+            if not isinstance(raw, dict):
+                raise ValueError("each line must be a JSON object")
+            case_id = next((raw.pop(k) for k in _CASE_ID_FIELDS if k in raw), None)
+            cases.append({"line": line_no, "case_id": case_id, "request": DiagnosisRequest(**raw)})
+        except (ValueError, ValidationError) as e:
+            cases.append({"line": line_no, "case_id": case_id, "error": f"invalid case: {e}"})
+    return cases
+
+
+# ---------------------------------------------------------------------------
+# Orchestrator pool
+# ---------------------------------------------------------------------------
+
+class OrchestratorPool:
+    """Reusable OrchestratorAgents sharing vendor clients across cases."""
+
+    def __init__(self, size: int, api_key: str, openai_key: str | None = None, google_key: str | None = None):
+        self.size = max(1, size)
+        self._keys = (api_key, openai_key, google_key)
+        self._idle: asyncio.Queue[OrchestratorAgent] = asyncio.Queue()
+        self._created = 0
+
+    @asynccontextmanager
+    async def lease(self):
+        """``async with pool.lease() as orchestrator:`` — exclusive use for one case."""
+        if self._idle.empty() and self._created < self.size:
+            self._created += 1
+            api_key, openai_key, google_key = self._keys
+            orchestrator = OrchestratorAgent(api_key=api_key, openai_key=openai_key, google_key=google_key)
+        else:
+            orchestrator = await self._idle.get()
+            orchestrator.reset()
+        try:
+            yield orchestrator
+        finally:
+            self._idle.put_nowait(orchestrator)
+
+    async def aclose(self) -> None:
+        while not self._idle.empty():
+            await self._idle.get_nowait().aclose()
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+class PipelineBackend:
+    """Full multi-agent pipeline per case on a shared orchestrator pool."""
+
+    name = "pipeline"
+
+    def __init__(self, pool: OrchestratorPool, concurrency: int = DEFAULT_CONCURRENCY, admission=None, tenant: str = "batch"):
+        self.pool = pool
+        self.concurrency = max(1, concurrency)
+        # Optional server-wide AdmissionController shared with interactive traffic
+        self.admission = admission
+        self.tenant = tenant
+
+    async def _run_one(self, req: DiagnosisRequest) -> dict:
+        async with self.pool.lease() as orchestrator:
+            return await orchestrator.run_diagnosis(
+                symptoms=req.symptoms,
+                age=req.age,
+                gender=req.gender,
+                duration=req.duration,
+                severity=req.severity,
+                image_base64=req.image_base64,
+                medical_history=req.medical_history,
+                current_medications=req.current_medications,
+                allergies=req.allergies,
+                family_history=req.family_history,
+                social_history=req.social_history,
+                model_preference=req.model_preference,
+                emergency_fast_path=req.emergency_fast_path,
+            )
+
+    async def _guarded(self, key: str, req: DiagnosisRequest, sem: asyncio.Semaphore) -> tuple[str, dict | Exception]:
+        async with sem:
+            try:
+                if self.admission is None:
+                    return key, await self._run_one(req)
+                async with self.admission.slot(self.tenant, shed=False):
+                    return key, await self._run_one(req)
+            except Exception as e:
+                logger.warning("Batch case %s failed: %s", key[:12], e)
+                return key, e
+
+    async def run_many(self, cases: dict[str, DiagnosisRequest]) -> AsyncIterator[tuple[str, dict | Exception]]:
+        """Yield ``(key, result_or_exception)`` in completion order."""
+        sem = asyncio.Semaphore(self.concurrency)
+        tasks = [asyncio.create_task(self._guarded(key, req, sem)) for key, req in cases.items()]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def aclose(self) -> None:
+        await self.pool.aclose()
+
+
+_BATCH_PROMPT = """Analyze this patient case and give a differential diagnosis.
+
+Patient: {age}-year-old {gender}
+Symptoms: {symptoms}
+Duration: {duration}
+Severity: {severity}/10
+{extra}
+Respond with valid JSON only:
+{{"diagnoses": [{{"condition": "Name", "confidence": 85, "explanation": "Clinical reasoning", "urgency": "routine|soon|urgent|emergency", "specialty": "Specialty"}}],
+ "red_flags": ["..."], "recommended_tests": ["..."], "patient_summary": "Plain language summary"}}
+List at least 3 diagnoses ranked by likelihood."""
+
+
+class AnthropicBatchBackend:
+    """Single-call differential per case through the Message Batches API."""
+
+    name = "anthropic-batch"
+    POLL_SECONDS = 30.0
+
+    def __init__(self, api_key: str, model: str = "claude-sonnet-4-6", max_tokens: int = 2000):
+        from anthropic import AsyncAnthropic
+        self.client = AsyncAnthropic(api_key=api_key)
+        self.model = model
+        self.max_tokens = max_tokens
+
+    def _params(self, req: DiagnosisRequest) -> dict:
+        extra = "\n".join(
+            f"{label}: {value}" for label, value in (
+                ("Past Medical History", req.medical_history),
+                ("Current Medications", req.current_medications),
+                ("Allergies", req.allergies),
+                ("Family History", req.family_history),
+                ("Social History", req.social_history),
+            ) if value
+        )
+        prompt = _BATCH_PROMPT.format(
+            age=req.age, gender=req.gender, symptoms=req.symptoms,
+            duration=req.duration, severity=req.severity, extra=extra,
+        )
+        return {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "temperature": 0.2,
+            "system": "You are an expert diagnostician. Always respond with valid JSON only.",
+            "messages": [{"role": "user", "content": prompt}],
+        }
+
+    def _to_result(self, text: str, elapsed: float) -> dict:
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            match = re.search(r"\{.*\}", text, re.DOTALL)
+            data = json.loads(match.group(0)) if match else {}
+        causes = [
+            {
+                "cause": d.get("condition", "Unknown"),
+                "value": d.get("confidence", 50),
+                "explanation": d.get("explanation", ""),
+                "urgency": d.get("urgency", "routine"),
+                "specialty": d.get("specialty", "Primary Care"),
+            }
+            for d in data.get("diagnoses", [])
+        ]
+        return {
+            "answer": data.get("patient_summary", ""),
+            "causes": causes,
+            "red_flags": data.get("red_flags", []),
+            "recommended_tests": data.get("recommended_tests", []),
+            "multi_agent": False,
+            "batch_backend": self.name,
+            "model": self.model,
+            "total_time": round(elapsed, 2),
+        }
+
+    async def run_many(self, cases: dict[str, DiagnosisRequest]) -> AsyncIterator[tuple[str, dict | Exception]]:
+        """Submit all cases as one batch, poll until it ends, then yield results."""
+        # custom_id allows at most 64 chars; the sha256 fingerprint fits
+        started = time.time()
+        batch = await self.client.messages.batches.create(
+            requests=[{"custom_id": key, "params": self._params(req)} for key, req in cases.items()],
+        )
+        logger.info("Submitted Anthropic message batch %s (%d cases)", batch.id, len(cases))
+        while batch.processing_status != "ended":
+            await asyncio.sleep(self.POLL_SECONDS)
+            batch = await self.client.messages.batches.retrieve(batch.id)
+        elapsed = time.time() - started
+        async for entry in await self.client.messages.batches.results(batch.id):
+            if entry.result.type == "succeeded":
+                text = "".join(b.text for b in entry.result.message.content if b.type == "text")
+                try:
+                    yield entry.custom_id, self._to_result(text, elapsed)
+                except (json.JSONDecodeError, AttributeError) as e:
+                    yield entry.custom_id, e
+            else:
+                yield entry.custom_id, RuntimeError(f"batch request {entry.result.type}")
+
+    async def aclose(self) -> None:
+        await self.client.close()
+
+
+def make_backend(
+    name: str,
+    api_key: str,
+    openai_key: str | None = None,
+    google_key: str | None = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    admission=None,
+    tenant: str = "batch",
+):
+    if name == "anthropic-batch":
+        return AnthropicBatchBackend(api_key)
+    if name != "pipeline":
+        raise ValueError(f"Unknown batch backend {name!r}; expected one of {BATCH_BACKENDS}")
+    pool = OrchestratorPool(concurrency, api_key, openai_key, google_key)
+    return PipelineBackend(pool, concurrency=concurrency, admission=admission, tenant=tenant)
+
+
+# ---------------------------------------------------------------------------
+# Batch runner
+# ---------------------------------------------------------------------------
+
+async def run_batch(cases: list[dict[str, Any]], backend) -> AsyncIterator[dict[str, Any]]:
+    """Run parsed *cases* on *backend*, yielding one result record per case.
+
+    Invalid lines are reported first; then results stream back as unique
+    cases finish, each fanned out to every line that shares its content.
+    """
+    groups: dict[str, list[dict]] = {}
+    unique: dict[str, DiagnosisRequest] = {}
+    for case in cases:
+        if "error" in case:
+            yield {"line": case["line"], "case_id": case["case_id"], "status": "error", "error": case["error"]}
+            continue
+        key = case_fingerprint(case["request"])
+        groups.setdefault(key, []).append(case)
+        unique.setdefault(key, case["request"])
+
+    logger.info("Batch: %d cases, %d unique, backend=%s", sum(map(len, groups.values())), len(unique), backend.name)
+    async for key, outcome in backend.run_many(unique):
+        members = groups.get(key, [])
+        first_line = members[0]["line"] if members else None
+        for case in members:
+            record = {
+                "line": case["line"],
+                "case_id": case["case_id"],
+                "fingerprint": key[:16],
+                "duplicate_of": first_line if case["line"] != first_line else None,
+            }
+            if isinstance(outcome, Exception):
+                record.update(status="error", error=str(outcome))
+            else:
+                record.update(status="ok", result=outcome)
+            yield record
+
+
+# ---------------------------------------------------------------------------
+# Command line
+# ---------------------------------------------------------------------------
+
+async def _main_async(args: argparse.Namespace) -> int:
+    api_key = os.getenv("ANTHROPIC_API_KEY")
+    if not api_key:
+        print("ANTHROPIC_API_KEY is not set", file=sys.stderr)
+        return 2
+    with open(args.input, encoding="utf-8") as f:
+        cases = parse_cases(f)
+    if len(cases) > MAX_BATCH_CASES:
+        print(f"{len(cases)} cases exceeds BATCH_MAX_CASES={MAX_BATCH_CASES}", file=sys.stderr)
+        return 2
+
+    backend = make_backend(
+        args.backend, api_key, os.getenv("OPENAI_API_KEY"), os.getenv("GOOGLE_API_KEY"),
+        concurrency=args.concurrency,
+    )
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    failed = 0
+    try:
+        async for record in run_batch(cases, backend):
+            failed += record["status"] != "ok"
+            out.write(json.dumps(record, default=str) + "\n")
+            out.flush()
+    finally:
+        await backend.aclose()
+        if out is not sys.stdout:
+            out.close()
+    print(f"{len(cases)} cases, {failed} failed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def main() -> None:
+    from dotenv import load_dotenv
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    parser = argparse.ArgumentParser(description="Run a JSONL file of diagnosis cases.")
+    parser.add_argument("input", help="JSONL file, one DiagnosisRequest per line")
+    parser.add_argument("-o", "--output", help="write JSONL results here (default: stdout)")
+    parser.add_argument("--backend", choices=BATCH_BACKENDS, default="pipeline")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    sys.exit(asyncio.run(_main_async(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
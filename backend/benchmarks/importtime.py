@@ -0,0 +1,110 @@
+"""
+Import-time benchmark (``python -X importtime``).
+
+Each target is imported in a fresh interpreter with ``-X importtime``; the
+report gives the median total import time over several runs and the
+slowest modules by cumulative time, so start-up regressions show up as a
+number instead of as slow-to-ready autoscaled workers.
+
+    python -m benchmarks.importtime                      # default targets
+    python -m benchmarks.importtime agents.orchestrator --top 15
+    python -m benchmarks.importtime agents --budget-ms 150   # exit 1 if slower
+
+A target is a comma-separated list of modules imported together.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+DEFAULT_TARGETS = (
+    "agents",
+    "agents.orchestrator",
+    # What a worker used to pay up front; now deferred to first use / warm-up
+    "agents.triage,agents.diagnostician,agents.research,agents.specialist,agents.treatment,agents.safety,agents.empathy",
+    "main",
+)
+
+
+def parse_importtime(stderr: str) -> tuple[float, dict[str, float]]:
+    """Return (total_ms, {module: cumulative_ms}) from ``-X importtime`` output."""
+    total_us = 0
+    cumulative: dict[str, float] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        # Nesting is shown by indentation; top-level imports sum to the total
+        if not name.startswith("  "):
+            total_us += int(cum_us)
+        cumulative[name.strip()] = int(cum_us) / 1000
+    return total_us / 1000, cumulative
+
+
+def measure(target: str, runs: int = 5) -> dict:
+    """Import *target* in *runs* fresh interpreters (after one bytecode-warming run)."""
+    code = "import " + ", ".join(m.strip() for m in target.split(",") if m.strip())
+    cmd = [sys.executable, "-X", "importtime", "-c", code]
+    totals = []
+    modules: dict[str, float] = {}
+    for i in range(runs + 1):
+        proc = subprocess.run(cmd, cwd=BACKEND_DIR, capture_output=True, text=True)
+        if proc.returncode != 0:
+            error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}"
+            return {"target": target, "error": error}
+        if i == 0:
+            continue  # first run compiles .pyc files
+        total, cumulative = parse_importtime(proc.stderr)
+        totals.append(total)
+        for module, ms in cumulative.items():
+            modules[module] = modules.get(module, 0.0) + ms / runs
+    return {
+        "target": target,
+        "median_ms": round(statistics.median(totals), 1),
+        "min_ms": round(min(totals), 1),
+        "slowest": sorted(modules.items(), key=lambda kv: -kv[1]),
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure backend import time with python -X importtime")
+    parser.add_argument("targets", nargs="*", default=list(DEFAULT_TARGETS))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list per target")
+    parser.add_argument("--budget-ms", type=float, help="fail if any target's median exceeds this")
+    parser.add_argument("--json", action="store_true", help="machine-readable output")
+    args = parser.parse_args(argv)
+
+    results = [measure(t, args.runs) for t in args.targets]
+    over_budget = [
+        r for r in results
+        if args.budget_ms is not None and "median_ms" in r and r["median_ms"] > args.budget_ms
+    ]
+
+    if args.json:
+        for r in results:
+            r["slowest"] = dict(r.get("slowest", [])[: args.top])
+        print(json.dumps(results, indent=2))
+    else:
+        for r in results:
+            if "error" in r:
+                print(f"{r['target']}: failed to import ({r['error']})\n")
+                continue
+            print(f"{r['target']}: median {r['median_ms']:.1f}ms (min {r['min_ms']:.1f}ms)")
+            for module, ms in r["slowest"][: args.top]:
+                print(f"    {ms:8.1f}ms  {module}")
+            print()
+        for r in over_budget:
+            print(f"OVER BUDGET: {r['target']} {r['median_ms']:.1f}ms > {args.budget_ms:.1f}ms")
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Throughput of the LLM-free medication safety checker.
+
+Generates random regimens from the drug names the safety databases know
+about (plus a few unknown names), then times ``MedicationSafetyChecker``
+over them on one core — once cold (empty per-drug cache) and once warm.
+
+    python -m benchmarks.med_safety --patients 2000 --regimen 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+
+CONDITIONS = (
+    "ckd", "asthma", "peptic ulcer", "heart failure", "liver disease", "pregnancy",
+    "gi bleed", "diabetes", "alcohol use", "hyperkalemia", "depression", "myasthenia gravis",
+)
+ALLERGIES = ("penicillin", "cephalosporin", "sulfa", "aspirin", "nsaid", "latex")
+
+
+def make_patients(count: int, regimen: int, seed: int = 0) -> list[dict]:
+    from agents.knowledge_store import knowledge
+
+    rng = random.Random(seed)
+    names = sorted(
+        set(knowledge.keys("contraindications")) | set(knowledge.keys("medications"))
+        | {"sumatriptan", "phenelzine", "clopidogrel", "unknownamab"}
+    )
+    return [
+        {
+            "medications": rng.sample(names, regimen),
+            "current_medications": rng.sample(names, rng.randint(0, 2)),
+            "conditions": rng.sample(CONDITIONS, rng.randint(0, 3)),
+            "allergies": rng.sample(ALLERGIES, rng.randint(0, 2)),
+            "age": rng.choice((4, 15, 34, 52, 70, 86)),
+            "gender": rng.choice(("female", "male", "unknown")),
+        }
+        for _ in range(count)
+    ]
+
+
+def run(patients: list[dict]) -> dict:
+    from agents.med_safety import MedicationSafetyChecker
+
+    checker = MedicationSafetyChecker()
+    report = {}
+    for label in ("cold", "warm"):
+        t0 = time.perf_counter()
+        checker.check_many(patients)
+        elapsed = time.perf_counter() - t0
+        checks = sum(len(p["medications"]) for p in patients)
+        report[label] = {
+            "seconds": round(elapsed, 3),
+            "regimens_per_second": round(len(patients) / elapsed),
+            "medication_checks_per_second": round(checks / elapsed),
+        }
+    report["cache"] = checker.stats()
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the LLM-free medication safety checker")
+    parser.add_argument("--patients", type=int, default=2000)
+    parser.add_argument("--regimen", type=int, default=5, help="medications per patient")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    patients = make_patients(max(1, args.patients), max(1, args.regimen), args.seed)
+    print(json.dumps(run(patients), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
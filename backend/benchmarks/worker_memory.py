@@ -0,0 +1,107 @@
+"""
+Worker memory benchmark for the pre-fork layout (Linux only).
+
+Mimics ``prefork.py``: the parent preloads the agent modules and knowledge
+store (optionally followed by ``gc.freeze()``), then forks N workers that
+each look up every knowledge entry and run a full GC — the things that
+dirty inherited pages.  Reports each worker's proportional (PSS) and
+private dirty memory from /proc/<pid>/smaps_rollup, so the marginal cost
+of one more worker is visible.
+
+    python -m benchmarks.worker_memory --workers 4
+    python -m benchmarks.worker_memory --workers 4 --no-freeze
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+
+
+def _rollup(pid: int | str = "self") -> dict[str, int]:
+    """kB values from /proc/<pid>/smaps_rollup."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup", encoding="ascii") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return fields
+
+
+def _worker_load() -> None:
+    from agents.knowledge_store import knowledge
+
+    conn = knowledge._open()
+    for (name, kind) in conn.execute("SELECT name, kind FROM tables"):
+        view = knowledge.table(name) if kind == "mapping" else knowledge.list(name)
+        if kind == "mapping":
+            for key in view:
+                view[key]
+        else:
+            list(view)
+    gc.collect()
+
+
+def run(workers: int, freeze: bool) -> dict:
+    from agents.knowledge_store import knowledge
+    from agents.warmup import preload
+
+    preload()
+    knowledge.close()
+    gc.collect()
+    if freeze:
+        gc.freeze()
+
+    pipes = []
+    for _ in range(workers):
+        r, w = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(r)
+            _worker_load()
+            os.write(w, b"x")
+            time.sleep(2)  # stay alive while the parent samples
+            os._exit(0)
+        os.close(w)
+        pipes.append((pid, r))
+
+    samples = []
+    for pid, r in pipes:
+        os.read(r, 1)
+        os.close(r)
+    for pid, _ in pipes:
+        roll = _rollup(pid)
+        samples.append({"pid": pid, "pss_kb": roll.get("Pss", 0), "private_dirty_kb": roll.get("Private_Dirty", 0)})
+    for pid, _ in pipes:
+        os.waitpid(pid, 0)
+
+    parent = _rollup()
+    return {
+        "workers": workers,
+        "gc_freeze": freeze,
+        "parent_pss_kb": parent.get("Pss", 0),
+        "workers_pss_kb": sum(s["pss_kb"] for s in samples),
+        "per_worker_private_dirty_kb": round(sum(s["private_dirty_kb"] for s in samples) / max(1, workers)),
+        "samples": samples,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure per-worker memory of the pre-fork layout")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--no-freeze", action="store_true", help="skip gc.freeze() before forking")
+    args = parser.parse_args(argv)
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        print("worker_memory needs Linux /proc/<pid>/smaps_rollup", file=sys.stderr)
+        return 2
+    print(json.dumps(run(max(1, args.workers), not args.no_freeze), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
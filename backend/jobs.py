@@ -0,0 +1,372 @@
+"""
+Asynchronous diagnosis jobs: submit, poll, fetch.
+
+POST /api/jobs/diagnose returns a job id immediately; a pool of background
+workers runs the pipeline and records status, per-agent progress and the
+final result, which clients poll with GET /api/jobs/{job_id}.
+
+  * JobManager owns the worker pool and is started lazily on first submit
+  * The queue/store backend is pluggable: in-process by default, or Redis
+    (JOB_QUEUE_BACKEND=redis + REDIS_URL) so any API worker can accept a
+    job and any other can run it or report on it
+  * The pipeline itself is supplied by the caller as a ``runner`` coroutine,
+    so this module has no dependency on the HTTP layer
+
+Per-request API keys never leave the submitting process: with the Redis
+backend, a job submitted with caller keys goes on that worker's private
+queue and only it runs the job; keyless jobs go on the shared queue and
+run on whichever worker pops them, with its server-configured keys.
+
+A running job's worker refreshes a heartbeat on the job record; a job
+whose heartbeat is older than the lease (its worker died) is reported
+failed instead of "running" forever.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Any, Awaitable, Callable
+
+from agents.metrics import PIPELINE_AGENTS
+from agents.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+DEFAULT_MAX_PENDING = 1000
+DEFAULT_JOB_TTL_SECONDS = 3600
+DEFAULT_JOB_LEASE_SECONDS = 60
+
+# Worker back-off after a queue/store error, doubled per consecutive failure
+WORKER_BACKOFF_SECONDS = 0.5
+WORKER_MAX_BACKOFF_SECONDS = 30.0
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+
+# runner(spec, progress) -> result dict
+JobRunner = Callable[[dict, "JobProgress"], Awaitable[dict]]
+
+
+class JobQueueFull(Exception):
+    """Raised when the pending-job limit is reached."""
+
+
+def new_job_record(job_id: str) -> dict[str, Any]:
+    return {
+        "job_id": job_id,
+        "status": "queued",
+        "created_at": time.time(),
+        "started_at": None,
+        "heartbeat_at": None,
+        "finished_at": None,
+        "progress": {
+            "completed_agents": [],
+            "agents_total": len(PIPELINE_AGENTS),
+            "emergency": False,
+        },
+        "result": None,
+        "error": None,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+class InMemoryJobBackend:
+    """Jobs, specs and the pending queue held in this process."""
+
+    def __init__(self, ttl: int = DEFAULT_JOB_TTL_SECONDS):
+        self.ttl = ttl
+        self._jobs: dict[str, dict] = {}
+        self._queue: asyncio.Queue[str] = asyncio.Queue()
+
+    async def save(self, job: dict) -> None:
+        self._jobs[job["job_id"]] = job
+        self._prune()
+
+    async def load(self, job_id: str) -> dict | None:
+        return self._jobs.get(job_id)
+
+    async def push(self, job_id: str, spec: dict) -> None:
+        await self._queue.put(job_id)
+
+    async def pop(self) -> tuple[str, dict | None]:
+        return await self._queue.get(), None
+
+    async def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.ttl
+        expired = [
+            jid for jid, job in self._jobs.items()
+            if job["finished_at"] is not None and job["finished_at"] < cutoff
+        ]
+        for jid in expired:
+            del self._jobs[jid]
+
+    async def aclose(self) -> None:
+        pass
+
+
+def _has_caller_keys(spec: dict) -> bool:
+    return any((spec.get("api_keys") or {}).values())
+
+
+class RedisJobBackend:
+    """Jobs in Redis: state as JSON strings, pending ids in lists.
+
+    Keyless jobs go on the shared queue; jobs carrying caller API keys go
+    on this process's private queue, since no other worker has the keys.
+    """
+
+    QUEUE_KEY = "diag:jobs:pending"
+
+    def __init__(self, client: Any, ttl: int = DEFAULT_JOB_TTL_SECONDS):
+        self._redis = client
+        self.ttl = ttl
+        self.worker_id = uuid.uuid4().hex
+        self.private_queue_key = f"{self.QUEUE_KEY}:{self.worker_id}"
+
+    @classmethod
+    def from_url(cls, url: str, ttl: int) -> "RedisJobBackend":
+        import redis.asyncio as aioredis
+        return cls(aioredis.from_url(url), ttl)
+
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f"diag:job:{job_id}"
+
+    @staticmethod
+    def _spec_key(job_id: str) -> str:
+        return f"diag:job:{job_id}:spec"
+
+    async def save(self, job: dict) -> None:
+        await self._redis.set(self._job_key(job["job_id"]), json.dumps(job, default=str), ex=self.ttl)
+
+    async def load(self, job_id: str) -> dict | None:
+        raw = await self._redis.get(self._job_key(job_id))
+        return json.loads(raw) if raw else None
+
+    async def push(self, job_id: str, spec: dict) -> None:
+        shared = {k: v for k, v in spec.items() if k != "api_keys"}
+        await self._redis.set(self._spec_key(job_id), json.dumps(shared, default=str), ex=self.ttl)
+        if _has_caller_keys(spec):
+            await self._redis.rpush(self.private_queue_key, job_id)
+            # Left behind if this process dies; don't keep it forever
+            await self._redis.expire(self.private_queue_key, self.ttl)
+        else:
+            await self._redis.rpush(self.QUEUE_KEY, job_id)
+
+    async def pop(self) -> tuple[str, dict | None]:
+        # BLPOP serves keys in order: this worker's own caller-keyed jobs first
+        _, raw_id = await self._redis.blpop([self.private_queue_key, self.QUEUE_KEY])
+        job_id = raw_id.decode() if isinstance(raw_id, bytes) else raw_id
+        raw_spec = await self._redis.get(self._spec_key(job_id))
+        return job_id, json.loads(raw_spec) if raw_spec else None
+
+    async def pending(self) -> int:
+        return await self._redis.llen(self.QUEUE_KEY) + await self._redis.llen(self.private_queue_key)
+
+    async def aclose(self) -> None:
+        await self._redis.aclose()
+
+
+# ---------------------------------------------------------------------------
+# Progress sink
+# ---------------------------------------------------------------------------
+
+class JobProgress:
+    """Event sink for the streaming pipeline that records job progress.
+
+    Has the same async ``put(event)`` interface as a stream event queue.
+    """
+
+    def __init__(self, manager: "JobManager", job: dict):
+        self._manager = manager
+        self._job = job
+        self.result: dict | None = None
+
+    async def put(self, event: dict[str, Any]) -> None:
+        kind = event.get("event")
+        progress = self._job["progress"]
+        if kind == "agent_complete":
+            agent = event.get("agent")
+            if agent and agent not in progress["completed_agents"]:
+                progress["completed_agents"].append(agent)
+        elif kind == "emergency":
+            progress["emergency"] = True
+        elif kind == "queue_position":
+            progress["queue_position"] = event.get("position")
+        elif kind == "complete":
+            self.result = event.get("result")
+            return
+        else:
+            return
+        await self._manager.backend.save(self._job)
+
+
+# ---------------------------------------------------------------------------
+# Manager / worker pool
+# ---------------------------------------------------------------------------
+
+class JobManager:
+    """Accepts jobs and runs them on a pool of background workers."""
+
+    def __init__(
+        self,
+        runner: JobRunner,
+        backend: InMemoryJobBackend | RedisJobBackend | None = None,
+        workers: int = DEFAULT_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        lease: float = DEFAULT_JOB_LEASE_SECONDS,
+    ):
+        self.runner = runner
+        self.backend = backend or InMemoryJobBackend()
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.lease = lease
+        # job_id -> (submitted_at, spec incl. API keys) for jobs submitted here
+        self._local_specs: dict[str, tuple[float, dict]] = {}
+        self._tasks: list[asyncio.Task] = []
+
+    @classmethod
+    def from_env(cls, runner: JobRunner) -> "JobManager":
+        """Build from JOB_WORKERS / JOB_MAX_PENDING / JOB_TTL_SECONDS / JOB_LEASE_SECONDS / JOB_QUEUE_BACKEND."""
+        try:
+            workers = int(os.getenv("JOB_WORKERS", DEFAULT_WORKERS))
+            max_pending = int(os.getenv("JOB_MAX_PENDING", DEFAULT_MAX_PENDING))
+            ttl = int(os.getenv("JOB_TTL_SECONDS", DEFAULT_JOB_TTL_SECONDS))
+            lease = float(os.getenv("JOB_LEASE_SECONDS", DEFAULT_JOB_LEASE_SECONDS))
+        except ValueError as e:
+            logger.warning("Ignoring invalid job settings: %s", e)
+            workers, max_pending, ttl = DEFAULT_WORKERS, DEFAULT_MAX_PENDING, DEFAULT_JOB_TTL_SECONDS
+            lease = DEFAULT_JOB_LEASE_SECONDS
+        backend = None
+        if os.getenv("JOB_QUEUE_BACKEND", "memory").lower() == "redis":
+            url = os.getenv("REDIS_URL", "").strip()
+            try:
+                backend = RedisJobBackend.from_url(url or "redis://localhost:6379/0", ttl)
+            except ImportError:
+                logger.warning("JOB_QUEUE_BACKEND=redis but the redis package is not installed — using in-process jobs")
+        return cls(runner, backend or InMemoryJobBackend(ttl), workers=workers, max_pending=max_pending, lease=lease)
+
+    def _ensure_started(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        logger.info("Started %d diagnosis job workers", self.workers)
+
+    async def submit(self, spec: dict) -> dict:
+        """Queue a job for *spec* and return its initial record."""
+        self._ensure_started()
+        if await self.backend.pending() >= self.max_pending:
+            raise JobQueueFull(f"{self.max_pending} jobs already pending")
+        job = new_job_record(uuid.uuid4().hex)
+        self._prune_local_specs()
+        self._local_specs[job["job_id"]] = (time.time(), spec)
+        await self.backend.save(job)
+        await self.backend.push(job["job_id"], spec)
+        return job
+
+    def _prune_local_specs(self) -> None:
+        # Jobs run by another worker never pop their local spec here
+        cutoff = time.time() - self.backend.ttl
+        for job_id in [j for j, (ts, _) in self._local_specs.items() if ts < cutoff]:
+            del self._local_specs[job_id]
+
+    async def get(self, job_id: str) -> dict | None:
+        job = await self.backend.load(job_id)
+        if job is not None and job["status"] == "running" and self._lease_expired(job):
+            # Its worker died mid-run; nobody else will ever finish it
+            job["status"] = "failed"
+            job["error"] = "worker lost"
+            job["finished_at"] = time.time()
+            await self.backend.save(job)
+            logger.warning("Job %s lost its worker (no heartbeat for %.0fs)", job_id, self.lease)
+        return job
+
+    def _lease_expired(self, job: dict) -> bool:
+        last = job.get("heartbeat_at") or job["started_at"]
+        return last is not None and time.time() - last > self.lease
+
+    async def _heartbeat(self, job: dict) -> None:
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            job["heartbeat_at"] = time.time()
+            try:
+                await self.backend.save(job)
+            except Exception as e:
+                logger.warning("Job %s heartbeat failed: %s", job["job_id"], e)
+
+    async def _worker(self, index: int) -> None:
+        # A failing backend (e.g. Redis unreachable) must not kill the worker:
+        # log, back off and retry.  Only cancellation ends the loop.
+        backoff = WORKER_BACKOFF_SECONDS
+        while True:
+            try:
+                job_id, shared_spec = await self.backend.pop()
+                local = self._local_specs.pop(job_id, None)
+                spec = local[1] if local else shared_spec
+                job = await self.backend.load(job_id)
+                if job is None or spec is None:
+                    logger.warning("Job %s expired before it could run", job_id)
+                    continue
+                await self._run(job, spec)
+                backoff = WORKER_BACKOFF_SECONDS
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Job worker %d error, retrying in %.1fs: %s", index, backoff, e, exc_info=True)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, WORKER_MAX_BACKOFF_SECONDS)
+
+    async def _run(self, job: dict, spec: dict) -> None:
+        job["status"] = "running"
+        job["started_at"] = job["heartbeat_at"] = time.time()
+        await self.backend.save(job)
+        progress = JobProgress(self, job)
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            # The job ID doubles as the trace (case correlation) ID
+            with tracer.span("job.diagnose", trace_id=job["job_id"]):
+                result = await self.runner(spec, progress)
+            job["result"] = result if result is not None else progress.result
+            job["status"] = "succeeded"
+        except asyncio.CancelledError:
+            job["status"] = "failed"
+            job["error"] = "cancelled"
+            raise
+        except Exception as e:
+            logger.error("Diagnosis job %s failed: %s", job["job_id"], e, exc_info=True)
+            job["status"] = "failed"
+            job["error"] = str(e)
+        finally:
+            heartbeat.cancel()
+            job["finished_at"] = time.time()
+            await self.backend.save(job)
+            logger.info(
+                "Job %s %s in %.1fs", job["job_id"], job["status"], job["finished_at"] - job["started_at"],
+            )
+
+    async def stats(self) -> dict[str, Any]:
+        return {
+            "workers": len(self._tasks) or self.workers,
+            "started": bool(self._tasks),
+            "pending": await self.backend.pending(),
+            "max_pending": self.max_pending,
+            "backend": type(self.backend).__name__,
+        }
+
+    async def aclose(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.backend.aclose()
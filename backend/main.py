@@ -9,19 +9,38 @@ Coordinated by the Orchestrator agent.
 import os
 import json
 import asyncio
+import hashlib
+import hmac
 import logging
+import uuid
+from contextlib import aclosing
 from typing import Optional
 
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, Request, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
-from models import DiagnosisRequest, FollowupRequest, QuestionGenerationRequest, InterviewRequest
+from models import (
+    DiagnosisRequest, FollowupRequest, QuestionGenerationRequest, InterviewRequest,
+    MedicationSafetyRequest, MedicationSafetyBatchRequest,
+)
 from agents import OrchestratorAgent
+from agents.run_log import ReplayTruncated, RunRegistry, TERMINAL_EVENTS, parse_event_id
+from agents.metrics import FALLBACKS, PIPELINES_INFLIGHT, QUEUE_DEPTH, render_prometheus
+from agents.profiling import SamplingProfiler
+from agents.timeouts import timeouts
+from agents.tracing import current_trace_id, tracer
+from agents.warmup import WarmUp
+from admission import AdmissionController, AdmissionRejected
+from jobs import JobManager, JobProgress, JobQueueFull
+from result_capture import ResultCapture
+from npi import NPIClient
+from provider_directory import ProviderDirectory
+from batch import BATCH_BACKENDS, MAX_BATCH_CASES, make_backend, parse_cases, run_batch
 from config import OLLAMA_VERSION_URL, OLLAMA_TAGS_URL, OLLAMA_API_URL, OLLAMA_HEALTH_CHECK_TIMEOUT
 
 # ── Setup ────────────────────────────────────────────────────────────
@@ -30,6 +49,24 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(message
 logger = logging.getLogger(__name__)
 
 limiter = Limiter(key_func=get_remote_address)
+# Server-wide cap on concurrent multi-agent pipelines (per-IP limits above
+# don't stop a burst from many clients)
+admission = AdmissionController.from_env()
+PIPELINES_INFLIGHT.set_function(lambda: admission.inflight)
+QUEUE_DEPTH.set_function(lambda: admission.queued)
+# Event logs of streaming runs, so dropped SSE connections can resume
+run_registry = RunRegistry.from_env()
+# Opt-in sampled capture of results for debugging (off unless RESULT_CAPTURE_RATE > 0)
+result_capture = ResultCapture.from_env()
+# Opt-in per-case sampling profiler (X-Profile header / PROFILE_SAMPLE_RATE) and event-loop lag watchdog
+profiler = SamplingProfiler.from_env()
+# Agent modules and the knowledge store load lazily; preload them in the background once serving
+warmup = WarmUp(enabled=os.getenv("WARMUP_ON_STARTUP", "true").lower() != "false")
+npi_client = NPIClient.from_env()
+# Doctor search answers from the local NPI snapshot when one is configured; misses go to the live registry
+provider_directory = ProviderDirectory.from_env()
+NPI_LIVE_FALLBACK = os.getenv("NPI_LIVE_FALLBACK", "true").lower() != "false"
+MAX_MED_SAFETY_PATIENTS = int(os.getenv("MEDICATION_SAFETY_MAX_PATIENTS", "1000"))
 
 app = FastAPI(
     title="AI Medical Diagnosis API",
@@ -45,9 +82,44 @@ app.add_middleware(
     allow_origins=_cors_origins,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["Content-Type", "Authorization", "X-Anthropic-API-Key", "X-OpenAI-API-Key", "X-Google-API-Key"],
+    allow_headers=["Content-Type", "Authorization", "X-Anthropic-API-Key", "X-OpenAI-API-Key", "X-Google-API-Key", "X-Profile"],
 )
 
+
+@app.on_event("startup")
+async def _start_loop_lag_monitor():
+    profiler.lag_monitor.start()
+
+
+@app.on_event("startup")
+async def _start_warmup():
+    warmup.start()
+
+
+@app.on_event("shutdown")
+async def _stop_loop_lag_monitor():
+    await profiler.lag_monitor.stop()
+
+
+@app.on_event("shutdown")
+async def _close_npi_client():
+    await npi_client.aclose()
+
+
+@app.on_event("shutdown")
+async def _close_run_registry():
+    await run_registry.aclose()
+
+
+@app.on_event("shutdown")
+async def _close_job_manager():
+    await job_manager.aclose()
+
+
+@app.on_event("shutdown")
+async def _close_result_capture():
+    await result_capture.aclose()
+
 # ── Security headers middleware ──────────────────────────────
 @app.middleware("http")
 async def add_security_headers(request: Request, call_next):
@@ -107,6 +179,68 @@ def _get_all_api_keys(request: Request) -> dict[str, Optional[str]]:
     }
 
 
+def _tenant_key(request: Request) -> str:
+    """Fair-queueing identity: hash of the caller's own API key, else client IP."""
+    for header in ("x-anthropic-api-key", "x-openai-api-key", "x-google-api-key"):
+        key = request.headers.get(header)
+        if key:
+            return "key:" + hashlib.sha256(key.encode()).hexdigest()[:16]
+    return "ip:" + get_remote_address(request)
+
+
+def _profile_requested(request: Request) -> bool:
+    """X-Profile: 1 from an admin (DEBUG_ADMIN_TOKEN); anyone else can't add profiler overhead."""
+    return (
+        request.headers.get("x-profile", "").lower() in ("1", "true", "yes")
+        and _has_bearer_token(request, "DEBUG_ADMIN_TOKEN")
+    )
+
+
+def _has_bearer_token(request: Request, env_var: str) -> bool:
+    """True when the request carries the (non-empty) token in *env_var* as a bearer token."""
+    token = os.getenv(env_var, "")
+    auth = request.headers.get("authorization", "")
+    return bool(token) and auth.startswith("Bearer ") and hmac.compare_digest(auth[7:].strip(), token)
+
+
+def _require_debug_admin(request: Request) -> None:
+    """Debug endpoints expose patient data: DEBUG_ADMIN_TOKEN required, and 404 when unset."""
+    if not os.getenv("DEBUG_ADMIN_TOKEN"):
+        raise HTTPException(status_code=404, detail="Debug endpoints are disabled (set DEBUG_ADMIN_TOKEN)")
+    if not _has_bearer_token(request, "DEBUG_ADMIN_TOKEN"):
+        raise HTTPException(status_code=401, detail="Admin token required", headers={"WWW-Authenticate": "Bearer"})
+
+
+def _busy_exception(rejected: AdmissionRejected) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail=f"Diagnosis service is at capacity ({rejected.reason}). Please retry shortly.",
+        headers={"Retry-After": str(rejected.retry_after)},
+    )
+
+
+def _pipeline_kwargs(req: DiagnosisRequest, streaming: bool = True) -> dict:
+    """Keyword arguments for OrchestratorAgent.run_diagnosis_streaming (or run_diagnosis)."""
+    kwargs = dict(
+        symptoms=req.symptoms,
+        age=req.age,
+        gender=req.gender,
+        duration=req.duration,
+        severity=req.severity,
+        image_base64=getattr(req, 'image_base64', None),
+        medical_history=req.medical_history,
+        current_medications=req.current_medications,
+        allergies=req.allergies,
+        family_history=req.family_history,
+        social_history=req.social_history,
+        model_preference=req.model_preference,
+        emergency_fast_path=req.emergency_fast_path,
+    )
+    if streaming:
+        kwargs["continue_after_emergency"] = req.continue_after_emergency
+    return kwargs
+
+
 def _resolve_key_with_fallback(model_pref: str, all_keys: dict, fallback_key=None) -> tuple[Optional[str], str]:
     """Resolve API key based on model preference with fallback to any available key.
 
@@ -146,6 +280,7 @@ def _resolve_key_with_fallback(model_pref: str, all_keys: dict, fallback_key=Non
 
 def _fallback_diagnosis(req: DiagnosisRequest) -> dict:
     """Basic keyword-based response when no AI key is available."""
+    FALLBACKS.inc(kind="keyword")
     symptoms_lower = req.symptoms.lower()
     conditions = []
 
@@ -198,6 +333,7 @@ def _fallback_diagnosis(req: DiagnosisRequest) -> dict:
 
 async def _openai_diagnosis(api_key: str, req: DiagnosisRequest) -> dict:
     """Fallback: use OpenAI GPT-4o for diagnosis when no Anthropic key is available."""
+    FALLBACKS.inc(kind="openai_single_model")
     import time
     from openai import OpenAI
 
@@ -325,9 +461,20 @@ async def health_check():
         "architecture": "multi-agent",
         "agents": ["triage", "diagnostician", "specialist", "treatment"],
         "cors": "enabled",
+        "admission": admission.stats(),
+        "jobs": await job_manager.stats(),
+        "profiling": profiler.stats(),
+        "agent_timeouts": timeouts.stats(),
+        "warmup": warmup.stats(),
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus scrape endpoint."""
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.post("/api/validate-key")
 @limiter.limit("10/minute")
 async def validate_api_key(
@@ -451,7 +598,7 @@ async def validate_api_key(
 
 
 @app.post("/api/diagnose")
-@limiter.limit("20/hour")
+@limiter.shared_limit("20/hour", scope="diagnose")
 async def diagnose_symptoms(
     diagnosis_request: DiagnosisRequest,
     http_request: Request,
@@ -500,46 +647,91 @@ async def diagnose_symptoms(
             openai_key=all_keys.get("openai"),
             google_key=all_keys.get("google"),
         )
-        result = await orchestrator.run_diagnosis(
-            symptoms=diagnosis_request.symptoms,
-            age=diagnosis_request.age,
-            gender=diagnosis_request.gender,
-            duration=diagnosis_request.duration,
-            severity=diagnosis_request.severity,
-            language=diagnosis_request.language,
-            image_base64=diagnosis_request.image_base64,
-            medical_history=diagnosis_request.medical_history,
-            current_medications=diagnosis_request.current_medications,
-            allergies=diagnosis_request.allergies,
-            family_history=diagnosis_request.family_history,
-            social_history=diagnosis_request.social_history,
-            model_preference=diagnosis_request.model_preference,
-            specialist_routing=diagnosis_request.specialist_routing,
-        )
+        try:
+            async with admission.slot(_tenant_key(http_request)):
+                with profiler.session(uuid.uuid4().hex, profiler.wanted(_profile_requested(http_request))) as profile:
+                    result = await orchestrator.run_diagnosis(**_pipeline_kwargs(diagnosis_request, streaming=False))
+        except AdmissionRejected as rejected:
+            logger.warning("Diagnosis shed by admission control: %s", rejected)
+            raise _busy_exception(rejected)
 
         logger.info(
-            "Multi-agent diagnosis complete in %.1fs (agents: %s, specialist: %s)",
+            "Multi-agent diagnosis complete in %.1fs (agents: %s, emergency: %s)",
             result.get("total_time", 0),
             ", ".join(result.get("agents_used", [])),
-            diagnosis_request.specialist_routing or "generic",
+            bool(result.get("emergency")),
         )
 
-        # Debug: dump result to file for inspection
-        try:
-            import pathlib
-            debug_path = pathlib.Path(__file__).parent / "_debug_last_result.json"
-            debug_path.write_text(json.dumps(result, indent=2, default=str), encoding="utf-8")
-            logger.info("Debug result written to %s", debug_path)
-        except Exception as dbg_err:
-            logger.warning("Failed to write debug result: %s", dbg_err)
-
+        if profile is not None:
+            result["profile"] = profile.summary
+        result_capture.capture("diagnose", result)
         return result
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Diagnosis error: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Diagnosis failed: {str(e)}")
 
 
+async def _stream_run_events(run_id: str, after: int, http_request: Request, first_event: dict):
+    """SSE generator: replay a run's events after seq *after*, then follow it live."""
+    run = run_registry.get(run_id)
+    delivered = False
+    try:
+        # Immediate first event to establish connection in browser
+        yield {"data": json.dumps(first_event)}
+        events = run.follow(after) if run else run_registry.follow_remote(run_id, after)
+        async with aclosing(events):
+            try:
+                async for item in events:
+                    if await http_request.is_disconnected():
+                        logger.info("Stream client disconnected from run %s", run_id)
+                        break
+                    if item is None:
+                        yield {"comment": "keepalive"}
+                        continue
+                    # Payload was serialized once when the run logged it
+                    yield {"id": item.id, "data": item.data}
+                    if item.event in TERMINAL_EVENTS:
+                        delivered = True
+                        break
+            except ReplayTruncated as e:
+                # Fell behind the run log's buffer: say so rather than skip events
+                logger.warning("Stream for run %s fell behind its log: %s", run_id, e)
+                yield {"data": json.dumps(e.to_event())}
+    finally:
+        # Runs on normal completion, disconnect, or generator cancellation.
+        # A run whose terminal event was delivered (or at least logged) is not
+        # abandoned, even if its task is still closing vendor clients; any
+        # other run keeps going for a grace period in case the client
+        # reconnects with Last-Event-ID.
+        if run and not delivered and not run.finished:
+            run_registry.release(run)
+
+
+async def _resume_stream(event_id: str, http_request: Request):
+    """EventSourceResponse re-attaching to an existing run, or None if unknown.
+
+    Raises 410 if events after *event_id* have been evicted from the run log.
+    """
+    parsed = parse_event_id(event_id)
+    if not parsed or not await run_registry.exists(parsed[0]):
+        return None
+    run_id, after = parsed
+    try:
+        await run_registry.check_replay(run_id, after)
+    except ReplayTruncated as e:
+        raise HTTPException(status_code=410, detail=e.to_event())
+    logger.info("Resuming stream for run %s after event %d", run_id, after)
+    from sse_starlette.sse import EventSourceResponse
+    return EventSourceResponse(
+        _stream_run_events(run_id, after, http_request, {"event": "resumed", "run_id": run_id, "after": after}),
+        ping=5,
+        headers={"X-Run-ID": run_id},
+    )
+
+
 @app.post("/api/diagnose/stream")
 async def diagnose_symptoms_stream(
     diagnosis_request: DiagnosisRequest,
@@ -553,10 +745,34 @@ async def diagnose_symptoms_stream(
     Each agent's result is streamed as it completes:
       data: {"event": "agent_complete", "agent": "triage", ...}\n\n
 
+    With emergency_fast_path, a critical triage also emits:
+      data: {"event": "emergency", "result": { ... }}\n\n
+
+    While waiting for a pipeline slot:
+      data: {"event": "queue_position", "position": 3, "eta_seconds": 45.0}\n\n
+
+    Requests are rejected with 503 + Retry-After when the server is at
+    capacity, or with a final {"event": "overloaded", "retry_after": N} if
+    the queue wait later exceeds the SLO.
+
     Final event:
       data: {"event": "complete", "result": { ... }}\n\n
+
+    Every pipeline event carries an SSE id "<run_id>:<seq>".  Reconnecting
+    with a Last-Event-ID header (here or on GET /api/diagnose/stream/{run_id})
+    replays the missed events and attaches to the still-running pipeline
+    instead of starting a new one.  If the missed events were already
+    evicted from the run log (RUN_LOG_MAX_BYTES), the reconnect gets 410.
+    A run cancelled after every client left ends with {"event": "cancelled"}.
     """
     try:
+        last_event_id = http_request.headers.get("last-event-id")
+        if last_event_id:
+            resumed = await _resume_stream(last_event_id, http_request)
+            if resumed is not None:
+                return resumed
+            logger.info("Unknown Last-Event-ID %s — starting a new run", last_event_id)
+
         # Resolve API key based on model preference with automatic fallback
         model_pref = diagnosis_request.model_preference or 'auto'
         all_keys = _get_all_api_keys(http_request)
@@ -595,7 +811,18 @@ async def diagnose_symptoms_stream(
             provider,
         )
 
-        event_queue: asyncio.Queue = asyncio.Queue()
+        # Shed before opening the stream so the client gets a real 503
+        tenant = _tenant_key(http_request)
+        profile_requested = _profile_requested(http_request)
+        try:
+            admission.check()
+        except AdmissionRejected as rejected:
+            logger.warning("Stream shed by admission control: %s", rejected)
+            raise _busy_exception(rejected)
+
+        # The pipeline writes to a run log rather than to this connection, so
+        # a client that drops can resume it
+        run = run_registry.create()
         all_keys = _get_all_api_keys(http_request)
         orchestrator = OrchestratorAgent(
             api_key=api_key if provider != "ollama" else "ollama",
@@ -604,26 +831,29 @@ async def diagnose_symptoms_stream(
         )
 
         # Spawn the streaming pipeline as a background task with error handling
+        async def _report_position(position: int, eta_seconds: float):
+            await run.put({"event": "queue_position", "position": position, "eta_seconds": eta_seconds})
+
         async def _run_streaming_pipeline():
             try:
-                await orchestrator.run_diagnosis_streaming(
-                    event_queue=event_queue,
-                    symptoms=diagnosis_request.symptoms,
-                    age=diagnosis_request.age,
-                    gender=diagnosis_request.gender,
-                    duration=diagnosis_request.duration,
-                    severity=diagnosis_request.severity,
-                    image_base64=getattr(diagnosis_request, 'image_base64', None),
-                    medical_history=diagnosis_request.medical_history,
-                    current_medications=diagnosis_request.current_medications,
-                    allergies=diagnosis_request.allergies,
-                    family_history=diagnosis_request.family_history,
-                    social_history=diagnosis_request.social_history,
-                    model_preference=diagnosis_request.model_preference,
-                )
+                # The run ID doubles as the trace (case correlation) ID
+                with tracer.span("http.diagnose_stream", trace_id=run.run_id, provider=provider):
+                    async with admission.slot(tenant, on_position=_report_position):
+                        # Profiles of streamed cases are stored under the run ID
+                        with profiler.session(run.run_id, profiler.wanted(profile_requested)):
+                            await orchestrator.run_diagnosis_streaming(
+                                event_queue=run, **_pipeline_kwargs(diagnosis_request),
+                            )
+            except AdmissionRejected as rejected:
+                logger.warning("Queued stream shed by admission control: %s", rejected)
+                await run.put({
+                    "event": "overloaded",
+                    "reason": rejected.reason,
+                    "retry_after": rejected.retry_after,
+                })
             except Exception as exc:
                 logger.error("Streaming pipeline crashed: %s", exc, exc_info=True)
-                await event_queue.put({
+                await run.put({
                     "event": "complete",
                     "result": {
                         "answer": f"Diagnosis pipeline error: {exc}",
@@ -638,29 +868,272 @@ async def diagnose_symptoms_stream(
                         "error": str(exc),
                     },
                 })
+            finally:
+                await orchestrator.aclose()
 
-        asyncio.create_task(_run_streaming_pipeline())
-
-        async def event_generator():
-            # Immediate first event to establish connection in browser
-            yield {"data": json.dumps({"event": "started", "message": "Pipeline started"})}
-            while True:
-                try:
-                    event = await asyncio.wait_for(event_queue.get(), timeout=10.0)
-                    yield {"data": json.dumps(event)}
-                    if event.get("event") == "complete":
-                        break
-                except asyncio.TimeoutError:
-                    yield {"comment": "keepalive"}
+        # Keep a reference so the pipeline can be cancelled if the client leaves
+        run_registry.start(run, _run_streaming_pipeline())
 
         from sse_starlette.sse import EventSourceResponse
-        return EventSourceResponse(event_generator(), ping=5)
+        return EventSourceResponse(
+            _stream_run_events(run.run_id, 0, http_request, {"event": "started", "message": "Pipeline started", "run_id": run.run_id}),
+            ping=5,
+            headers={"X-Run-ID": run.run_id},
+        )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Streaming diagnosis error: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Streaming diagnosis failed: {str(e)}")
 
 
+@app.get("/api/diagnose/stream/{run_id}")
+async def resume_diagnosis_stream(
+    run_id: str,
+    http_request: Request,
+    last_event_id: Optional[str] = None,
+):
+    """
+    Re-attach to a streaming diagnosis run.
+
+    Replays events after the Last-Event-ID header (or ?last_event_id=),
+    or the whole run if neither is given, then follows it live.  Works
+    with a plain EventSource, which reconnects with GET.
+    """
+    event_id = http_request.headers.get("last-event-id") or last_event_id or f"{run_id}:0"
+    parsed = parse_event_id(event_id)
+    if not parsed or parsed[0] != run_id:
+        event_id = f"{run_id}:0"
+    resumed = await _resume_stream(event_id, http_request)
+    if resumed is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired diagnosis run")
+    return resumed
+
+
+# ── Async job API ────────────────────────────────────────────────────
+
+async def _run_diagnosis_job(spec: dict, progress: JobProgress) -> dict:
+    """JobManager runner: one diagnosis, with the same provider resolution as /api/diagnose."""
+    diagnosis_request = DiagnosisRequest(**spec["request"])
+    header_keys = spec.get("api_keys") or {}
+    all_keys = {
+        "anthropic": header_keys.get("anthropic") or os.getenv("ANTHROPIC_API_KEY"),
+        "openai": header_keys.get("openai") or os.getenv("OPENAI_API_KEY"),
+        "google": header_keys.get("google") or os.getenv("GOOGLE_API_KEY"),
+    }
+    api_key, provider = _resolve_key_with_fallback(diagnosis_request.model_preference or 'auto', all_keys)
+    if not api_key:
+        return _fallback_diagnosis(diagnosis_request)
+    if provider == "openai":
+        return await _openai_diagnosis(api_key, diagnosis_request)
+    if provider == "ollama":
+        if not diagnosis_request.model_preference or diagnosis_request.model_preference == "auto":
+            diagnosis_request.model_preference = "llama3.1:8b"
+
+    orchestrator = OrchestratorAgent(
+        api_key=api_key if provider != "ollama" else "ollama",
+        openai_key=all_keys.get("openai"),
+        google_key=all_keys.get("google"),
+    )
+
+    async def _report_position(position: int, eta_seconds: float):
+        await progress.put({"event": "queue_position", "position": position, "eta_seconds": eta_seconds})
+
+    try:
+        # The job is already accepted — wait for capacity instead of shedding it
+        async with admission.slot(spec.get("tenant", "jobs"), on_position=_report_position, shed=False):
+            # Job profiles are stored under the job ID (the job's trace ID)
+            with profiler.session(current_trace_id() or uuid.uuid4().hex, profiler.wanted()):
+                await orchestrator.run_diagnosis_streaming(
+                    event_queue=progress, **_pipeline_kwargs(diagnosis_request),
+                )
+    finally:
+        await orchestrator.aclose()
+    if progress.result is not None:
+        result_capture.capture("job", progress.result)
+    return progress.result
+
+
+job_manager = JobManager.from_env(_run_diagnosis_job)
+
+
+def _job_links(job_id: str) -> dict:
+    return {"status_url": f"/api/jobs/{job_id}", "result_url": f"/api/jobs/{job_id}/result"}
+
+
+@app.post("/api/jobs/diagnose", status_code=202)
+@limiter.shared_limit("20/hour", scope="diagnose")
+async def submit_diagnosis_job(
+    diagnosis_request: DiagnosisRequest,
+    http_request: Request,
+):
+    """
+    Submit a diagnosis to run in the background.
+
+    Returns immediately with a job id; poll GET /api/jobs/{job_id} for
+    status and per-agent progress, then fetch GET /api/jobs/{job_id}/result.
+
+    Jobs share /api/diagnose's rate limit, so queueing work is no way
+    around it.  A job submitted without API key headers runs on the
+    server's keys, exactly like a keyless /api/diagnose call, and counts
+    against that same limit.
+    """
+    spec = {
+        "request": diagnosis_request.model_dump(),
+        # Caller's own keys only; env keys are resolved by the worker
+        "api_keys": {
+            "anthropic": http_request.headers.get("x-anthropic-api-key"),
+            "openai": http_request.headers.get("x-openai-api-key"),
+            "google": http_request.headers.get("x-google-api-key"),
+        },
+        "tenant": _tenant_key(http_request),
+    }
+    try:
+        job = await job_manager.submit(spec)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=f"Job queue is full: {e}", headers={"Retry-After": "60"})
+    logger.info("Queued diagnosis job %s", job["job_id"])
+    return {"job_id": job["job_id"], "status": job["status"], **_job_links(job["job_id"])}
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_diagnosis_job(job_id: str):
+    """Job status, per-agent progress, and the result once it has succeeded."""
+    job = await job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+    return {**job, **_job_links(job_id)}
+
+
+@app.get("/api/jobs/{job_id}/result")
+async def get_diagnosis_job_result(job_id: str):
+    """The final diagnosis; 202 with Retry-After while the job is still running."""
+    job = await job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+    if job["status"] == "succeeded":
+        return job["result"]
+    if job["status"] == "failed":
+        raise HTTPException(status_code=500, detail=f"Diagnosis job failed: {job['error']}")
+    return JSONResponse(
+        status_code=202,
+        content={"job_id": job_id, "status": job["status"], "progress": job["progress"]},
+        headers={"Retry-After": "5"},
+    )
+
+
+# ── Batch API ────────────────────────────────────────────────────────
+
+def _batch_api_keys(request: Request) -> dict[str, Optional[str]]:
+    """Vendor keys for a batch: the caller's own, or the server's for an admin.
+
+    Batches never fall back to the server's keys on their own — only a
+    caller presenting BATCH_ADMIN_TOKEN as a bearer token may spend them.
+    """
+    if _has_bearer_token(request, "BATCH_ADMIN_TOKEN"):
+        return _get_all_api_keys(request)
+    keys = {
+        "anthropic": request.headers.get("x-anthropic-api-key"),
+        "openai": request.headers.get("x-openai-api-key"),
+        "google": request.headers.get("x-google-api-key"),
+    }
+    if not keys["anthropic"]:
+        raise HTTPException(
+            status_code=401,
+            detail="Batch diagnosis requires your own X-Anthropic-API-Key header (or an admin token)",
+        )
+    return keys
+
+
+@app.post("/api/batch/diagnose")
+@limiter.limit("5/hour")
+async def batch_diagnose(
+    http_request: Request,
+    backend: str = "pipeline",
+    concurrency: int = 4,
+):
+    """
+    Run a JSONL body of DiagnosisRequests (one per line, optional "id").
+
+    Streams back one JSONL record per input line as cases finish:
+      {"line": 3, "case_id": "...", "status": "ok", "duplicate_of": null, "result": { ... }}
+
+    Identical cases run once.  Pipeline cases share a pool of orchestrators
+    and go through the server-wide admission controller; backend
+    "anthropic-batch" uses the discounted Message Batches API instead.
+
+    Runs on the caller's X-Anthropic-API-Key; the server's own keys are used
+    only with an admin bearer token (BATCH_ADMIN_TOKEN).
+    """
+    if backend not in BATCH_BACKENDS:
+        raise HTTPException(status_code=400, detail=f"backend must be one of {', '.join(BATCH_BACKENDS)}")
+    all_keys = _batch_api_keys(http_request)
+    body = (await http_request.body()).decode("utf-8", errors="replace")
+    cases = parse_cases(body.splitlines())
+    if not cases:
+        raise HTTPException(status_code=400, detail="Request body must be JSONL with at least one case")
+    if len(cases) > MAX_BATCH_CASES:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH_CASES} cases per batch")
+
+    if not all_keys.get("anthropic"):
+        raise HTTPException(status_code=400, detail="Batch diagnosis requires an Anthropic API key")
+    # Never let one batch take every pipeline slot from interactive users
+    concurrency = max(1, min(concurrency, max(1, admission.max_inflight // 2)))
+    runner = make_backend(
+        backend, all_keys["anthropic"], all_keys.get("openai"), all_keys.get("google"),
+        concurrency=concurrency, admission=admission, tenant=_tenant_key(http_request),
+    )
+    logger.info("Batch diagnosis: %d cases, backend=%s, concurrency=%d", len(cases), backend, concurrency)
+
+    async def result_lines():
+        try:
+            async for record in run_batch(cases, runner):
+                yield json.dumps(record, default=str) + "\n"
+        finally:
+            await runner.aclose()
+
+    return StreamingResponse(result_lines(), media_type="application/x-ndjson")
+
+
+# ── Medication safety (LLM-free) ─────────────────────────────────────
+
+def _medication_safety(patients: list[MedicationSafetyRequest]) -> list[dict]:
+    from agents.med_safety import med_safety
+
+    results = []
+    for patient in patients:
+        result = med_safety.check(**patient.model_dump(exclude={"id"}))
+        if patient.id is not None:
+            result["id"] = patient.id
+        results.append(result)
+    return results
+
+
+@app.post("/api/medication-safety/check")
+@limiter.limit("600/minute")
+async def check_medication_safety(req: MedicationSafetyRequest, http_request: Request):
+    """
+    Check one regimen against the contraindication, allergy, interaction
+    and combination databases — no LLM call, no API key needed.
+    """
+    if not req.medications:
+        raise HTTPException(status_code=400, detail="medications must not be empty")
+    results = await asyncio.to_thread(_medication_safety, [req])
+    return results[0]
+
+
+@app.post("/api/medication-safety/check-batch")
+@limiter.limit("60/minute")
+async def check_medication_safety_batch(req: MedicationSafetyBatchRequest, http_request: Request):
+    """Bulk variant of /api/medication-safety/check: one result per patient, in order."""
+    if len(req.patients) > MAX_MED_SAFETY_PATIENTS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_MED_SAFETY_PATIENTS} patients per request")
+    # Pure CPU work; keep large batches off the event loop
+    results = await asyncio.to_thread(_medication_safety, req.patients)
+    return {"results": results, "count": len(results)}
+
+
 @app.post("/api/followup")
 async def followup_question(
     followup_req: FollowupRequest,
@@ -923,6 +1396,43 @@ async def list_agents():
     }
 
 
+@app.get("/debug/results")
+async def debug_results(http_request: Request):
+    """Recently captured results (newest first); 404 unless capture is enabled.  Admin only."""
+    _require_debug_admin(http_request)
+    if not result_capture.enabled:
+        raise HTTPException(status_code=404, detail="Result capture is disabled (set RESULT_CAPTURE_RATE)")
+    return {"captures": result_capture.recent(), **result_capture.stats()}
+
+
+@app.get("/debug/results/{capture_id}")
+async def debug_result(capture_id: str, http_request: Request):
+    _require_debug_admin(http_request)
+    if not result_capture.enabled:
+        raise HTTPException(status_code=404, detail="Result capture is disabled (set RESULT_CAPTURE_RATE)")
+    entry = result_capture.get(capture_id)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Capture not in buffer")
+    return entry
+
+
+@app.get("/debug/profiles")
+async def debug_profiles(http_request: Request):
+    """Summaries of recently profiled cases (newest first).  Admin only."""
+    _require_debug_admin(http_request)
+    return {"profiles": profiler.recent(), **profiler.stats()}
+
+
+@app.get("/debug/profiles/{profile_id}", response_class=PlainTextResponse)
+async def debug_profile(profile_id: str, http_request: Request):
+    """Collapsed stacks for one case — pipe into flamegraph.pl or open in speedscope.  Admin only."""
+    _require_debug_admin(http_request)
+    session = profiler.get(profile_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Profile not in buffer")
+    return PlainTextResponse(session.collapsed())
+
+
 @app.get("/debug")
 async def debug_info():
     return {
@@ -937,6 +1447,7 @@ async def debug_info():
             "POST /api/generate-question",
             "GET /api/agents",
             "GET /debug",
+            "GET /debug/results",
             "GET /docs",
         ],
         "cors_enabled": True,
@@ -986,24 +1497,45 @@ def _resolve_taxonomy_terms(specialty: str) -> list[str]:
     return terms if terms else [specialty]
 
 
-async def _npi_search(client, taxonomy: str, postal_code: str = "", city: str = "", state: str = "", limit: int = 10):
-    """Run a single NPI registry search and return parsed results."""
-    params = {
-        "version": "2.1",
-        "enumeration_type": "NPI-1",
-        "taxonomy_description": taxonomy,
-        "limit": limit,
-    }
-    if postal_code:
-        params["postal_code"] = postal_code
-    if city:
-        params["city"] = city
-    if state:
-        params["state"] = state
+async def _search_doctors(
+    terms: list[str], specialty_label: str, postal_code: str = "", city: str = "", state: str = "", limit: int = 10,
+) -> list[list[dict]]:
+    """Doctor records per taxonomy term: local snapshot first, live NPI registry for the misses."""
+    per_term = provider_directory.search_terms(terms, postal_code, city, state, limit, specialty_label)
+    # Only terms before the local results already fill ``limit`` are worth a registry call
+    misses, local = [], set()
+    for i, records in enumerate(per_term):
+        if len(local) >= limit:
+            break
+        if records is None:
+            misses.append(i)
+        else:
+            local.update(r["npi"] for r in records)
+    if misses and NPI_LIVE_FALLBACK:
+        live = await npi_client.search_terms(
+            [terms[i] for i in misses], postal_code=postal_code, city=city, state=state, limit=limit,
+        )
+        for i, raw in zip(misses, live):
+            per_term[i] = _parse_npi_results(raw, specialty_label)
+    return [records or [] for records in per_term]
 
-    resp = await client.get("https://npiregistry.cms.hhs.gov/api/", params=params)
-    data = resp.json()
-    return data.get("results", [])
+
+def _take_npi_results(per_term: list[list[dict]], target: int, seen: set[int] | None = None) -> list[dict]:
+    """Concatenate per-term results in order, up to the term that reaches ``target``.
+
+    The same provider can come back under several taxonomy terms; only its
+    first record is taken, and NPIs already in *seen* are skipped.
+    """
+    seen = set() if seen is None else seen
+    taken = []
+    for records in per_term:
+        for doctor in records:
+            if doctor["npi"] not in seen:
+                seen.add(doctor["npi"])
+                taken.append(doctor)
+        if len(taken) >= target:
+            break
+    return taken
 
 
 def _parse_npi_results(raw_results: list, specialty_label: str) -> list[dict]:
@@ -1011,7 +1543,11 @@ def _parse_npi_results(raw_results: list, specialty_label: str) -> list[dict]:
     results = []
     seen_npis = set()
     for r in raw_results:
-        npi = r.get("number", "")
+        # The NPI stays a number in the response, as in snapshot records
+        try:
+            npi = int(r.get("number"))
+        except (TypeError, ValueError):
+            continue
         if npi in seen_npis:
             continue
         seen_npis.add(npi)
@@ -1072,9 +1608,10 @@ async def find_doctors(
     Search the NPI Registry (free, no API key) for healthcare providers
     by specialty and location (zip code, city, or state).
     Handles compound specialty names and broadens search if needed.
+    Answered from the local provider snapshot (PROVIDER_DIRECTORY_PATH) when
+    configured; other taxonomy terms are queried concurrently through the
+    shared NPI client.
     """
-    import httpx
-
     # Parse location
     loc = location.strip()
     postal_code = ""
@@ -1097,24 +1634,24 @@ async def find_doctors(
     target_limit = min(limit, 20)
 
     try:
-        all_raw = []
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            # Search each taxonomy term
-            for term in taxonomy_terms:
-                raw = await _npi_search(client, term, postal_code=postal_code, city=city, state=state, limit=target_limit)
-                all_raw.extend(raw)
-                if len(all_raw) >= target_limit:
-                    break
-
-            # If zip code search returned too few, broaden to zip prefix (e.g., 816*)
-            if len(all_raw) < 3 and postal_code and len(postal_code) == 5:
-                for term in taxonomy_terms:
-                    raw = await _npi_search(client, term, postal_code=postal_code[:3] + "*", limit=target_limit)
-                    all_raw.extend(raw)
-                    if len(all_raw) >= target_limit:
-                        break
+        # Search every taxonomy term at once; keep term order and stop where
+        # enough distinct providers are in
+        seen_npis: set[int] = set()
+        found = _take_npi_results(
+            await _search_doctors(taxonomy_terms, specialty, postal_code=postal_code, city=city, state=state, limit=target_limit),
+            target_limit,
+            seen_npis,
+        )
+
+        # If zip code search returned too few, broaden to zip prefix (e.g., 816*)
+        if len(found) < 3 and postal_code and len(postal_code) == 5:
+            found.extend(_take_npi_results(
+                await _search_doctors(taxonomy_terms, specialty, postal_code=postal_code[:3] + "*", limit=target_limit),
+                target_limit - len(found),
+                seen_npis,
+            ))
 
-        results = _parse_npi_results(all_raw, specialty)[:target_limit]
+        results = found[:target_limit]
         return {"results": results, "count": len(results)}
 
     except Exception as e:
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 
 
@@ -18,6 +18,9 @@ class DiagnosisRequest(BaseModel):
     social_history: Optional[str] = None
     # Model selection
     model_preference: str = "auto"  # "auto", "opus", "sonnet", "haiku"
+    # Emergency fast path: answer from triage alone on ESI-1/ESI-2 cases
+    emergency_fast_path: bool = False
+    continue_after_emergency: bool = True  # streaming only: keep refining after the emergency event
 
 
 class FollowupRequest(BaseModel):
@@ -35,3 +38,23 @@ class QuestionGenerationRequest(BaseModel):
     previous_questions: list[str] = []
     questions_asked: int = 0
     total_ai_questions: int = 4
+
+
+# Medication safety checks are O(n^2) in regimen size; bound every list
+MAX_REGIMEN_MEDICATIONS = 100
+MAX_PATIENT_FACTS = 200
+MAX_MED_SAFETY_BATCH = 1000
+
+
+class MedicationSafetyRequest(BaseModel):
+    medications: list[str] = Field(max_length=MAX_REGIMEN_MEDICATIONS)
+    current_medications: list[str] = Field(default=[], max_length=MAX_REGIMEN_MEDICATIONS)
+    conditions: list[str] = Field(default=[], max_length=MAX_PATIENT_FACTS)
+    allergies: list[str] = Field(default=[], max_length=MAX_PATIENT_FACTS)
+    age: int = 30
+    gender: str = "unknown"
+    id: Optional[str] = None  # caller label, echoed back
+
+
+class MedicationSafetyBatchRequest(BaseModel):
+    patients: list[MedicationSafetyRequest] = Field(max_length=MAX_MED_SAFETY_BATCH)
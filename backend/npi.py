@@ -0,0 +1,194 @@
+"""
+Process-wide client for the NPI Registry (GET /api/find-doctors).
+
+/api/find-doctors used to open a new HTTP client per request and query
+each taxonomy term of a specialty one after another.  The NPIClient:
+
+  * Keeps one pooled, keep-alive connection to the registry per worker
+    (HTTP/2 when the ``h2`` package is installed, otherwise HTTP/1.1)
+  * Fans out over taxonomy terms concurrently, so a compound specialty
+    costs about one round-trip instead of one per term
+  * Coalesces identical in-flight queries into one registry request
+  * Caches results per (taxonomy, location) for NPI_CACHE_TTL_SECONDS; a
+    cached answer serves any request with the same or a smaller limit
+
+Failed lookups and registry error responses are not cached.  The HTTP
+client is created lazily on first use, so each pre-forked worker opens
+its own connections.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any
+
+from agents.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+NPI_API_URL = "https://npiregistry.cms.hhs.gov/api/"
+
+DEFAULT_CACHE_TTL_SECONDS = 3600.0
+DEFAULT_CACHE_SIZE = 2048
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_TIMEOUT_SECONDS = 15.0
+
+NPI_LOOKUPS = Counter(
+    "npi_lookups_total",
+    "NPI registry taxonomy lookups, by outcome (cache_hit, coalesced, fetched, error)",
+    ("outcome",),
+)
+
+# (taxonomy, postal_code, city, state)
+QueryKey = tuple[str, str, str, str]
+
+
+class NPIClient:
+    """Pooled, caching, request-coalescing NPI registry client."""
+
+    def __init__(
+        self,
+        cache_ttl: float = DEFAULT_CACHE_TTL_SECONDS,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        http2: bool = True,
+    ):
+        self.cache_ttl = max(0.0, cache_ttl)
+        self.cache_size = max(1, cache_size)
+        self.max_connections = max(1, max_connections)
+        self.timeout = timeout
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        if http2 and not self.http2:
+            logger.info("h2 not installed; NPI client uses HTTP/1.1 keep-alive")
+        self._client = None
+        # key -> (expires_at, limit requested, results)
+        self._cache: OrderedDict[QueryKey, tuple[float, int, list[dict]]] = OrderedDict()
+        self._inflight: dict[tuple[QueryKey, int], asyncio.Task] = {}
+
+    @classmethod
+    def from_env(cls) -> "NPIClient":
+        """Build a client from NPI_CACHE_TTL_SECONDS / NPI_CACHE_SIZE / NPI_MAX_CONNECTIONS / NPI_TIMEOUT_SECONDS / NPI_HTTP2."""
+        http2 = os.getenv("NPI_HTTP2", "true").lower() != "false"
+        try:
+            return cls(
+                cache_ttl=float(os.getenv("NPI_CACHE_TTL_SECONDS", DEFAULT_CACHE_TTL_SECONDS)),
+                cache_size=int(os.getenv("NPI_CACHE_SIZE", DEFAULT_CACHE_SIZE)),
+                max_connections=int(os.getenv("NPI_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)),
+                timeout=float(os.getenv("NPI_TIMEOUT_SECONDS", DEFAULT_TIMEOUT_SECONDS)),
+                http2=http2,
+            )
+        except ValueError as e:
+            logger.warning("Ignoring invalid NPI client settings: %s", e)
+            return cls(http2=http2)
+
+    # ------------------------------------------------------------------
+    # Connection pool
+    # ------------------------------------------------------------------
+
+    def _http(self):
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                http2=self.http2,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def _cached(self, key: QueryKey, limit: int) -> list[dict] | None:
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expires_at, cached_limit, results = entry
+        if expires_at < time.monotonic():
+            del self._cache[key]
+            return None
+        # A smaller limit is a prefix of a larger one; a short answer is complete
+        if limit <= cached_limit or len(results) < cached_limit:
+            self._cache.move_to_end(key)
+            return results[:limit]
+        return None
+
+    async def _fetch(self, key: QueryKey, limit: int) -> list[dict]:
+        taxonomy, postal_code, city, state = key
+        params: dict[str, Any] = {
+            "version": "2.1",
+            "enumeration_type": "NPI-1",
+            "taxonomy_description": taxonomy,
+            "limit": limit,
+        }
+        if postal_code:
+            params["postal_code"] = postal_code
+        if city:
+            params["city"] = city
+        if state:
+            params["state"] = state
+
+        try:
+            resp = await self._http().get(NPI_API_URL, params=params)
+            data = resp.json()
+        except Exception:
+            NPI_LOOKUPS.inc(outcome="error")
+            raise
+        NPI_LOOKUPS.inc(outcome="fetched")
+        results = data.get("results", [])
+        if resp.status_code == 200 and not data.get("Errors") and self.cache_ttl > 0:
+            self._cache[key] = (time.monotonic() + self.cache_ttl, limit, results)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return results
+
+    async def search(
+        self, taxonomy: str, postal_code: str = "", city: str = "", state: str = "", limit: int = 10,
+    ) -> list[dict]:
+        """Raw registry results for one taxonomy term and location."""
+        key: QueryKey = (taxonomy, postal_code, city, state)
+        cached = self._cached(key, limit)
+        if cached is not None:
+            NPI_LOOKUPS.inc(outcome="cache_hit")
+            return cached
+
+        flight = (key, limit)
+        task = self._inflight.get(flight)
+        if task is not None:
+            NPI_LOOKUPS.inc(outcome="coalesced")
+        else:
+            task = asyncio.ensure_future(self._fetch(key, limit))
+            self._inflight[flight] = task
+            task.add_done_callback(lambda t: self._landed(flight, t))
+        # Shielded so one caller disconnecting does not cancel the others' lookup
+        return await asyncio.shield(task)
+
+    def _landed(self, flight: tuple[QueryKey, int], task: asyncio.Task) -> None:
+        self._inflight.pop(flight, None)
+        # Mark the failure retrieved even if every waiter has gone away
+        if not task.cancelled():
+            task.exception()
+
+    async def search_terms(
+        self, taxonomies: list[str], postal_code: str = "", city: str = "", state: str = "", limit: int = 10,
+    ) -> list[list[dict]]:
+        """``search`` for every taxonomy term concurrently; results in term order."""
+        return list(await asyncio.gather(*(
+            self.search(t, postal_code=postal_code, city=city, state=state, limit=limit) for t in taxonomies
+        )))
@@ -0,0 +1,207 @@
+"""
+Pre-fork server: load once in the master, fork uvicorn workers.
+
+``uvicorn main:app --workers N`` spawns N fresh interpreters, each importing
+and building everything on its own.  Here the master process instead
+
+  * imports the app and every agent module and compiles/reads the
+    knowledge store (agents.warmup.preload)
+  * runs a full collection and ``gc.freeze()``, moving every surviving
+    object into the permanent generation so the cyclic GC in the workers
+    never walks (and so never writes to) the inherited pages
+  * binds the listening socket and forks the workers, which share all of
+    the above copy-on-write; the clinical knowledge itself lives in the
+    memory-mapped store, so touching it never dirties a private page
+
+Dead workers are replaced, with exponential back-off for a worker that
+keeps dying at startup; after WORKER_MAX_STARTUP_CRASHES such crashes in
+a row its slot is given up, and the master exits once no worker is left.
+SIGTERM/SIGINT are forwarded for a graceful stop.
+
+    python prefork.py --workers 4 --port 8000
+
+Process-local state (admission slots, in-memory run logs and jobs) is per
+worker, as with ``--workers``; use the Redis backends to share it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+
+logger = logging.getLogger("prefork")
+
+WORKER_RESTART_BACKOFF_SECONDS = 1.0
+WORKER_MAX_RESTART_BACKOFF_SECONDS = 60.0
+# A worker that dies sooner than this after it was spawned crashed at startup
+WORKER_MIN_UPTIME_SECONDS = 10.0
+WORKER_MAX_STARTUP_CRASHES = 5
+
+
+class RestartPolicy:
+    """How long to wait before respawning a worker slot, or None to give it up."""
+
+    def __init__(
+        self,
+        backoff: float = WORKER_RESTART_BACKOFF_SECONDS,
+        max_backoff: float = WORKER_MAX_RESTART_BACKOFF_SECONDS,
+        min_uptime: float = WORKER_MIN_UPTIME_SECONDS,
+        max_crashes: int = WORKER_MAX_STARTUP_CRASHES,
+    ):
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.min_uptime = min_uptime
+        self.max_crashes = max_crashes
+        self._crashes: dict[int, int] = {}  # worker index -> startup crashes in a row
+
+    def delay(self, index: int, uptime: float) -> float | None:
+        if uptime >= self.min_uptime:
+            self._crashes[index] = 0
+            return self.backoff
+        crashes = self._crashes.get(index, 0) + 1
+        self._crashes[index] = crashes
+        if crashes > self.max_crashes:
+            return None
+        return min(self.backoff * 2 ** (crashes - 1), self.max_backoff)
+
+
+def describe_exit(status: int) -> str:
+    """Readable form of an ``os.wait`` status."""
+    code = os.waitstatus_to_exitcode(status)
+    if code < 0:
+        try:
+            return f"killed by {signal.Signals(-code).name}"
+        except ValueError:
+            return f"killed by signal {-code}"
+    return f"exited with code {code}"
+
+
+def preload_app():
+    """Import and warm everything the workers need, then freeze the heap."""
+    t0 = time.perf_counter()
+    from main import app
+    from agents.knowledge_store import knowledge
+    from agents.warmup import preload
+
+    details = preload()
+    # Each worker opens its own SQLite connection; the mapped pages are shared anyway
+    knowledge.close()
+    gc.collect()
+    gc.freeze()
+    logger.info(
+        "Preloaded app in %.0fms (%s); %d objects frozen",
+        (time.perf_counter() - t0) * 1000, details, gc.get_freeze_count(),
+    )
+    return app
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(app, sock: socket.socket, log_level: str) -> None:
+    import uvicorn
+
+    # Default signal handling; uvicorn installs its own for graceful shutdown
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    config = uvicorn.Config(app, log_level=log_level, lifespan="on")
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def serve(host: str, port: int, workers: int, log_level: str = "info") -> int:
+    """Run until stopped; returns the exit status (1 if every worker was given up)."""
+    app = preload_app()
+    sock = _bind(host, port)
+    children: dict[int, tuple[int, float]] = {}  # pid -> (worker index, spawned at)
+    respawns: dict[int, float] = {}  # worker index -> monotonic time to respawn it
+    policy = RestartPolicy()
+    stopping = False
+
+    def spawn(index: int) -> None:
+        pid = os.fork()
+        if pid == 0:
+            try:
+                _run_worker(app, sock, log_level)
+            finally:
+                os._exit(0)
+        children[pid] = (index, time.monotonic())
+        logger.info("Worker %d started (pid %d)", index, pid)
+
+    def stop(signum, _frame) -> None:
+        nonlocal stopping
+        stopping = True
+        respawns.clear()
+        for pid in list(children):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for i in range(workers):
+        spawn(i)
+    logger.info("Serving on %s:%d with %d pre-forked workers", host, port, workers)
+
+    while children or (respawns and not stopping):
+        now = time.monotonic()
+        for index, due in list(respawns.items()):
+            if due <= now and not stopping:
+                del respawns[index]
+                spawn(index)
+        try:
+            # Poll while a respawn is waiting out its back-off
+            pid, status = os.waitpid(-1, os.WNOHANG if respawns else 0)
+        except ChildProcessError:
+            pid = 0
+        if pid == 0:
+            time.sleep(0.1)
+            continue
+        child = children.pop(pid, None)
+        if child is None or stopping:
+            continue
+        index, spawned = child
+        delay = policy.delay(index, time.monotonic() - spawned)
+        if delay is None:
+            logger.error(
+                "Worker %d (pid %d) %s; it crashed at startup %d times in a row, not restarting it",
+                index, pid, describe_exit(status), policy.max_crashes + 1,
+            )
+            continue
+        logger.warning("Worker %d (pid %d) %s; restarting in %.0fs", index, pid, describe_exit(status), delay)
+        respawns[index] = time.monotonic() + delay
+    sock.close()
+    if not stopping:
+        logger.error("No workers left; exiting")
+        return 1
+    return 0
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the API with pre-forked, copy-on-write-sharing workers")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", "2")))
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+    if not hasattr(os, "fork"):
+        sys.exit("Pre-fork mode needs os.fork (Linux/macOS); use `uvicorn main:app --workers N` instead")
+    sys.exit(serve(args.host, args.port, max(1, args.workers), args.log_level))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+"""
+Local provider directory for offline doctor search.
+
+GET /api/find-doctors queries the live CMS NPI Registry, which is slow,
+rate-limited and unreachable from air-gapped deployments.  This module
+imports the NPPES bulk dissemination file into a read-only SQLite snapshot
+and answers the same searches locally:
+
+  * Individual providers (entity type 1) with an active NPI are kept; each
+    is stored once as a precomputed ``_parse_npi_results``-shaped record
+  * Every (taxonomy code, practice location) pair is indexed by zip,
+    zip3 (for the "816*" fallback), state and city/state
+  * Taxonomy search terms ("Family Medicine") resolve to NUCC codes by
+    classification / specialization, as the registry's
+    ``taxonomy_description`` filter does
+  * The snapshot is memory-mapped read-only, so every worker shares the
+    pages and a search is a few index probes (well under a millisecond)
+
+A search the snapshot cannot answer — an unknown taxonomy term, or a
+location outside a partial (``--states``) import — is a miss, and
+/api/find-doctors sends only those terms to the live registry.  On a
+partial import a city is only covered together with its state: a bare
+"Aurora" may be the one in a state that was not imported.
+
+    python -m provider_directory npidata_pfile_20240101-20240107.csv \\
+        --taxonomy nucc_taxonomy_240.csv -o providers.sqlite [--states CO,WY]
+
+Files: https://download.cms.gov/nppes/NPI_Files.html (NPPES) and
+https://nucc.org (taxonomy code set CSV).
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable
+
+logger = logging.getLogger(__name__)
+
+MMAP_SIZE = 1 << 30
+_BATCH_ROWS = 50_000
+_MAX_TAXONOMY_SLOTS = 15
+_MAX_TERM_CACHE = 1024
+
+
+# ---------------------------------------------------------------------------
+# Import
+# ---------------------------------------------------------------------------
+
+def load_taxonomy_codes(path: str | Path) -> dict[str, tuple[str, str]]:
+    """NUCC taxonomy CSV -> {code: (classification, specialization)}."""
+    codes = {}
+    with open(path, newline="", encoding="utf-8-sig", errors="replace") as f:
+        for row in csv.DictReader(f):
+            code = (row.get("Code") or "").strip()
+            if code:
+                codes[code] = ((row.get("Classification") or "").strip(), (row.get("Specialization") or "").strip())
+    return codes
+
+
+def taxonomy_description(classification: str, specialization: str) -> str:
+    return f"{classification}, {specialization}" if specialization else classification
+
+
+def format_phone(number: str) -> str:
+    """NPPES snapshot digits ("3035550100") in the registry API's format ("303-555-0100")."""
+    digits = "".join(ch for ch in number if ch.isdigit())
+    if len(digits) == 11 and digits[0] == "1":
+        digits = digits[1:]
+    if len(digits) != 10:
+        return number
+    return f"{digits[:3]}-{digits[3:6]}-{digits[6:]}"
+
+
+def provider_record(row: dict[str, str], taxonomies: dict[str, tuple[str, str]]) -> tuple[dict, list[str]] | None:
+    """(doctor record, taxonomy codes) for one NPPES row, or None if it is not an active individual.
+
+    The record has the fields ``_parse_npi_results`` builds from a registry
+    API result; ``specialty`` is None when the primary taxonomy is unknown.
+    """
+    if row.get("Entity Type Code") != "1" or not row.get("NPI", "").isdigit():
+        return None
+    if row.get("NPI Deactivation Date") and not row.get("NPI Reactivation Date"):
+        return None
+
+    codes, primary_code, primary_license_state = [], None, ""
+    for i in range(1, _MAX_TAXONOMY_SLOTS + 1):
+        code = row.get(f"Healthcare Provider Taxonomy Code_{i}", "")
+        if not code:
+            continue
+        codes.append(code)
+        if primary_code is None and row.get(f"Healthcare Provider Primary Taxonomy Switch_{i}") == "Y":
+            primary_code = code
+            primary_license_state = row.get(f"Provider License Number State Code_{i}", "")
+    if not codes:
+        return None
+    if primary_code is None:
+        primary_code = codes[0]
+        primary_license_state = row.get("Provider License Number State Code_1", "")
+
+    name_parts = [p.title() for p in (row.get("Provider First Name", ""), row.get("Provider Last Name (Legal Name)", "")) if p]
+    full_name = " ".join(name_parts)
+    credential = row.get("Provider Credential Text", "")
+    if credential:
+        full_name += f", {credential}"
+
+    prefix = "Provider Business Practice Location Address"
+    address_lines = [
+        line.title() for line in (
+            row.get("Provider First Line Business Practice Location Address", ""),
+            row.get("Provider Second Line Business Practice Location Address", ""),
+        ) if line
+    ]
+    city_state = []
+    if row.get(f"{prefix} City Name"):
+        city_state.append(row[f"{prefix} City Name"].title())
+    if row.get(f"{prefix} State Name"):
+        city_state.append(row[f"{prefix} State Name"])
+    if row.get(f"{prefix} Postal Code"):
+        city_state.append(row[f"{prefix} Postal Code"][:5])
+    if city_state:
+        address_lines.append(", ".join(city_state))
+
+    primary = taxonomies.get(primary_code)
+    record = {
+        "npi": int(row["NPI"]),
+        "name": full_name,
+        "specialty": taxonomy_description(*primary) if primary else None,
+        "address": "\n".join(address_lines),
+        "phone": format_phone(row.get(f"{prefix} Telephone Number", "")),
+        # Mirrors _parse_npi_results, which reads the primary taxonomy's license state
+        "accepting_patients": primary_license_state != "N",
+    }
+    return record, codes
+
+
+def import_snapshot(
+    npi_csv: str | Path,
+    taxonomy_csv: str | Path,
+    db_path: str | Path,
+    states: Iterable[str] | None = None,
+) -> dict[str, Any]:
+    """Import an NPPES bulk file into a snapshot at *db_path* (replaced atomically)."""
+    t0 = time.perf_counter()
+    taxonomies = load_taxonomy_codes(taxonomy_csv)
+    states = sorted({s.strip().upper() for s in states or () if s.strip()})
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=".providers-", suffix=".sqlite", dir=db_path.parent)
+    os.close(fd)
+    counts = {"rows": 0, "providers": 0, "locations": 0}
+    try:
+        conn = sqlite3.connect(tmp_name)
+        conn.executescript(
+            """
+            PRAGMA journal_mode = OFF;
+            PRAGMA synchronous = OFF;
+            CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE taxonomies (code TEXT PRIMARY KEY, classification TEXT NOT NULL, specialization TEXT NOT NULL);
+            CREATE TABLE providers (npi INTEGER PRIMARY KEY, record TEXT NOT NULL);
+            CREATE TABLE locations (code TEXT NOT NULL, zip5 TEXT NOT NULL, zip3 TEXT NOT NULL,
+                                    state TEXT NOT NULL, city TEXT NOT NULL, npi INTEGER NOT NULL);
+            CREATE TABLE coverage (kind TEXT NOT NULL, value TEXT NOT NULL, PRIMARY KEY (kind, value)) WITHOUT ROWID;
+            """
+        )
+        conn.executemany(
+            "INSERT INTO taxonomies VALUES (?, ?, ?)",
+            ((code, c, s) for code, (c, s) in taxonomies.items()),
+        )
+
+        providers, locations, covered = [], [], set()
+        prefix = "Provider Business Practice Location Address"
+        with open(npi_csv, newline="", encoding="utf-8", errors="replace") as f:
+            for row in csv.DictReader(f):
+                counts["rows"] += 1
+                state = row.get(f"{prefix} State Name", "").upper()
+                if states and state not in states:
+                    continue
+                parsed = provider_record(row, taxonomies)
+                if parsed is None:
+                    continue
+                record, codes = parsed
+                zip5 = row.get(f"{prefix} Postal Code", "")[:5]
+                city = row.get(f"{prefix} City Name", "").upper()
+                providers.append((record["npi"], json.dumps(record)))
+                locations.extend((code, zip5, zip5[:3], state, city, record["npi"]) for code in dict.fromkeys(codes))
+                covered.update((("state", state), ("zip3", zip5[:3])))
+                if len(providers) >= _BATCH_ROWS:
+                    _flush(conn, providers, locations, counts)
+                    logger.info("Imported %d providers (%d rows read)", counts["providers"], counts["rows"])
+        _flush(conn, providers, locations, counts)
+
+        conn.executemany("INSERT OR IGNORE INTO coverage VALUES (?, ?)", ((k, v) for k, v in covered if v))
+        # Indexes end in npi so each probe returns providers in a stable order without sorting
+        conn.executescript(
+            """
+            CREATE INDEX locations_zip5 ON locations (code, zip5, npi);
+            CREATE INDEX locations_zip3 ON locations (code, zip3, npi);
+            CREATE INDEX locations_state ON locations (code, state, npi);
+            CREATE INDEX locations_city ON locations (code, city, state, npi);
+            ANALYZE;
+            """
+        )
+        conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [
+                ("source", Path(npi_csv).name),
+                ("taxonomy_source", Path(taxonomy_csv).name),
+                ("imported_at", time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())),
+                ("states", ",".join(states)),
+                ("providers", str(counts["providers"])),
+            ],
+        )
+        conn.commit()
+        conn.close()
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, db_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    counts["seconds"] = round(time.perf_counter() - t0, 1)
+    logger.info("Provider directory written to %s: %s", db_path, counts)
+    return counts
+
+
+def _flush(conn: sqlite3.Connection, providers: list, locations: list, counts: dict[str, int]) -> None:
+    # A provider listed twice in the file keeps its first record
+    conn.executemany("INSERT OR IGNORE INTO providers VALUES (?, ?)", providers)
+    conn.executemany("INSERT INTO locations VALUES (?, ?, ?, ?, ?, ?)", locations)
+    counts["providers"] += len(providers)
+    counts["locations"] += len(locations)
+    providers.clear()
+    locations.clear()
+
+
+# ---------------------------------------------------------------------------
+# Search
+# ---------------------------------------------------------------------------
+
+class ProviderDirectory:
+    """Read-only provider snapshot; opened on first use. Disabled when no path is set."""
+
+    def __init__(self, db_path: str | Path | None = None):
+        self.db_path = Path(db_path) if db_path else None
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._states: frozenset[str] = frozenset()
+        self._term_codes: dict[str, tuple[str, ...]] = {}
+
+    @classmethod
+    def from_env(cls) -> "ProviderDirectory":
+        return cls(os.getenv("PROVIDER_DIRECTORY_PATH") or None)
+
+    def _open(self) -> sqlite3.Connection | None:
+        if self._conn is not None or self.db_path is None:
+            return self._conn
+        with self._lock:
+            if self._conn is None and self.db_path is not None:
+                try:
+                    # immutable: snapshots are only ever replaced by rename, never modified in place
+                    conn = sqlite3.connect(
+                        f"{self.db_path.resolve().as_uri()}?mode=ro&immutable=1", uri=True, check_same_thread=False,
+                    )
+                    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+                    row = conn.execute("SELECT value FROM meta WHERE name = 'states'").fetchone()
+                except sqlite3.Error as e:
+                    logger.warning("Provider directory %s unavailable, using the live NPI registry: %s", self.db_path, e)
+                    self.db_path = None
+                    return None
+                self._states = frozenset(s for s in (row[0] if row else "").split(",") if s)
+                self._conn = conn
+        return self._conn
+
+    def taxonomy_codes(self, term: str) -> tuple[str, ...]:
+        """NUCC codes whose classification or specialization matches a registry search term."""
+        key = term.strip().lower()
+        codes = self._term_codes.get(key)
+        if codes is None:
+            conn = self._open()
+            pattern = f"%{key}%"
+            codes = tuple(r[0] for r in conn.execute(
+                "SELECT code FROM taxonomies WHERE lower(classification) LIKE ? OR lower(specialization) LIKE ? "
+                "OR lower(classification || ', ' || specialization) = ? ORDER BY code",
+                (pattern, pattern, key),
+            ))
+            if len(self._term_codes) >= _MAX_TERM_CACHE:
+                self._term_codes.clear()
+            self._term_codes[key] = codes
+        return codes
+
+    def _covers(self, conn: sqlite3.Connection, postal_code: str, city: str, state: str) -> bool:
+        if not self._states:
+            return True
+        # Imports are partial by state, so a covered state covers all of its cities
+        if state:
+            return state.upper() in self._states
+        if postal_code:
+            value = postal_code.rstrip("*")[:3]
+            return conn.execute("SELECT 1 FROM coverage WHERE kind = 'zip3' AND value = ?", (value,)).fetchone() is not None
+        # A city name alone can match cities in states the snapshot lacks
+        return False
+
+    def _query(self, conn: sqlite3.Connection, code: str, postal_code: str, city: str, state: str, limit: int) -> list[int]:
+        if postal_code.endswith("*"):
+            prefix = postal_code.rstrip("*")
+            if len(prefix) == 3:
+                where, args = "zip3 = ?", (prefix,)
+            else:
+                where, args = "zip5 >= ? AND zip5 < ?", (prefix, prefix + ":")
+        elif postal_code:
+            where, args = "zip5 = ?", (postal_code[:5],)
+        elif city:
+            where, args = ("city = ? AND state = ?", (city.upper(), state.upper())) if state else ("city = ?", (city.upper(),))
+        elif state:
+            where, args = "state = ?", (state.upper(),)
+        else:
+            where, args = "1", ()
+        return [r[0] for r in conn.execute(
+            f"SELECT npi FROM locations WHERE code = ? AND {where} ORDER BY npi LIMIT ?", (code, *args, limit),
+        )]
+
+    def search(
+        self, taxonomy: str, postal_code: str = "", city: str = "", state: str = "", limit: int = 10,
+        specialty_label: str = "",
+    ) -> list[dict] | None:
+        """Doctor records for one taxonomy term and location, or None on a miss."""
+        conn = self._open()
+        if conn is None or not self._covers(conn, postal_code, city, state):
+            return None
+        codes = self.taxonomy_codes(taxonomy)
+        if not codes:
+            return None
+        npis = sorted({npi for code in codes for npi in self._query(conn, code, postal_code, city, state, limit)})[:limit]
+        if not npis:
+            return []
+        rows = dict(conn.execute(
+            f"SELECT npi, record FROM providers WHERE npi IN ({','.join('?' * len(npis))})", npis,
+        ).fetchall())
+        records = []
+        for npi in npis:
+            record = json.loads(rows[npi])
+            if record["specialty"] is None:
+                record["specialty"] = specialty_label or taxonomy
+            records.append(record)
+        return records
+
+    def search_terms(
+        self, taxonomies: list[str], postal_code: str = "", city: str = "", state: str = "", limit: int = 10,
+        specialty_label: str = "",
+    ) -> list[list[dict] | None]:
+        """``search`` per taxonomy term; None marks the terms to ask the live registry."""
+        return [self.search(t, postal_code, city, state, limit, specialty_label) for t in taxonomies]
+
+    def info(self) -> dict[str, str]:
+        conn = self._open()
+        return dict(conn.execute("SELECT name, value FROM meta")) if conn is not None else {}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def main(argv: list[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    parser = argparse.ArgumentParser(description="Import the NPPES bulk NPI file into a local provider directory")
+    parser.add_argument("npi_csv", help="npidata_pfile_*.csv from the NPPES full replacement file")
+    parser.add_argument("--taxonomy", required=True, help="NUCC health care provider taxonomy CSV")
+    parser.add_argument("-o", "--output", default=os.getenv("PROVIDER_DIRECTORY_PATH") or "providers.sqlite")
+    parser.add_argument("--states", default="", help="comma-separated states to keep (default: all)")
+    args = parser.parse_args(argv)
+    counts = import_snapshot(args.npi_csv, args.taxonomy, args.output, args.states.split(","))
+    print(json.dumps(counts))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Opt-in capture of diagnosis results for debugging.
+
+Replaces the old unconditional ``_debug_last_result.json`` dump, which
+pretty-printed and wrote every result synchronously on the event loop and
+raced between concurrent requests.
+
+  * Off by default (RESULT_CAPTURE_RATE=0): ``capture()`` returns at once
+  * Sampled: a fraction of runs (0.0–1.0) is captured
+  * Captured results go to an in-memory ring buffer (served at
+    GET /debug/results) and, if RESULT_CAPTURE_DIR is set, to one JSON file
+    per run written by a background task through a bounded queue — the
+    request never waits on disk, and captures are dropped when the writer
+    falls behind
+  * Files are rotated: only the newest RESULT_CAPTURE_MAX_FILES are kept
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUFFER_SIZE = 20
+DEFAULT_MAX_FILES = 50
+WRITE_QUEUE_SIZE = 32
+# How long shutdown waits for queued captures to reach disk
+DRAIN_TIMEOUT_SECONDS = 5.0
+
+
+class ResultCapture:
+    """Sampled, non-blocking capture of pipeline results."""
+
+    def __init__(
+        self,
+        rate: float = 0.0,
+        directory: str | None = None,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        max_files: int = DEFAULT_MAX_FILES,
+    ):
+        self.rate = min(max(rate, 0.0), 1.0)
+        self.directory = Path(directory) if directory else None
+        self.max_files = max(1, max_files)
+        self._buffer: deque[dict[str, Any]] = deque(maxlen=max(1, buffer_size))
+        self._queue: asyncio.Queue | None = None
+        self._writer: asyncio.Task | None = None
+        self.dropped = 0
+
+    @classmethod
+    def from_env(cls) -> "ResultCapture":
+        """Build from RESULT_CAPTURE_RATE / _DIR / _BUFFER / _MAX_FILES."""
+        try:
+            return cls(
+                rate=float(os.getenv("RESULT_CAPTURE_RATE", "0")),
+                directory=os.getenv("RESULT_CAPTURE_DIR") or None,
+                buffer_size=int(os.getenv("RESULT_CAPTURE_BUFFER", DEFAULT_BUFFER_SIZE)),
+                max_files=int(os.getenv("RESULT_CAPTURE_MAX_FILES", DEFAULT_MAX_FILES)),
+            )
+        except ValueError as e:
+            logger.warning("Ignoring invalid result capture settings: %s", e)
+            return cls()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def capture(self, kind: str, result: dict[str, Any], run_id: str | None = None) -> None:
+        """Record *result* if this run is sampled.  Never blocks."""
+        if self.rate <= 0 or random.random() >= self.rate:
+            return
+        entry = {
+            "capture_id": run_id or uuid.uuid4().hex,
+            "kind": kind,
+            "captured_at": time.time(),
+            "result": result,
+        }
+        self._buffer.append(entry)
+        if self.directory is None:
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=WRITE_QUEUE_SIZE)
+            self._writer = asyncio.create_task(self._write_loop())
+        try:
+            self._queue.put_nowait(entry)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    # ------------------------------------------------------------------
+    # Ring buffer access
+    # ------------------------------------------------------------------
+
+    def recent(self) -> list[dict[str, Any]]:
+        """Summaries of buffered captures, newest first."""
+        return [
+            {
+                "capture_id": e["capture_id"],
+                "kind": e["kind"],
+                "captured_at": e["captured_at"],
+                "total_time": e["result"].get("total_time") if isinstance(e["result"], dict) else None,
+            }
+            for e in reversed(self._buffer)
+        ]
+
+    def get(self, capture_id: str) -> dict[str, Any] | None:
+        for entry in self._buffer:
+            if entry["capture_id"] == capture_id:
+                return entry
+        return None
+
+    # ------------------------------------------------------------------
+    # Background file writer
+    # ------------------------------------------------------------------
+
+    def _write_file(self, entry: dict[str, Any]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(entry["captured_at"]))
+        path = self.directory / f"{stamp}_{entry['kind']}_{entry['capture_id']}.json"
+        path.write_text(json.dumps(entry, indent=2, default=str), encoding="utf-8")
+        captures = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime_ns)
+        for old in captures[: max(0, len(captures) - self.max_files)]:
+            old.unlink(missing_ok=True)
+
+    async def _write_loop(self) -> None:
+        while True:
+            entry = await self._queue.get()
+            try:
+                # Serialization and disk I/O stay off the event loop
+                await asyncio.to_thread(self._write_file, entry)
+            except Exception as e:
+                logger.warning("Result capture write failed: %s", e)
+            finally:
+                self._queue.task_done()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "rate": self.rate,
+            "buffered": len(self._buffer),
+            "directory": str(self.directory) if self.directory else None,
+            "dropped": self.dropped,
+        }
+
+    async def aclose(self) -> None:
+        """Write out queued captures (up to DRAIN_TIMEOUT_SECONDS), then stop the writer."""
+        if self._writer is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), DRAIN_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                logger.warning("Result capture: %d queued captures not written at shutdown", self._queue.qsize())
+            self._writer.cancel()
+            await asyncio.gather(self._writer, return_exceptions=True)
+            self._writer = None
+            self._queue = None
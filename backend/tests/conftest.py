@@ -0,0 +1,8 @@
+"""Shared pytest setup: the backend modules import each other as top-level modules."""
+
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
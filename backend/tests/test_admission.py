@@ -0,0 +1,155 @@
+"""AdmissionController: slot cap, round-robin fairness across tenants, load shedding."""
+
+import asyncio
+
+import pytest
+
+from admission import AdmissionController, AdmissionRejected
+
+
+def test_admits_up_to_max_inflight_without_queueing():
+    async def scenario():
+        ctl = AdmissionController(max_inflight=2, max_queued=4)
+        assert await ctl.acquire("a") == 0.0
+        assert await ctl.acquire("b") == 0.0
+        assert ctl.inflight == 2 and ctl.queued == 0
+
+    asyncio.run(scenario())
+
+
+def test_queue_is_round_robin_across_tenants():
+    async def scenario():
+        ctl = AdmissionController(max_inflight=1, max_queued=10, queue_slo=600)
+        await ctl.acquire("busy")
+        order = []
+
+        async def run(tenant, tag):
+            await ctl.acquire(tenant)
+            order.append(tag)
+
+        # One tenant queues three requests before a second tenant queues one
+        tasks = [asyncio.create_task(run("busy", f"busy{i}")) for i in range(3)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(run("quiet", "quiet0")))
+        await asyncio.sleep(0)
+        assert ctl.queued == 4
+
+        for _ in range(4):
+            ctl.release()
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        assert order == ["busy0", "quiet0", "busy1", "busy2"]
+
+    asyncio.run(scenario())
+
+
+def test_position_counts_other_tenants_turns():
+    async def scenario():
+        ctl = AdmissionController(max_inflight=1, max_queued=10, queue_slo=600)
+        await ctl.acquire("x")
+        positions = {}
+
+        async def report(tag, position, eta):
+            positions.setdefault(tag, position)
+
+        tasks = [
+            asyncio.create_task(ctl.acquire("a", lambda p, e: report("a0", p, e))),
+            asyncio.create_task(ctl.acquire("a", lambda p, e: report("a1", p, e))),
+            asyncio.create_task(ctl.acquire("b", lambda p, e: report("b0", p, e))),
+        ]
+        await asyncio.sleep(0)
+        # a1 was second in line on arrival; b0 overtakes it in the rotation
+        assert positions == {"a0": 1, "a1": 2, "b0": 2}
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        assert ctl.queued == 0
+
+    asyncio.run(scenario())
+
+
+def test_sheds_when_queue_is_full():
+    async def scenario():
+        ctl = AdmissionController(max_inflight=1, max_queued=1, queue_slo=600)
+        await ctl.acquire("a")
+        waiting = asyncio.create_task(ctl.acquire("b"))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as exc:
+            await ctl.acquire("c")
+        assert exc.value.reason == "queue_full"
+        assert exc.value.retry_after >= 1
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+
+    asyncio.run(scenario())
+
+
+def test_sheds_when_projected_wait_exceeds_slo():
+    async def scenario():
+        ctl = AdmissionController(max_inflight=1, max_queued=10, queue_slo=10)
+        await ctl.acquire("a")
+        # Default service estimate (45s) puts the next request past a 10s SLO
+        with pytest.raises(AdmissionRejected) as exc:
+            await ctl.acquire("b")
+        assert exc.value.reason == "projected_wait"
+
+    asyncio.run(scenario())
+
+
+def test_accepted_background_work_waits_instead_of_being_shed():
+    async def scenario():
+        ctl = AdmissionController(max_inflight=1, max_queued=0, queue_slo=0)
+        await ctl.acquire("a")
+        job = asyncio.create_task(ctl.acquire("jobs", shed=False))
+        await asyncio.sleep(0)
+        assert not job.done()
+        ctl.release()
+        await job
+        assert ctl.inflight == 1
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_frees_its_place():
+    async def scenario():
+        ctl = AdmissionController(max_inflight=1, max_queued=10, queue_slo=600)
+        await ctl.acquire("a")
+        gone = asyncio.create_task(ctl.acquire("b"))
+        kept = asyncio.create_task(ctl.acquire("c"))
+        await asyncio.sleep(0)
+        gone.cancel()
+        await asyncio.gather(gone, return_exceptions=True)
+        ctl.release()
+        await kept
+        assert ctl.inflight == 1 and ctl.queued == 0
+
+    asyncio.run(scenario())
+
+
+def test_failing_position_callback_frees_its_place():
+    async def on_position(position, eta):
+        raise ConnectionError("client went away")
+
+    async def scenario():
+        ctl = AdmissionController(max_inflight=1, max_queued=10, queue_slo=600)
+        await ctl.acquire("a")
+        with pytest.raises(ConnectionError):
+            await ctl.acquire("b", on_position=on_position)
+        assert ctl.queued == 0
+        # The slot goes back to the pool, not to the dead waiter
+        ctl.release()
+        assert ctl.inflight == 0
+
+    asyncio.run(scenario())
+
+
+def test_slot_releases_and_learns_service_time():
+    async def scenario():
+        ctl = AdmissionController(max_inflight=1)
+        async with ctl.slot("a"):
+            assert ctl.inflight == 1
+        assert ctl.inflight == 0
+        # A near-instant run pulls the estimate down from the 45s default
+        assert ctl.stats()["avg_pipeline_seconds"] < 45
+
+    asyncio.run(scenario())
@@ -0,0 +1,87 @@
+"""Batch diagnosis: JSONL parsing and deduplication of identical cases."""
+
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from batch import case_fingerprint, parse_cases, run_batch  # noqa: E402
+from models import DiagnosisRequest  # noqa: E402
+
+
+class _RecordingBackend:
+    """Answers each unique case with its symptoms and records what it was asked to run."""
+
+    name = "fake"
+
+    def __init__(self, fail_on=()):
+        self.ran = []
+        self.fail_on = set(fail_on)
+
+    async def run_many(self, unique):
+        for key, request in unique.items():
+            self.ran.append(request.symptoms)
+            if request.symptoms in self.fail_on:
+                yield key, RuntimeError("vendor error")
+            else:
+                yield key, {"symptoms": request.symptoms}
+
+
+def _lines(*cases):
+    return [json.dumps(c) if isinstance(c, dict) else c for c in cases]
+
+
+async def _collect(cases, backend):
+    return [record async for record in run_batch(cases, backend)]
+
+
+def test_parse_cases_keeps_ids_and_reports_invalid_lines():
+    cases = parse_cases(_lines({"id": "c1", "symptoms": "cough"}, "", "not json", {"age": 40}, "[1, 2]"))
+    assert [c["line"] for c in cases] == [1, 3, 4, 5]
+    assert cases[0]["case_id"] == "c1"
+    assert cases[0]["request"].symptoms == "cough"
+    assert all("error" in c for c in cases[1:])
+
+
+def test_fingerprint_ignores_case_ids_but_not_content():
+    a, b, c = parse_cases(_lines(
+        {"id": "x", "symptoms": "cough", "age": 40},
+        {"case_id": "y", "age": 40, "symptoms": "cough"},
+        {"symptoms": "cough", "age": 41},
+    ))
+    assert case_fingerprint(a["request"]) == case_fingerprint(b["request"])
+    assert case_fingerprint(a["request"]) != case_fingerprint(c["request"])
+    assert case_fingerprint(DiagnosisRequest(symptoms="cough")) == case_fingerprint(DiagnosisRequest(symptoms="cough"))
+
+
+def test_identical_cases_run_once_and_fan_out():
+    cases = parse_cases(_lines(
+        {"id": "a", "symptoms": "cough"},
+        {"id": "b", "symptoms": "fever"},
+        {"id": "c", "symptoms": "cough"},
+        "{broken",
+    ))
+    backend = _RecordingBackend()
+    records = asyncio.run(_collect(cases, backend))
+
+    assert sorted(backend.ran) == ["cough", "fever"]
+    assert len(records) == 4
+    # Invalid lines are reported first
+    assert records[0] == {"line": 4, "case_id": None, "status": "error", "error": records[0]["error"]}
+    by_line = {r["line"]: r for r in records}
+    assert by_line[1]["duplicate_of"] is None
+    assert by_line[3]["duplicate_of"] == 1
+    assert by_line[3]["case_id"] == "c"
+    assert by_line[3]["result"] == by_line[1]["result"] == {"symptoms": "cough"}
+    assert by_line[1]["fingerprint"] == by_line[3]["fingerprint"] != by_line[2]["fingerprint"]
+
+
+def test_a_failed_case_fails_every_duplicate():
+    cases = parse_cases(_lines({"symptoms": "cough"}, {"symptoms": "cough"}, {"symptoms": "fever"}))
+    records = asyncio.run(_collect(cases, _RecordingBackend(fail_on={"cough"})))
+    by_line = {r["line"]: r for r in records}
+    assert by_line[1]["status"] == by_line[2]["status"] == "error"
+    assert by_line[2]["error"] == "vendor error"
+    assert by_line[3]["status"] == "ok"
@@ -0,0 +1,88 @@
+"""Context packer: per-agent projection, deduplication and token budgets."""
+
+import json
+
+from agents.context_packer import pack_context, project_context
+from agents.token_counter import count_tokens
+
+LONG = "Patient reports progressive exertional dyspnea with orthopnea over several weeks."
+
+
+def _context():
+    return {
+        "triage_assessment": {
+            "esi_level": 3,
+            "urgency_level": "urgent",
+            "red_flags": ["chest pain"],
+            "immediate_actions": ["ECG"],
+            "symptom_domains": ["cardio"],
+            "triage_summary": LONG,
+            "unused_field": "x" * 500,
+        },
+        "differential_diagnosis": {
+            "differential_diagnosis": [
+                {"condition": "Heart failure", "confidence": 0.6, "supporting_features": ["edema"], "icd10": "I50"},
+                {"condition": "COPD", "confidence": 0.2},
+            ],
+            "must_not_miss": ["ACS"],
+            "clinical_reasoning_summary": LONG,
+        },
+        "previous_diagnosis": {"anything": 1},
+    }
+
+
+def test_projection_keeps_only_fields_the_consumer_reads():
+    packed = project_context("treatment", _context())
+    assert list(packed) == ["triage_assessment", "differential_diagnosis", "previous_diagnosis"]
+    assert packed["triage_assessment"] == {
+        "urgency_level": "urgent", "red_flags": ["chest pain"], "immediate_actions": ["ECG"],
+    }
+    # List items are projected onto the brief differential fields
+    assert packed["differential_diagnosis"]["differential_diagnosis"][0] == {"condition": "Heart failure", "confidence": 0.6}
+    # Sections without a projection pass through unchanged
+    assert packed["previous_diagnosis"] == {"anything": 1}
+
+
+def test_failures_and_raw_output_stay_visible():
+    packed = project_context("treatment", {
+        "triage_assessment": {"error": "timeout", "timed_out": True},
+        "differential_diagnosis": {"raw_text": "unparsed model output"},
+    })
+    assert packed["triage_assessment"] == {"error": "timeout", "timed_out": True}
+    assert packed["differential_diagnosis"] == {"raw_text": "unparsed model output"}
+
+
+def test_repeated_long_strings_become_back_references():
+    packed = json.loads(pack_context("specialist", _context()))
+    assert packed["triage_assessment"]["triage_summary"] == LONG
+    assert packed["differential_diagnosis"]["clinical_reasoning_summary"] == "(same as triage_assessment.triage_summary)"
+
+
+def test_output_is_compact_json():
+    text = pack_context("specialist", _context())
+    assert "\n" not in text and ": " not in text
+    assert json.loads(text)
+
+
+def test_token_budget_shrinks_then_drops_lowest_priority_sections():
+    context = _context()
+    context["differential_diagnosis"]["clinical_reasoning_summary"] = "reasoning " * 400
+    context["triage_assessment"]["red_flags"] = [f"flag {i}" for i in range(30)]
+    unbounded = pack_context("specialist", context)
+
+    budget = count_tokens(unbounded) // 3
+    text = pack_context("specialist", context, token_budget=budget)
+    assert count_tokens(text) <= budget
+    packed = json.loads(text)
+    assert "(+" in packed["triage_assessment"]["red_flags"][-1]
+
+    tiny = json.loads(pack_context("specialist", context, token_budget=20))
+    # The highest-priority section is never dropped, only shrunk
+    assert "triage_assessment" in tiny
+    assert "differential_diagnosis" not in tiny
+    assert "_omitted" in tiny
+
+
+def test_within_budget_is_unchanged():
+    context = _context()
+    assert pack_context("specialist", context, token_budget=100_000) == pack_context("specialist", context)
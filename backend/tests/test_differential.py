@@ -0,0 +1,94 @@
+"""Batched differential probabilities: agreement with the single-condition tool, and normalisation."""
+
+import asyncio
+import json
+import math
+import random
+
+import pytest
+
+from agents.diagnostician import DiagnosticianAgent
+from agents.message_bus import MessageBus
+
+
+@pytest.fixture(scope="module")
+def agent():
+    # "ollama" skips the Anthropic client; these tools never call a model
+    return DiagnosticianAgent(api_key="ollama", bus=MessageBus())
+
+
+def _random_feature(rng, i):
+    feature = {"feature": f"f{i}", "present": rng.random() < 0.6}
+    if rng.random() < 0.5:
+        feature["lr_positive"] = rng.choice([rng.uniform(0.5, 30), rng.uniform(1, 5000)])
+        feature["lr_negative"] = rng.uniform(0.0001, 1.2)
+    else:
+        feature["sensitivity"] = rng.uniform(0.05, 0.99)
+        feature["specificity"] = rng.uniform(0.05, 0.99)
+    return feature
+
+
+def _random_condition(rng, k):
+    return {
+        "condition": f"c{k}",
+        "pre_test_probability_pct": rng.uniform(-5, 105),  # includes out-of-range values to clamp
+        "features_with_lr": [_random_feature(rng, i) for i in range(rng.randint(0, 8))],
+    }
+
+
+def _run(coro):
+    return json.loads(asyncio.run(coro))
+
+
+def test_batched_posteriors_equal_single_condition_tool(agent):
+    rng = random.Random(20260419)
+    conditions = [_random_condition(rng, k) for k in range(500)]
+
+    batched = _run(agent._calculate_differential({"conditions": conditions}))
+    by_name = {e["condition"]: e for e in batched["differential"]}
+    assert len(by_name) == 500
+
+    for condition in conditions:
+        single = _run(agent._calculate_probability(condition))
+        entry = by_name[condition["condition"]]
+        for key in ("pre_test_probability_pct", "post_test_probability_pct", "probability_change", "confidence_level"):
+            assert entry[key] == single[key], (condition, key)
+        assert [f["lr_value"] for f in entry["features"]] == [s["lr_value"] for s in single["calculation_chain"][1:]]
+
+
+def _exclusive(agent, pre_pcts, lrs):
+    conditions = [
+        {"condition": f"c{k}", "pre_test_probability_pct": p, "features_with_lr": [{"feature": "x", "lr_positive": lr}]}
+        for k, (p, lr) in enumerate(zip(pre_pcts, lrs))
+    ]
+    result = _run(agent._calculate_differential({"conditions": conditions, "mutually_exclusive": True}))
+    return result, {e["condition"]: e["normalized_probability_pct"] for e in result["differential"]}
+
+
+def test_exclusive_pre_test_below_100_keeps_other_diagnoses(agent):
+    result, normalized = _exclusive(agent, [30, 20], [4, 1])
+
+    # Weights 0.3*4 = 1.2 and 0.2*1 = 0.2, plus 0.5 unassigned: total 1.9
+    assert normalized["c0"] == round(100 * 1.2 / 1.9, 2)
+    assert normalized["c1"] == round(100 * 0.2 / 1.9, 2)
+    assert result["other_diagnoses_pct"] == round(100 * 0.5 / 1.9, 2)
+    assert [e["rank"] for e in result["differential"]] == [1, 2]
+    assert result["differential"][0]["condition"] == "c0"
+
+
+def test_exclusive_pre_test_above_100_is_rescaled(agent):
+    result, normalized = _exclusive(agent, [70, 60], [1, 2])
+
+    # No unassigned mass: 0.7 and 1.2 rescaled to sum to 100%
+    assert result["other_diagnoses_pct"] == 0.0
+    assert normalized["c0"] == round(100 * 0.7 / 1.9, 2)
+    assert normalized["c1"] == round(100 * 1.2 / 1.9, 2)
+    assert math.isclose(sum(normalized.values()), 100, abs_tol=0.02)
+    # Ranked by the normalized share, not the independent posteriors
+    assert result["differential"][0]["condition"] == "c1"
+
+
+def test_non_exclusive_differential_has_no_normalization(agent):
+    result = _run(agent._calculate_differential({"conditions": [{"condition": "a", "pre_test_probability_pct": 40}]}))
+    assert "other_diagnoses_pct" not in result
+    assert "normalized_probability_pct" not in result["differential"][0]
@@ -0,0 +1,66 @@
+"""Emergency fast path: which triage results qualify, and the result built from triage alone."""
+
+from types import SimpleNamespace
+
+from agents.message_bus import MessageBus
+from agents.orchestrator import EMERGENCY_ACTION_CHECKLIST, EMERGENCY_PATIENT_MESSAGE, OrchestratorAgent
+
+
+def test_critical_triage_requires_esi1_or_esi2_with_red_flags():
+    critical = OrchestratorAgent._is_critical_triage
+    assert critical({"esi_level": 1})
+    assert critical({"esi_level": "ESI-2", "red_flags": ["sudden worst headache"]})
+    assert not critical({"esi_level": 2, "red_flags": []})
+    assert not critical({"esi_level": 2, "red_flags": "chest pain"})  # malformed, not a list
+    assert not critical({"esi_level": 3, "red_flags": ["fever"]})
+    # A failed triage never short-circuits the pipeline
+    assert not critical({"esi_level": 1, "error": "timeout"})
+    assert not critical(None)
+
+
+def _build(triage):
+    # Only the message bus is touched, so skip the provider-client constructor
+    host = SimpleNamespace(bus=MessageBus())
+    return OrchestratorAgent._build_emergency_result(host, triage, {"triage": 1.2}, 1.5, "chest pain", 58, "male")
+
+
+def test_emergency_result_orders_critical_flags_and_merges_actions():
+    triage = {
+        "esi_level": 2,
+        "urgency_level": "emergent",
+        "red_flags": [
+            {"finding": "diaphoresis", "severity": "high"},
+            {"finding": "ST elevation described", "severity": "critical"},
+            "radiating arm pain",
+        ],
+        "immediate_actions": "Chew aspirin 325 mg",
+        "triage_summary": "Possible ACS",
+    }
+    result = _build(triage)
+
+    assert result["emergency"] is True
+    assert result["safety_status"] == "EMERGENCY"
+    assert result["red_flags"] == ["ST elevation described", "diaphoresis", "radiating arm pain"]
+    assert result["action_checklist"] == (
+        EMERGENCY_ACTION_CHECKLIST[:1] + ["Chew aspirin 325 mg"] + EMERGENCY_ACTION_CHECKLIST[1:]
+    )
+    assert result["emergency_alert"] == {
+        "esi_level": 2,
+        "urgency_level": "emergent",
+        "red_flags": result["red_flags"],
+        "message": EMERGENCY_PATIENT_MESSAGE,
+    }
+    assert "Triage: ESI-2 (EMERGENT)" in result["answer"]
+    assert "Summary: Possible ACS" in result["answer"]
+    assert result["agents_used"] == ["triage"]
+    assert result["agent_timings"] == {"triage": 1.2}
+    assert result["total_time"] == 1.5
+
+
+def test_emergency_result_defaults_urgency_and_dedupes_actions():
+    result = _build({"esi_level": 1, "immediate_actions": [EMERGENCY_ACTION_CHECKLIST[0]]})
+
+    assert result["emergency_alert"]["urgency_level"] == "emergency"
+    assert result["action_checklist"] == EMERGENCY_ACTION_CHECKLIST
+    assert result["red_flags"] == []
+    assert "WARNING SIGNS DETECTED:" not in result["answer"]
@@ -0,0 +1,93 @@
+"""Illness-script index: Aho-Corasick matching equals ``any(k in text)``; ranking and fallback."""
+
+import json
+import random
+
+import pytest
+
+from agents.illness_scripts import FALLBACK_DOMAIN, IllnessScriptIndex, KeywordAutomaton
+from agents.knowledge_store import knowledge
+
+
+def _naive(keywords, text):
+    return {k for k in keywords if k in text}
+
+
+def test_overlapping_keywords():
+    keywords = ["he", "she", "his", "hers", "a", "aa", "chest pain", "pain"]
+    automaton = KeywordAutomaton(keywords)
+    for text in ("ushers", "ahishers", "aaaa", "severe chest pain", "she", "", "xyz"):
+        assert automaton.find(text) == _naive(keywords, text), text
+
+
+def test_random_texts_match_substring_semantics():
+    rng = random.Random(47)
+    keywords = {"".join(rng.choice("abc ") for _ in range(rng.randint(1, 5))) for _ in range(60)}
+    automaton = KeywordAutomaton(keywords)
+    for _ in range(500):
+        text = "".join(rng.choice("abcd ") for _ in range(rng.randint(0, 40)))
+        assert automaton.find(text) == _naive(keywords, text)
+
+
+@pytest.fixture(scope="module")
+def scripts():
+    return dict(knowledge.table("illness_scripts").items())
+
+
+@pytest.fixture(scope="module")
+def index():
+    return IllnessScriptIndex()
+
+
+SYMPTOMS = [
+    "crushing chest pain radiating to the left arm with shortness of breath",
+    "fever, productive cough and pleuritic chest pain for three days",
+    "worst headache of my life with neck stiffness and photophobia",
+    "itchy rash on the groin for 3 months",
+    "fatigue",
+    "",
+]
+
+
+@pytest.mark.parametrize("symptoms", SYMPTOMS)
+def test_matched_domains_equal_any_keyword_check(index, scripts, symptoms):
+    expected = {d for d, entry in scripts.items() if any(k in symptoms for k in entry.get("triggers", []))}
+    ranked = index.score(symptoms)
+    assert {domain for domain, _, _ in ranked} == expected
+    for domain, _, keywords in ranked:
+        assert set(keywords) == _naive(scripts[domain]["triggers"], symptoms)
+
+
+def test_ranking_is_by_strength_then_source_order(index):
+    ranked = index.score(SYMPTOMS[0])
+    assert len(ranked) > 1
+    strengths = [s for _, s, _ in ranked]
+    assert strengths == sorted(strengths, reverse=True)
+    order = index.domains
+    for (a, sa, _), (b, sb, _) in zip(ranked, ranked[1:]):
+        if sa == sb:
+            assert order.index(a) < order.index(b)
+
+
+def test_match_returns_top_k_and_summarizes_the_rest(index):
+    text, others = index.match(SYMPTOMS[1], top_k=1)
+    top = json.loads(text)
+    assert len(top) == 1
+    assert top[0]["domain"] == index.score(SYMPTOMS[1])[0][0]
+    assert [o["domain"] for o in others] == [d for d, _, _ in index.score(SYMPTOMS[1])[1:]]
+    assert all("illness_scripts" not in o for o in others)
+
+
+def test_no_match_falls_back_to_general(index, scripts):
+    text, others = index.match("zzzz qqqq")
+    top = json.loads(text)
+    assert [t["domain"] for t in top] == [FALLBACK_DOMAIN]
+    assert top[0]["illness_scripts"] == scripts[FALLBACK_DOMAIN]["illness_scripts"]
+    assert others == []
+
+
+def test_field_projection_keeps_condition(index):
+    top = json.loads(index.match(SYMPTOMS[2], fields=["risk_factors"])[0])
+    for script in top[0]["illness_scripts"]:
+        assert set(script) <= {"condition", "risk_factors"}
+        assert "condition" in script
@@ -0,0 +1,192 @@
+"""JobManager: submit/poll lifecycle, progress recording, failures, worker survival."""
+
+import asyncio
+
+import pytest
+
+import jobs
+from jobs import InMemoryJobBackend, JobManager, JobQueueFull
+
+
+async def _wait_for_status(manager, job_id, status, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        job = await manager.get(job_id)
+        if job["status"] == status:
+            return job
+        assert asyncio.get_running_loop().time() < deadline, f"job stuck in {job['status']}"
+        await asyncio.sleep(0.01)
+
+
+def test_job_runs_through_lifecycle_and_records_progress():
+    async def runner(spec, progress):
+        await progress.put({"event": "agent_complete", "agent": "triage"})
+        await progress.put({"event": "emergency"})
+        await progress.put({"event": "complete", "result": {"answer": spec["request"]}})
+        return None
+
+    async def scenario():
+        manager = JobManager(runner, workers=1)
+        job = await manager.submit({"request": "rash", "api_keys": {"anthropic": "k"}})
+        assert job["status"] == "queued"
+        done = await _wait_for_status(manager, job["job_id"], "succeeded")
+        # The runner returned None, so the result comes from the "complete" event
+        assert done["result"] == {"answer": "rash"}
+        assert done["progress"]["completed_agents"] == ["triage"]
+        assert done["progress"]["emergency"] is True
+        assert done["started_at"] <= done["finished_at"]
+        # The spec (and its API keys) is dropped once the job has been picked up
+        assert job["job_id"] not in manager._local_specs
+        await manager.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_runner_failure_marks_job_failed():
+    async def runner(spec, progress):
+        raise RuntimeError("vendor down")
+
+    async def scenario():
+        manager = JobManager(runner, workers=1)
+        job = await manager.submit({"request": "x"})
+        failed = await _wait_for_status(manager, job["job_id"], "failed")
+        assert failed["error"] == "vendor down"
+        await manager.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_queue_full_is_rejected():
+    async def runner(spec, progress):
+        await asyncio.sleep(10)
+
+    async def scenario():
+        manager = JobManager(runner, workers=1, max_pending=1)
+        await manager.submit({"request": 1})
+        await asyncio.sleep(0.01)  # first job is running, not pending
+        await manager.submit({"request": 2})
+        with pytest.raises(JobQueueFull):
+            await manager.submit({"request": 3})
+        await manager.aclose()
+
+    asyncio.run(scenario())
+
+
+class _FlakyBackend(InMemoryJobBackend):
+    """Fails the first ``failures`` pops, as an unreachable Redis would."""
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    async def pop(self):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("backend unavailable")
+        return await super().pop()
+
+
+def test_worker_survives_backend_errors(monkeypatch):
+    monkeypatch.setattr(jobs, "WORKER_BACKOFF_SECONDS", 0.001)
+
+    async def runner(spec, progress):
+        return {"ok": True}
+
+    async def scenario():
+        backend = _FlakyBackend(failures=3)
+        manager = JobManager(runner, backend=backend, workers=1)
+        job = await manager.submit({"request": "x"})
+        done = await _wait_for_status(manager, job["job_id"], "succeeded")
+        assert done["result"] == {"ok": True}
+        assert backend.failures == 0
+        assert not manager._tasks[0].done()
+        await manager.aclose()
+        assert manager._tasks == []
+
+    asyncio.run(scenario())
+
+
+def test_heartbeat_keeps_long_job_running_and_dead_worker_fails_it():
+    release = None
+
+    async def runner(spec, progress):
+        await release.wait()
+        return {"ok": True}
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        manager = JobManager(runner, workers=1, lease=0.06)
+        job = await manager.submit({"request": "x"})
+        await _wait_for_status(manager, job["job_id"], "running")
+        await asyncio.sleep(0.2)  # several leases; the heartbeat keeps it alive
+        assert (await manager.get(job["job_id"]))["status"] == "running"
+        release.set()
+        await _wait_for_status(manager, job["job_id"], "succeeded")
+
+        # A record left "running" by a worker that died: no heartbeat
+        orphan = jobs.new_job_record("orphan")
+        orphan["status"] = "running"
+        orphan["started_at"] = orphan["heartbeat_at"] = jobs.time.time() - 1
+        await manager.backend.save(orphan)
+        lost = await manager.get("orphan")
+        assert lost["status"] == "failed" and lost["error"] == "worker lost"
+        assert lost["finished_at"] is not None
+        await manager.aclose()
+
+    asyncio.run(scenario())
+
+
+class _FakeRedis:
+    """The handful of list/string commands RedisJobBackend uses."""
+
+    def __init__(self):
+        self.values = {}
+        self.lists = {}
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value)
+
+    async def expire(self, key, seconds):
+        pass
+
+    async def llen(self, key):
+        return len(self.lists.get(key, []))
+
+    async def blpop(self, keys):
+        while True:
+            for key in keys:
+                if self.lists.get(key):
+                    return key, self.lists[key].pop(0)
+            await asyncio.sleep(0.001)
+
+    async def aclose(self):
+        pass
+
+
+def test_redis_caller_keyed_jobs_stay_on_submitting_worker():
+    async def scenario():
+        redis = _FakeRedis()
+        here, other = jobs.RedisJobBackend(redis), jobs.RedisJobBackend(redis)
+        await here.push("keyed", {"request": "a", "api_keys": {"anthropic": "sk-caller", "openai": None}})
+        await here.push("keyless", {"request": "b", "api_keys": {"anthropic": None}})
+
+        # Another worker only ever sees the keyless job
+        job_id, spec = await other.pop()
+        assert job_id == "keyless" and spec == {"request": "b"}
+        assert await other.pending() == 0
+
+        assert await here.pending() == 1
+        job_id, spec = await here.pop()
+        assert job_id == "keyed"
+        # The shared copy never carries the keys; the worker uses its local spec
+        assert "api_keys" not in spec
+        assert "sk-caller" not in "".join(redis.values.values())
+
+    asyncio.run(scenario())
@@ -0,0 +1,103 @@
+"""Knowledge store: compiled tables equal the literals they replaced; lazy views behave like dicts/lists."""
+
+import hashlib
+import json
+import shutil
+
+import pytest
+
+from agents.knowledge_store import SOURCE_DIR, KnowledgeStore
+
+# sha256 (first 16 hex digits) of each table as the agents' Python literals held
+# it before the store, serialized in source order.  Update only for a deliberate
+# knowledge change.
+LEGACY_DIGESTS = {
+    "care_plans": "76776c402d2a3527",
+    "clinical_guidelines": "802d430bafe6c227",
+    "contraindications": "7193be285526cfa0",
+    "dangerous_combinations": "31bcb6a250030abb",
+    "diagnostic_criteria": "df46ae1efc14e147",
+    "disease_prevalence": "87feed83448e2a0f",
+    "dosage_database": "521b29d3e9f95e54",
+    "drug_interaction_matrix": "69dbaaf329867109",
+    "drug_interactions": "42e8cc5f34edc392",
+    "medical_terms": "1e073208c37864f7",
+    "medications": "d21bc71f5262b088",
+    "prognosis": "d5ce9731c1d0658f",
+    "specialist_knowledge": "8ef015ec58c05a44",
+}
+
+
+def _digest(value):
+    canonical = json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
+
+
+def _materialize(store, name):
+    source = json.loads((SOURCE_DIR / f"{name}.json").read_text(encoding="utf-8"))
+    if isinstance(source, dict):
+        return source, dict(store.table(name).items())
+    return source, list(store.list(name))
+
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    s = KnowledgeStore(db_path=tmp_path_factory.mktemp("knowledge") / "knowledge.sqlite")
+    yield s
+    s.close()
+
+
+@pytest.mark.parametrize("name", sorted(LEGACY_DIGESTS))
+def test_table_equals_legacy_literal(store, name):
+    _, compiled = _materialize(store, name)
+    assert _digest(compiled) == LEGACY_DIGESTS[name]
+
+
+@pytest.mark.parametrize("name", sorted(p.stem for p in SOURCE_DIR.glob("*.json")))
+def test_table_equals_its_source_in_order(store, name):
+    source, compiled = _materialize(store, name)
+    assert compiled == source
+    assert list(compiled) == list(source)
+
+
+def test_mapping_view_behaves_like_a_dict(store):
+    table = store.table("dosage_database")
+    key = next(iter(table))
+    assert key in table and "no-such-drug" not in table
+    assert table.get("no-such-drug") is None
+    assert table.get(["unhashable"]) is None
+    with pytest.raises(KeyError):
+        table["no-such-drug"]
+    # Decoded once, then shared
+    assert table[key] is table[key]
+    assert store.table("dosage_database") is table
+
+
+def test_sequence_view_behaves_like_a_list(store):
+    source = json.loads((SOURCE_DIR / "drug_interactions.json").read_text(encoding="utf-8"))
+    view = store.list("drug_interactions")
+    assert len(view) == len(source)
+    assert view[0] == source[0] and view[-1] == source[-1]
+    assert view[1:4] == source[1:4]
+    assert view[2] is view[2]
+    with pytest.raises(IndexError):
+        view[len(source)]
+
+
+def test_store_recompiles_when_a_source_changes(tmp_path):
+    sources = tmp_path / "sources"
+    shutil.copytree(SOURCE_DIR, sources, ignore=shutil.ignore_patterns("*.sqlite"))
+    db = tmp_path / "k.sqlite"
+
+    first = KnowledgeStore(db_path=db, source_dir=sources)
+    assert "zz-new" not in first.table("dosage_database")
+    first.close()
+
+    path = sources / "dosage_database.json"
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data["zz-new"] = {"adult": "1 mg"}
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+    second = KnowledgeStore(db_path=db, source_dir=sources)
+    assert second.table("dosage_database")["zz-new"] == {"adult": "1 mg"}
+    second.close()
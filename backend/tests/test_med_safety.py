@@ -0,0 +1,72 @@
+"""Bulk medication safety checks: interaction, combination and allergy flags, and the drug cache."""
+
+import pytest
+
+from agents.med_safety import MedicationSafetyChecker
+
+
+def test_interactions_and_combinations_flagged_across_regimen():
+    checker = MedicationSafetyChecker()
+    result = checker.check(["ibuprofen", "warfarin"])
+
+    ibuprofen, warfarin = result["medications"]
+    assert {a["between"] for a in ibuprofen["interactions"]} == {"ibuprofen <-> warfarin"}
+    assert {a["between"] for a in warfarin["interactions"]} == {"warfarin <-> ibuprofen"}
+    assert [c["category"] for c in result["dangerous_combinations"]] == ["Bleeding Risk"]
+    assert result["summary"]["dangerous_combinations"] == 1
+    assert result["summary"]["flagged_medications"] == 2
+
+
+def test_combinations_include_current_medications():
+    checker = MedicationSafetyChecker()
+    result = checker.check(["lisinopril"], current_medications=["spironolactone"])
+
+    # Only the new medication is reported, but the combination spans both lists
+    assert [m["medication"] for m in result["medications"]] == ["lisinopril"]
+    assert [c["category"] for c in result["dangerous_combinations"]] == ["Hyperkalemia Risk"]
+
+
+def test_allergy_cross_reactivity():
+    checker = MedicationSafetyChecker()
+    flagged = checker.check(["amoxicillin"], allergies=["penicillin"])
+    clean = checker.check(["amoxicillin"])
+
+    risks = flagged["medications"][0]["allergy_risks"]
+    assert risks and risks[0]["risk"] == "high"
+    assert flagged["summary"]["highest_severity"] == "high"
+    assert clean["medications"][0]["allergy_risks"] == []
+
+
+def test_patient_context_drives_contraindications():
+    checker = MedicationSafetyChecker()
+    elderly_ckd = checker.check(["ibuprofen"], conditions=["ckd"], age=70)
+    young = checker.check(["ibuprofen"], age=30)
+
+    assert len(elderly_ckd["medications"][0]["contraindications"]) > len(young["medications"][0]["contraindications"])
+
+
+def test_drug_cache_evicts_least_recent_and_clears_pairs():
+    checker = MedicationSafetyChecker(cache_size=2)
+    checker.check(["ibuprofen", "warfarin"])
+    assert checker.stats()["cached_pairs"] == 2
+
+    checker.drug("ibuprofen")  # refresh; warfarin is now least recent
+    checker.drug("amoxicillin")
+    assert list(checker._drugs) == ["ibuprofen", "amoxicillin"]
+    assert checker.stats()["cached_pairs"] == 0
+
+    # Evicted facts are recomputed, and results don't change
+    assert checker.check(["ibuprofen", "warfarin"]) == MedicationSafetyChecker().check(["ibuprofen", "warfarin"])
+
+
+def test_request_lists_are_bounded():
+    pydantic = pytest.importorskip("pydantic")
+    from models import MAX_MED_SAFETY_BATCH, MAX_REGIMEN_MEDICATIONS, MedicationSafetyBatchRequest, MedicationSafetyRequest
+
+    MedicationSafetyRequest(medications=["aspirin"] * MAX_REGIMEN_MEDICATIONS)
+    with pytest.raises(pydantic.ValidationError):
+        MedicationSafetyRequest(medications=["aspirin"] * (MAX_REGIMEN_MEDICATIONS + 1))
+    with pytest.raises(pydantic.ValidationError):
+        MedicationSafetyRequest(medications=["aspirin"], current_medications=["aspirin"] * (MAX_REGIMEN_MEDICATIONS + 1))
+    with pytest.raises(pydantic.ValidationError):
+        MedicationSafetyBatchRequest(patients=[{"medications": ["aspirin"]}] * (MAX_MED_SAFETY_BATCH + 1))
@@ -0,0 +1,75 @@
+"""Model routing: complexity scoring from triage, tier assignment, MODEL_ROUTING_CONFIG."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from agents.model_router import DEFAULT_TIERS, ModelRouter, score_case_complexity
+
+
+def test_uncomplicated_case_is_simple():
+    scored = score_case_complexity({"esi_level": 5, "red_flags": []}, age=30, symptoms="runny nose")
+    assert scored["level"] == "simple"
+
+
+def test_esi3_with_history_and_medications_is_moderate():
+    scored = score_case_complexity(
+        {"esi_level": "ESI-3", "red_flags": ["fever"]},
+        age=40,
+        medical_history="asthma, hypertension",
+        current_medications="lisinopril, albuterol, ibuprofen",
+    )
+    assert scored["level"] == "moderate"
+    assert scored["features"]["medication_count"] == 3
+    assert scored["features"]["history_count"] == 2
+
+
+def test_emergent_triage_is_complex():
+    scored = score_case_complexity(
+        {"urgency_level": "emergent", "red_flags": [{"finding": "syncope", "severity": "critical"}]}, age=80,
+    )
+    assert scored["features"]["esi_level"] == 2
+    assert scored["level"] == "complex"
+
+
+def test_failed_triage_never_routes_down():
+    assert score_case_complexity({"error": "timeout"})["level"] == "moderate"
+
+
+def test_tiers_assigned_per_level():
+    router = ModelRouter()
+    agents = [SimpleNamespace(name=n, model="unrouted") for n in ("diagnostician", "research", "safety", "unknown")]
+
+    assert router.assign(agents, "simple") == {
+        "diagnostician": DEFAULT_TIERS["standard"],
+        "research": DEFAULT_TIERS["fast"],
+        "safety": DEFAULT_TIERS["standard"],
+        "unknown": "unrouted",
+    }
+    assert router.assign(agents, "complex")["diagnostician"] == DEFAULT_TIERS["deep"]
+
+
+def test_from_env_applies_overrides(monkeypatch):
+    monkeypatch.setenv(
+        "MODEL_ROUTING_CONFIG",
+        '{"tiers": {"fast": "gpt-4o-mini"}, "agents": {"treatment": {"simple": "standard"}, "safety": {"simple": "my-model"}}}',
+    )
+    router = ModelRouter.from_env()
+    assert router.model_for("research", "simple", "x") == "gpt-4o-mini"
+    assert router.model_for("treatment", "simple", "x") == DEFAULT_TIERS["standard"]
+    # A routing entry may name a model directly
+    assert router.model_for("safety", "simple", "x") == "my-model"
+
+
+@pytest.mark.parametrize("raw", [
+    "{not json",
+    "[1, 2]",
+    '{"tiers": "fast"}',
+    '{"agents": {"treatment": "fast"}}',
+    '{"agents": ["treatment"]}',
+])
+def test_from_env_ignores_invalid_config(monkeypatch, raw):
+    monkeypatch.setenv("MODEL_ROUTING_CONFIG", raw)
+    router = ModelRouter.from_env()
+    assert router.tiers == ModelRouter().tiers
+    assert router.routing == ModelRouter().routing
@@ -0,0 +1,162 @@
+"""NPIClient: request coalescing, result caching and term-ordered fan-out (no network)."""
+
+import asyncio
+import types
+
+import pytest
+
+import npi
+from npi import NPIClient
+
+
+class _Response:
+    def __init__(self, payload, status_code=200):
+        self._payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self._payload
+
+
+class _FakeRegistry:
+    """Stands in for the pooled httpx client; answers after a per-term delay."""
+
+    def __init__(self, delays=None, errors=()):
+        self.calls = []
+        self.delays = delays or {}
+        self.errors = set(errors)
+        self.active = self.peak = 0
+
+    async def get(self, url, params):
+        taxonomy = params["taxonomy_description"]
+        self.calls.append(dict(params))
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delays.get(taxonomy, 0.01))
+        finally:
+            self.active -= 1
+        if taxonomy in self.errors:
+            return _Response({"Errors": [{"description": "bad"}]})
+        return _Response({"results": [{"number": f"{taxonomy}-{i}"} for i in range(params["limit"])]})
+
+    async def aclose(self):
+        pass
+
+
+def _client(registry, **kwargs):
+    client = NPIClient(http2=False, **kwargs)
+    client._client = registry
+    return client
+
+
+def test_identical_concurrent_lookups_share_one_request():
+    async def scenario():
+        registry = _FakeRegistry()
+        client = _client(registry)
+        results = await asyncio.gather(*(client.search("Dermatology", postal_code="80202") for _ in range(5)))
+        assert len(registry.calls) == 1
+        assert all(r == results[0] for r in results)
+        assert not client._inflight
+
+    asyncio.run(scenario())
+
+
+def test_results_are_cached_and_serve_smaller_limits():
+    async def scenario():
+        registry = _FakeRegistry()
+        client = _client(registry)
+        first = await client.search("Neurology", state="CO", limit=10)
+        assert await client.search("Neurology", state="CO", limit=10) == first
+        assert await client.search("Neurology", state="CO", limit=3) == first[:3]
+        assert len(registry.calls) == 1
+        # A larger limit than was fetched needs a new request
+        await client.search("Neurology", state="CO", limit=20)
+        assert len(registry.calls) == 2
+        # Different location, different key
+        await client.search("Neurology", state="WY", limit=10)
+        assert len(registry.calls) == 3
+
+    asyncio.run(scenario())
+
+
+def test_cache_expires_and_is_bounded(monkeypatch):
+    async def scenario():
+        registry = _FakeRegistry()
+        client = _client(registry, cache_ttl=60, cache_size=2)
+        await client.search("A")
+        await client.search("B")
+        await client.search("C")
+        assert len(client._cache) == 2
+        await client.search("A")
+        assert len(registry.calls) == 4
+
+        # Fake clock for the cache only; the event loop keeps the real one
+        now = [1000.0]
+        monkeypatch.setattr(npi, "time", types.SimpleNamespace(monotonic=lambda: now[0]))
+        client._cache.clear()
+        await client.search("D")
+        now[0] += 61
+        await client.search("D")
+        assert [c["taxonomy_description"] for c in registry.calls[-2:]] == ["D", "D"]
+
+    asyncio.run(scenario())
+
+
+def test_registry_errors_are_not_cached():
+    async def scenario():
+        registry = _FakeRegistry(errors={"Bad"})
+        client = _client(registry)
+        await client.search("Bad")
+        await client.search("Bad")
+        assert len(registry.calls) == 2
+
+    asyncio.run(scenario())
+
+
+def test_failed_fetch_reaches_every_waiter_and_is_retried():
+    class Broken(_FakeRegistry):
+        async def get(self, url, params):
+            self.calls.append(params)
+            await asyncio.sleep(0.01)
+            raise ConnectionError("registry down")
+
+    async def scenario():
+        registry = Broken()
+        client = _client(registry)
+        outcomes = await asyncio.gather(*(client.search("X") for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(o, ConnectionError) for o in outcomes)
+        assert len(registry.calls) == 1
+        with pytest.raises(ConnectionError):
+            await client.search("X")
+        assert len(registry.calls) == 2
+
+    asyncio.run(scenario())
+
+
+def test_search_terms_fans_out_and_keeps_term_order():
+    async def scenario():
+        # The first term answers last
+        registry = _FakeRegistry(delays={"Family Medicine": 0.05, "Internal Medicine": 0.0, "General Practice": 0.02})
+        client = _client(registry)
+        terms = ["Family Medicine", "Internal Medicine", "General Practice"]
+        per_term = await client.search_terms(terms, city="Denver", state="CO", limit=2)
+        assert registry.peak == len(terms)
+        assert [r[0]["number"] for r in per_term] == [f"{t}-0" for t in terms]
+        assert all(c["city"] == "Denver" and c["state"] == "CO" for c in registry.calls)
+
+    asyncio.run(scenario())
+
+
+def test_one_caller_cancelling_does_not_cancel_the_shared_lookup():
+    async def scenario():
+        registry = _FakeRegistry(delays={"Y": 0.05})
+        client = _client(registry)
+        leaver = asyncio.create_task(client.search("Y"))
+        stayer = asyncio.create_task(client.search("Y"))
+        await asyncio.sleep(0.01)
+        leaver.cancel()
+        assert (await stayer)[0]["number"] == "Y-0"
+        assert len(registry.calls) == 1
+
+    asyncio.run(scenario())
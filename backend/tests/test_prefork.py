@@ -0,0 +1,64 @@
+"""Pre-fork master: worker exit reporting and the restart back-off."""
+
+import os
+import signal
+
+import pytest
+
+from prefork import RestartPolicy, describe_exit
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="pre-fork mode needs os.fork")
+
+
+def _status(fn):
+    pid = os.fork()
+    if pid == 0:
+        fn()
+        os._exit(0)
+    return os.waitpid(pid, 0)[1]
+
+
+def test_describe_exit_reports_code_or_signal():
+    assert describe_exit(_status(lambda: os._exit(3))) == "exited with code 3"
+    assert describe_exit(_status(lambda: os.kill(os.getpid(), signal.SIGKILL))) == "killed by SIGKILL"
+
+
+def test_startup_crashes_back_off_then_give_up():
+    policy = RestartPolicy(backoff=1, max_backoff=5, min_uptime=10, max_crashes=4)
+    assert [policy.delay(0, uptime=0.5) for _ in range(5)] == [1, 2, 4, 5, None]
+    # Other slots keep their own count
+    assert policy.delay(1, uptime=0.5) == 1
+
+
+def test_worker_that_ran_a_while_resets_the_count():
+    policy = RestartPolicy(backoff=1, max_backoff=60, min_uptime=10, max_crashes=2)
+    policy.delay(0, uptime=1)
+    policy.delay(0, uptime=1)
+    assert policy.delay(0, uptime=3600) == 1
+    assert policy.delay(0, uptime=1) == 1
+
+
+def test_master_gives_up_on_workers_that_crash_at_startup(monkeypatch):
+    import prefork
+
+    spawned = []
+    monkeypatch.setattr(prefork, "preload_app", lambda: None)
+    monkeypatch.setattr(prefork, "_run_worker", lambda app, sock, log_level: os._exit(1))
+    monkeypatch.setattr(prefork, "RestartPolicy", lambda: RestartPolicy(backoff=0.01, min_uptime=10, max_crashes=2))
+    real_fork = os.fork
+
+    def fork():
+        pid = real_fork()
+        if pid:
+            spawned.append(pid)
+        return pid
+
+    monkeypatch.setattr(prefork.os, "fork", fork)
+    handlers = {sig: signal.getsignal(sig) for sig in (signal.SIGTERM, signal.SIGINT)}
+    try:
+        assert prefork.serve("127.0.0.1", 0, workers=2) == 1
+    finally:
+        for sig, handler in handlers.items():
+            signal.signal(sig, handler)
+    # Each slot: the first start plus two restarts
+    assert len(spawned) == 6
@@ -0,0 +1,44 @@
+"""SamplingProfiler: loop busy/idle attribution under the stdlib loop and uvloop."""
+
+import asyncio
+import time
+
+import pytest
+
+from agents.profiling import SamplingProfiler
+
+
+def _loop_factory(name):
+    if name == "uvloop":
+        return pytest.importorskip("uvloop").new_event_loop
+    return None
+
+
+async def _profiled(work):
+    profiler = SamplingProfiler(interval=0.002)
+    with profiler.session("case") as session:
+        await work()
+    return session.summary
+
+
+async def _wait_on_io():
+    await asyncio.sleep(0.2)
+
+
+async def _spin():
+    end = time.perf_counter() + 0.2
+    while time.perf_counter() < end:
+        pass
+
+
+@pytest.mark.parametrize("loop", ["asyncio", "uvloop"])
+def test_waiting_loop_is_idle_and_spinning_loop_is_busy(loop):
+    factory = _loop_factory(loop)
+    with asyncio.Runner(loop_factory=factory) as runner:
+        idle = runner.run(_profiled(_wait_on_io))
+    with asyncio.Runner(loop_factory=factory) as runner:
+        busy = runner.run(_profiled(_spin))
+
+    assert idle["samples"] > 0 and busy["samples"] > 0
+    assert idle["loop_busy_pct"] < 20
+    assert busy["loop_busy_pct"] > 80
@@ -0,0 +1,176 @@
+"""Provider directory: NPPES import and local search, including partial-snapshot coverage."""
+
+import csv
+
+import pytest
+
+from provider_directory import ProviderDirectory, format_phone, import_snapshot, provider_record
+
+LOC = "Provider Business Practice Location Address"
+NPPES_FIELDS = [
+    "NPI", "Entity Type Code", "NPI Deactivation Date", "NPI Reactivation Date",
+    "Provider First Name", "Provider Last Name (Legal Name)", "Provider Credential Text",
+    "Provider First Line Business Practice Location Address",
+    "Provider Second Line Business Practice Location Address",
+    f"{LOC} City Name", f"{LOC} State Name", f"{LOC} Postal Code", f"{LOC} Telephone Number",
+    "Healthcare Provider Taxonomy Code_1", "Healthcare Provider Primary Taxonomy Switch_1",
+    "Provider License Number State Code_1",
+    "Healthcare Provider Taxonomy Code_2", "Healthcare Provider Primary Taxonomy Switch_2",
+    "Provider License Number State Code_2",
+]
+
+FAMILY, INTERNAL, DERM = "207Q00000X", "207R00000X", "207N00000X"
+
+
+def _provider(npi, last, city, state, zip5, codes, entity="1", deactivated=""):
+    row = {
+        "NPI": str(npi), "Entity Type Code": entity, "NPI Deactivation Date": deactivated,
+        "Provider First Name": "PAT", "Provider Last Name (Legal Name)": last, "Provider Credential Text": "MD",
+        "Provider First Line Business Practice Location Address": "1 MAIN ST",
+        f"{LOC} City Name": city, f"{LOC} State Name": state, f"{LOC} Postal Code": zip5 + "1234",
+        f"{LOC} Telephone Number": "3035550100",
+    }
+    for i, code in enumerate(codes, start=1):
+        row[f"Healthcare Provider Taxonomy Code_{i}"] = code
+        row[f"Healthcare Provider Primary Taxonomy Switch_{i}"] = "Y" if i == 1 else "N"
+        row[f"Provider License Number State Code_{i}"] = state
+    return row
+
+
+PROVIDERS = [
+    _provider(1000000003, "ALPHA", "DENVER", "CO", "80202", [FAMILY]),
+    _provider(1000000001, "BRAVO", "DENVER", "CO", "80202", [FAMILY, INTERNAL]),
+    _provider(1000000002, "CHARLIE", "AURORA", "CO", "80010", [INTERNAL]),
+    _provider(1000000004, "DELTA", "BOULDER", "CO", "80302", [DERM]),
+    _provider(1000000005, "ECHO", "AURORA", "IL", "60505", [FAMILY]),
+    _provider(1000000006, "CLINIC", "DENVER", "CO", "80202", [FAMILY], entity="2"),
+    _provider(1000000007, "RETIRED", "DENVER", "CO", "80202", [FAMILY], deactivated="2020-01-01"),
+    _provider(1000000008, "UNKNOWN", "DENVER", "CO", "80203", ["999Z00000X"]),
+]
+
+
+@pytest.fixture(scope="module")
+def sources(tmp_path_factory):
+    root = tmp_path_factory.mktemp("nppes")
+    taxonomy = root / "nucc.csv"
+    with open(taxonomy, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["Code", "Classification", "Specialization"])
+        writer.writeheader()
+        writer.writerow({"Code": FAMILY, "Classification": "Family Medicine", "Specialization": ""})
+        writer.writerow({"Code": INTERNAL, "Classification": "Internal Medicine", "Specialization": ""})
+        writer.writerow({"Code": DERM, "Classification": "Dermatology", "Specialization": ""})
+    nppes = root / "npidata.csv"
+    with open(nppes, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=NPPES_FIELDS)
+        writer.writeheader()
+        writer.writerows(PROVIDERS)
+    return nppes, taxonomy
+
+
+def _directory(sources, path, states=None):
+    counts = import_snapshot(*sources, path, states=states)
+    return ProviderDirectory(path), counts
+
+
+@pytest.fixture(scope="module")
+def full(sources, tmp_path_factory):
+    directory, counts = _directory(sources, tmp_path_factory.mktemp("full") / "providers.sqlite")
+    yield directory, counts
+    directory.close()
+
+
+@pytest.fixture(scope="module")
+def colorado(sources, tmp_path_factory):
+    directory, _ = _directory(sources, tmp_path_factory.mktemp("co") / "providers.sqlite", states=["co"])
+    yield directory
+    directory.close()
+
+
+def _npis(records):
+    return [r["npi"] for r in records]
+
+
+def test_import_keeps_active_individuals_only(full):
+    directory, counts = full
+    assert counts["rows"] == len(PROVIDERS)
+    assert counts["providers"] == 6
+    assert directory.info()["states"] == ""
+
+
+def test_record_matches_registry_result_shape():
+    record, codes = provider_record(PROVIDERS[1], {FAMILY: ("Family Medicine", "")})
+    assert record == {
+        "npi": 1000000001,
+        "name": "Pat Bravo, MD",
+        "specialty": "Family Medicine",
+        "address": "1 Main St\nDenver, CO, 80202",
+        "phone": "303-555-0100",
+        "accepting_patients": True,
+    }
+    assert codes == [FAMILY, INTERNAL]
+
+
+def test_phone_numbers_use_registry_format():
+    assert format_phone("3035550100") == "303-555-0100"
+    assert format_phone("13035550100") == "303-555-0100"
+    assert format_phone("303-555-0100") == "303-555-0100"
+    # Anything that isn't a US number is passed through untouched
+    assert format_phone("5550100") == "5550100"
+    assert format_phone("") == ""
+
+
+def test_search_by_zip_city_and_state(full):
+    directory, _ = full
+    assert _npis(directory.search("Family Medicine", postal_code="80202")) == [1000000001, 1000000003]
+    assert _npis(directory.search("Internal Medicine", city="Aurora", state="CO")) == [1000000002]
+    assert _npis(directory.search("Family Medicine", state="IL")) == [1000000005]
+    assert _npis(directory.search("Family Medicine", postal_code="802*")) == [1000000001, 1000000003]
+    assert _npis(directory.search("Family Medicine", postal_code="80202", limit=1)) == [1000000001]
+    assert directory.search("Dermatology", postal_code="80202") == []
+
+
+def test_taxonomy_terms_resolve_to_codes(full):
+    directory, _ = full
+    assert directory.taxonomy_codes("internal medicine") == (INTERNAL,)
+    # An unknown term is a miss for the live registry, not an empty answer
+    assert directory.search("Astrology", state="CO") is None
+
+
+def test_unknown_primary_taxonomy_uses_the_specialty_label(full):
+    directory, _ = full
+    directory._term_codes["mystery"] = ("999Z00000X",)
+    [record] = directory.search("Mystery", postal_code="80203", specialty_label="Primary Care")
+    assert record["specialty"] == "Primary Care"
+
+
+def test_full_snapshot_covers_every_location(full):
+    directory, _ = full
+    assert _npis(directory.search("Family Medicine", city="Aurora")) == [1000000005]
+
+
+def test_partial_snapshot_coverage(colorado):
+    assert colorado.info()["states"] == "CO"
+    assert _npis(colorado.search("Internal Medicine", city="Aurora", state="CO")) == [1000000002]
+    assert colorado.search("Family Medicine", city="Denver", state="CO") is not None
+    # Outside the imported states: ask the live registry
+    assert colorado.search("Family Medicine", city="Aurora", state="IL") is None
+    assert colorado.search("Family Medicine", state="IL") is None
+    assert colorado.search("Family Medicine", postal_code="60505") is None
+    # A bare city may be the Aurora in a state the snapshot lacks
+    assert colorado.search("Internal Medicine", city="Aurora") is None
+    assert colorado.search("Internal Medicine", city="Denver") is None
+    assert colorado.search("Family Medicine", postal_code="80202") is not None
+
+
+def test_search_terms_marks_misses(colorado):
+    per_term = colorado.search_terms(["Family Medicine", "Astrology", "Dermatology"], state="CO")
+    assert _npis(per_term[0]) == [1000000001, 1000000003]
+    assert per_term[1] is None
+    assert _npis(per_term[2]) == [1000000004]
+
+
+def test_disabled_or_unreadable_directory_misses(tmp_path):
+    assert ProviderDirectory(None).search("Family Medicine", state="CO") is None
+    broken = tmp_path / "broken.sqlite"
+    broken.write_text("not a database")
+    assert ProviderDirectory(broken).search("Family Medicine", state="CO") is None
@@ -0,0 +1,33 @@
+"""ResultCapture: sampling, the ring buffer, and writing queued captures out at shutdown."""
+
+import asyncio
+
+from result_capture import ResultCapture
+
+
+def test_disabled_capture_records_nothing():
+    capture = ResultCapture(rate=0)
+    capture.capture("diagnose", {"total_time": 1})
+    assert capture.recent() == []
+
+
+def test_ring_buffer_keeps_newest():
+    capture = ResultCapture(rate=1, buffer_size=2)
+    for i in range(3):
+        capture.capture("diagnose", {"total_time": i}, run_id=f"run{i}")
+    assert [e["capture_id"] for e in capture.recent()] == ["run2", "run1"]
+    assert capture.get("run0") is None
+    assert capture.get("run1")["result"] == {"total_time": 1}
+
+
+def test_aclose_drains_queued_captures_to_disk(tmp_path):
+    async def scenario():
+        capture = ResultCapture(rate=1, directory=str(tmp_path), max_files=10)
+        for i in range(5):
+            capture.capture("diagnose", {"total_time": i}, run_id=f"run{i}")
+        # Nothing has been written yet; shutdown must not lose the queue
+        await capture.aclose()
+        assert capture._writer is None
+
+    asyncio.run(scenario())
+    assert sorted(p.name.split("_")[-1] for p in tmp_path.glob("*.json")) == [f"run{i}.json" for i in range(5)]
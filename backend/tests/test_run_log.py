@@ -0,0 +1,217 @@
+"""RunEventLog / RunRegistry: replay, coalescing, byte budget, truncation, abandonment."""
+
+import asyncio
+import json
+from contextlib import aclosing
+
+import pytest
+
+from agents.run_log import ReplayTruncated, RunEventLog, RunRegistry, parse_event_id
+
+
+async def _drain(log, after=0):
+    items = []
+    async with aclosing(log.follow(after, keepalive=0.05)) as events:
+        async for item in events:
+            if item is not None:
+                items.append(item)
+    return items
+
+
+def test_parse_event_id():
+    assert parse_event_id("abc:12") == ("abc", 12)
+    assert parse_event_id("abc") is None
+    assert parse_event_id("abc:x") is None
+    assert parse_event_id(None) is None
+
+
+def test_replay_after_last_event_id_then_terminal():
+    async def scenario():
+        log = RunEventLog("r1")
+        for agent in ("triage", "diagnostician"):
+            await log.put({"event": "agent_complete", "agent": agent})
+        await log.put({"event": "complete", "result": {}})
+        items = await _drain(log, after=1)
+        assert [i.seq for i in items] == [2, 3]
+        assert items[0].id == "r1:2"
+        assert json.loads(items[-1].data)["event"] == "complete"
+        assert log.finished
+        assert log.completed_agents == {"triage", "diagnostician"}
+
+    asyncio.run(scenario())
+
+
+def test_follower_receives_live_events():
+    async def scenario():
+        log = RunEventLog("r1")
+        reader = asyncio.create_task(_drain(log))
+        await asyncio.sleep(0)
+        await log.put({"event": "agent_complete", "agent": "triage"})
+        await log.put({"event": "complete"})
+        items = await reader
+        assert [i.event for i in items] == ["agent_complete", "complete"]
+        assert log.subscribers == 0
+
+    asyncio.run(scenario())
+
+
+def test_superseded_events_are_coalesced_not_truncated():
+    async def scenario():
+        log = RunEventLog("r1")
+        await log.put({"event": "queue_position", "position": 3})
+        await log.put({"event": "queue_position", "position": 1})
+        await log.put({"event": "emergency", "result": {}})
+        await log.put({"event": "complete", "result": {}})
+        assert [(e.seq, e.event) for e in log.events_after(0)] == [(2, "queue_position"), (4, "complete")]
+        assert log.evicted_through == 0
+        assert log.nbytes == sum(e.size for e in log.events_after(0))
+
+    asyncio.run(scenario())
+
+
+def test_byte_budget_evicts_oldest_and_keeps_newest():
+    async def scenario():
+        log = RunEventLog("r1", max_bytes=300)
+        for i in range(10):
+            await log.put({"event": "agent_complete", "agent": f"a{i}", "text": "x" * 50})
+        assert log.nbytes <= 300
+        assert log.evicted_through > 0
+        assert [e.seq for e in log.events_after(log.evicted_through)][-1] == 10
+
+        big = RunEventLog("r2", max_bytes=10)
+        await big.put({"event": "complete", "result": "y" * 100})
+        assert [e.seq for e in big.events_after(0)] == [1]
+
+    asyncio.run(scenario())
+
+
+def test_event_count_cap():
+    async def scenario():
+        log = RunEventLog("r1", max_events=3)
+        for i in range(5):
+            await log.put({"event": "agent_complete", "agent": f"a{i}"})
+        assert [e.seq for e in log.events_after(2)] == [3, 4, 5]
+        assert log.evicted_through == 2
+
+    asyncio.run(scenario())
+
+
+def test_replay_from_before_the_buffer_is_truncated():
+    async def scenario():
+        log = RunEventLog("r1", max_events=2)
+        for i in range(4):
+            await log.put({"event": "agent_complete", "agent": f"a{i}"})
+        with pytest.raises(ReplayTruncated) as exc:
+            log.events_after(1)
+        assert exc.value.to_event() == {
+            "event": "replay_truncated", "run_id": "r1", "after": 1, "first_available": 3,
+        }
+        # A follower resuming from an evicted event fails instead of skipping it
+        with pytest.raises(ReplayTruncated):
+            await _drain(log, after=0)
+
+    asyncio.run(scenario())
+
+
+def test_registry_check_replay():
+    async def scenario():
+        registry = RunRegistry(max_bytes=200)
+        run = registry.create()
+        for i in range(6):
+            await run.put({"event": "agent_complete", "agent": f"a{i}", "text": "x" * 40})
+        assert await registry.exists(run.run_id)
+        assert not await registry.exists("missing")
+        await registry.check_replay(run.run_id, run.evicted_through)
+        with pytest.raises(ReplayTruncated):
+            await registry.check_replay(run.run_id, 0)
+
+    asyncio.run(scenario())
+
+
+def _registry_with_run(grace):
+    registry = RunRegistry(grace=grace)
+    run = registry.create()
+    run.task = asyncio.create_task(asyncio.sleep(10))
+    return registry, run
+
+
+def test_release_cancels_abandoned_run_after_grace():
+    async def scenario():
+        registry, run = _registry_with_run(grace=0.01)
+        registry.release(run)
+        assert len(registry._watchers) == 1
+        await asyncio.sleep(0.05)
+        assert run.task.cancelled()
+        assert not registry._watchers
+
+    asyncio.run(scenario())
+
+
+def test_release_keeps_run_that_was_reattached_or_finished():
+    async def scenario():
+        registry, run = _registry_with_run(grace=0.01)
+        registry.release(run)
+        run.subscribers = 1
+        await asyncio.sleep(0.05)
+        assert not run.task.done()
+
+        registry, done = _registry_with_run(grace=0.01)
+        await done.put({"event": "complete"})
+        registry.release(done)
+        assert not registry._watchers
+        await asyncio.sleep(0.05)
+        assert not done.task.done()
+        run.task.cancel()
+        done.task.cancel()
+
+    asyncio.run(scenario())
+
+
+def test_abandoned_run_logs_cancelled_and_releases_followers():
+    async def scenario():
+        registry = RunRegistry(grace=0.01)
+        run = registry.create()
+
+        async def pipeline():
+            await run.put({"event": "agent_complete", "agent": "triage"})
+            await asyncio.sleep(10)
+
+        registry.start(run, pipeline())
+        await asyncio.sleep(0)
+        registry.release(run)
+        await asyncio.sleep(0.05)
+        assert run.task.cancelled()
+        assert run.finished
+        # A client resuming the cancelled run gets the terminal event instead of keepalives forever
+        items = await asyncio.wait_for(_drain(run, after=1), timeout=1)
+        assert [i.event for i in items] == ["cancelled"]
+
+    asyncio.run(scenario())
+
+
+def test_prune_evicts_runs_whose_task_died_or_never_started():
+    async def scenario():
+        registry = RunRegistry(ttl=60, max_runs=2)
+        dead = []
+        for _ in range(3):
+            run = registry.create()
+            run.task = asyncio.create_task(asyncio.sleep(0))
+            dead.append(run)
+        registry.create()  # never started
+        live = registry.create()
+        registry.start(live, asyncio.sleep(10))
+        await asyncio.sleep(0.01)
+        # Over capacity: dead runs go first, the live one stays
+        registry._prune()
+        assert len(registry._runs) <= 2
+        assert registry.get(live.run_id) is live
+
+        # Past the TTL, a run that never got a task is evicted even under capacity
+        registry = RunRegistry(ttl=60)
+        orphan = registry.create()
+        orphan.started -= 61
+        assert registry.get(orphan.run_id) is None
+        live.task.cancel()
+        await asyncio.gather(live.task, return_exceptions=True)
+
+    asyncio.run(scenario())
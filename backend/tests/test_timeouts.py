@@ -0,0 +1,99 @@
+"""Adaptive agent timeouts: latency quantiles, warm-up default, deadline capping."""
+
+import asyncio
+
+import pytest
+
+from agents.timeouts import LatencyWindow, TimeoutManager, within_slo
+
+
+def _warm(manager, agent, model, samples):
+    for s in samples:
+        manager.observe(agent, model, s)
+
+
+def test_quantile_is_nearest_rank():
+    window = LatencyWindow()
+    for s in range(1, 101):
+        window.add(float(s))
+    assert window.quantile(0.95) == 95.0
+    assert window.quantile(0.5) == 50.0
+    assert window.quantile(1.0) == 100.0
+
+
+def test_window_keeps_only_recent_samples():
+    window = LatencyWindow(size=3)
+    for s in (100.0, 1.0, 2.0, 3.0):
+        window.add(s)
+    assert len(window) == 3 and window.quantile(1.0) == 3.0
+
+
+def test_default_until_enough_samples_then_quantile_times_headroom():
+    manager = TimeoutManager(quantile=0.95, headroom=1.5, min_timeout=1, max_timeout=100, min_samples=20)
+    _warm(manager, "triage", "haiku", [10.0] * 19)
+    assert manager.timeout_for("triage", "haiku", default=45) == 45
+    manager.observe("triage", "haiku", 10.0)
+    assert manager.timeout_for("triage", "haiku", default=45) == pytest.approx(15.0)
+    # Windows are per (agent, model)
+    assert manager.timeout_for("triage", "opus", default=45) == 45
+
+
+def test_adaptive_timeout_is_clamped():
+    manager = TimeoutManager(min_timeout=10, max_timeout=60, min_samples=1)
+    _warm(manager, "a", "fast", [0.5])
+    _warm(manager, "a", "slow", [200.0])
+    assert manager.timeout_for("a", "fast", default=45) == 10
+    assert manager.timeout_for("a", "slow", default=45) == 60
+
+
+def test_observed_timeouts_do_not_lower_the_quantile():
+    manager = TimeoutManager(min_samples=1)
+    _warm(manager, "a", "m", [30.0] * 10)
+    # A deadline-capped timeout of 5s still counts as at least the current p95
+    manager.observe_timeout("a", "m", 5.0)
+    assert min(manager._by_model[("a", "m")].samples) == 30.0
+
+
+def test_deadline_caps_timeout_and_reserves_downstream_time():
+    manager = TimeoutManager(min_timeout=5, max_timeout=300, min_samples=1)
+    # Five stages follow triage, each expected to take its median of 10s
+    for agent in ("diagnostician", "research", "specialist", "treatment", "safety", "empathy"):
+        _warm(manager, agent, "m", [10.0])
+    assert manager.remaining() is None
+    with manager.deadline(100):
+        timeout = manager.timeout_for("triage", "m", default=90)
+        assert 49 < timeout <= 50
+        # The last stage gets whatever time is left
+        assert 99 < manager.timeout_for("empathy", "cold", default=200) <= 100
+    assert manager.remaining() is None
+
+
+def test_behind_schedule_agents_get_a_minimal_slot():
+    manager = TimeoutManager(min_timeout=5, min_samples=1)
+    for agent in ("specialist", "treatment", "safety", "empathy"):
+        _warm(manager, agent, "m", [30.0])
+    with manager.deadline(20):
+        assert 4.9 < manager.timeout_for("diagnostician", "m", default=45) <= 5
+    with manager.deadline(0.5):
+        assert manager.timeout_for("diagnostician", "m", default=45) == 1.0
+
+
+def test_nested_deadline_keeps_the_tighter_one():
+    manager = TimeoutManager()
+    with manager.deadline(10):
+        with manager.deadline(100):
+            assert manager.remaining() <= 10
+        with manager.deadline(0):
+            assert manager.remaining() <= 10
+
+
+def test_within_slo_applies_the_default_deadline(monkeypatch):
+    from agents import timeouts as module
+
+    monkeypatch.setattr(module, "timeouts", TimeoutManager(slo=30))
+
+    @within_slo
+    async def pipeline():
+        return module.timeouts.remaining()
+
+    assert 29 < asyncio.run(pipeline()) <= 30
@@ -0,0 +1,98 @@
+"""Token estimates and tool-result compaction against a per-request budget."""
+
+import json
+
+import pytest
+
+from agents import token_counter
+from agents.token_counter import (
+    IMAGE_TOKENS,
+    MESSAGE_OVERHEAD_TOKENS,
+    compact_tool_results,
+    count_message_tokens,
+    count_request_tokens,
+    count_tokens,
+    summarize_tool_result,
+    truncate_to_tokens,
+)
+
+
+@pytest.fixture(autouse=True)
+def heuristic_counts(monkeypatch):
+    # Same numbers whether or not tiktoken is installed
+    monkeypatch.setattr(token_counter, "_get_encoding", lambda: None)
+
+
+def test_heuristic_uses_vendor_chars_per_token():
+    text = "x" * 350
+    assert count_tokens("", "claude-sonnet-4-6") == 0
+    assert count_tokens(text, "claude-sonnet-4-6") == 101
+    assert count_tokens(text, "gpt-4o") == 88
+
+
+def test_message_tokens_charge_images_and_overhead():
+    messages = [
+        {"role": "user", "content": [
+            {"type": "text", "text": "a" * 35},
+            {"type": "image", "source": {}},
+        ]},
+    ]
+    expected = MESSAGE_OVERHEAD_TOKENS + IMAGE_TOKENS + count_tokens("a" * 35)
+    assert count_message_tokens(messages, "claude-sonnet-4-6") == expected
+
+
+def test_request_tokens_include_system_and_tools():
+    tools = [{"name": "lookup", "input_schema": {"type": "object"}}]
+    messages = [{"role": "user", "content": "hi"}]
+    base = count_request_tokens("", messages, None, "claude-sonnet-4-6")
+    assert count_request_tokens("system " * 50, messages, tools, "claude-sonnet-4-6") > base
+
+
+def test_truncate_to_tokens():
+    text = "word " * 1000
+    cut = truncate_to_tokens(text, 100, "claude-sonnet-4-6", marker="…")
+    assert cut.endswith("…")
+    assert count_tokens(cut) <= 101
+    assert truncate_to_tokens("short", 100, "claude-sonnet-4-6") == "short"
+
+
+def test_summarize_tool_result_keeps_scalars_and_sizes():
+    summary = json.loads(summarize_tool_result(json.dumps({
+        "condition": "asthma", "score": 0.7, "items": [1, 2, 3], "detail": {"a": 1}, "notes": "n" * 200,
+    })))
+    assert summary["_summarized"] is True
+    assert summary["condition"] == "asthma" and summary["score"] == 0.7
+    assert summary["items"] == "[3 items]" and summary["detail"] == "{1 fields}"
+    assert len(summary["notes"]) == 81
+    assert summarize_tool_result("plain text " * 100, max_chars=50).endswith("chars]")
+
+
+def _tool_turn(i, payload):
+    return [
+        {"role": "assistant", "content": [{"type": "tool_use", "id": f"t{i}", "name": "lookup", "input": {}}]},
+        {"role": "user", "content": [{"type": "tool_result", "tool_use_id": f"t{i}", "content": payload}]},
+    ]
+
+
+def test_compaction_fits_budget_and_keeps_latest_result():
+    payload = json.dumps({"findings": ["finding " * 20] * 20, "summary": "s"})
+    messages = [{"role": "user", "content": "case"}]
+    for i in range(3):
+        messages += _tool_turn(i, payload)
+    model = "claude-sonnet-4-6"
+    full = count_request_tokens("sys", messages, None, model)
+
+    budget = full // 2
+    estimate = compact_tool_results(messages, "sys", None, model, budget)
+    assert estimate <= budget
+    assert estimate == count_request_tokens("sys", messages, None, model)
+    # The result the model is about to act on is never touched
+    assert messages[-1]["content"][0]["content"] == payload
+    assert messages[2]["content"][0]["content"] != payload
+
+
+def test_compaction_is_a_no_op_under_budget():
+    messages = [{"role": "user", "content": "case"}, *_tool_turn(0, "{}"), *_tool_turn(1, "{}")]
+    before = json.dumps(messages)
+    compact_tool_results(messages, "sys", None, "claude-sonnet-4-6", 10_000)
+    assert json.dumps(messages) == before
@@ -0,0 +1,71 @@
+"""Treatment index: name normalization and indexed lookups agree with the first-match scans."""
+
+import pytest
+
+from agents.knowledge_store import knowledge
+from agents.treatment_index import TreatmentIndex, normalize_drug_name
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("Omeprazole 20 mg DR capsule", "omeprazole"),
+    ("Ibuprofen 400mg tablets", "ibuprofen"),
+    ("Hydrocortisone 1% cream", "hydrocortisone cream"),
+    ("  METFORMIN ER 500 mg  ", "metformin"),
+    ("500 mg", "500 mg"),
+])
+def test_normalize_drug_name(raw, expected):
+    assert normalize_drug_name(raw) == expected
+
+
+def _scan_medication(med):
+    """The TreatmentAgent's original lookup: first entry whose name or alias overlaps."""
+    med = normalize_drug_name(med)
+    for name, info in knowledge.table("medications").items():
+        aliases = info.get("aliases", [])
+        if med in name or name in med or any(a in med or med in a for a in aliases):
+            return name
+    return None
+
+
+@pytest.fixture(scope="module")
+def index():
+    return TreatmentIndex()
+
+
+def _queries():
+    meds = knowledge.table("medications")
+    names = list(meds)
+    aliases = [a for info in meds.values() for a in info.get("aliases") or ()]
+    variants = [f"{n.title()} 10 mg tablet" for n in names] + [f"take {a} daily" for a in aliases]
+    return names + aliases + variants + ["asp", "unknownium", "vitamin"]
+
+
+def test_medication_lookup_matches_the_scan(index):
+    for query in _queries():
+        found, info = index.medication(query)
+        assert found == _scan_medication(query), query
+        if found is not None:
+            assert info is knowledge.table("medications")[found]
+
+
+def test_brand_alias_resolves_to_generic(index):
+    assert index.medication("Tylenol 500 mg")[0] == "acetaminophen"
+    assert index.medication("unknownium") == (None, None)
+
+
+def test_care_plans_and_timing_rules(index):
+    plans = knowledge.table("care_plans")
+    for condition in plans:
+        assert index.care_plan(condition.upper())[0] == condition
+    assert index.care_plan("severe migraine with aura")[0] == "migraine"
+    assert index.timing_rule("Omeprazole 20 mg") == knowledge.table("medication_timing")["omeprazole"]
+    assert index.timing_rule("unknownium") is None
+
+
+def test_class_groups_and_name_lists(index):
+    assert {"ibuprofen", "naproxen"} <= set(index.medications_in_class("NSAID"))
+    # "Analgesic/Antipyretic" files acetaminophen under both classes
+    assert "acetaminophen" in index.medications_in_class("antipyretic")
+    assert index.medications_in_class("nonexistent") == ()
+    assert index.medication_names == sorted(knowledge.table("medications"))
+    assert index.care_plan_conditions == sorted(knowledge.table("care_plans"))